@@ -0,0 +1,102 @@
+"""Cached reach of users over clients and units.
+
+Role-scoped viewsets used to join ``Client.users`` or nest
+``UnitOperation`` subqueries into every list query to find what a user
+may see. ``get_access_scope`` resolves those associations once into
+sets of ids, which the viewsets filter on with ``id__in``.
+
+Scopes are cached per user under a version (see
+``core.cache_versions``), in the default cache shared by every worker
+and instance (see ``CACHES``). Replacing the version
+(``invalidate_access_scope``) makes the next request of any worker
+recompute it; the clients_management signals do so whenever
+``Client.users``, a unit's manager or client, or a client's activation
+changes. A per-process cache would let other workers keep granting a
+revoked scope, so it must not back deployed settings.
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+
+from clients_management.models import Client, Unit
+from core.cache_versions import bump_versions, get_version
+from core.timing import PERMISSION, timed
+from users.models import UserAccount
+
+SCOPE_CACHE_PREFIX = "access-scope"
+SCOPE_VERSION_PREFIX = "access-scope-version"
+
+
+@dataclass(frozen=True)
+class AccessScope:
+    """Ids of the clients and units a user is associated with.
+
+    Attributes:
+        client_ids: Clients listing the user among their responsibles.
+        active_client_ids: The subset of ``client_ids`` that is active.
+        unit_ids: Units managed by the user.
+        active_unit_ids: The subset of ``unit_ids`` whose client is
+            active.
+    """
+
+    client_ids: frozenset[int]
+    active_client_ids: frozenset[int]
+    unit_ids: frozenset[int]
+    active_unit_ids: frozenset[int]
+
+
+def _version_key(user_id: int) -> str:
+    return f"{SCOPE_VERSION_PREFIX}:{user_id}"
+
+
+def _compute_access_scope(user: UserAccount) -> AccessScope:
+    clients = Client.objects.filter(users=user).values_list("pk", "is_active")
+    units = Unit.objects.filter(user=user).values_list(
+        "pk", "client__is_active"
+    )
+    return AccessScope(
+        client_ids=frozenset(pk for pk, _active in clients),
+        active_client_ids=frozenset(pk for pk, active in clients if active),
+        unit_ids=frozenset(pk for pk, _active in units),
+        active_unit_ids=frozenset(pk for pk, active in units if active),
+    )
+
+
+def get_access_scope(user: UserAccount) -> AccessScope:
+    """Return the cached scope of ``user``, recomputing it if stale."""
+    version = get_version(_version_key(user.pk))
+    key = f"{SCOPE_CACHE_PREFIX}:{user.pk}:{version}"
+
+    scope = cache.get(key)
+    if scope is None:
+        with timed(PERMISSION):
+            scope = _compute_access_scope(user)
+        cache.set(key, scope, timeout=settings.ACCESS_SCOPE_CACHE_TIMEOUT)
+    return scope
+
+
+def invalidate_access_scope(user_ids: Iterable[int | None]) -> None:
+    """Make the next ``get_access_scope`` of each user recompute it."""
+    bump_versions(
+        _version_key(user_id)
+        for user_id in set(user_ids)
+        if user_id is not None
+    )
+
+
+def client_audience(client_ids: Iterable[int]) -> set[int]:
+    """Return the ids of users whose scope covers any of ``client_ids``.
+
+    These are the client's responsibles and the managers of its units.
+    """
+    client_ids = list(client_ids)
+    responsibles = Client.users.through.objects.filter(
+        client_id__in=client_ids
+    ).values_list("useraccount_id", flat=True)
+    unit_managers = Unit.objects.filter(
+        client_id__in=client_ids, user__isnull=False
+    ).values_list("user_id", flat=True)
+    return {*responsibles, *unit_managers}
@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class GestaoClientesConfig(AppConfig):
@@ -7,4 +8,6 @@ class GestaoClientesConfig(AppConfig):
     verbose_name = "Gestão de Clientes"
 
     def ready(self) -> None:
-        from clients_management import signals  # noqa: F401
+        from clients_management import signals
+
+        post_migrate.connect(signals.create_report_search_index, sender=self)
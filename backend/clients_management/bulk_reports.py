@@ -0,0 +1,293 @@
+"""Bulk creation of reports from a ZIP archive and a manifest.
+
+The manifest lists one report per row, as a JSON array of objects or
+as CSV with a header, with the fields of ``BulkReportRowSerializer``.
+Its ``pdf_file`` and ``word_file`` columns name entries of the archive.
+
+Every row is validated before anything is written, without reading the
+archive entries: sizes come from the archive directory and units and
+equipment are loaded in one query each. The previous reports replaced
+by the new ones are then archived with a single update and the new
+ones inserted with a single bulk insert, in one transaction. Each
+entry is streamed from the archive to the storage while it is
+inserted, so the archive is never extracted or held in memory.
+"""
+
+import csv
+import io
+import json
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from functools import reduce
+from operator import or_
+from pathlib import PurePosixPath
+from typing import Any
+from zipfile import BadZipFile, ZipFile, ZipInfo
+
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.db import transaction
+from django.db.models import Q
+
+from clients_management.models import Equipment, Report, Unit
+from clients_management.serializers import BulkReportRowSerializer
+from core.conditional import touch_models
+from core.counting import invalidate_model_counts
+from users.models import UserAccount
+
+MAX_BULK_REPORTS = 100
+PDF_EXTENSIONS = (".pdf",)
+WORD_EXTENSIONS = (".doc", ".docx")
+OPTIONAL_FIELDS = ("unit", "equipment")
+
+
+class ManifestError(ValueError):
+    """Raised when a manifest or an archive cannot be read."""
+
+
+def read_manifest(manifest: str | bytes | File) -> list[dict[str, Any]]:
+    """Read the rows of a JSON or CSV manifest.
+
+    Args:
+        manifest: The manifest text, or an uploaded manifest file.
+
+    Returns:
+        list[dict[str, Any]]: The rows, with empty CSV cells of the
+            optional columns read as ``None``.
+
+    Raises:
+        ManifestError: If the manifest is neither a JSON array of
+            objects nor CSV, or has too many rows.
+    """
+    if isinstance(manifest, File):
+        manifest = manifest.read()
+    if isinstance(manifest, bytes):
+        try:
+            manifest = manifest.decode("utf-8-sig")
+        except UnicodeDecodeError as exc:
+            raise ManifestError("The manifest must be UTF-8.") from exc
+
+    if manifest.lstrip().startswith("["):
+        try:
+            rows = json.loads(manifest)
+        except json.JSONDecodeError as exc:
+            raise ManifestError(f"Invalid JSON manifest: {exc}") from exc
+        if not all(isinstance(row, dict) for row in rows):
+            raise ManifestError("Every manifest row must be an object.")
+    else:
+        rows = [
+            {
+                key: None if key in OPTIONAL_FIELDS and not value else value
+                for key, value in row.items()
+            }
+            for row in csv.DictReader(io.StringIO(manifest))
+        ]
+
+    if not rows:
+        raise ManifestError("The manifest has no rows.")
+    if len(rows) > MAX_BULK_REPORTS:
+        raise ManifestError(
+            f"A manifest can list at most {MAX_BULK_REPORTS} reports."
+        )
+    return rows
+
+
+def open_archive(archive: File) -> ZipFile:
+    """Open an uploaded ZIP archive without reading its entries.
+
+    Raises:
+        ManifestError: If the file is not a ZIP archive.
+    """
+    try:
+        return ZipFile(archive)
+    except BadZipFile as exc:
+        raise ManifestError("The archive is not a valid ZIP file.") from exc
+
+
+class ArchiveEntry(File):
+    """An archive entry, opened only when it is stored.
+
+    Its size is the one recorded in the archive directory, so size
+    validators run without decompressing it, and storages read it in
+    chunks straight from the archive.
+    """
+
+    def __init__(self, archive: ZipFile, info: ZipInfo) -> None:
+        self.archive = archive
+        self.info = info
+        super().__init__(None, name=PurePosixPath(info.filename).name)
+
+    @property
+    def file(self) -> Any:
+        if self._file is None:
+            self._file = self.archive.open(self.info)
+        return self._file
+
+    @file.setter
+    def file(self, value: Any) -> None:
+        self._file = value
+
+    @property
+    def size(self) -> int:
+        return self.info.file_size
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+@dataclass
+class BulkReportUpload:
+    """Validates and creates the reports of a manifest.
+
+    Attributes:
+        archive: The archive holding the report files.
+        rows: The manifest rows.
+        user: The user uploading the reports, recorded as having
+            archived the reports they replace.
+        errors: The errors of each row, empty for valid rows.
+        reports: The reports built from the rows, once validated.
+    """
+
+    archive: ZipFile
+    rows: list[dict[str, Any]]
+    user: UserAccount
+    errors: list[dict[str, Any]] = field(default_factory=list, init=False)
+    reports: list[Report] = field(default_factory=list, init=False)
+
+    def is_valid(self) -> bool:
+        """Validate every row, collecting the errors of all of them."""
+        serializer = BulkReportRowSerializer(data=self.rows, many=True)
+        if not serializer.is_valid():
+            self.errors = [dict(errors) for errors in serializer.errors]
+            return False
+
+        rows = serializer.validated_data
+        units = Unit.objects.select_related("client").in_bulk(
+            {row["unit"] for row in rows if row.get("unit")}
+        )
+        equipments = Equipment.objects.select_related("unit__client").in_bulk(
+            {row["equipment"] for row in rows if row.get("equipment")}
+        )
+        entries = {
+            info.filename: info
+            for info in self.archive.infolist()
+            if not info.is_dir()
+        }
+
+        self.errors = []
+        self.reports = []
+        targets: set[tuple] = set()
+        for row in rows:
+            report, errors = self._build(row, (units, equipments), entries)
+            target = (
+                report.report_type,
+                report.unit_id,
+                report.equipment_id,
+            )
+            if report.report_type not in Report.NO_DUE_DATE_TYPES:
+                if target in targets:
+                    errors.setdefault("non_field_errors", []).append(
+                        "Another row replaces the same report."
+                    )
+                targets.add(target)
+            self.errors.append(errors)
+            self.reports.append(report)
+        return not any(self.errors)
+
+    def save(self) -> list[Report]:
+        """Archive the replaced reports and insert the new ones.
+
+        Returns:
+            list[Report]: The created reports.
+        """
+        try:
+            with transaction.atomic():
+                replaced = Report.all_objects.active().filter(
+                    reduce(or_, self._replaced_conditions(), Q(pk__in=[]))
+                )
+                replaced.soft_delete(deleted_by=self.user)
+                created = Report.all_objects.bulk_create(self.reports)
+        except Exception:
+            self._delete_stored_files()
+            raise
+        invalidate_model_counts(Report)
+        touch_models(Report)
+        return created
+
+    def _build(
+        self,
+        row: dict[str, Any],
+        related: tuple[dict[int, Unit], dict[int, Equipment]],
+        entries: dict[str, ZipInfo],
+    ) -> tuple[Report, dict[str, Any]]:
+        units, equipments = related
+        errors: dict[str, Any] = {}
+        report = Report(
+            report_type=row["report_type"],
+            completion_date=row["completion_date"],
+            description=row["description"],
+        )
+        for name, related_objects in (
+            ("unit", units),
+            ("equipment", equipments),
+        ):
+            pk = row.get(name)
+            if pk is None:
+                continue
+            if pk not in related_objects:
+                errors[name] = [f"No {name} with id {pk}."]
+            else:
+                setattr(report, name, related_objects[pk])
+
+        for name, extensions in (
+            ("pdf_file", PDF_EXTENSIONS),
+            ("word_file", WORD_EXTENSIONS),
+        ):
+            entry = entries.get(row[name])
+            if entry is None:
+                errors[name] = [f"The archive has no entry {row[name]!r}."]
+            elif not entry.filename.lower().endswith(extensions):
+                errors[name] = [f"Expected a {' or '.join(extensions)} file."]
+            else:
+                setattr(report, name, ArchiveEntry(self.archive, entry))
+
+        if not errors:
+            try:
+                # Units and equipment were loaded above, so their
+                # foreign keys are not checked again one by one.
+                report.full_clean(
+                    exclude={
+                        "unit",
+                        "equipment",
+                        "owner_client",
+                        "owner_unit",
+                        "deleted_by",
+                    }
+                )
+            except ValidationError as exc:
+                errors = exc.message_dict
+            else:
+                report.derive_fields()
+        return report, errors
+
+    def _replaced_conditions(self) -> Iterable[Q]:
+        """Match the active reports each new report replaces."""
+        for report in self.reports:
+            if report.report_type in Report.NO_DUE_DATE_TYPES:
+                continue
+            if report.unit_id is not None:
+                yield Q(report_type=report.report_type, unit=report.unit_id)
+            if report.equipment_id is not None:
+                yield Q(
+                    report_type=report.report_type,
+                    equipment=report.equipment_id,
+                )
+
+    def _delete_stored_files(self) -> None:
+        """Remove the files stored before the insert failed."""
+        for report in self.reports:
+            for stored in (report.pdf_file, report.word_file):
+                if stored and stored._committed:
+                    stored.storage.delete(stored.name)
@@ -0,0 +1,44 @@
+import statistics
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models import QuerySet
+
+PAGE = 20
+BATCH_SIZE = 2000
+
+
+@contextmanager
+def rolled_back() -> Iterator[None]:
+    """Run the block in a transaction that is always rolled back.
+
+    Benchmarks seed their rows inside it, so they can be pointed at a
+    development database without leaving data behind.
+    """
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def time_list_query(queryset: QuerySet) -> float:
+    """Time one page and total of ``queryset``, like a list endpoint.
+
+    Returns:
+        float: The elapsed time in milliseconds.
+    """
+    start = time.perf_counter()
+    list(queryset[:PAGE])
+    queryset.count()
+    return (time.perf_counter() - start) * 1000
+
+
+def summarize(timings: list[float]) -> tuple[float, float]:
+    """Return the median and 95th percentile of ``timings``."""
+    if len(timings) < 2:  # noqa: PLR2004
+        return timings[0], timings[0]
+    return (
+        statistics.median(timings),
+        statistics.quantiles(timings, n=20)[-1],
+    )
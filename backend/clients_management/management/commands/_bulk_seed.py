@@ -0,0 +1,513 @@
+import time
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from random import Random
+from typing import Any
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection
+from django.db.models import Max, Model
+from django.utils import timezone
+from faker import Faker
+
+from clients_management.models import (
+    Appointment,
+    Client,
+    ContractState,
+    Equipment,
+    Modality,
+    Proposal,
+    Report,
+    ServiceOrder,
+    Unit,
+)
+from core.conditional import touch_models
+from core.counting import invalidate_model_counts
+from requisitions.models import (
+    ClientOperation,
+    EquipmentOperation,
+    UnitOperation,
+    refresh_pending_operations,
+)
+from users.models import UserAccount
+
+from ._benchmark_common import BATCH_SIZE
+from ._seed_common import (
+    EQUIPMENT_LABEL_PHOTO_PATH,
+    EQUIPMENT_PHOTO_PATH,
+    PROPOSAL_PDF_PATH,
+    PROPOSAL_WORD_PATH,
+    random_completion_date,
+)
+
+UNITS_PER_CLIENT = 2
+EQUIPMENT_PER_UNIT = 5
+UNIT_REPORT_TYPES = (
+    Report.ReportType.MEMORIAL,
+    Report.ReportType.DESIGNATION_ACT,
+)
+APPOINTMENTS_PER_UNIT = 2
+# One client out of PENDING_EVERY has edits under review, and one
+# report out of ARCHIVED_EVERY is soft deleted.
+PENDING_EVERY = 20
+ARCHIVED_EVERY = 50
+ACCEPTED = {
+    "operation_type": ClientOperation.OperationType.CLOSED,
+    "operation_status": ClientOperation.OperationStatus.ACCEPTED,
+}
+REVIEW = {
+    "operation_type": ClientOperation.OperationType.EDIT,
+    "operation_status": ClientOperation.OperationStatus.REVIEW,
+}
+MANUFACTURERS = (
+    "Agfa",
+    "Canon",
+    "Carestream",
+    "Fujifilm",
+    "GE",
+    "Hologic",
+    "Philips",
+    "Shimadzu",
+    "Siemens",
+    "Toshiba",
+)
+
+# Placeholder files shared by every seeded row, by storage directory.
+PLACEHOLDERS = {
+    "reports/pdfs": PROPOSAL_PDF_PATH,
+    "reports/words": PROPOSAL_WORD_PATH,
+    "equipments/photos": EQUIPMENT_PHOTO_PATH,
+    "equipments/labels": EQUIPMENT_LABEL_PHOTO_PATH,
+    "proposals/pdfs": PROPOSAL_PDF_PATH,
+    "proposals/words": PROPOSAL_WORD_PATH,
+}
+
+
+def save_placeholders() -> dict[str, str]:
+    """Stores each placeholder file once.
+
+    Returns:
+        dict[str, str]: The stored file name, by storage directory.
+    """
+    return {
+        directory: default_storage.save(
+            f"{directory}/seed-{path.name}", ContentFile(path.read_bytes())
+        )
+        for directory, path in PLACEHOLDERS.items()
+    }
+
+
+def delete_placeholders(files: dict[str, str]) -> None:
+    """Deletes the placeholder files stored by ``save_placeholders``."""
+    for name in files.values():
+        default_storage.delete(name)
+
+
+def bulk_create_children(
+    model: type[Model], parents: Iterable[Model], **values: Any
+) -> int:
+    """Inserts multi-table inheritance rows extending ``parents``.
+
+    ``bulk_create`` refuses models with concrete parents, such as the
+    requisition operations, so only the child table is written here:
+    one row per parent, linked to it and filled with ``values`` and the
+    field defaults. Like ``bulk_create``, no signal is sent.
+
+    Returns:
+        int: The number of rows inserted.
+    """
+    fields = model._meta.local_concrete_fields
+    quote = connection.ops.quote_name
+    columns = ", ".join(quote(field.column) for field in fields)
+    placeholders = ", ".join(["%s"] * len(fields))
+    rows = []
+    for parent in parents:
+        child = model(**{model._meta.pk.attname: parent.pk}, **values)
+        rows.append(
+            [
+                field.get_db_prep_save(
+                    field.pre_save(child, add=True), connection
+                )
+                for field in fields
+            ]
+        )
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {quote(model._meta.db_table)} ({columns}) "
+            f"VALUES ({placeholders})",
+            rows,
+        )
+    return len(rows)
+
+
+@dataclass
+class Throughput:
+    """Rows inserted into a table and the time it took.
+
+    Attributes:
+        rows: Number of rows inserted.
+        seconds: Time spent inserting them.
+    """
+
+    rows: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        """Rows inserted per second."""
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+@dataclass
+class BulkSeeder:
+    """Seeds large realistic datasets with batched inserts.
+
+    Rows are written with ``bulk_create``, so ``save``, ``full_clean``
+    and the signals are skipped. The columns they would derive are
+    precomputed instead: report due dates, owners and search documents,
+    contract states, pending operation flags and appointment statuses.
+    Every entity is the accepted operation that added it, as the
+    requisition workflow leaves them, and every row shares the
+    placeholder ``files``.
+
+    Attributes:
+        files: Stored placeholder names, from ``save_placeholders``.
+        seed: Seed of the random values, for reproducible datasets.
+        throughput: Rows inserted and time spent, by table.
+        models: The models inserted into.
+    """
+
+    files: dict[str, str]
+    seed: int = 0
+    throughput: dict[str, Throughput] = field(default_factory=dict)
+    fake: Faker = field(init=False)
+    random: Random = field(init=False)
+    models: set[type[Model]] = field(init=False, default_factory=set)
+
+    def __post_init__(self) -> None:
+        """Create the seeded random generators."""
+        self.fake = Faker("pt_BR")
+        self.fake.seed_instance(self.seed)
+        self.random = Random(self.seed)
+
+    def _insert(self, model: type[Model], rows: Iterable[Model]) -> list:
+        start = time.perf_counter()
+        created = model._default_manager.bulk_create(
+            rows, batch_size=BATCH_SIZE
+        )
+        self._record(model, len(created), start)
+        return created
+
+    def _insert_children(
+        self, model: type[Model], parents: Iterable[Model], **values: Any
+    ) -> None:
+        start = time.perf_counter()
+        inserted = bulk_create_children(model, parents, **values)
+        self._record(model, inserted, start)
+
+    def _record(self, model: type[Model], rows: int, start: float) -> None:
+        stats = self.throughput.setdefault(model._meta.db_table, Throughput())
+        stats.rows += rows
+        stats.seconds += time.perf_counter() - start
+        self.models.add(model)
+
+    def invalidate_caches(self) -> None:
+        """Invalidates the caches of the seeded tables.
+
+        The signals skipped by the bulk inserts would have dropped the
+        cached counts and replaced the table versions of the ETags.
+        """
+        for model in self.models:
+            invalidate_model_counts(model)
+        touch_models(*self.models)
+
+    def clients(
+        self, count: int, responsibles: Sequence[UserAccount]
+    ) -> list[Client]:
+        """Creates ``count`` clients, each shared by a responsible.
+
+        CNPJs are numbered after the highest client id, so seeding
+        again never reuses the contract state of an earlier run.
+        """
+        first = (Client.objects.aggregate(Max("pk"))["pk__max"] or 0) + 1
+        fake = self.fake
+        clients = self._insert(
+            Client,
+            (
+                Client(
+                    cnpj=f"{first + index:014d}",
+                    name=fake.company()[:50],
+                    razao_social=fake.company(),
+                    email=fake.company_email(),
+                    phone="11999999999",
+                    address=fake.street_address(),
+                    state=fake.estado_sigla(),
+                    city=fake.city()[:50],
+                    is_active=True,
+                )
+                for index in range(count)
+            ),
+        )
+        self._insert_children(ClientOperation, clients, **ACCEPTED)
+        self._insert(
+            Client.users.through,
+            (
+                Client.users.through(
+                    client=client,
+                    useraccount=responsibles[index % len(responsibles)],
+                )
+                for index, client in enumerate(clients)
+            ),
+        )
+        return clients
+
+    def units(self, clients: Sequence[Client]) -> list[Unit]:
+        """Creates the units of ``clients``."""
+        units = self._insert(
+            Unit,
+            (
+                Unit(
+                    client=client,
+                    name=f"{client.name[:40]} {number}",
+                    razao_social=client.razao_social,
+                    cnpj=client.cnpj,
+                    email=client.email,
+                    phone=client.phone,
+                    address=client.address,
+                    state=client.state,
+                    city=client.city,
+                )
+                for client in clients
+                for number in range(1, UNITS_PER_CLIENT + 1)
+            ),
+        )
+        self._insert_children(UnitOperation, units, **ACCEPTED)
+        return units
+
+    def equipments(
+        self, units: Sequence[Unit], modalities: Sequence[Modality]
+    ) -> list[Equipment]:
+        """Creates the equipment of ``units``."""
+        fake = self.fake
+        equipments = self._insert(
+            Equipment,
+            (
+                Equipment(
+                    unit=unit,
+                    modality=self.random.choice(modalities),
+                    manufacturer=self.random.choice(MANUFACTURERS),
+                    model=fake.bothify("??-####").upper(),
+                    series_number=fake.bothify("SN-########"),
+                    equipment_photo=self.files["equipments/photos"],
+                    label_photo=self.files["equipments/labels"],
+                )
+                for unit in units
+                for _ in range(EQUIPMENT_PER_UNIT)
+            ),
+        )
+        self._insert_children(EquipmentOperation, equipments, **ACCEPTED)
+        return equipments
+
+    def pending_operations(
+        self,
+        clients: Sequence[Client],
+        units: Sequence[Unit],
+        equipments: Sequence[Equipment],
+    ) -> None:
+        """Opens edits under review for a share of the clients.
+
+        One client out of ``PENDING_EVERY`` has an edit under review on
+        itself, on its first unit and on the first equipment of that
+        unit. Each edit holds a copy of the entity's row, as the
+        requisition workflow does, and the clients' pending flags are
+        updated.
+        """
+        pending = clients[::PENDING_EVERY]
+        first_units = {}
+        for unit in units:
+            first_units.setdefault(unit.client_id, unit)
+        first_equipments = {}
+        for equipment in equipments:
+            first_equipments.setdefault(equipment.unit_id, equipment)
+        pending_units = [first_units[client.pk] for client in pending]
+        pending_equipments = [
+            first_equipments[unit.pk]
+            for unit in pending_units
+            if unit.pk in first_equipments
+        ]
+        for model, originals, original in (
+            (ClientOperation, pending, "original_client"),
+            (UnitOperation, pending_units, "original_unit"),
+            (EquipmentOperation, pending_equipments, "original_equipment"),
+        ):
+            for row, copy in zip(
+                originals, self._copy_rows(originals), strict=True
+            ):
+                self._insert_children(
+                    model, [copy], **REVIEW, **{original: row}
+                )
+        refresh_pending_operations(*(client.cnpj for client in pending))
+
+    def _copy_rows(self, rows: Sequence[Model]) -> list:
+        if not rows:
+            return []
+        model = type(rows[0])
+        fields = [
+            field
+            for field in model._meta.concrete_fields
+            if not field.primary_key
+        ]
+        return self._insert(
+            model,
+            (
+                model(
+                    **{
+                        field.attname: getattr(row, field.attname)
+                        for field in fields
+                    }
+                )
+                for row in rows
+            ),
+        )
+
+    def proposals(self, clients: Sequence[Client]) -> None:
+        """Creates the accepted proposal of each client.
+
+        Two thirds of the contracts are annual, signed up to a year ago,
+        so that some clients need an appointment. The contract states
+        are derived from the proposals.
+        """
+        today = date.today()
+        proposals = self._insert(
+            Proposal,
+            (
+                Proposal(
+                    cnpj=client.cnpj,
+                    state=client.state,
+                    city=client.city,
+                    contact_name=self.fake.name()[:50],
+                    contact_phone="11999999999",
+                    email=self.fake.email(),
+                    date=today - timedelta(days=self.random.randrange(365)),
+                    value=1000,
+                    contract_type=(
+                        Proposal.ContractType.ANNUAL
+                        if index % 3
+                        else Proposal.ContractType.MONTHLY
+                    ),
+                    status=Proposal.Status.ACCEPTED,
+                    pdf_version=self.files["proposals/pdfs"],
+                    word_version=self.files["proposals/words"],
+                )
+                for index, client in enumerate(clients)
+            ),
+        )
+        annual = Proposal.ContractType.ANNUAL
+        self._insert(
+            ContractState,
+            (
+                ContractState(
+                    cnpj=proposal.cnpj,
+                    latest_accepted_date=proposal.date,
+                    latest_accepted_contract_type=proposal.contract_type,
+                    latest_annual_accepted_date=(
+                        proposal.date
+                        if proposal.contract_type == annual
+                        else None
+                    ),
+                )
+                for proposal in proposals
+            ),
+        )
+
+    def appointments(
+        self,
+        units: Sequence[Unit],
+        equipments: Sequence[Equipment],
+        responsible: UserAccount,
+    ) -> None:
+        """Creates the appointments of ``units``, up to a year ago.
+
+        Past appointments were fulfilled and have a service order on
+        the unit's equipment, signed by ``responsible``.
+        """
+        now = timezone.now()
+        appointments = [
+            Appointment(
+                unit=unit,
+                date=now + timedelta(days=self.random.randrange(-365, 90)),
+                contact_name=self.fake.name()[:50],
+                contact_phone="11999999999",
+            )
+            for unit in units
+            for _ in range(APPOINTMENTS_PER_UNIT)
+        ]
+        past = [
+            appointment
+            for appointment in appointments
+            if appointment.date < now
+        ]
+        orders = self._insert(
+            ServiceOrder,
+            (
+                ServiceOrder(
+                    subject="Levantamento radiométrico",
+                    description=self.fake.paragraph(),
+                    conclusion=self.fake.paragraph(),
+                    responsible_prophy=responsible,
+                )
+                for _ in past
+            ),
+        )
+        for appointment, order in zip(past, orders, strict=True):
+            appointment.status = Appointment.Status.FULFILLED
+            appointment.service_order = order
+        self._insert(Appointment, appointments)
+
+        unit_equipments: dict[int, list[Equipment]] = {}
+        for equipment in equipments:
+            unit_equipments.setdefault(equipment.unit_id, []).append(equipment)
+        self._insert(
+            ServiceOrder.equipments.through,
+            (
+                ServiceOrder.equipments.through(
+                    serviceorder=appointment.service_order,
+                    equipment=equipment,
+                )
+                for appointment in past
+                for equipment in unit_equipments.get(appointment.unit.pk, [])
+            ),
+        )
+
+    def reports(
+        self, units: Sequence[Unit], equipments: Sequence[Equipment]
+    ) -> list[Report]:
+        """Creates a quality control per equipment and unit reports.
+
+        Completion dates are spread so that every status is present.
+        """
+        reports = [
+            Report(
+                equipment=equipment,
+                report_type=Report.ReportType.QUALITY_CONTROL,
+            )
+            for equipment in equipments
+        ] + [
+            Report(unit=unit, report_type=report_type)
+            for unit in units
+            for report_type in UNIT_REPORT_TYPES
+        ]
+        deleted_at = timezone.now()
+        for index, report in enumerate(reports):
+            report.completion_date = random_completion_date(
+                report.report_type, self.random
+            )
+            report.pdf_file = self.files["reports/pdfs"]
+            report.word_file = self.files["reports/words"]
+            report.description = report.get_report_type_display()
+            report.derive_fields()
+            if index % ARCHIVED_EVERY == 0:
+                report.deleted_at = deleted_at
+        return self._insert(Report, reports)
@@ -2,14 +2,16 @@ import json
 import os
 import re
 import uuid
+from datetime import date, timedelta
 from pathlib import Path
+from random import Random
 
 from django.conf import settings
 from django.contrib.auth.models import Group, Permission
 from django.core.files.base import ContentFile
 from django.db import connection
 
-from clients_management.models import Modality
+from clients_management.models import Modality, Report
 from users.models import UserAccount
 
 CPF_ADMIN = "03446254005"
@@ -72,6 +74,11 @@ FIXTURE_PATH = (
 
 RANDOM_ID_FLOOR = 100_000
 
+OVERDUE_ROLL_THRESHOLD = 20
+NEAR_DUE_ROLL_THRESHOLD = 50
+
+_random = Random()
+
 
 def get_accessory_type(modality: str) -> Modality.AccessoryType:
     modality_to_accessory_map = {
@@ -86,6 +93,32 @@ def get_accessory_type(modality: str) -> Modality.AccessoryType:
     return modality_to_accessory_map.get(modality, Modality.AccessoryType.NONE)
 
 
+def random_completion_date(
+    report_type_code: str, rng: Random = _random
+) -> date:
+    today = date.today()
+    if report_type_code == Report.ReportType.RADIOMETRIC_SURVEY:
+        validity_days = 4 * 365
+    else:
+        validity_days = 365
+
+    roll = rng.randint(1, 100)
+    if roll <= OVERDUE_ROLL_THRESHOLD:
+        # Overdue: due_date in the past
+        delta = validity_days + rng.randint(1, 60)
+        return today - timedelta(days=delta)
+    elif roll <= NEAR_DUE_ROLL_THRESHOLD:
+        # Near due: due within ~30 days
+        offset = max(0, validity_days - rng.randint(0, 30))
+        return today - timedelta(days=offset)
+    else:
+        # General case within validity window but not too close to edges
+        low = 30
+        high = max(low + 1, validity_days - 60)
+        delta = rng.randint(low, high)
+        return today - timedelta(days=delta)
+
+
 def create_fixture_path(output_name: str) -> str:
     return os.path.join(FIXTURE_PATH, output_name)
 
@@ -0,0 +1,313 @@
+import json
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.http.response import HttpResponseBase
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from clients_management.models import (
+    Appointment,
+    Client,
+    ContractState,
+    Equipment,
+    Modality,
+    Proposal,
+    Report,
+    ServiceOrder,
+    Unit,
+)
+from clients_management.reference import invalidate_modalities
+from core.counting import invalidate_model_counts
+from users.models import UserAccount
+
+from ._benchmark_common import rolled_back, summarize
+from ._bulk_seed import BulkSeeder, delete_placeholders, save_placeholders
+
+PHYSICISTS = 10
+# Clients shared by the client manager benchmarked.
+MANAGED_CLIENTS = 3
+
+ROLES = (
+    UserAccount.Role.PROPHY_MANAGER,
+    UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST,
+    UserAccount.Role.CLIENT_GENERAL_MANAGER,
+    UserAccount.Role.UNIT_MANAGER,
+)
+SEEDED_MODELS = (
+    Client,
+    Unit,
+    Equipment,
+    Report,
+    Appointment,
+    ServiceOrder,
+    Proposal,
+    ContractState,
+    UserAccount,
+)
+
+
+class Command(BaseCommand):
+    """Times the hot API endpoints for each role on a large dataset.
+
+    Seeds ``--clients`` clients as the requisition workflow leaves
+    them: each with units, equipment, reports, appointments with their
+    service orders and a contract proposal, plus a share of edits under
+    review. The real endpoints are then requested through the test
+    client, authenticated with a JWT, as a Prophy manager, an internal
+    physicist, a client manager and a unit manager, including the
+    client list with its ``needs_appointment`` ordering, the report
+    list with each filter, the equipment manufacturers, the appointment
+    and requisition lists, a report download and a service order PDF.
+
+    The result is a JSON document with the p50 and p95 latency, the
+    status and the most queries run by each request, written to stdout
+    or ``--output``, so that runs can be compared before a release.
+
+    Everything runs inside a transaction that is rolled back, so the
+    command can be pointed at a development database. Run it against
+    PostgreSQL, after ``migrate``, to measure production plans.
+    """
+
+    help = "Benchmarks the hot API endpoints for each role."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--clients",
+            type=int,
+            default=2000,
+            help="Clients to seed (default: 2000).",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Timed requests per role and endpoint (default: 20).",
+        )
+        parser.add_argument(
+            "--output",
+            help="File to write the JSON results to (default: stdout).",
+        )
+
+    def handle(self, *args, **options):
+        self.stderr.write(
+            f"Seeding {options['clients']} clients on {connection.vendor}..."
+        )
+        files = save_placeholders()
+        try:
+            with rolled_back():
+                users, sample = self._seed(options["clients"], files)
+                self._invalidate_caches()
+                if connection.vendor == "postgresql":
+                    with connection.cursor() as cursor:
+                        cursor.execute("ANALYZE")
+                rows = {
+                    model._meta.model_name: model._base_manager.count()
+                    for model in SEEDED_MODELS
+                }
+                results = self._run(users, sample, options["repeat"])
+        finally:
+            delete_placeholders(files)
+            self._invalidate_caches()
+
+        document = json.dumps(
+            {
+                "vendor": connection.vendor,
+                "repeat": options["repeat"],
+                "rows": rows,
+                "results": results,
+            },
+            indent=2,
+        )
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output:
+                output.write(document)
+            self.stderr.write(f"Results written to {options['output']}.")
+        else:
+            self.stdout.write(document)
+
+    @staticmethod
+    def _invalidate_caches() -> None:
+        """Drop cached counts and modalities of the seeded tables.
+
+        ``bulk_create`` sends no signal, so the caches are invalidated
+        once after seeding and again after the rollback.
+        """
+        for model in SEEDED_MODELS:
+            invalidate_model_counts(model)
+        invalidate_modalities()
+
+    def _seed(
+        self, clients: int, files: dict[str, str]
+    ) -> tuple[dict[str, UserAccount], dict[str, str]]:
+        users = {
+            role: UserAccount.objects.create_user(
+                cpf=f"{index:011d}",
+                email=f"benchmark-{role.lower()}@example.com",
+                password=None,
+                name=f"Benchmark {role.label}",
+                phone=f"119{index:08d}",
+                role=role,
+            )
+            for index, role in enumerate(ROLES)
+        }
+        physicists = [users[UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST]]
+        physicists += [
+            UserAccount.objects.create_user(
+                cpf=f"{index:011d}",
+                email=f"benchmark-physicist-{index}@example.com",
+                password=None,
+                name=f"Benchmark Physicist {index}",
+                phone=f"119{index:08d}",
+                role=UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST,
+            )
+            for index in range(len(ROLES), len(ROLES) + PHYSICISTS - 1)
+        ]
+        modality = Modality.objects.create(name="Benchmark")
+
+        seeder = BulkSeeder(files)
+        created_clients = seeder.clients(clients, physicists)
+        users[UserAccount.Role.CLIENT_GENERAL_MANAGER].clients.add(
+            *created_clients[:MANAGED_CLIENTS]
+        )
+        units = seeder.units(created_clients)
+        Unit.objects.filter(pk=units[0].pk).update(
+            user=users[UserAccount.Role.UNIT_MANAGER]
+        )
+        equipments = seeder.equipments(units, [modality])
+        seeder.pending_operations(created_clients, units, equipments)
+        seeder.proposals(created_clients)
+        seeder.appointments(
+            units, equipments, users[UserAccount.Role.PROPHY_MANAGER]
+        )
+        seeder.reports(units, equipments)
+
+        client = created_clients[0]
+        unit = units[0]
+        sample = {
+            "client_name": client.name.split()[0],
+            "client_cnpj": client.cnpj,
+            "unit": str(unit.pk),
+            "unit_name": unit.name.split()[0],
+            "unit_city": unit.city,
+            "equipment": str(equipments[0].pk),
+            "responsible_cpf": physicists[0].cpf,
+            "search": unit.name.split()[0],
+            "report": str(
+                Report.objects.filter(owner_unit=unit).values_list(
+                    "pk", flat=True
+                )[0]
+            ),
+            "service_order": str(
+                ServiceOrder.objects.filter(
+                    appointment__unit__client=client
+                ).values_list("pk", flat=True)[0]
+            ),
+        }
+        return users, sample
+
+    @staticmethod
+    def _endpoints(sample: dict[str, str]) -> dict[str, str]:
+        today = date.today()
+        reports = "/api/reports/"
+        report_filters = {
+            "unit": sample["unit"],
+            "equipment": sample["equipment"],
+            "report_type": Report.ReportType.MEMORIAL,
+            "due_date_start": today.isoformat(),
+            "due_date_end": (today + timedelta(days=90)).isoformat(),
+            "client_name": sample["client_name"],
+            "responsible_cpf": sample["responsible_cpf"],
+            "client_cnpj": sample["client_cnpj"],
+            "unit_name": sample["unit_name"],
+            "unit_city": sample["unit_city"],
+            "due_soon": "true",
+            "q": sample["search"],
+        }
+        return {
+            "clients": "/api/clients/",
+            "reports": reports,
+            "reports cursor": f"{reports}?pagination=cursor",
+            **{
+                f"reports {name}": f"{reports}?{name}={value}"
+                for name, value in report_filters.items()
+            },
+            **{
+                f"reports status={value}": f"{reports}?status={value}"
+                for value in (
+                    "overdue",
+                    "due_soon",
+                    "ok",
+                    "archived",
+                    "no_due_date",
+                )
+            },
+            "equipment manufacturers": "/api/equipments/manufacturers/",
+            "appointments": "/api/appointments/",
+            "client operations": "/api/clients/operations/",
+            "unit operations": "/api/units/operations/",
+            "equipment operations": "/api/equipments/operations/",
+            "report download": (f"{reports}{sample['report']}/download/pdf/"),
+            "service order pdf": (
+                f"/api/service-orders/{sample['service_order']}/pdf/"
+            ),
+        }
+
+    def _run(
+        self,
+        users: dict[str, UserAccount],
+        sample: dict[str, str],
+        repeat: int,
+    ) -> list[dict]:
+        results = []
+        endpoints = self._endpoints(sample)
+        with override_settings(ALLOWED_HOSTS=["testserver"]):
+            for role, user in users.items():
+                api_client = APIClient()
+                api_client.credentials(
+                    HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}"
+                )
+                for endpoint, url in endpoints.items():
+                    self.stderr.write(f"{role} {endpoint}")
+                    # The first request warms the caches up, untimed.
+                    self._request(api_client, url)
+                    timings = []
+                    queries = 0
+                    for _ in range(repeat):
+                        elapsed, response = self._request(api_client, url)
+                        timings.append(elapsed)
+                        queries = max(
+                            queries, response.wsgi_request.query_stats.count
+                        )
+                    p50, p95 = summarize(timings)
+                    results.append(
+                        {
+                            "role": role,
+                            "endpoint": endpoint,
+                            "url": url,
+                            "status": response.status_code,
+                            "p50_ms": round(p50, 2),
+                            "p95_ms": round(p95, 2),
+                            "queries": queries,
+                        }
+                    )
+        return results
+
+    @staticmethod
+    def _request(
+        api_client: APIClient, url: str
+    ) -> tuple[float, HttpResponseBase]:
+        """Request ``url`` and read the whole body, timing both.
+
+        Returns:
+            tuple[float, HttpResponseBase]: The elapsed time in
+                milliseconds and the response.
+        """
+        start = time.perf_counter()
+        response = api_client.get(url)
+        if response.streaming:
+            b"".join(response.streaming_content)
+        return (time.perf_counter() - start) * 1000, response
@@ -0,0 +1,212 @@
+from random import Random
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from faker import Faker
+
+from clients_management.models import (
+    Client,
+    Equipment,
+    Modality,
+    Proposal,
+    Unit,
+)
+from clients_management.views import (
+    ClientViewSet,
+    EquipmentViewSet,
+    ProposalViewSet,
+)
+from core.fuzzy import FUZZY_MATCH, MATCH_PARAM, normalize_search_text
+
+from ._benchmark_common import (
+    BATCH_SIZE,
+    rolled_back,
+    summarize,
+    time_list_query,
+)
+
+UNITS_PER_CLIENT = 1
+MIN_TERM_LENGTH = 4
+
+
+class Command(BaseCommand):
+    """Benchmarks the ``icontains`` and ``fuzzy`` list text filters.
+
+    Seeds ``--rows`` clients, equipment and proposals with Portuguese
+    names, then times the text filters of the client, equipment and
+    proposal lists in both matching modes. Each query fetches the first
+    page and the total count, as the list endpoints do. The search
+    terms are accent-free, so the matches column also shows how many
+    rows plain ``icontains`` misses.
+
+    Everything runs inside a transaction that is rolled back, so the
+    command can be pointed at a development database. Run it against
+    PostgreSQL, after ``migrate``, to measure the trigram indexes.
+    """
+
+    help = "Benchmarks the fuzzy text filters of the list endpoints."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=50_000,
+            help="Rows to seed per table (default: 50000).",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Timed runs per filter and mode (default: 20).",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"Seeding {options['rows']} rows per table on "
+            f"{connection.vendor}..."
+        )
+        with rolled_back():
+            terms = self._seed(options["rows"])
+            if connection.vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute("ANALYZE")
+            self._run(terms, options["repeat"])
+
+    def _seed(self, rows: int) -> dict[str, str]:
+        fake = Faker("pt_BR")
+        fake.seed_instance(0)
+        modality = Modality.objects.create(name="Benchmark")
+
+        clients = Client.objects.bulk_create(
+            (
+                Client(
+                    cnpj=fake.cnpj().translate(str.maketrans("", "", "./-")),
+                    name=fake.company()[:50],
+                    razao_social=fake.company(),
+                    email=fake.company_email(),
+                    phone="11999999999",
+                    address=fake.street_address(),
+                    state=fake.estado_sigla(),
+                    city=fake.city()[:50],
+                )
+                for _ in range(rows)
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        units = Unit.objects.bulk_create(
+            (
+                Unit(
+                    client=client,
+                    name=client.name,
+                    razao_social=client.razao_social,
+                    cnpj=client.cnpj,
+                    email=client.email,
+                    phone=client.phone,
+                    address=client.address,
+                    state=client.state,
+                    city=client.city,
+                )
+                for client in clients
+                for _ in range(UNITS_PER_CLIENT)
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        Equipment.objects.bulk_create(
+            (
+                Equipment(
+                    unit=unit,
+                    modality=modality,
+                    manufacturer=fake.last_name()[:30],
+                    model=fake.bothify("??-####"),
+                    equipment_photo="equipments/photos/benchmark.jpg",
+                    label_photo="equipments/labels/benchmark.jpg",
+                )
+                for unit in units
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        proposals = Proposal.objects.bulk_create(
+            (
+                Proposal(
+                    cnpj=client.cnpj,
+                    state=client.state,
+                    city=client.city,
+                    contact_name=fake.name()[:50],
+                    contact_phone="11999999999",
+                    email=fake.email(),
+                    value=1000,
+                    contract_type=Proposal.ContractType.ANNUAL,
+                    pdf_version="proposals/pdfs/benchmark.pdf",
+                    word_version="proposals/words/benchmark.docx",
+                )
+                for client in clients
+            ),
+            batch_size=BATCH_SIZE,
+        )
+
+        # Accent-free terms taken from accented values, when any.
+        random = Random(0)
+        samples = {
+            "client name": [client.name for client in clients],
+            "client city": [client.city for client in clients],
+            "equipment manufacturer": [
+                equipment.manufacturer
+                for equipment in Equipment.objects.only("manufacturer")[:1000]
+            ],
+            "proposal contact": [
+                proposal.contact_name for proposal in proposals
+            ],
+        }
+        terms = {}
+        for label, values in samples.items():
+            words = [
+                word
+                for value in values[:1000]
+                for word in value.split()
+                if word.isalpha() and len(word) >= MIN_TERM_LENGTH
+            ]
+            accented = [
+                word
+                for word in words
+                if normalize_search_text(word) != word.lower()
+            ]
+            terms[label] = normalize_search_text(
+                random.choice(accented or words)
+            )
+        return terms
+
+    def _querysets(self, terms: dict[str, str], mode: dict) -> dict:
+        client_view = ClientViewSet()
+        equipment_view = EquipmentViewSet()
+        proposal_view = ProposalViewSet()
+        return {
+            "client name": client_view._apply_filters(
+                Client.objects.all(), {**mode, "name": terms["client name"]}
+            ),
+            "client city": client_view._apply_filters(
+                Client.objects.all(), {**mode, "city": terms["client city"]}
+            ),
+            "equipment manufacturer": equipment_view._apply_filters(
+                Equipment.objects.all(),
+                {**mode, "manufacturer": terms["equipment manufacturer"]},
+            ),
+            "proposal contact": proposal_view._apply_filters(
+                Proposal.objects.all(),
+                {**mode, "contact_name": terms["proposal contact"]},
+            ),
+        }
+
+    def _run(self, terms: dict[str, str], repeat: int) -> None:
+        self.stdout.write(
+            f"{'filter':<24}{'term':<14}{'mode':<11}"
+            f"{'matches':>8}{'median ms':>11}{'p95 ms':>9}"
+        )
+        modes = {"icontains": {}, FUZZY_MATCH: {MATCH_PARAM: FUZZY_MATCH}}
+        for mode, params in modes.items():
+            for label, queryset in self._querysets(terms, params).items():
+                timings = [time_list_query(queryset) for _ in range(repeat)]
+                median, p95 = summarize(timings)
+                self.stdout.write(
+                    f"{label:<24}{terms[label]:<14}{mode:<11}"
+                    f"{queryset.count():>8}{median:>11.2f}{p95:>9.2f}"
+                )
@@ -0,0 +1,230 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import QuerySet
+from django.utils import timezone
+from faker import Faker
+
+from clients_management import policies
+from clients_management.models import (
+    Appointment,
+    Client,
+    Equipment,
+    Modality,
+    Report,
+    Unit,
+)
+from clients_management.views import ClientViewSet
+from users.models import UserAccount
+
+from ._benchmark_common import (
+    BATCH_SIZE,
+    rolled_back,
+    summarize,
+    time_list_query,
+)
+
+UNITS_PER_CLIENT = 2
+ROWS_PER_UNIT = 2
+# Physicists sharing every client, so that joins through Client.users
+# multiply rows.
+PHYSICISTS = 3
+
+
+class Command(BaseCommand):
+    """Compares join-based access filters with the row policies.
+
+    Seeds ``--clients`` clients, each with units, equipment,
+    appointments and reports and a few physicists responsible for all
+    of them. For one of those physicists it then times the join
+    filters the viewsets used before ``clients_management.policies``
+    (``legacy``) against the policy querysets (``policy``), fetching a
+    page and the total count as the list endpoints do. With ``-v 2``
+    the query plan of each variant is printed as well.
+
+    Everything runs inside a transaction that is rolled back.
+    """
+
+    help = "Benchmarks the row-level access policies against joins."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--clients",
+            type=int,
+            default=5_000,
+            help="Clients to seed (default: 5000).",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Timed runs per query and variant (default: 20).",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"Seeding {options['clients']} clients on {connection.vendor}..."
+        )
+        with rolled_back():
+            user = self._seed(options["clients"])
+            if connection.vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute("ANALYZE")
+            self._run(user, options["repeat"], options["verbosity"])
+
+    def _seed(self, clients: int) -> UserAccount:
+        fake = Faker("pt_BR")
+        fake.seed_instance(0)
+        modality = Modality.objects.create(name="Benchmark")
+        physicists = [
+            UserAccount.objects.create_user(
+                cpf=f"{index:011d}",
+                email=f"benchmark-physicist-{index}@example.com",
+                password=None,
+                name=f"Benchmark Physicist {index}",
+                phone=f"119{index:08d}",
+                role=UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST,
+            )
+            for index in range(PHYSICISTS)
+        ]
+
+        created_clients = Client.objects.bulk_create(
+            (
+                Client(
+                    cnpj=f"{index:014d}",
+                    name=fake.company()[:50],
+                    razao_social=fake.company(),
+                    email=fake.company_email(),
+                    phone="11999999999",
+                    address=fake.street_address(),
+                    state=fake.estado_sigla(),
+                    city=fake.city()[:50],
+                    is_active=True,
+                )
+                for index in range(clients)
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        Client.users.through.objects.bulk_create(
+            (
+                Client.users.through(client=client, useraccount=physicist)
+                for client in created_clients
+                for physicist in physicists
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        units = Unit.objects.bulk_create(
+            (
+                Unit(
+                    client=client,
+                    name=client.name,
+                    razao_social=client.razao_social,
+                    cnpj=client.cnpj,
+                    email=client.email,
+                    phone=client.phone,
+                    address=client.address,
+                    state=client.state,
+                    city=client.city,
+                )
+                for client in created_clients
+                for _ in range(UNITS_PER_CLIENT)
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        Equipment.objects.bulk_create(
+            (
+                Equipment(
+                    unit=unit,
+                    modality=modality,
+                    manufacturer=fake.last_name()[:30],
+                    model=fake.bothify("??-####"),
+                    equipment_photo="equipments/photos/benchmark.jpg",
+                    label_photo="equipments/labels/benchmark.jpg",
+                )
+                for unit in units
+                for _ in range(ROWS_PER_UNIT)
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        Appointment.objects.bulk_create(
+            (
+                Appointment(
+                    unit=unit,
+                    date=fake.date_time_this_year(
+                        tzinfo=timezone.get_current_timezone()
+                    ),
+                    contact_name=fake.name()[:50],
+                    contact_phone="11999999999",
+                )
+                for unit in units
+                for _ in range(ROWS_PER_UNIT)
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        Report.objects.bulk_create(
+            (
+                Report(
+                    unit=unit,
+                    owner_unit=unit,
+                    owner_client_id=unit.client_id,
+                    report_type=Report.ReportType.MEMORIAL,
+                    completion_date=date.today(),
+                    pdf_file="reports/benchmark.pdf",
+                    description="Benchmark",
+                )
+                for unit in units
+                for _ in range(ROWS_PER_UNIT)
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        return physicists[0]
+
+    def _variants(self, user: UserAccount) -> dict[str, dict[str, QuerySet]]:
+        physicist_role = UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST
+        client_view = ClientViewSet()
+        return {
+            "appointments": {
+                "legacy": Appointment.objects.filter(unit__client__users=user),
+                "policy": policies.APPOINTMENTS.apply(
+                    Appointment.objects.all(), user
+                ),
+            },
+            "equipments": {
+                "legacy": Equipment.objects.filter(
+                    unit__client__users=user, unit__client__is_active=True
+                ),
+                "policy": policies.EQUIPMENTS.apply(
+                    Equipment.objects.all(), user
+                ),
+            },
+            "reports": {
+                "legacy": Report.objects.filter(owner_client__users=user),
+                "policy": policies.REPORTS.apply(Report.objects.all(), user),
+            },
+            "clients by role": {
+                "legacy": Client.objects.filter(
+                    users__role=physicist_role
+                ).distinct(),
+                "policy": client_view._apply_filters(
+                    Client.objects.all(), {"user_role": physicist_role}
+                ),
+            },
+        }
+
+    def _run(self, user: UserAccount, repeat: int, verbosity: int) -> None:
+        self.stdout.write(
+            f"{'query':<18}{'variant':<9}{'rows':>8}"
+            f"{'median ms':>11}{'p95 ms':>9}"
+        )
+        for label, variants in self._variants(user).items():
+            for variant, queryset in variants.items():
+                queryset = queryset.order_by("-pk")
+                timings = [time_list_query(queryset) for _ in range(repeat)]
+                median, p95 = summarize(timings)
+                self.stdout.write(
+                    f"{label:<18}{variant:<9}{queryset.count():>8}"
+                    f"{median:>11.2f}{p95:>9.2f}"
+                )
+                if verbosity > 1:
+                    self.stdout.write(queryset.explain())
@@ -0,0 +1,75 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from clients_management.models import Report
+from core.conditional import touch_models
+from core.counting import invalidate_model_counts
+
+
+class Command(BaseCommand):
+    """Checks the denormalized owner columns of every report.
+
+    Compares ``owner_unit``/``owner_client`` with the values resolved
+    from the report's unit or equipment, including soft-deleted
+    reports. With ``--fix`` the divergent rows are rewritten, otherwise
+    the command exits with an error when any divergence is found.
+    """
+
+    help = "Checks (and optionally fixes) report owner columns."
+
+    BATCH_SIZE = 500
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Rewrite report owner columns that are out of sync.",
+        )
+
+    def handle(self, *args, **options):
+        reports = (
+            Report.all_objects.select_related("unit", "equipment__unit")
+            .order_by("pk")
+            .iterator(chunk_size=self.BATCH_SIZE)
+        )
+
+        divergent: list[Report] = []
+        for report in reports:
+            owner_unit_id, owner_client_id = report.resolve_owner()
+            if (
+                report.owner_unit_id == owner_unit_id
+                and report.owner_client_id == owner_client_id
+            ):
+                continue
+
+            self.stdout.write(
+                f"  - Report ID {report.id}: stored "
+                f"(unit={report.owner_unit_id}, "
+                f"client={report.owner_client_id}), expected "
+                f"(unit={owner_unit_id}, client={owner_client_id})"
+            )
+            report.owner_unit_id = owner_unit_id
+            report.owner_client_id = owner_client_id
+            divergent.append(report)
+
+        if not divergent:
+            self.stdout.write(
+                self.style.SUCCESS("All report owners are consistent.")
+            )
+            return
+
+        if not options["fix"]:
+            raise CommandError(
+                f"Found {len(divergent)} report(s) with inconsistent "
+                "owners. Run again with --fix to repair them."
+            )
+
+        Report.all_objects.bulk_update(
+            divergent,
+            ["owner_unit", "owner_client"],
+            batch_size=self.BATCH_SIZE,
+        )
+        invalidate_model_counts(Report)
+        touch_models(Report)
+        self.stdout.write(
+            self.style.SUCCESS(f"Fixed owners of {len(divergent)} report(s).")
+        )
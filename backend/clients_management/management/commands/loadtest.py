@@ -0,0 +1,414 @@
+import json
+import statistics
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from io import StringIO
+from random import Random
+from typing import Any
+from urllib.error import HTTPError, URLError
+from urllib.parse import urljoin
+from urllib.request import Request, urlopen
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test.utils import override_settings
+
+from ._seed_common import (
+    CPF_ADMIN,
+    CPF_CLIENT_MANAGER,
+    CPF_INTERNAL_PHYSICIST,
+    PASSWORD,
+)
+
+DEFAULT_MIX = "physicist=5,manager=2,client_manager=3,scheduler=1"
+ROLE_CPFS = {
+    "physicist": CPF_INTERNAL_PHYSICIST,
+    "manager": CPF_ADMIN,
+    "client_manager": CPF_CLIENT_MANAGER,
+}
+# Access tokens last five minutes; sessions log in again before that.
+TOKEN_LIFETIME = 240
+REQUEST_TIMEOUT = 30
+# Commands run by the Cloud Scheduler triggers, and how often the
+# scheduler virtual user fires them.
+SCHEDULED_COMMANDS = (
+    "send_due_report_notifications",
+    "update_appointments",
+    "send_contract_notifications",
+    "purge_expired_uploads",
+)
+SCHEDULER_INTERVAL = 10.0
+
+
+@dataclass
+class StepStats:
+    """Outcome of the requests of one journey step.
+
+    Attributes:
+        timings: Latency of each request, in milliseconds.
+        errors: Number of failed requests.
+    """
+
+    timings: list[float] = field(default_factory=list)
+    errors: int = 0
+
+
+class Recorder:
+    """Collects step outcomes from every virtual user thread."""
+
+    def __init__(self) -> None:
+        self.steps: dict[str, StepStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, step: str, elapsed: float, ok: bool) -> None:
+        """Record a request of ``step`` that took ``elapsed`` ms."""
+        with self._lock:
+            stats = self.steps.setdefault(step, StepStats())
+            stats.timings.append(elapsed)
+            if not ok:
+                stats.errors += 1
+
+
+class Session:
+    """A virtual user, logged in to the API as one account.
+
+    Args:
+        base_url: Root URL of the server under test.
+        cpf: CPF of the account to log in as.
+        recorder: Where request outcomes are recorded.
+    """
+
+    def __init__(self, base_url: str, cpf: str, recorder: Recorder) -> None:
+        self.base_url = base_url
+        self.cpf = cpf
+        self.recorder = recorder
+        self.token = ""
+        self.logged_in_at = 0.0
+
+    def get(self, step: str, path: str) -> Any:
+        """Request ``path`` as ``step``, logging in first if needed.
+
+        Returns:
+            Any: The decoded JSON body, or ``None`` for files and
+                failed requests.
+        """
+        if time.monotonic() - self.logged_in_at > TOKEN_LIFETIME:
+            self.login()
+        return self._request(step, Request(urljoin(self.base_url, path)))
+
+    def login(self) -> None:
+        """Obtain a new access token, as the login form does."""
+        body = self._request(
+            "login",
+            Request(
+                urljoin(self.base_url, "/api/jwt/create/"),
+                data=json.dumps(
+                    {"cpf": self.cpf, "password": PASSWORD}
+                ).encode(),
+                headers={"Content-Type": "application/json"},
+            ),
+        )
+        self.token = body["access"] if body else ""
+        self.logged_in_at = time.monotonic()
+
+    def _request(self, step: str, request: Request) -> Any:
+        if self.token:
+            request.add_header("Authorization", f"Bearer {self.token}")
+        start = time.perf_counter()
+        ok = False
+        body = None
+        try:
+            with urlopen(request, timeout=REQUEST_TIMEOUT) as response:  # noqa: S310
+                content = response.read()
+                if response.headers.get_content_type() == "application/json":
+                    body = json.loads(content)
+                ok = True
+        except (HTTPError, URLError, TimeoutError):
+            pass
+        self.recorder.record(step, (time.perf_counter() - start) * 1000, ok)
+        return body
+
+
+def _results(body: Any) -> list[dict]:
+    """Return the rows of a paginated list body."""
+    return body.get("results", []) if isinstance(body, dict) else []
+
+
+def physicist_journey(session: Session, random: Random) -> None:
+    """Browse and filter reports, then download a few."""
+    reports = session.get("reports", "/api/reports/")
+    if reports and reports.get("next"):
+        session.get("reports next page", reports["next"])
+    for status in ("overdue", "due_soon"):
+        session.get(f"reports {status}", f"/api/reports/?status={status}")
+    session.get("clients", "/api/clients/")
+    session.get("equipment manufacturers", "/api/equipments/manufacturers/")
+    rows = _results(reports)
+    for report in random.sample(rows, min(2, len(rows))):
+        session.get(
+            "report download", f"/api/reports/{report['id']}/download/pdf/"
+        )
+
+
+def manager_journey(session: Session, random: Random) -> None:
+    """Triage the requisitions under review and the clients."""
+    session.get("clients", "/api/clients/")
+    for entity in ("clients", "units", "equipments"):
+        session.get(f"{entity} operations", f"/api/{entity}/operations/")
+    session.get("appointments", "/api/appointments/")
+    session.get("reports overdue", "/api/reports/?status=overdue")
+
+
+def client_manager_journey(session: Session, random: Random) -> None:
+    """Check the reports and download the PDFs of the client's units."""
+    reports = _results(session.get("reports", "/api/reports/"))
+    for report in random.sample(reports, min(3, len(reports))):
+        session.get(
+            "report download", f"/api/reports/{report['id']}/download/pdf/"
+        )
+    appointments = _results(session.get("appointments", "/api/appointments/"))
+    orders = [
+        appointment["service_order"]["id"]
+        for appointment in appointments
+        if appointment.get("service_order")
+    ]
+    if orders:
+        order = random.choice(orders)
+        session.get("service order pdf", f"/api/service-orders/{order}/pdf/")
+
+
+JOURNEYS: dict[str, Callable[[Session, Random], None]] = {
+    "physicist": physicist_journey,
+    "manager": manager_journey,
+    "client_manager": client_manager_journey,
+}
+
+
+def run_scheduled_commands(recorder: Recorder) -> None:
+    """Run the work of the Cloud Scheduler triggers in-process.
+
+    The trigger endpoints only accept Google OIDC tokens, which cannot
+    be obtained offline, so their commands are called directly against
+    the same database as the server.
+    """
+    for name in SCHEDULED_COMMANDS:
+        start = time.perf_counter()
+        ok = True
+        try:
+            call_command(name, stdout=StringIO())
+        except Exception:  # noqa: BLE001
+            ok = False
+        recorder.record(
+            f"scheduler {name}", (time.perf_counter() - start) * 1000, ok
+        )
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    """Parse a traffic mix such as ``physicist=5,manager=2``.
+
+    Raises:
+        CommandError: If a role is unknown or a weight is invalid.
+    """
+    mix = {}
+    for item in value.split(","):
+        role, _, weight = item.partition("=")
+        role = role.strip()
+        if role not in (*JOURNEYS, "scheduler"):
+            raise CommandError(f"Unknown role in --mix: {role!r}.")
+        if not weight.strip().isdigit():
+            raise CommandError(f"Invalid weight in --mix: {item!r}.")
+        mix[role] = int(weight)
+    if not any(mix.values()):
+        raise CommandError("--mix needs at least one positive weight.")
+    return mix
+
+
+def assign_roles(mix: dict[str, int], concurrency: int) -> list[str]:
+    """Spread ``concurrency`` virtual users over the roles of ``mix``.
+
+    Every role with a weight gets at least one user when there are
+    enough of them; the rest follow the weights.
+    """
+    roles = [role for role, weight in mix.items() if weight]
+    total = sum(mix.values())
+    assigned = roles[:concurrency]
+    while len(assigned) < concurrency:
+        assigned.append(
+            min(
+                roles,
+                key=lambda role: assigned.count(role) / mix[role],
+            )
+        )
+    return sorted(assigned, key=lambda role: -mix[role] / total)
+
+
+class Command(BaseCommand):
+    """Drives a local server with concurrent role-mixed user journeys.
+
+    Each virtual user logs in as one of the seeded accounts and loops
+    over its role's journey until ``--duration`` elapses, waiting
+    ``--think`` seconds between journeys:
+
+    - physicists browse and filter the report list and download PDFs
+    - Prophy managers triage the requisitions and the client list
+    - client managers download report and service order PDFs
+    - the scheduler runs the commands of the Cloud Scheduler triggers
+
+    The requests go to ``--url`` over HTTP, so the whole URL conf,
+    middleware and WSGI server are exercised, e.g. gunicorn serving
+    ``core.wsgi``. Nothing outside that server and its database is
+    contacted, and e-mails of the scheduled commands stay in memory.
+    The server must share this command's database and be seeded with
+    ``populate``, optionally with ``--scale``.
+
+    The summary reports the throughput, error rate and latency
+    percentiles of every step, as a table or, with ``--output``, as
+    JSON.
+    """
+
+    help = "Load tests a local server with role-mixed user journeys."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url",
+            default="http://127.0.0.1:8000",
+            help="Server to test (default: http://127.0.0.1:8000).",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=10,
+            help="Concurrent virtual users (default: 10).",
+        )
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=60,
+            help="Seconds to run for (default: 60).",
+        )
+        parser.add_argument(
+            "--think",
+            type=float,
+            default=0.0,
+            help="Seconds each user waits between journeys (default: 0).",
+        )
+        parser.add_argument(
+            "--mix",
+            default=DEFAULT_MIX,
+            help=f"Weight of each role (default: {DEFAULT_MIX}).",
+        )
+        parser.add_argument(
+            "--output",
+            help="File to write the JSON summary to.",
+        )
+
+    def handle(self, *args, **options):
+        roles = assign_roles(parse_mix(options["mix"]), options["concurrency"])
+        self.stderr.write(
+            f"Running {len(roles)} virtual users against {options['url']} "
+            f"for {options['duration']:g}s..."
+        )
+        recorder = Recorder()
+        deadline = time.monotonic() + options["duration"]
+        start = time.perf_counter()
+        with (
+            override_settings(
+                EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend"
+            ),
+            ThreadPoolExecutor(max_workers=len(roles)) as executor,
+        ):
+            futures = [
+                executor.submit(
+                    self._virtual_user,
+                    role,
+                    seed,
+                    (options, recorder, deadline),
+                )
+                for seed, role in enumerate(roles)
+            ]
+            for future in futures:
+                future.result()
+        summary = self._summarize(recorder, time.perf_counter() - start, roles)
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output:
+                json.dump(summary, output, indent=2)
+            self.stderr.write(f"Summary written to {options['output']}.")
+        self._write_table(summary)
+
+    def _virtual_user(
+        self, role: str, seed: int, run: tuple[dict, Recorder, float]
+    ) -> None:
+        options, recorder, deadline = run
+        random = Random(seed)
+        try:
+            if role == "scheduler":
+                while time.monotonic() < deadline:
+                    run_scheduled_commands(recorder)
+                    self._wait(SCHEDULER_INTERVAL, deadline)
+                return
+
+            session = Session(options["url"], ROLE_CPFS[role], recorder)
+            while time.monotonic() < deadline:
+                JOURNEYS[role](session, random)
+                self._wait(options["think"], deadline)
+        finally:
+            connections.close_all()
+
+    @staticmethod
+    def _wait(seconds: float, deadline: float) -> None:
+        time.sleep(max(0.0, min(seconds, deadline - time.monotonic())))
+
+    @staticmethod
+    def _summarize(
+        recorder: Recorder, elapsed: float, roles: list[str]
+    ) -> dict:
+        steps = {}
+        for step, stats in sorted(recorder.steps.items()):
+            timings = stats.timings
+            percentiles = (
+                statistics.quantiles(timings, n=100, method="inclusive")
+                if len(timings) > 1
+                else timings * 99
+            )
+            steps[step] = {
+                "requests": len(timings),
+                "errors": stats.errors,
+                "rps": round(len(timings) / elapsed, 2),
+                "p50_ms": round(percentiles[49], 2),
+                "p95_ms": round(percentiles[94], 2),
+                "p99_ms": round(percentiles[98], 2),
+                "max_ms": round(max(timings), 2),
+            }
+        requests = sum(step["requests"] for step in steps.values())
+        errors = sum(step["errors"] for step in steps.values())
+        return {
+            "users": {role: roles.count(role) for role in sorted(set(roles))},
+            "seconds": round(elapsed, 2),
+            "requests": requests,
+            "errors": errors,
+            "error_rate": round(errors / requests, 4) if requests else 0.0,
+            "rps": round(requests / elapsed, 2),
+            "steps": steps,
+        }
+
+    def _write_table(self, summary: dict) -> None:
+        self.stdout.write(
+            f"{'step':<44}{'reqs':>7}{'errors':>7}{'rps':>8}"
+            f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        )
+        for step, stats in summary["steps"].items():
+            self.stdout.write(
+                f"{step:<44}{stats['requests']:>7}{stats['errors']:>7}"
+                f"{stats['rps']:>8.2f}{stats['p50_ms']:>9.1f}"
+                f"{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}"
+            )
+        self.stdout.write(
+            f"{summary['requests']} requests in {summary['seconds']}s: "
+            f"{summary['rps']} req/s, "
+            f"{summary['error_rate']:.2%} errors."
+        )
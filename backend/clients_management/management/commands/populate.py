@@ -1,4 +1,5 @@
 import os
+import time
 import uuid
 from datetime import date, timedelta
 from random import choice, randint
@@ -34,6 +35,7 @@ from requisitions.models import (
 )
 from users.models import UserAccount
 
+from ._bulk_seed import BulkSeeder, save_placeholders
 from ._seed_common import (
     APPROVED_PROPOSAL_CNPJ,
     COMPLIANT_APPOINTMENT_CNPJ,
@@ -60,6 +62,7 @@ from ._seed_common import (
     make_report_file,
     make_report_word_file,
     raise_postgres_id_floor,
+    random_completion_date,
     safe_slug,
     write_json_file,
 )
@@ -79,37 +82,21 @@ def fake_cpf():
     return fake.cpf().replace(".", "").replace("-", "")
 
 
-OVERDUE_ROLL_THRESHOLD = 20
-NEAR_DUE_ROLL_THRESHOLD = 50
-
-
-def random_completion_date(report_type_code: str) -> date:
-    today = date.today()
-    if report_type_code == Report.ReportType.RADIOMETRIC_SURVEY:
-        validity_days = 4 * 365
-    else:
-        validity_days = 365
-
-    roll = randint(1, 100)
-    if roll <= OVERDUE_ROLL_THRESHOLD:
-        # Overdue: due_date in the past
-        delta = validity_days + randint(1, 60)
-        return today - timedelta(days=delta)
-    elif roll <= NEAR_DUE_ROLL_THRESHOLD:
-        # Near due: due within ~30 days
-        offset = max(0, validity_days - randint(0, 30))
-        return today - timedelta(days=offset)
-    else:
-        # General case within validity window but not too close to edges
-        low = 30
-        high = max(low + 1, validity_days - 60)
-        delta = randint(low, high)
-        return today - timedelta(days=delta)
-
-
 class Command(BaseCommand):
     help = "Populate the database with fake data."
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            type=int,
+            default=0,
+            metavar="CLIENTS",
+            help=(
+                "Also bulk insert CLIENTS synthetic clients, with about 14 "
+                "reports each, to reproduce production volumes."
+            ),
+        )
+
     def _raise_postgres_id_floor(self) -> None:
         raise_postgres_id_floor()
 
@@ -139,6 +126,8 @@ class Command(BaseCommand):
         approved_cnpjs = self.populate_proposals()
 
         self.populate_pending_appointment_scenarios()
+        if options["scale"]:
+            self.populate_scaled(options["scale"])
 
         self.create_json_fixture(
             {
@@ -155,6 +144,51 @@ class Command(BaseCommand):
             )
         )
 
+    def populate_scaled(self, clients: int) -> None:
+        """Bulk inserts ``clients`` clients with all their data.
+
+        Rows are inserted in batches by ``BulkSeeder``, sharing one copy
+        of each placeholder file, and the insert throughput of every
+        table is reported. No JSON fixture is written for them.
+        """
+        self.stdout.write(
+            self.style.WARNING(f"Bulk inserting {clients} scaled clients...")
+        )
+        start = time.perf_counter()
+        seeder = BulkSeeder(save_placeholders())
+        physicists = list(
+            UserAccount.objects.filter(
+                role__in=[
+                    UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST,
+                    UserAccount.Role.EXTERNAL_MEDICAL_PHYSICIST,
+                ]
+            )
+        )
+        created_clients = seeder.clients(clients, physicists)
+        units = seeder.units(created_clients)
+        equipments = seeder.equipments(units, list(Modality.objects.all()))
+        seeder.pending_operations(created_clients, units, equipments)
+        seeder.proposals(created_clients)
+        seeder.appointments(
+            units, equipments, UserAccount.objects.get(cpf=CPF_ADMIN)
+        )
+        seeder.reports(units, equipments)
+        seeder.invalidate_caches()
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(
+            f"{'table':<48}{'rows':>9}{'seconds':>9}{'rows/s':>10}"
+        )
+        for table, stats in seeder.throughput.items():
+            self.stdout.write(
+                f"{table:<48}{stats.rows:>9}{stats.seconds:>9.2f}"
+                f"{stats.rows_per_second:>10.0f}"
+            )
+        total = sum(stats.rows for stats in seeder.throughput.values())
+        self.stdout.write(
+            f"{'total':<48}{total:>9}{elapsed:>9.2f}{total / elapsed:>10.0f}"
+        )
+
     def create_groups(self):
         """Creates user groups and assigns permissions per role."""
         base_permissions = (
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from clients_management.models import Client
+from requisitions.models import (
+    pending_operations_condition,
+    sync_pending_operations,
+)
+
+
+class Command(BaseCommand):
+    """Rebuilds the ``has_pending_operations`` flag of every client.
+
+    The flag is maintained by the requisitions signals; this command
+    recomputes it from the operations under review to repair drift
+    left by writes that bypass them, such as ``QuerySet.update``. With
+    ``--check`` nothing is written and the command exits with an error
+    when any client is out of sync.
+    """
+
+    help = "Rebuilds (or checks) the pending operations flag of clients."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report clients whose flag is out of sync.",
+        )
+
+    def handle(self, *args, **options):
+        if options["check"]:
+            pending = pending_operations_condition()
+            divergent = Client.objects.filter(
+                (pending & Q(has_pending_operations=False))
+                | (~pending & Q(has_pending_operations=True))
+            ).values_list("pk", "has_pending_operations")
+
+            for client_id, stored in divergent:
+                self.stdout.write(
+                    f"  - Client ID {client_id}: stored {stored}, "
+                    f"expected {not stored}"
+                )
+            if divergent:
+                raise CommandError(
+                    f"Found {len(divergent)} client(s) with an outdated "
+                    "pending operations flag. Run again without --check "
+                    "to rebuild them."
+                )
+            self.stdout.write(
+                self.style.SUCCESS("All pending operation flags are valid.")
+            )
+            return
+
+        changed = sync_pending_operations(Client.objects.all())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt pending operation flags; {changed} client(s) "
+                "changed."
+            )
+        )
@@ -5,7 +5,6 @@ from anymail.message import AnymailMessage
 from dateutil.relativedelta import relativedelta
 from django.conf import settings
 from django.core.management.base import BaseCommand
-from django.db.models import Max
 from django.db.models.query import QuerySet
 from django.template.loader import render_to_string
 from django.utils import timezone
@@ -205,34 +204,13 @@ class Command(BaseCommand):
 
         Returns only the latest annual accepted proposal per CNPJ.
         """
-        latest_annual_per_cnpj = (
-            Proposal.objects.filter(
-                status=Proposal.Status.ACCEPTED,
-                contract_type=Proposal.ContractType.ANNUAL,
-            )
-            .values("cnpj")
-            .annotate(latest_date=Max("date"))
-        )
-
-        cnpj_date_pairs = {
-            item["cnpj"]: item["latest_date"]
-            for item in latest_annual_per_cnpj
-        }
-
-        proposals = Proposal.objects.filter(
+        return Proposal.objects.filter(
             status=Proposal.Status.ACCEPTED,
             contract_type=Proposal.ContractType.ANNUAL,
             date=threshold_date,
+            contract_state__latest_annual_accepted_date=threshold_date,
         )
 
-        filtered_proposals = [
-            p for p in proposals if cnpj_date_pairs.get(p.cnpj) == p.date
-        ]
-
-        return Proposal.objects.filter(
-            id__in=[p.id for p in filtered_proposals]
-        ).select_related()
-
     def _query_winback_proposals(
         self, threshold_date: date
     ) -> QuerySet[Proposal]:
@@ -4,13 +4,17 @@ from datetime import date, timedelta
 from anymail.message import AnymailMessage
 from django.conf import settings
 from django.core.management.base import BaseCommand
-from django.db.models import OuterRef, Subquery
 from django.db.models.query import QuerySet
 from django.template.loader import render_to_string
 from django.utils import timezone
 from django.utils.html import strip_tags
 
-from clients_management.models import Client, Proposal, Report
+from clients_management.models import (
+    Client,
+    Proposal,
+    Report,
+    get_contract_state,
+)
 from users.models import UserAccount
 
 logger = logging.getLogger(__name__)
@@ -124,48 +128,20 @@ class Command(BaseCommand):
     ) -> QuerySet[Report]:
         return Report.objects.filter(
             due_date__gte=target_date_start, due_date__lt=target_date_end
-        ).prefetch_related(
-            "unit__client__users", "equipment__unit__client__users"
-        )
+        ).select_related("unit", "equipment", "owner_client__contract_state")
 
     def _get_is_annual_by_client_id(
         self, reports: QuerySet[Report]
     ) -> dict[int, bool]:
-        client_ids = set()
+        is_annual_by_client_id = {}
         for report in reports:
-            if report.unit_id and report.unit and report.unit.client_id:
-                client_ids.add(report.unit.client_id)
+            client = report.owner_client
+            if client is None:
                 continue
-            if (
-                report.equipment_id
-                and report.equipment
-                and report.equipment.unit
-                and report.equipment.unit.client_id
-            ):
-                client_ids.add(report.equipment.unit.client_id)
-
-        if not client_ids:
-            return {}
-
-        latest_contract_type_by_client = (
-            Client.objects.filter(id__in=client_ids)
-            .annotate(
-                latest_accepted_contract_type=Subquery(
-                    Proposal.objects.filter(
-                        cnpj=OuterRef("cnpj"),
-                        status=Proposal.Status.ACCEPTED,
-                    )
-                    .order_by("-date")
-                    .values("contract_type")[:1]
-                )
-            )
-            .values("id", "latest_accepted_contract_type")
-        )
-
-        is_annual_by_client_id = {}
-        for item in latest_contract_type_by_client:
-            is_annual_by_client_id[item["id"]] = (
-                item["latest_accepted_contract_type"]
+            contract_state = get_contract_state(client)
+            is_annual_by_client_id[client.id] = (
+                contract_state is not None
+                and contract_state.latest_accepted_contract_type
                 == Proposal.ContractType.ANNUAL
             )
 
@@ -176,11 +152,7 @@ class Command(BaseCommand):
         report: Report,
         is_annual_by_client_id: dict[int, bool],
     ) -> tuple[Client, list[str]] | None:
-        client = None
-        if report.unit:
-            client = report.unit.client
-        elif report.equipment:
-            client = report.equipment.unit.client
+        client = report.owner_client
         if not client:
             logger.error(
                 "Data integrity issue: Report ID %s has no associated Client.",
@@ -2,6 +2,8 @@ from django.core.management.base import BaseCommand
 from django.utils import timezone
 
 from clients_management.models import Appointment
+from core.conditional import touch_models
+from core.counting import invalidate_model_counts
 
 
 class Command(BaseCommand):
@@ -34,6 +36,8 @@ class Command(BaseCommand):
 
         if count > 0:
             overdue_appointments.update(status=Appointment.Status.UNFULFILLED)
+            invalidate_model_counts(Appointment)
+            touch_models(Appointment)
             self.stdout.write(
                 self.style.SUCCESS(
                     f"Successfully updated {count} overdue "
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.16 on 2026-10-17 01:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import F, OuterRef, Subquery
+
+
+def backfill_report_owners(apps, schema_editor):
+    Report = apps.get_model("clients_management", "Report")
+    Unit = apps.get_model("clients_management", "Unit")
+    Equipment = apps.get_model("clients_management", "Equipment")
+
+    Report.objects.filter(unit__isnull=False).update(
+        owner_unit=F("unit"),
+        owner_client=Subquery(
+            Unit.objects.filter(pk=OuterRef("unit_id")).values("client_id")[
+                :1
+            ]
+        ),
+    )
+    Report.objects.filter(unit__isnull=True, equipment__isnull=False).update(
+        owner_unit=Subquery(
+            Equipment.objects.filter(pk=OuterRef("equipment_id")).values(
+                "unit_id"
+            )[:1]
+        ),
+        owner_client=Subquery(
+            Equipment.objects.filter(pk=OuterRef("equipment_id")).values(
+                "unit__client_id"
+            )[:1]
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients_management', '0014_accessory_default_ordering'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='report',
+            name='owner_client',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='owned_reports', to='clients_management.client', verbose_name='Cliente proprietário'),
+        ),
+        migrations.AddField(
+            model_name='report',
+            name='owner_unit',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='owned_reports', to='clients_management.unit', verbose_name='Unidade proprietária'),
+        ),
+        migrations.RunPython(backfill_report_owners, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.16 on 2026-10-17 02:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+ACCEPTED = "A"
+ANNUAL = "A"
+
+
+def backfill_contract_states(apps, schema_editor):
+    Proposal = apps.get_model("clients_management", "Proposal")
+    ContractState = apps.get_model("clients_management", "ContractState")
+
+    states = {}
+    accepted = (
+        Proposal.objects.filter(status=ACCEPTED)
+        .order_by("cnpj", "-date", "-pk")
+        .values_list("cnpj", "date", "contract_type")
+    )
+    for cnpj, proposal_date, contract_type in accepted.iterator():
+        state = states.get(cnpj)
+        if state is None:
+            state = states[cnpj] = ContractState(
+                cnpj=cnpj,
+                latest_accepted_date=proposal_date,
+                latest_accepted_contract_type=contract_type,
+            )
+        if contract_type == ANNUAL and state.latest_annual_accepted_date is None:
+            state.latest_annual_accepted_date = proposal_date
+
+    ContractState.objects.bulk_create(states.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients_management', '0015_report_owner_columns'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContractState',
+            fields=[
+                ('cnpj', models.CharField(max_length=14, primary_key=True, serialize=False, verbose_name='CNPJ')),
+                ('latest_accepted_date', models.DateField(verbose_name='Data da última proposta aceita')),
+                ('latest_accepted_contract_type', models.CharField(choices=[('A', 'Anual'), ('M', 'Mensal'), ('W', 'Semanal')], max_length=1, verbose_name='Tipo de contrato vigente')),
+                ('latest_annual_accepted_date', models.DateField(blank=True, null=True, verbose_name='Data da última proposta anual aceita')),
+            ],
+            options={
+                'verbose_name': 'Estado de contrato',
+                'verbose_name_plural': 'Estados de contrato',
+            },
+        ),
+        migrations.AddField(
+            model_name='client',
+            name='contract_state',
+            field=models.ForeignObject(blank=True, editable=False, from_fields=['cnpj'], null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', serialize=False, to='clients_management.contractstate', to_fields=['cnpj'], verbose_name='Estado do contrato'),
+        ),
+        migrations.AddField(
+            model_name='proposal',
+            name='contract_state',
+            field=models.ForeignObject(blank=True, editable=False, from_fields=['cnpj'], null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', serialize=False, to='clients_management.contractstate', to_fields=['cnpj'], verbose_name='Estado do contrato'),
+        ),
+        migrations.RunPython(
+            backfill_contract_states, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.16 on 2026-10-17 02:17
+
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef, Q
+
+REVIEW = "REV"
+
+
+def backfill_pending_operations(apps, schema_editor):
+    Client = apps.get_model("clients_management", "Client")
+    ClientOperation = apps.get_model("requisitions", "ClientOperation")
+    UnitOperation = apps.get_model("requisitions", "UnitOperation")
+    EquipmentOperation = apps.get_model("requisitions", "EquipmentOperation")
+
+    client_operations = ClientOperation.objects.filter(
+        Q(cnpj=OuterRef("cnpj")) | Q(original_client__cnpj=OuterRef("cnpj")),
+        operation_status=REVIEW,
+    )
+    unit_operations = UnitOperation.objects.filter(
+        Q(client__cnpj=OuterRef("cnpj"))
+        | Q(original_unit__client__cnpj=OuterRef("cnpj")),
+        operation_status=REVIEW,
+    )
+    equipment_operations = EquipmentOperation.objects.filter(
+        Q(unit__client__cnpj=OuterRef("cnpj"))
+        | Q(original_equipment__unit__client__cnpj=OuterRef("cnpj")),
+        operation_status=REVIEW,
+    )
+    Client.objects.filter(
+        Q(Exists(client_operations))
+        | Q(Exists(unit_operations))
+        | Q(Exists(equipment_operations))
+    ).update(has_pending_operations=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients_management', '0016_contract_state'),
+        ('requisitions', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='client',
+            name='has_pending_operations',
+            field=models.BooleanField(db_index=True, default=False, editable=False, verbose_name='Possui requisições pendentes'),
+        ),
+        migrations.RunPython(
+            backfill_pending_operations, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 5.2.16 on 2026-10-17 02:21
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class AddIndexConcurrentlyOnPostgreSQL(AddIndexConcurrently):
+    """Build an index concurrently on PostgreSQL, and plainly elsewhere.
+
+    Other databases cannot build indexes concurrently, and their tables
+    are small enough to be locked while they are indexed.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(
+                app_label, schema_editor, from_state, to_state
+            )
+        else:
+            migrations.AddIndex.database_forwards(
+                self, app_label, schema_editor, from_state, to_state
+            )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(
+                app_label, schema_editor, from_state, to_state
+            )
+        else:
+            migrations.AddIndex.database_backwards(
+                self, app_label, schema_editor, from_state, to_state
+            )
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently, outside a transaction, so that the
+    # tables stay writable meanwhile.
+    atomic = False
+
+    dependencies = [
+        ('clients_management', '0017_client_has_pending_operations'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyOnPostgreSQL(
+            model_name='appointment',
+            index=models.Index(fields=['-date'], name='appointment_date_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgreSQL(
+            model_name='appointment',
+            index=models.Index(fields=['unit', '-date'], name='appointment_unit_date_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgreSQL(
+            model_name='appointment',
+            index=models.Index(fields=['status', '-date'], name='appointment_status_date_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgreSQL(
+            model_name='client',
+            index=models.Index(fields=['cnpj'], name='client_cnpj_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgreSQL(
+            model_name='proposal',
+            index=models.Index(fields=['-date'], name='proposal_date_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgreSQL(
+            model_name='proposal',
+            index=models.Index(fields=['cnpj', '-date'], name='proposal_cnpj_date_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgreSQL(
+            model_name='proposal',
+            index=models.Index(fields=['status', 'contract_type', '-date'], name='proposal_status_type_date_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgreSQL(
+            model_name='report',
+            index=models.Index(fields=['-completion_date'], name='report_completion_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgreSQL(
+            model_name='report',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', False)), fields=['-completion_date'], name='report_archived_completion_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgreSQL(
+            model_name='report',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['due_date'], name='report_active_due_date_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgreSQL(
+            model_name='report',
+            index=models.Index(fields=['report_type', 'unit'], name='report_type_unit_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgreSQL(
+            model_name='report',
+            index=models.Index(fields=['report_type', 'equipment'], name='report_type_equipment_idx'),
+        ),
+    ]
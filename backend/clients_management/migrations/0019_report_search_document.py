@@ -0,0 +1,55 @@
+# Generated by Django 5.2.16 on 2026-10-17 02:24
+
+from itertools import batched
+
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+
+
+def build_search_document(report):
+    unit = report.unit
+    if unit is None and report.equipment is not None:
+        unit = report.equipment.unit
+
+    parts = [report.description, report.get_report_type_display()]
+    if unit is not None:
+        parts += [unit.name, unit.city]
+        if unit.client is not None:
+            parts.append(unit.client.name)
+    if report.equipment is not None:
+        parts += [report.equipment.model, report.equipment.series_number]
+    return " ".join(part for part in parts if part)
+
+
+def backfill_search_documents(apps, schema_editor):
+    Report = apps.get_model("clients_management", "Report")
+
+    queryset = Report.objects.select_related(
+        "unit__client", "equipment__unit__client"
+    ).order_by("pk")
+    # Reports are updated batch by batch, so that memory stays bounded.
+    for reports in batched(
+        queryset.iterator(chunk_size=BATCH_SIZE), BATCH_SIZE
+    ):
+        for report in reports:
+            report.search_document = build_search_document(report)
+        Report.objects.bulk_update(reports, ["search_document"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients_management', '0018_index_pack'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='report',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='Documento de busca'),
+        ),
+        migrations.RunPython(
+            backfill_search_documents, migrations.RunPython.noop
+        ),
+    ]
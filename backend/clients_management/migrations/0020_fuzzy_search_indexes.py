@@ -0,0 +1,61 @@
+# Generated by Django 5.2.16 on 2026-10-17 03:10
+
+from django.db import migrations
+
+# Columns filtered with ``?match=fuzzy`` (see ``core.fuzzy``).
+FUZZY_INDEXES = [
+    ("client_name_trgm_idx", "clients_management_client", "name"),
+    ("client_city_trgm_idx", "clients_management_client", "city"),
+    (
+        "equipment_manufacturer_trgm_idx",
+        "clients_management_equipment",
+        "manufacturer",
+    ),
+    (
+        "proposal_contact_name_trgm_idx",
+        "clients_management_proposal",
+        "contact_name",
+    ),
+]
+
+
+def create_fuzzy_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # unaccent() is only STABLE; pinning the dictionary makes the wrapper
+    # safe to declare IMMUTABLE, which expression indexes require.
+    schema_editor.execute(
+        "CREATE OR REPLACE FUNCTION normalize_search_text(text) "
+        "RETURNS text LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT AS "
+        "$$ SELECT lower(public.unaccent("
+        "'public.unaccent'::regdictionary, $1)) $$"
+    )
+    for name, table, column in FUZZY_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin "
+            f"(normalize_search_text({column}) gin_trgm_ops)"
+        )
+
+
+def drop_fuzzy_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for name, _table, _column in FUZZY_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+    schema_editor.execute("DROP FUNCTION IF EXISTS normalize_search_text(text)")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("clients_management", "0019_report_search_document"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            create_fuzzy_search_indexes, drop_fuzzy_search_indexes
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.16 on 2026-10-17 05:02
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+INDEX_NAME = "report_search_idx"
+
+
+class AddSearchIndexConcurrently(AddIndexConcurrently):
+    """Build the report search GIN index on PostgreSQL only.
+
+    The index is kept out of the model state: SQLite rebuilds tables
+    with every index of their state, and cannot build GIN indexes. It
+    searches an FTS5 table instead (see ``clients_management.search``).
+    An index of the same name that already exists is left as it is.
+    """
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        connection = schema_editor.connection
+        if connection.vendor != "postgresql":
+            return
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, "clients_management_report"
+            )
+        if INDEX_NAME not in constraints:
+            super().database_forwards(
+                app_label, schema_editor, from_state, to_state
+            )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(
+                app_label, schema_editor, from_state, to_state
+            )
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently, outside a transaction, so that
+    # reports stay writable meanwhile.
+    atomic = False
+
+    dependencies = [
+        ("clients_management", "0020_fuzzy_search_indexes"),
+    ]
+
+    operations = [
+        AddSearchIndexConcurrently(
+            model_name="report",
+            index=GinIndex(
+                SearchVector("search_document", config="portuguese"),
+                name=INDEX_NAME,
+            ),
+        ),
+    ]
@@ -15,7 +15,9 @@ from django.utils.translation import gettext as _
 from localflavor.br.br_states import STATE_CHOICES
 
 from clients_management.validators import CNPJValidator
+from core.conditional import touch_models
 from core.constants import MAX_DOCUMENT_FILE_SIZE_MB, MAX_IMAGE_FILE_SIZE_MB
+from core.counting import invalidate_model_counts
 from core.validators import MaxFileSize
 from users.models import UserAccount
 
@@ -68,6 +70,37 @@ def get_status(
     return None
 
 
+def contract_state_relation() -> models.ForeignObject:
+    """Build a virtual relation from a model's ``cnpj`` to its contract.
+
+    The relation has no column of its own: it joins ``cnpj`` to
+    ``ContractState.cnpj``, so the contract state of many rows can be
+    read or filtered with a plain LEFT JOIN. CNPJs without accepted
+    proposals have no state row; use ``get_contract_state`` to read the
+    relation without handling ``ContractState.DoesNotExist``.
+    """
+    return models.ForeignObject(
+        "clients_management.ContractState",
+        on_delete=models.DO_NOTHING,
+        from_fields=["cnpj"],
+        to_fields=["cnpj"],
+        related_name="+",
+        null=True,
+        blank=True,
+        editable=False,
+        serialize=False,
+        verbose_name="Estado do contrato",
+    )
+
+
+def get_contract_state(instance: Client | Proposal) -> ContractState | None:
+    """Return the contract state of a client or proposal, if any."""
+    try:
+        return instance.contract_state
+    except ContractState.DoesNotExist:
+        return None
+
+
 class BaseEquipment(models.Model):
     """A base abstract model representing common equipment attributes.
 
@@ -136,6 +169,11 @@ class Client(models.Model):
         city (CharField): Institution's city (max 50 characters)
         active (BooleanField): Flag indicating if the client is
             currently active
+        contract_state (ForeignObject): Contract state of the client's
+            CNPJ, joined on ``cnpj``
+        has_pending_operations (BooleanField): Whether a requisition
+            under review refers to the client's CNPJ, maintained by the
+            requisitions app
 
     Methods:
         responsables(): Returns formatted HTML string of associated
@@ -167,6 +205,18 @@ class Client(models.Model):
     )
     city = models.CharField("Cidade da instituição", max_length=50)
     is_active = models.BooleanField("Ativo", default=False)
+    contract_state = contract_state_relation()
+    has_pending_operations = models.BooleanField(
+        "Possui requisições pendentes",
+        default=False,
+        db_index=True,
+        editable=False,
+    )
+
+    def clean_fields(self, exclude=None):
+        # The contract state is derived data; validating it would only
+        # cost a query.
+        super().clean_fields(exclude={*(exclude or ()), "contract_state"})
 
     @admin.display(description="Responsáveis")
     def responsables(self):
@@ -191,6 +241,9 @@ class Client(models.Model):
     class Meta:
         verbose_name = "Cliente"
         verbose_name_plural = "Clientes"
+        indexes = [
+            models.Index(fields=["cnpj"], name="client_cnpj_idx"),
+        ]
 
 
 class Unit(models.Model):
@@ -445,6 +498,8 @@ class Proposal(models.Model):
         value (DecimalField): Proposed contract value
         contract_type (CharField): Type of contract
         status (CharField): Current status of the proposal
+        contract_state (ForeignObject): Contract state of the
+            proposal's CNPJ, joined on ``cnpj``
     Methods:
         approved_client(): Returns True if proposal status is Accepted,
             False otherwise
@@ -530,6 +585,10 @@ class Proposal(models.Model):
         null=False,
         default=Status.PENDING,
     )
+    contract_state = contract_state_relation()
+
+    def clean_fields(self, exclude=None):
+        super().clean_fields(exclude={*(exclude or ()), "contract_state"})
 
     def approved_client(self):
         return self.status == "A"
@@ -543,11 +602,94 @@ class Proposal(models.Model):
         ordering = ["-date"]
         verbose_name = "Proposta"
         verbose_name_plural = "Propostas"
+        indexes = [
+            # Unfiltered list, in its default ordering.
+            models.Index(fields=["-date"], name="proposal_date_idx"),
+            # Proposals of a CNPJ, newest first (list filter, contract
+            # state refresh).
+            models.Index(
+                fields=["cnpj", "-date"], name="proposal_cnpj_date_idx"
+            ),
+            # List filters on status and contract type.
+            models.Index(
+                fields=["status", "contract_type", "-date"],
+                name="proposal_status_type_date_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"Proposta {self.cnpj} - {self.contact_name}"
 
 
+class ContractState(models.Model):
+    """Contract state of a CNPJ, derived from its accepted proposals.
+
+    One row is kept per CNPJ with at least one accepted proposal and is
+    refreshed by signals on every Proposal save or delete. Clients and
+    proposals read it through their ``contract_state`` relation instead
+    of re-deriving the latest accepted proposal with subqueries.
+
+    Attributes:
+        cnpj (CharField): Brazilian company registration number (14
+            digits), primary key
+        latest_accepted_date (DateField): Date of the latest accepted
+            proposal
+        latest_accepted_contract_type (CharField): Contract type of the
+            latest accepted proposal
+        latest_annual_accepted_date (DateField): Date of the latest
+            accepted annual proposal, if any
+    """
+
+    cnpj = models.CharField("CNPJ", max_length=14, primary_key=True)
+    latest_accepted_date = models.DateField("Data da última proposta aceita")
+    latest_accepted_contract_type = models.CharField(
+        "Tipo de contrato vigente",
+        max_length=1,
+        choices=Proposal.ContractType.choices,
+    )
+    latest_annual_accepted_date = models.DateField(
+        "Data da última proposta anual aceita", blank=True, null=True
+    )
+
+    @classmethod
+    def refresh(cls, *cnpjs: str) -> None:
+        """Recompute the contract state of the given CNPJs.
+
+        CNPJs left without accepted proposals lose their state row.
+
+        Args:
+            cnpjs: The CNPJs whose proposals changed.
+        """
+        for cnpj in set(cnpjs):
+            accepted = Proposal.objects.filter(
+                cnpj=cnpj, status=Proposal.Status.ACCEPTED
+            ).order_by("-date", "-pk")
+            latest = accepted.values("date", "contract_type").first()
+            if latest is None:
+                cls.objects.filter(cnpj=cnpj).delete()
+                continue
+
+            cls.objects.update_or_create(
+                cnpj=cnpj,
+                defaults={
+                    "latest_accepted_date": latest["date"],
+                    "latest_accepted_contract_type": latest["contract_type"],
+                    "latest_annual_accepted_date": accepted.filter(
+                        contract_type=Proposal.ContractType.ANNUAL
+                    )
+                    .values_list("date", flat=True)
+                    .first(),
+                },
+            )
+
+    class Meta:
+        verbose_name = "Estado de contrato"
+        verbose_name_plural = "Estados de contrato"
+
+    def __str__(self) -> str:
+        return f"Contrato {self.cnpj}"
+
+
 class ServiceOrder(models.Model):
     """Represents a service order issued for a client's unit.
 
@@ -710,30 +852,32 @@ class Appointment(models.Model):
     def periodicity(self) -> str | None:
         """Calculates the contract periodicity for this appointment.
 
-        It finds the most recent, approved proposal for the client
-        associated with this appointment's unit and returns its contract
-        type. Returns None if no such proposal or client is found.
+        It reads the contract state of the client associated with this
+        appointment's unit, which tracks the contract type of its most
+        recent approved proposal. Returns None if no such proposal or
+        client is found.
         """
         if self.unit is None or self.unit.client is None:
             return None
-        client_cnpj = self.unit.client.cnpj
-
-        latest_approved_proposal = (
-            Proposal.objects.filter(
-                cnpj=client_cnpj, status=Proposal.Status.ACCEPTED
-            )
-            .order_by("-date")
-            .first()
-        )
 
-        if latest_approved_proposal:
-            return latest_approved_proposal.contract_type
-
-        return None
+        contract_state = get_contract_state(self.unit.client)
+        if contract_state is None:
+            return None
+        return contract_state.latest_accepted_contract_type
 
     class Meta:
         verbose_name = "Agendamento"
         verbose_name_plural = "Agendamentos"
+        indexes = [
+            models.Index(fields=["-date"], name="appointment_date_idx"),
+            models.Index(
+                fields=["unit", "-date"], name="appointment_unit_date_idx"
+            ),
+            models.Index(
+                fields=["status", "-date"],
+                name="appointment_status_date_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         client_name = (
@@ -767,7 +911,10 @@ class ReportQuerySet(models.QuerySet):
                 "deleted_by is required for soft delete operations"
             )
 
-        return self.update(deleted_at=timezone.now(), deleted_by=deleted_by)
+        updated = self.update(deleted_at=timezone.now(), deleted_by=deleted_by)
+        invalidate_model_counts(self.model)
+        touch_models(self.model)
+        return updated
 
 
 class ReportManager(
@@ -814,6 +961,14 @@ class Report(models.Model):
         deleted_at (DateTimeField): Timestamp when report was
             soft-deleted
         deleted_by (ForeignKey): User who soft-deleted the report
+        owner_client (ForeignKey): Client owning the report, resolved
+            from the unit or the equipment's unit. Kept in sync on save
+            and when units or equipment are re-parented.
+        owner_unit (ForeignKey): Unit owning the report, resolved from
+            the unit or the equipment's unit.
+        search_document (TextField): Text indexed by the report
+            full-text search, rebuilt on save and when the owning
+            client, unit or equipment is renamed.
     """
 
     class ReportType(TextChoices):
@@ -915,6 +1070,30 @@ class Report(models.Model):
         related_name="deleted_reports",
         verbose_name="Deletado por",
     )
+    owner_client = models.ForeignKey(
+        Client,
+        on_delete=models.SET_NULL,
+        related_name="owned_reports",
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name="Cliente proprietário",
+    )
+    owner_unit = models.ForeignKey(
+        Unit,
+        on_delete=models.SET_NULL,
+        related_name="owned_reports",
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name="Unidade proprietária",
+    )
+    search_document = models.TextField(
+        "Documento de busca",
+        blank=True,
+        default="",
+        editable=False,
+    )
 
     objects = ReportManager()
     all_objects = ReportAllManager()
@@ -964,11 +1143,50 @@ class Report(models.Model):
                     }
                 )
 
-    def save(self, *args, **kwargs):
-        """Calculate the due date before saving.
+    def resolve_owner(self) -> tuple[int | None, int | None]:
+        """Resolve the owning unit and client ids of the report.
 
-        Based on the completion date and report type.
+        Returns:
+            tuple[int | None, int | None]: The owning unit id and client
+                id, taken from the unit or from the equipment's unit.
+        """
+        owner_unit = self.unit
+        if owner_unit is None and self.equipment is not None:
+            owner_unit = self.equipment.unit
+        if owner_unit is None:
+            return None, None
+        return owner_unit.pk, owner_unit.client_id
+
+    def build_search_document(self) -> str:
+        """Build the text indexed by the report full-text search.
+
+        It combines the description and type with the names of the
+        owning client and unit, the unit's city and the equipment model
+        and series number.
+        """
+        unit = self.unit
+        if unit is None and self.equipment is not None:
+            unit = self.equipment.unit
+
+        parts = [self.description, self.get_report_type_display()]
+        if unit is not None:
+            parts += [unit.name, unit.city]
+            if unit.client is not None:
+                parts.append(unit.client.name)
+        if self.equipment is not None:
+            parts += [self.equipment.model, self.equipment.series_number]
+        return " ".join(part for part in parts if part)
+
+    def derive_fields(self) -> None:
+        """Calculate the due date, owner and search document.
+
+        The due date is based on the completion date and report type.
+        The owner columns are resolved from the unit or equipment.
+        Called by ``save``, and directly before bulk inserts.
         """
+        self.owner_unit_id, self.owner_client_id = self.resolve_owner()
+        self.search_document = self.build_search_document()
+
         if self.report_type in self.NO_DUE_DATE_TYPES:
             self.due_date = None
         elif self.completion_date and not self.due_date:
@@ -977,9 +1195,14 @@ class Report(models.Model):
             else:
                 self.due_date = self.completion_date + timedelta(days=365)
 
-        # Exclude deleted_by from validation if it's None (not being
-        # soft-deleted)
-        exclude = set()
+    def save(self, *args, **kwargs):
+        """Derive the computed fields, validate and save the report."""
+        self.derive_fields()
+
+        # Owner columns are derived from unit/equipment, which are
+        # already validated. Exclude deleted_by from validation if it's
+        # None (not being soft-deleted)
+        exclude = {"owner_client", "owner_unit"}
         if self.deleted_by is None:
             exclude.add("deleted_by")
 
@@ -1029,3 +1252,28 @@ class Report(models.Model):
         verbose_name = "Relatório"
         verbose_name_plural = "Relatórios"
         ordering = ["-completion_date"]
+        indexes = [
+            # Managers list every report, the other roles only active
+            # ones; both are ordered by completion date.
+            models.Index(
+                fields=["-completion_date"], name="report_completion_idx"
+            ),
+            models.Index(
+                fields=["-completion_date"],
+                condition=models.Q(deleted_at__isnull=False),
+                name="report_archived_completion_idx",
+            ),
+            # Derived status filters only apply to active reports.
+            models.Index(
+                fields=["due_date"],
+                condition=models.Q(deleted_at__isnull=True),
+                name="report_active_due_date_idx",
+            ),
+            models.Index(
+                fields=["report_type", "unit"], name="report_type_unit_idx"
+            ),
+            models.Index(
+                fields=["report_type", "equipment"],
+                name="report_type_equipment_idx",
+            ),
+        ]
@@ -0,0 +1,215 @@
+"""Declarative row-level access policies.
+
+Each policy states, per role, how rows of a model relate to the clients
+or units of the user's ``AccessScope``. ``RowPolicy.apply`` compiles
+that relation into predicates that never multiply rows:
+
+- A foreign key pointing straight at the scoped table becomes a column
+  filter, e.g. ``owner_client_id IN (...)``.
+- Longer paths become nested ``EXISTS`` semi-joins, one per hop, so no
+  join is added to the outer query and no ``DISTINCT`` is needed.
+
+Roles without a rule see every row. Being ``ObjectPolicy`` subclasses,
+the policies also check individual objects; when the rule is a column
+of the objects, that check is answered from the cached scope alone.
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from django.db.models import Exists, Model, OuterRef, Q, QuerySet
+
+from clients_management.access import get_access_scope
+from clients_management.models import (
+    Accessory,
+    Appointment,
+    Client,
+    Equipment,
+    Report,
+    Unit,
+)
+from core.permissions import ObjectPolicy
+from requisitions.models import UnitOperation
+from users.models import UserAccount
+
+Role = UserAccount.Role
+
+STAFF_ROLES = frozenset({Role.PROPHY_MANAGER, Role.COMMERCIAL})
+
+
+@dataclass(frozen=True)
+class Rule:
+    """Rows related to the clients or units in a user's scope.
+
+    Attributes:
+        path: Lookup from the policy's model to the scoped client or
+            unit, ``""`` when the rows are the clients or units.
+        scope: The ``AccessScope`` id set the path must end in, such
+            as ``"active_client_ids"``.
+        where: Extra conditions on the client or unit reached.
+    """
+
+    path: str
+    scope: str
+    where: Q = field(default_factory=Q)
+
+    def compile(self, model: type[Model], ids: list[int]) -> Any:
+        """Compile the rule into a filter of ``model`` rows.
+
+        Args:
+            model: The model the rule path starts from.
+            ids: The primary keys the path must end in.
+
+        Returns:
+            A ``Q`` or ``Exists`` expression for ``QuerySet.filter``.
+        """
+
+        def hop(model: type[Model], path: str) -> Any:
+            if not path:
+                return Q(pk__in=ids) & self.where
+
+            name, _, rest = path.partition("__")
+            relation: Any = model._meta.get_field(name)
+            if relation.many_to_one:
+                if not rest and not self.where:
+                    # The key is stored on the row; filter it directly.
+                    return Q(**{f"{relation.attname}__in": ids})
+                correlation = {"pk": OuterRef(relation.attname)}
+            elif relation.one_to_many:
+                correlation = {relation.field.attname: OuterRef("pk")}
+            else:
+                raise ValueError(f"Cannot compile access path {path!r}.")
+
+            related = relation.related_model
+            return Exists(
+                related._base_manager.filter(hop(related, rest), **correlation)
+            )
+
+        return hop(model, self.path)
+
+    def column(self, model: type[Model]) -> str | None:
+        """Return the attribute of ``model`` rows the scope ids match.
+
+        Only rules without conditions whose path is empty or a single
+        foreign key have one; others need a query to be checked.
+        """
+        if self.where or "__" in self.path:
+            return None
+        if not self.path:
+            return "pk"
+        relation: Any = model._meta.get_field(self.path)
+        return relation.attname if relation.many_to_one else None
+
+
+@dataclass(frozen=True)
+class RowPolicy(ObjectPolicy):
+    """The rows of ``model`` each role may see.
+
+    Attributes:
+        model: The model the rule paths start from. Querysets of its
+            subclasses can be filtered as well.
+        default: The rule of roles missing from ``rules``.
+        rules: Rules of roles that differ from the default.
+        unrestricted: Roles that see every row.
+    """
+
+    model: type[Model]
+    default: Rule
+    rules: dict[str, Rule] = field(default_factory=dict)
+    unrestricted: frozenset[str] = STAFF_ROLES
+
+    def rule_for(self, user: UserAccount) -> Rule | None:
+        """Return the rule restricting ``user``, if any."""
+        if user.role in self.unrestricted:
+            return None
+        return self.rules.get(user.role, self.default)
+
+    def is_unrestricted(self, user: UserAccount) -> bool:
+        """Return whether ``user`` sees every row."""
+        return self.rule_for(user) is None
+
+    def apply(self, queryset: QuerySet, user: UserAccount) -> QuerySet:
+        """Restrict ``queryset`` to the rows ``user`` may see."""
+        rule = self.rule_for(user)
+        if rule is None:
+            return queryset
+
+        ids = getattr(get_access_scope(user), rule.scope)
+        if not ids:
+            return queryset.none()
+        return queryset.filter(rule.compile(self.model, sorted(ids)))
+
+    def accessible_pks(
+        self, user: UserAccount, objects: Iterable[Model | Any]
+    ) -> set[Any]:
+        """Return the keys of the ``objects`` that ``user`` may access.
+
+        Instances are matched against the cached scope without a query
+        when the rule is one of their columns.
+        """
+        objects = list(objects)
+        rule = self.rule_for(user)
+        column = rule and rule.column(self.model)
+        if not column or not all(isinstance(o, Model) for o in objects):
+            return super().accessible_pks(user, objects)
+
+        ids = getattr(get_access_scope(user), rule.scope)
+        return {obj.pk for obj in objects if getattr(obj, column) in ids}
+
+
+CLIENTS = RowPolicy(
+    Client,
+    default=Rule("", "active_client_ids"),
+    rules={
+        # Unit managers see the clients of their accepted units.
+        Role.UNIT_MANAGER: Rule(
+            "units",
+            "active_unit_ids",
+            Q(
+                operation__operation_status=(
+                    UnitOperation.OperationStatus.ACCEPTED
+                )
+            ),
+        ),
+    },
+)
+
+UNITS = RowPolicy(
+    Unit,
+    default=Rule("client", "active_client_ids"),
+    rules={Role.UNIT_MANAGER: Rule("", "active_unit_ids")},
+)
+
+EQUIPMENTS = RowPolicy(
+    Equipment,
+    default=Rule("unit__client", "active_client_ids"),
+    rules={Role.UNIT_MANAGER: Rule("unit", "active_unit_ids")},
+)
+
+APPOINTMENTS = RowPolicy(
+    Appointment,
+    default=Rule("unit__client", "client_ids"),
+    rules={Role.UNIT_MANAGER: Rule("unit", "unit_ids")},
+)
+
+ACCESSORIES = RowPolicy(
+    Accessory,
+    default=Rule("equipment__unit__client", "client_ids"),
+    rules={Role.UNIT_MANAGER: Rule("equipment__unit", "unit_ids")},
+)
+
+# Service orders are handled by Prophy managers, the physicists of the
+# client and the manager of the unit, never by commercial users.
+SERVICE_ORDER_APPOINTMENTS = RowPolicy(
+    Appointment,
+    default=Rule("unit__client", "client_ids"),
+    rules={Role.UNIT_MANAGER: Rule("unit", "unit_ids")},
+    unrestricted=frozenset({Role.PROPHY_MANAGER}),
+)
+
+REPORTS = RowPolicy(
+    Report,
+    default=Rule("owner_client", "client_ids"),
+    rules={Role.UNIT_MANAGER: Rule("owner_unit", "unit_ids")},
+)
@@ -1,34 +1,77 @@
 from __future__ import annotations
 
-from django.db.models import OuterRef, QuerySet, Subquery
+from collections.abc import Iterable
 
-from clients_management.models import Proposal
+from django.db.models import F, QuerySet
+
+from clients_management.models import Client
+from users.models import UserAccount
+
+RESPONSIBLE_ROLES = [
+    UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST,
+    UserAccount.Role.EXTERNAL_MEDICAL_PHYSICIST,
+    UserAccount.Role.PROPHY_MANAGER,
+]
 
 
 def annotate_latest_annual_accepted_proposal_date(
-    queryset: QuerySet, cnpj_field: str = "cnpj"
+    queryset: QuerySet, relation: str = "contract_state"
 ) -> QuerySet:
     """Annotates a queryset with the latest accepted proposal date.
 
-    The queryset must contain a field identified by ``cnpj_field``
-    that stores the client's CNPJ. The annotation will be added
-    under the name ``latest_annual_accepted_proposal_date``.
+    The queryset's model must expose a relation to ``ContractState``
+    identified by ``relation`` (``Client`` and ``Proposal`` both have
+    one joined on their CNPJ). The annotation will be added under the
+    name ``latest_annual_accepted_proposal_date`` and is read with a
+    plain join on the contract state row.
 
     This is intended to be reused wherever we need to reason about
     the most recent annual contract per client, such as:
       - determining if a client needs a new appointment
       - identifying proposals close to renewal windows
     """
-    latest_annual_proposals = Proposal.objects.filter(
-        **{
-            cnpj_field: OuterRef(cnpj_field),
-            "status": Proposal.Status.ACCEPTED,
-            "contract_type": Proposal.ContractType.ANNUAL,
-        }
-    ).order_by("-date")
-
     return queryset.annotate(
-        latest_annual_accepted_proposal_date=Subquery(
-            latest_annual_proposals.values("date")[:1]
+        latest_annual_accepted_proposal_date=F(
+            f"{relation}__latest_annual_accepted_date"
         )
     )
+
+
+def get_responsibles_by_client(
+    client_ids: Iterable[int],
+    fields: Iterable[str] = ("id", "name", "role"),
+) -> dict[int, list[dict]]:
+    """Resolves the responsible physicists of many clients at once.
+
+    Runs a single query over the ``Client.users`` through table instead
+    of one ``client.users.filter(...)`` per client, so serializers can
+    render a whole page of rows with a constant number of queries.
+
+    Args:
+        client_ids: Primary keys of the clients to resolve.
+        fields: UserAccount fields to include for each responsible.
+
+    Returns:
+        A mapping of every requested client id to the list of its
+        responsible users (FMI, FME, GP), each as a dict of ``fields``.
+        Clients without responsibles map to an empty list.
+    """
+    client_ids = set(client_ids)
+    fields = tuple(fields)
+    responsibles: dict[int, list[dict]] = {pk: [] for pk in client_ids}
+    if not client_ids:
+        return responsibles
+
+    rows = (
+        Client.users.through.objects.filter(
+            client_id__in=client_ids,
+            useraccount__role__in=RESPONSIBLE_ROLES,
+        )
+        .order_by("client_id", "id")
+        .values("client_id", *(f"useraccount__{field}" for field in fields))
+    )
+    for row in rows:
+        responsibles[row["client_id"]].append(
+            {field: row[f"useraccount__{field}"] for field in fields}
+        )
+    return responsibles
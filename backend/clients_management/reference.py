@@ -0,0 +1,103 @@
+"""Cached reference data of the modalities.
+
+Modalities are read by every equipment form, filter and list item, but
+change only through ``ModalityViewSet`` and the admin. They are served
+from a copy held by each process, backed by one in the default cache,
+which every worker and instance shares (see ``CACHES``).
+
+Writes call ``invalidate_modalities`` (see
+``clients_management.signals``), which drops the shared copy and the
+one of the writing process. Copies of other processes are refreshed
+from the shared cache after ``LOCAL_TIMEOUT`` seconds at most, so no
+process serves stale modalities for longer, whatever
+``MODALITY_CACHE_TIMEOUT`` is.
+"""
+
+import time
+from typing import TypedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from clients_management.models import Modality
+
+MODALITIES_CACHE_KEY = "reference:modalities"
+
+# Seconds a process serves its copy without checking the shared cache.
+LOCAL_TIMEOUT = 10
+
+
+class ModalityDict(TypedDict):
+    id: int
+    name: str
+    accessory_type: str
+
+
+class _ProcessCopy:
+    """The modalities held by this process, until ``expires_at``."""
+
+    expires_at: float = 0.0
+    modalities: dict[int, ModalityDict] = {}
+
+
+_local = _ProcessCopy()
+
+
+MODALITY_FIELDS = ("id", "name", "accessory_type")
+
+
+def _load() -> dict[int, ModalityDict]:
+    modalities = cache.get(MODALITIES_CACHE_KEY)
+    if modalities is None:
+        modalities = {
+            row["id"]: row
+            for row in Modality.objects.order_by("pk").values(*MODALITY_FIELDS)
+        }
+        cache.set(
+            MODALITIES_CACHE_KEY,
+            modalities,
+            timeout=settings.MODALITY_CACHE_TIMEOUT,
+        )
+    return modalities
+
+
+def get_modalities() -> dict[int, ModalityDict]:
+    """Return every modality by id, ordered by id.
+
+    The returned mapping is shared and must not be modified.
+    """
+    now = time.monotonic()
+    if _local.expires_at <= now:
+        _local.modalities = _load()
+        _local.expires_at = now + LOCAL_TIMEOUT
+    return _local.modalities
+
+
+def get_modality(pk: int) -> ModalityDict | None:
+    """Return a copy of the modality ``pk``, or ``None`` if missing.
+
+    A modality missing from the copy of the process, such as one just
+    created by another process, is looked up again in the shared copy,
+    then in the database. Missing ids leave the shared copy alone:
+    only writes invalidate it.
+    """
+    modality = get_modalities().get(pk)
+    if modality is None:
+        clear_local_modalities()
+        modality = get_modalities().get(pk)
+    if modality is None:
+        modality = (
+            Modality.objects.filter(pk=pk).values(*MODALITY_FIELDS).first()
+        )
+    return None if modality is None else ModalityDict(**modality)
+
+
+def invalidate_modalities() -> None:
+    """Drop the modalities cached by the process and shared cache."""
+    clear_local_modalities()
+    cache.delete(MODALITIES_CACHE_KEY)
+
+
+def clear_local_modalities() -> None:
+    """Drop the copy of this process only, e.g. between tests."""
+    _local.expires_at = 0.0
@@ -0,0 +1,194 @@
+"""Full-text search over reports.
+
+Each report stores a ``search_document`` (see
+``Report.build_search_document``) that is indexed per database
+backend:
+
+- PostgreSQL: a GIN index on ``to_tsvector(search_document)``, built
+  concurrently by a migration.
+- SQLite: an external-content FTS5 table kept in sync by triggers.
+
+The SQLite table and triggers are created by
+``ensure_report_search_index``, which runs after every ``migrate``.
+SQLite rebuilds tables on most schema changes, which drops their
+triggers, so they have to be re-applied afterwards rather than once in
+a migration.
+"""
+
+import re
+from collections.abc import Iterable
+
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.models import FloatField, QuerySet, Value
+from django.db.models.expressions import RawSQL
+
+from clients_management.models import Client, Equipment, Report, Unit
+from core.conditional import touch_models
+from core.counting import invalidate_model_counts
+
+SEARCH_PARAM = "q"
+
+SEARCH_CONFIG = "portuguese"
+POSTGRES_INDEX_NAME = "report_search_idx"
+SQLITE_FTS_TABLE = "clients_management_report_fts"
+
+# Fields of the related rows that ``Report.build_search_document``
+# reads, including the links it follows to other rows.
+INDEXED_FIELDS = {
+    Client: ("name",),
+    Unit: ("name", "city", "client_id"),
+    Equipment: ("model", "series_number", "unit_id"),
+}
+
+_TERM_PATTERN = re.compile(r"\w+")
+
+
+def _search_terms(text: str) -> list[str]:
+    return _TERM_PATTERN.findall(text)
+
+
+def _postgres_vector():
+    from django.contrib.postgres.search import SearchVector
+
+    return SearchVector("search_document", config=SEARCH_CONFIG)
+
+
+def _ensure_sqlite_index(connection: BaseDatabaseWrapper) -> None:
+    table = Report._meta.db_table
+    fts = SQLITE_FTS_TABLE
+    names = [fts, f"{fts}_ai", f"{fts}_ad", f"{fts}_au"]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT count(*) FROM sqlite_master WHERE name IN "
+            "(%s, %s, %s, %s)",
+            names,
+        )
+        if cursor.fetchone()[0] == len(names):
+            return
+
+    statements = [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"search_document, content='{table}', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} "
+        f"BEGIN INSERT INTO {fts}(rowid, search_document) "
+        "VALUES (new.id, new.search_document); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} "
+        f"BEGIN INSERT INTO {fts}({fts}, rowid, search_document) "
+        "VALUES ('delete', old.id, old.search_document); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au "
+        f"AFTER UPDATE OF search_document ON {table} "
+        f"BEGIN INSERT INTO {fts}({fts}, rowid, search_document) "
+        "VALUES ('delete', old.id, old.search_document); "
+        f"INSERT INTO {fts}(rowid, search_document) "
+        "VALUES (new.id, new.search_document); END",
+        # Rows written while the triggers were missing, or before the
+        # table existed, are picked up by rebuilding the index from the
+        # reports table.
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def ensure_report_search_index(using: str = "default") -> None:
+    """Create the SQLite report search table and triggers if missing.
+
+    PostgreSQL has its index built by a migration. Other backends are
+    left untouched; searching then falls back to ``icontains``
+    matching.
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+    table = Report._meta.db_table
+    if table not in connection.introspection.table_names():
+        return
+    # Migrating to a state before the column was added.
+    with connection.cursor() as cursor:
+        columns = connection.introspection.get_table_description(cursor, table)
+    if any(column.name == "search_document" for column in columns):
+        _ensure_sqlite_index(connection)
+
+
+def search_reports(queryset: QuerySet[Report], text: str) -> QuerySet:
+    """Filter reports matching every term of ``text``, ranked.
+
+    Terms match as prefixes of the indexed words. Matching reports are
+    annotated with ``search_rank``, higher being more relevant.
+
+    Args:
+        queryset: The reports to search.
+        text: The user's search text.
+
+    Returns:
+        QuerySet: The matching reports annotated with ``search_rank``.
+    """
+    terms = _search_terms(text)
+    if not terms:
+        return queryset.annotate(search_rank=Value(0.0))
+
+    vendor = connections[queryset.db].vendor
+    if vendor == "postgresql":
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        query = SearchQuery(
+            " & ".join(f"{term}:*" for term in terms),
+            config=SEARCH_CONFIG,
+            search_type="raw",
+        )
+        vector = _postgres_vector()
+        return (
+            queryset.alias(search_vector=vector)
+            .filter(search_vector=query)
+            .annotate(search_rank=SearchRank(vector, query))
+        )
+
+    if vendor == "sqlite":
+        match = " ".join(f'"{term}"*' for term in terms)
+        table = Report._meta.db_table
+        fts = SQLITE_FTS_TABLE
+        return queryset.filter(
+            id__in=RawSQL(
+                f"SELECT rowid FROM {fts} WHERE {fts} MATCH %s", (match,)
+            )
+        ).annotate(
+            # bm25() is lower for better matches.
+            search_rank=RawSQL(
+                f"SELECT -bm25({fts}) FROM {fts} WHERE {fts} MATCH %s "
+                f'AND rowid = "{table}"."id"',
+                (match,),
+                output_field=FloatField(),
+            )
+        )
+
+    for term in terms:
+        queryset = queryset.filter(search_document__icontains=term)
+    return queryset.annotate(search_rank=Value(0.0))
+
+
+def refresh_search_documents(reports: Iterable[Report]) -> int:
+    """Rebuild the stored search document of ``reports``.
+
+    The reports should be fetched with their unit, equipment and their
+    client selected. Only changed documents are written.
+
+    Returns:
+        int: The number of reports updated.
+    """
+    changed = []
+    for report in reports:
+        document = report.build_search_document()
+        if document != report.search_document:
+            report.search_document = document
+            changed.append(report)
+
+    if changed:
+        Report.all_objects.bulk_update(
+            changed, ["search_document"], batch_size=500
+        )
+        invalidate_model_counts(Report)
+        touch_models(Report)
+    return len(changed)
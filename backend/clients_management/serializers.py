@@ -1,8 +1,8 @@
 from datetime import date, timedelta
-from typing import Any, TypedDict
+from typing import Any, TypedDict, cast
 
 from django.core.exceptions import ValidationError
-from django.db import transaction
+from django.db import models, transaction
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework import serializers
@@ -18,6 +18,9 @@ from clients_management.models import (
     ServiceOrder,
     Unit,
 )
+from clients_management.query_utils import get_responsibles_by_client
+from clients_management.reference import get_modality
+from core.fieldsets import SparseFieldsetMixin
 from users.models import UserAccount
 
 
@@ -27,7 +30,7 @@ class ResponsibleDict(TypedDict):
     role: str
 
 
-class ProposalSerializer(serializers.ModelSerializer):
+class ProposalSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Proposal
         fields = "__all__"
@@ -50,7 +53,7 @@ class CNPJSerializer(serializers.Serializer):
     cnpj = serializers.CharField(max_length=14)
 
 
-class ClientSerializer(serializers.ModelSerializer):
+class ClientSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     users = UserNameSerializer(many=True, read_only=True)
 
     class Meta:
@@ -71,6 +74,8 @@ class ClientSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance: Client):
         representation = super().to_representation(instance)
+        if not self.wants("users"):
+            return representation
         representation["users"] = [
             {
                 "name": user["name"],
@@ -90,7 +95,7 @@ class ClientListSerializer(ClientSerializer):
         fields = ClientSerializer.Meta.fields + ["needs_appointment"]
 
 
-class UnitSerializer(serializers.ModelSerializer):
+class UnitSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     user = UserNameSerializer(read_only=True)
 
     class Meta:
@@ -98,30 +103,36 @@ class UnitSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
-class EquipmentSerializer(serializers.ModelSerializer):
+class EquipmentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    computed_sources = {
+        "modality": ("modality",),
+        "unit_name": ("unit__name",),
+        "client_name": ("unit__client__name",),
+    }
+
     class Meta:
         model = Equipment
         fields = "__all__"
 
     def to_representation(self, instance: Equipment):
         representation = super().to_representation(instance)
-        representation["modality"] = {
-            "id": instance.modality.id,
-            "name": instance.modality.name,
-            "accessory_type": instance.modality.accessory_type,
-        }
+        if self.wants("modality"):
+            representation["modality"] = get_modality(instance.modality_id)
 
-        if instance.unit:
+        if self.wants("unit_name") and instance.unit:
             representation["unit_name"] = instance.unit.name
+        if (
+            self.wants("client_name")
+            and instance.unit
+            and instance.unit.client
+        ):
+            representation["client_name"] = instance.unit.client.name
 
-            if instance.unit.client:
-                representation["client_name"] = instance.unit.client.name
-
-        if instance.equipment_photo:
+        if self.wants("equipment_photo") and instance.equipment_photo:
             representation["equipment_photo"] = reverse(
                 "equipment-photo", kwargs={"pk": instance.pk}
             )
-        if instance.label_photo:
+        if self.wants("label_photo") and instance.label_photo:
             representation["label_photo"] = reverse(
                 "equipment-label", kwargs={"pk": instance.pk}
             )
@@ -240,12 +251,110 @@ class ServiceOrderCreateSerializer(serializers.ModelSerializer):
             return order
 
 
-class AppointmentSerializer(serializers.ModelSerializer):
+class ClientResponsiblesListSerializer(serializers.ListSerializer):
+    """List serializer resolving client responsibles for a whole page.
+
+    Collects the owning client of every object being serialized and
+    loads their responsibles with a single query, so the number of
+    queries does not grow with the page size. The child serializer must
+    use ClientResponsiblesMixin.
+    """
+
+    def to_representation(self, data):
+        iterable = (
+            data.all()
+            if isinstance(data, models.manager.BaseManager)
+            else data
+        )
+        instances = list(iterable)
+        if not self.child.wants_responsibles():
+            return super().to_representation(instances)
+
+        client_ids = {
+            client.pk
+            for instance in instances
+            if (client := self.child.get_owning_client(instance)) is not None
+        }
+        self.child.responsibles_by_client.update(
+            get_responsibles_by_client(
+                client_ids, self.child.responsible_fields
+            )
+        )
+        return super().to_representation(instances)
+
+
+class ClientResponsiblesMixin(SparseFieldsetMixin):
+    """Resolves the responsibles of an object's owning client.
+
+    Responsibles are cached per client id, so every field rendering
+    them shares a single lookup. ClientResponsiblesListSerializer
+    pre-fills the cache for a whole page, unless none of the
+    ``responsible_outputs`` are requested.
+    """
+
+    responsible_fields: tuple[str, ...] = ("id", "name", "role")
+    responsible_outputs: tuple[str, ...] = ("responsibles",)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # ABCMeta conflicts with the metaclass of DRF serializers, so
+        # the override is checked when the serializer is defined.
+        if (
+            issubclass(cls, serializers.BaseSerializer)
+            and cls.get_owning_client
+            is ClientResponsiblesMixin.get_owning_client
+        ):
+            raise TypeError(
+                f"{cls.__name__} must implement get_owning_client()."
+            )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.responsibles_by_client: dict[int, list[dict]] = {}
+
+    def get_owning_client(self, instance) -> Client | None:
+        """Return the client whose responsibles ``instance`` renders.
+
+        Serializers using the mixin must implement it.
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def wants_responsibles(self) -> bool:
+        return any(self.wants(name) for name in self.responsible_outputs)
+
+    def get_client_responsibles(self, client: Client) -> list[dict]:
+        if client.pk not in self.responsibles_by_client:
+            self.responsibles_by_client.update(
+                get_responsibles_by_client(
+                    [client.pk], self.responsible_fields
+                )
+            )
+        return self.responsibles_by_client[client.pk]
+
+
+class AppointmentSerializer(
+    ClientResponsiblesMixin, serializers.ModelSerializer
+):
     service_order = ServiceOrderSerializer(read_only=True)
+    unit = serializers.PrimaryKeyRelatedField(
+        queryset=Unit.objects.select_related("client"),
+        required=False,
+        allow_null=True,
+    )
+
+    responsible_fields = ("id", "name", "role", "email", "phone")
+    computed_sources = {
+        "unit_name": ("unit__name",),
+        "client_name": ("unit__client__name",),
+        "responsibles": ("unit__client__id",),
+        "unit_full_address": ("unit__address", "unit__state", "unit__city"),
+        "type_display": ("type",),
+    }
 
     class Meta:
         model = Appointment
         fields = "__all__"
+        list_serializer_class = ClientResponsiblesListSerializer
 
     def validate_date(self, value):
         request = self.context.get("request")
@@ -263,44 +372,44 @@ class AppointmentSerializer(serializers.ModelSerializer):
     def to_representation(self, instance: Appointment):
         representation = super().to_representation(instance)
 
-        unit = getattr(instance, "unit", None)
-        if unit is not None:
-            representation["unit_name"] = unit.name
-
+        unit_outputs = (
+            "unit_name",
+            "client_name",
+            "responsibles",
+            "unit_full_address",
+        )
+        unit = None
+        if any(self.wants(name) for name in unit_outputs):
+            unit = getattr(instance, "unit", None)
+        client = None
+        if self.wants("client_name") or self.wants("responsibles"):
             client = getattr(unit, "client", None)
-            if client is not None:
-                representation["client_name"] = client.name
 
-                physicist_roles = [
-                    UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST,
-                    UserAccount.Role.EXTERNAL_MEDICAL_PHYSICIST,
-                    UserAccount.Role.PROPHY_MANAGER,
-                ]
-                responsibles = client.users.filter(
-                    role__in=physicist_roles
-                ).values(
-                    "id",
-                    "name",
-                    "role",
-                    "email",
-                    "phone",
+        if unit is not None:
+            if self.wants("unit_name"):
+                representation["unit_name"] = unit.name
+            if self.wants("client_name") and client is not None:
+                representation["client_name"] = client.name
+            if self.wants("unit_full_address"):
+                representation["unit_full_address"] = (
+                    f"{unit.address} - {unit.state}, {unit.city}"
                 )
-                representation["responsibles"] = list(responsibles)
-            else:
-                representation["responsibles"] = []
 
-            representation["unit_full_address"] = (
-                f"{unit.address} - {unit.state}, {unit.city}"
+        if self.wants("responsibles"):
+            representation["responsibles"] = (
+                self.get_client_responsibles(client) if client else []
             )
-        else:
-            representation["responsibles"] = []
 
-        representation["type_display"] = instance.get_type_display()
+        if self.wants("type_display"):
+            representation["type_display"] = instance.get_type_display()
 
         return representation
 
+    def get_owning_client(self, instance: Appointment) -> Client | None:
+        return instance.unit.client if instance.unit else None
+
 
-class ReportSerializer(serializers.ModelSerializer):
+class ReportSerializer(ClientResponsiblesMixin, serializers.ModelSerializer):
     status = serializers.SerializerMethodField()
     responsibles = serializers.SerializerMethodField()
     responsibles_display = serializers.SerializerMethodField()
@@ -314,9 +423,21 @@ class ReportSerializer(serializers.ModelSerializer):
     # behaviour.
     word_file = serializers.FileField(required=True)
 
+    responsible_outputs = ("responsibles", "responsibles_display")
+    computed_sources = {
+        "status": ("deleted_at", "report_type", "due_date"),
+        "is_deleted": ("deleted_at",),
+        "responsibles": ("owner_client__id",),
+        "responsibles_display": ("owner_client__id",),
+        "unit_name": ("unit__name",),
+        "equipment_name": ("equipment__manufacturer", "equipment__model"),
+        "client_name": ("owner_client__name",),
+    }
+
     class Meta:
         model = Report
         fields = "__all__"
+        list_serializer_class = ClientResponsiblesListSerializer
 
     def create(self, validated_data: dict[str, Any]) -> Report:
         request = self.context.get("request")
@@ -362,17 +483,14 @@ class ReportSerializer(serializers.ModelSerializer):
         if request is not None and request.user.role not in word_allowed_roles:
             representation.pop("word_file", None)
 
-        if instance.unit:
+        if self.wants("unit_name") and instance.unit:
             representation["unit_name"] = instance.unit.name
-            if instance.unit.client:
-                representation["client_name"] = instance.unit.client.name
 
-        if instance.equipment:
+        if self.wants("equipment_name") and instance.equipment:
             representation["equipment_name"] = str(instance.equipment)
-            if instance.equipment.unit and instance.equipment.unit.client:
-                representation["client_name"] = (
-                    instance.equipment.unit.client.name
-                )
+
+        if self.wants("client_name") and instance.owner_client:
+            representation["client_name"] = instance.owner_client.name
 
         return representation
 
@@ -395,29 +513,19 @@ class ReportSerializer(serializers.ModelSerializer):
         else:
             return "ok"
 
+    def get_owning_client(self, instance: Report) -> Client | None:
+        """Return the denormalized client owning a report."""
+        return instance.owner_client
+
     def get_responsibles(self, obj: Report) -> list[ResponsibleDict]:
         """Returns responsible users (FMI, FME, GP) for the client."""
-        client = None
-        if obj.unit and obj.unit.client:
-            client = obj.unit.client
-        elif (
-            obj.equipment and obj.equipment.unit and obj.equipment.unit.client
-        ):
-            client = obj.equipment.unit.client
-
+        client = self.get_owning_client(obj)
         if not client:
             return []
 
-        physicist_roles = [
-            UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST,
-            UserAccount.Role.EXTERNAL_MEDICAL_PHYSICIST,
-            UserAccount.Role.PROPHY_MANAGER,
-        ]
-
-        responsibles = client.users.filter(role__in=physicist_roles).values(
-            "id", "name", "role"
+        return cast(
+            list[ResponsibleDict], self.get_client_responsibles(client)
         )
-        return list(responsibles)
 
     def get_responsibles_display(self, obj: Report) -> str:
         """Returns responsible users formatted for display."""
@@ -426,3 +534,18 @@ class ReportSerializer(serializers.ModelSerializer):
             return "—"
 
         return "; ".join(user["name"] for user in responsibles)
+
+
+class BulkReportRowSerializer(serializers.Serializer):
+    """A row of a bulk report upload manifest.
+
+    ``pdf_file`` and ``word_file`` name entries of the uploaded archive.
+    """
+
+    report_type = serializers.ChoiceField(choices=Report.ReportType.choices)
+    completion_date = serializers.DateField()
+    description = serializers.CharField()
+    unit = serializers.IntegerField(required=False, allow_null=True)
+    equipment = serializers.IntegerField(required=False, allow_null=True)
+    pdf_file = serializers.CharField()
+    word_file = serializers.CharField()
@@ -1,8 +1,42 @@
-from django.db.models.signals import pre_delete
+from collections.abc import Iterable
+
+from django.db.models import Subquery
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
 from django.dispatch import receiver
 from django.utils import timezone
 
-from clients_management.models import Equipment, Report, Unit
+from clients_management.access import (
+    client_audience,
+    invalidate_access_scope,
+)
+from clients_management.models import (
+    Client,
+    ContractState,
+    Equipment,
+    Modality,
+    Proposal,
+    Report,
+    Unit,
+)
+from clients_management.reference import invalidate_modalities
+from clients_management.search import (
+    INDEXED_FIELDS,
+    ensure_report_search_index,
+    refresh_search_documents,
+)
+from core.conditional import touch_models
+from core.counting import invalidate_model_counts
+from requisitions.models import (
+    ClientOperation,
+    EquipmentOperation,
+    UnitOperation,
+)
 
 
 def _soft_delete_reports(
@@ -19,6 +53,8 @@ def _soft_delete_reports(
         deleted_by=None,
         **report_updates,
     )
+    invalidate_model_counts(Report)
+    touch_models(Report)
 
 
 @receiver(pre_delete, sender=Unit)
@@ -29,7 +65,11 @@ def soft_delete_reports_for_unit(
 ) -> None:
     _soft_delete_reports(
         report_filter={"unit_id": instance.id},
-        report_updates={"unit": None},
+        report_updates={
+            "unit": None,
+            "owner_unit": None,
+            "owner_client": None,
+        },
     )
 
 
@@ -41,5 +81,242 @@ def soft_delete_reports_for_equipment(
 ) -> None:
     _soft_delete_reports(
         report_filter={"equipment_id": instance.id},
-        report_updates={"equipment": None},
+        report_updates={
+            "equipment": None,
+            "owner_unit": None,
+            "owner_client": None,
+        },
+    )
+
+
+# Fields read back before a client, unit or equipment is saved, so that
+# receivers can tell what changed, in one query: the fields access
+# scopes depend on, a client's CNPJ for the pending operations flag of
+# requisitions, and the ``INDEXED_FIELDS`` of report search documents.
+TRACKED_FIELDS = {
+    Client: ("is_active", "cnpj", "name"),
+    Unit: ("user_id", "client_id", "name", "city"),
+    Equipment: ("model", "series_number", "unit_id"),
+}
+
+
+def _tracked_model(instance: Client | Unit | Equipment) -> type:
+    return next(
+        model for model in TRACKED_FIELDS if isinstance(instance, model)
+    )
+
+
+def _changed(
+    instance: Client | Unit | Equipment, fields: Iterable[str]
+) -> bool:
+    """Whether ``fields`` differ from the row read before the save."""
+    old = getattr(instance, "_old_fields", None)
+    return old is None or any(
+        old[field] != getattr(instance, field) for field in fields
+    )
+
+
+@receiver(pre_save, sender=Client)
+@receiver(pre_save, sender=ClientOperation)
+@receiver(pre_save, sender=Unit)
+@receiver(pre_save, sender=UnitOperation)
+@receiver(pre_save, sender=Equipment)
+@receiver(pre_save, sender=EquipmentOperation)
+def capture_old_fields(
+    sender: type[Client | Unit | Equipment],
+    instance: Client | Unit | Equipment,
+    **kwargs,
+) -> None:
+    """Remember the tracked fields of the stored row before a save.
+
+    Requisition subclasses of Client, Unit and Equipment are saved
+    under their own sender, so they are connected as well.
+    ``_old_fields`` is ``None`` for rows that are not stored yet.
+    """
+    model = _tracked_model(instance)
+    instance._old_fields = (
+        model.objects.filter(pk=instance.pk)
+        .values(*TRACKED_FIELDS[model])
+        .first()
+        if instance.pk and not kwargs.get("raw")
+        else None
     )
+
+
+@receiver(post_save)
+def sync_report_owners(
+    sender: type,
+    instance: object,
+    created: bool,
+    **kwargs,
+) -> None:
+    """Keep denormalized report owners in sync with units and equipment.
+
+    Connected without a sender so that requisition subclasses of Unit
+    and Equipment, which are saved under their own model, are covered
+    as well. Only reports whose stored owner differs are updated.
+    """
+    if created or kwargs.get("raw"):
+        return
+
+    if isinstance(instance, Unit):
+        updated = (
+            Report.all_objects.filter(owner_unit_id=instance.pk)
+            .exclude(owner_client_id=instance.client_id)
+            .update(owner_client_id=instance.client_id)
+        )
+    elif isinstance(instance, Equipment):
+        # Client changes of the unit itself are handled by the branch
+        # above, so only a move to another unit needs to be propagated.
+        updated = (
+            Report.all_objects.filter(equipment_id=instance.pk)
+            .exclude(owner_unit_id=instance.unit_id)
+            .update(
+                owner_unit_id=instance.unit_id,
+                owner_client_id=Subquery(
+                    Unit.objects.filter(pk=instance.unit_id).values(
+                        "client_id"
+                    )[:1]
+                ),
+            )
+        )
+    else:
+        return
+
+    if updated:
+        invalidate_model_counts(Report)
+        touch_models(Report)
+
+
+@receiver(post_save, sender=Client)
+@receiver(post_save, sender=ClientOperation)
+@receiver(post_save, sender=Unit)
+@receiver(post_save, sender=UnitOperation)
+@receiver(post_save, sender=Equipment)
+@receiver(post_save, sender=EquipmentOperation)
+def sync_report_search_documents(
+    sender: type[Client | Unit | Equipment],
+    instance: Client | Unit | Equipment,
+    created: bool,
+    **kwargs,
+) -> None:
+    """Rebuild report search documents after indexed fields change.
+
+    Runs after ``sync_report_owners`` so that reports moved to another
+    unit are indexed under their new owner.
+    """
+    if created or kwargs.get("raw"):
+        return
+
+    model = _tracked_model(instance)
+    if not _changed(instance, INDEXED_FIELDS[model]):
+        return
+    if model is Client:
+        reports = Report.all_objects.filter(owner_client_id=instance.pk)
+    elif model is Unit:
+        reports = Report.all_objects.filter(owner_unit_id=instance.pk)
+    else:
+        reports = Report.all_objects.filter(equipment_id=instance.pk)
+
+    refresh_search_documents(
+        reports.select_related("unit__client", "equipment__unit__client")
+    )
+
+
+def create_report_search_index(using: str, **kwargs) -> None:
+    """Create the SQLite report search table after migrations."""
+    ensure_report_search_index(using)
+
+
+@receiver(pre_save, sender=Proposal)
+def capture_old_proposal_cnpj(
+    sender: type[Proposal],
+    instance: Proposal,
+    **kwargs,
+) -> None:
+    instance._old_cnpj = (
+        Proposal.objects.filter(pk=instance.pk)
+        .values_list("cnpj", flat=True)
+        .first()
+        if instance.pk
+        else None
+    )
+
+
+@receiver(post_save, sender=Proposal)
+@receiver(post_delete, sender=Proposal)
+def refresh_contract_state(
+    sender: type[Proposal],
+    instance: Proposal,
+    **kwargs,
+) -> None:
+    """Keep the contract state of the proposal's CNPJ up to date.
+
+    When a proposal moves to another CNPJ the previous one is refreshed
+    as well.
+    """
+    cnpjs = [instance.cnpj]
+    old_cnpj = getattr(instance, "_old_cnpj", None)
+    if old_cnpj and old_cnpj != instance.cnpj:
+        cnpjs.append(old_cnpj)
+    ContractState.refresh(*cnpjs)
+
+
+@receiver(post_save, sender=Client)
+@receiver(post_save, sender=ClientOperation)
+@receiver(post_save, sender=Unit)
+@receiver(post_save, sender=UnitOperation)
+def invalidate_access_scopes_on_save(
+    sender: type[Client | Unit],
+    instance: Client | Unit,
+    created: bool,
+    **kwargs,
+) -> None:
+    """Invalidate the scopes of users affected by a unit or client save.
+
+    A unit affects its previous and current manager when either its
+    manager or its client changes. A client affects every user linked
+    to it when it is activated or deactivated. Rows deleted later are
+    left in cached scopes, where their ids simply match nothing.
+    """
+    if kwargs.get("raw"):
+        return
+
+    if isinstance(instance, Unit):
+        if not _changed(instance, ("user_id", "client_id")):
+            return
+        old = instance._old_fields
+        invalidate_access_scope([instance.user_id, old and old["user_id"]])
+    elif not created and _changed(instance, ("is_active",)):
+        invalidate_access_scope(client_audience([instance.pk]))
+
+
+@receiver(m2m_changed, sender=Client.users.through)
+def invalidate_access_scopes_on_responsibles_change(
+    sender: type,
+    instance: object,
+    action: str,
+    **kwargs,
+) -> None:
+    """Invalidate scopes of users added to or removed from clients."""
+    if kwargs["reverse"]:
+        # ``user.clients`` was changed; only that user is affected.
+        if action.startswith("post_"):
+            invalidate_access_scope([instance.pk])
+        return
+
+    if action == "pre_clear":
+        instance._cleared_responsibles = list(
+            instance.users.values_list("pk", flat=True)
+        )
+    elif action == "post_clear":
+        invalidate_access_scope(instance._cleared_responsibles)
+    elif action in ("post_add", "post_remove"):
+        invalidate_access_scope(kwargs["pk_set"])
+
+
+@receiver(post_save, sender=Modality)
+@receiver(post_delete, sender=Modality)
+def invalidate_cached_modalities(sender: type[Modality], **kwargs) -> None:
+    """Drop the cached modalities whenever one is written."""
+    invalidate_modalities()
@@ -0,0 +1,184 @@
+import pytest
+from django.core.cache import caches
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from clients_management.access import get_access_scope
+from clients_management.models import Client
+from core.cache_versions import VERSIONS_CACHE, versions
+from requisitions.models import ClientOperation
+from tests.factories import (
+    AppointmentFactory,
+    ClientFactory,
+    ClientOperationFactory,
+    UnitFactory,
+    UserFactory,
+)
+from users.models import UserAccount
+
+
+def _authenticated(user: UserAccount) -> APIClient:
+    api_client = APIClient()
+    api_client.force_authenticate(user=user)
+    return api_client
+
+
+def _list_ids(api_client: APIClient, url: str) -> set[int]:
+    response = api_client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    return {item["id"] for item in response.data["results"]}
+
+
+@pytest.fixture
+def prophy_client() -> APIClient:
+    return _authenticated(UserFactory(role=UserAccount.Role.PROPHY_MANAGER))
+
+
+@pytest.fixture
+def accepted_client() -> ClientOperation:
+    return ClientOperationFactory(
+        is_active=True,
+        operation_status=ClientOperation.OperationStatus.ACCEPTED,
+    )
+
+
+@pytest.mark.django_db
+def test_access_scope_is_computed_once(django_assert_num_queries):
+    user = UserFactory(role=UserAccount.Role.CLIENT_GENERAL_MANAGER)
+    client = ClientFactory(users=[user], is_active=True)
+    unit = UnitFactory(client=client)
+
+    scope = get_access_scope(user)
+    with django_assert_num_queries(0):
+        assert get_access_scope(user) == scope
+
+    assert scope.client_ids == {client.pk}
+    assert scope.active_client_ids == {client.pk}
+    assert not scope.unit_ids
+    assert unit.pk not in scope.active_unit_ids
+
+
+@pytest.mark.django_db
+def test_client_association_endpoints_refresh_the_scope(
+    prophy_client, accepted_client
+):
+    user = UserFactory(role=UserAccount.Role.CLIENT_GENERAL_MANAGER)
+    api_client = _authenticated(user)
+    assert _list_ids(api_client, "/api/clients/") == set()
+
+    response = prophy_client.post(
+        f"/api/clients/{accepted_client.pk}/users/",
+        {"user_id": user.pk},
+        format="json",
+    )
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert _list_ids(api_client, "/api/clients/") == {accepted_client.pk}
+
+    response = prophy_client.delete(
+        f"/api/clients/{accepted_client.pk}/users/{user.pk}/"
+    )
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert _list_ids(api_client, "/api/clients/") == set()
+
+
+@pytest.mark.django_db
+def test_unit_manager_reassignment_refreshes_both_scopes(prophy_client):
+    appointment = AppointmentFactory()
+    unit = appointment.unit
+    previous = UserFactory(role=UserAccount.Role.UNIT_MANAGER)
+    unit.user = previous
+    unit.save()
+    previous_client = _authenticated(previous)
+    assert _list_ids(previous_client, "/api/appointments/") == {appointment.pk}
+
+    unit.user = None
+    unit.save()
+    successor = UserFactory(role=UserAccount.Role.UNIT_MANAGER)
+    successor_client = _authenticated(successor)
+    assert _list_ids(successor_client, "/api/appointments/") == set()
+
+    response = prophy_client.put(
+        f"/api/units/{unit.pk}/unit-manager/",
+        {"user_id": successor.pk},
+        format="json",
+    )
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert _list_ids(previous_client, "/api/appointments/") == set()
+    assert _list_ids(successor_client, "/api/appointments/") == {
+        appointment.pk
+    }
+
+
+@pytest.mark.django_db
+def test_client_activation_refreshes_responsibles_and_unit_managers(
+    accepted_client,
+):
+    responsible = UserFactory(role=UserAccount.Role.CLIENT_GENERAL_MANAGER)
+    accepted_client.users.add(responsible)
+    unit_manager = UserFactory(role=UserAccount.Role.UNIT_MANAGER)
+    unit = UnitFactory(client=accepted_client, user=unit_manager)
+    assert get_access_scope(responsible).active_client_ids == {
+        accepted_client.pk
+    }
+    assert get_access_scope(unit_manager).active_unit_ids == {unit.pk}
+
+    # Accepted delete operations deactivate the plain client row.
+    client = Client.objects.get(pk=accepted_client.pk)
+    client.is_active = False
+    client.save()
+
+    assert not get_access_scope(responsible).active_client_ids
+    assert get_access_scope(responsible).client_ids == {accepted_client.pk}
+    assert not get_access_scope(unit_manager).active_unit_ids
+
+
+@pytest.mark.django_db
+def test_reverse_and_cleared_memberships_refresh_the_scope():
+    user = UserFactory(role=UserAccount.Role.CLIENT_GENERAL_MANAGER)
+    first, second = ClientFactory(), ClientFactory()
+    assert not get_access_scope(user).client_ids
+
+    user.clients.add(first, second)
+    assert get_access_scope(user).client_ids == {first.pk, second.pk}
+
+    first.users.clear()
+    assert get_access_scope(user).client_ids == {second.pk}
+
+
+@pytest.mark.django_db
+def test_revoked_membership_is_seen_by_every_worker(settings):
+    settings.CACHES = {
+        alias: {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": f"test_{alias}",
+        }
+        for alias in ("default", VERSIONS_CACHE)
+    }
+    call_command("createcachetable", verbosity=0)
+    user = UserFactory(role=UserAccount.Role.CLIENT_GENERAL_MANAGER)
+    client = ClientFactory(users=[user])
+    assert get_access_scope(user).client_ids == {client.pk}
+
+    client.users.remove(user)
+
+    # Another worker holds its own connections to the shared caches.
+    version = caches.create_connection(VERSIONS_CACHE).get(
+        f"access-scope-version:{user.pk}"
+    )
+    worker_cache = caches.create_connection("default")
+    assert worker_cache.get(f"access-scope:{user.pk}:{version}") is None
+    assert not get_access_scope(user).client_ids
+
+
+@pytest.mark.django_db
+def test_lost_versions_never_restore_a_revoked_scope():
+    user = UserFactory(role=UserAccount.Role.CLIENT_GENERAL_MANAGER)
+    client = ClientFactory(users=[user])
+    assert get_access_scope(user).client_ids == {client.pk}
+    client.users.remove(user)
+    assert not get_access_scope(user).client_ids
+
+    versions.clear()
+
+    assert not get_access_scope(user).client_ids
@@ -0,0 +1,130 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from clients_management.models import Appointment
+from tests.factories import (
+    AppointmentFactory,
+    ClientFactory,
+    EquipmentFactory,
+    ServiceOrderFactory,
+    UnitFactory,
+    UserFactory,
+)
+from users.models import UserAccount
+
+
+def _create_appointments(count: int, physicist: UserAccount) -> None:
+    for _ in range(count):
+        unit = UnitFactory(client=ClientFactory(users=[physicist]))
+        order = ServiceOrderFactory(
+            equipments=[EquipmentFactory(unit=unit)],
+            responsible_prophy=physicist,
+        )
+        AppointmentFactory(unit=unit, service_order=order)
+
+
+def _count_queries(api_client: APIClient, method: str, url: str, **kwargs):
+    with CaptureQueriesContext(connection) as ctx:
+        response = getattr(api_client, method)(url, **kwargs)
+    return response, len(ctx.captured_queries)
+
+
+@pytest.mark.django_db
+def test_appointments_list_query_count_does_not_grow_with_rows():
+    api_client = APIClient()
+    physicist = UserFactory(role=UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST)
+    api_client.force_authenticate(user=physicist)
+
+    _create_appointments(1, physicist)
+    response, single_row_queries = _count_queries(
+        api_client, "get", "/api/appointments/"
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    _create_appointments(7, physicist)
+    response, full_page_queries = _count_queries(
+        api_client, "get", "/api/appointments/"
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["results"]) == 8  # noqa: PLR2004
+
+    assert full_page_queries == single_row_queries
+
+
+@pytest.mark.django_db
+def test_appointments_list_renders_responsibles_with_contact_fields():
+    api_client = APIClient()
+    manager = UserFactory(role=UserAccount.Role.PROPHY_MANAGER)
+    physicist = UserFactory(role=UserAccount.Role.EXTERNAL_MEDICAL_PHYSICIST)
+    client_manager = UserFactory(role=UserAccount.Role.CLIENT_GENERAL_MANAGER)
+    unit = UnitFactory(client=ClientFactory(users=[physicist, client_manager]))
+    AppointmentFactory(unit=unit)
+    AppointmentFactory(unit=UnitFactory(client=None))
+
+    api_client.force_authenticate(user=manager)
+    response = api_client.get("/api/appointments/")
+
+    assert response.status_code == status.HTTP_200_OK
+    responsibles_by_unit = {
+        item["unit"]: item["responsibles"] for item in response.data["results"]
+    }
+    assert responsibles_by_unit[unit.id] == [
+        {
+            "id": physicist.id,
+            "name": physicist.name,
+            "role": physicist.role,
+            "email": physicist.email,
+            "phone": physicist.phone,
+        }
+    ]
+    assert [] in responsibles_by_unit.values()
+
+
+@pytest.mark.django_db
+def test_appointment_create_and_update_run_fixed_number_of_queries():
+    api_client = APIClient()
+    manager = UserFactory(role=UserAccount.Role.PROPHY_MANAGER)
+    physicists = [
+        UserFactory(role=UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST)
+        for _ in range(3)
+    ]
+    small_unit = UnitFactory(client=ClientFactory(users=physicists[:1]))
+    large_unit = UnitFactory(client=ClientFactory(users=physicists))
+    api_client.force_authenticate(user=manager)
+
+    create_counts = []
+    for unit in (small_unit, large_unit):
+        response, queries = _count_queries(
+            api_client,
+            "post",
+            "/api/appointments/",
+            data={
+                "unit": unit.id,
+                "date": (timezone.now() + timezone.timedelta(days=1)),
+                "type": Appointment.Type.IN_PERSON,
+                "contact_phone": "11999999999",
+                "contact_name": "Contato",
+            },
+            format="json",
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        create_counts.append(queries)
+    assert create_counts[0] == create_counts[1]
+
+    update_counts = []
+    for unit in (small_unit, large_unit):
+        appointment = Appointment.objects.filter(unit=unit).get()
+        response, queries = _count_queries(
+            api_client,
+            "patch",
+            f"/api/appointments/{appointment.id}/",
+            data={"contact_name": "Outro contato"},
+            format="json",
+        )
+        assert response.status_code == status.HTTP_200_OK
+        update_counts.append(queries)
+    assert update_counts[0] == update_counts[1]
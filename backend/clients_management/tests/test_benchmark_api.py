@@ -0,0 +1,38 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from rest_framework import status
+
+from clients_management.models import Client, Report
+
+
+@pytest.mark.django_db
+def test_benchmark_api_reports_every_endpoint_and_rolls_back():
+    stdout = StringIO()
+
+    call_command(
+        "benchmark_api",
+        "--clients",
+        "2",
+        "--repeat",
+        "2",
+        stdout=stdout,
+        stderr=StringIO(),
+    )
+
+    document = json.loads(stdout.getvalue())
+    assert document["rows"]["client"] > 0
+    assert {result["role"] for result in document["results"]} == {
+        "GP",
+        "FMI",
+        "GGC",
+        "GU",
+    }
+    for result in document["results"]:
+        assert result["status"] == status.HTTP_200_OK, result["url"]
+        assert result["queries"] > 0
+        assert result["p95_ms"] >= result["p50_ms"] > 0
+    assert not Client.objects.exists()
+    assert not Report.all_objects.exists()
@@ -0,0 +1,81 @@
+import pytest
+from django.core.management import call_command
+
+from clients_management.management.commands._bulk_seed import (
+    BulkSeeder,
+    delete_placeholders,
+    save_placeholders,
+)
+from clients_management.models import ContractState, Modality, Report
+from requisitions.models import ClientOperation, EquipmentOperation
+from tests.factories import UserFactory
+from users.models import UserAccount
+
+CLIENTS = 3
+
+
+@pytest.fixture
+def seeder():
+    files = save_placeholders()
+    yield BulkSeeder(files)
+    delete_placeholders(files)
+
+
+@pytest.fixture
+def seeded(seeder) -> BulkSeeder:
+    manager = UserFactory(role=UserAccount.Role.PROPHY_MANAGER)
+    physicist = UserFactory(role=UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST)
+    clients = seeder.clients(CLIENTS, [physicist])
+    units = seeder.units(clients)
+    equipments = seeder.equipments(units, list(Modality.objects.all()))
+    seeder.pending_operations(clients, units, equipments)
+    seeder.proposals(clients)
+    seeder.appointments(units, equipments, manager)
+    seeder.reports(units, equipments)
+    return seeder
+
+
+@pytest.mark.django_db
+def test_seeded_reports_match_what_save_derives(seeded):
+    for report in Report.all_objects.all():
+        seeded_values = (
+            report.due_date,
+            report.owner_unit_id,
+            report.owner_client_id,
+            report.search_document,
+        )
+        report.due_date = None
+        report.save()
+
+        assert seeded_values == (
+            report.due_date,
+            report.owner_unit_id,
+            report.owner_client_id,
+            report.search_document,
+        )
+
+
+@pytest.mark.django_db
+def test_seeded_contracts_and_pending_flags_are_consistent(seeded):
+    states = list(ContractState.objects.order_by("cnpj").values())
+    ContractState.refresh(*(state["cnpj"] for state in states))
+
+    assert list(ContractState.objects.order_by("cnpj").values()) == states
+    call_command("rebuild_pending_operations", "--check")
+    assert (
+        ClientOperation.objects.filter(
+            operation_status=ClientOperation.OperationStatus.ACCEPTED
+        ).count()
+        == CLIENTS
+    )
+    assert EquipmentOperation.objects.filter(
+        operation_status=EquipmentOperation.OperationStatus.REVIEW
+    ).exists()
+
+
+@pytest.mark.django_db
+def test_throughput_is_recorded_per_table(seeded):
+    reports = seeded.throughput[Report._meta.db_table]
+
+    assert reports.rows == Report.all_objects.count()
+    assert reports.rows_per_second > 0
@@ -0,0 +1,35 @@
+import pytest
+from rest_framework import serializers
+
+from clients_management.models import Report
+from clients_management.serializers import ClientResponsiblesMixin
+
+
+def test_serializers_must_implement_get_owning_client():
+    with pytest.raises(TypeError, match="get_owning_client"):
+
+        class ResponsiblesSerializer(
+            ClientResponsiblesMixin, serializers.ModelSerializer
+        ):
+            class Meta:
+                model = Report
+                fields = ["id"]
+
+
+def test_mixins_may_leave_get_owning_client_to_serializers():
+    class ResponsiblesMixin(ClientResponsiblesMixin):
+        pass
+
+    class ResponsiblesSerializer(
+        ResponsiblesMixin, serializers.ModelSerializer
+    ):
+        class Meta:
+            model = Report
+            fields = ["id"]
+
+        def get_owning_client(self, instance: Report):
+            return instance.owner_client
+
+    assert ResponsiblesSerializer.get_owning_client is not (
+        ClientResponsiblesMixin.get_owning_client
+    )
@@ -0,0 +1,110 @@
+from datetime import date
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from clients_management.models import ContractState, Proposal
+from requisitions.models import ClientOperation
+from tests.factories import (
+    AppointmentFactory,
+    ClientOperationFactory,
+    ProposalFactory,
+    UnitFactory,
+    UserFactory,
+)
+from users.models import UserAccount
+
+
+@pytest.mark.django_db
+def test_contract_state_tracks_latest_accepted_proposals():
+    cnpj = ProposalFactory(
+        date=date(2024, 1, 10),
+        contract_type=Proposal.ContractType.ANNUAL,
+    ).cnpj
+    monthly = ProposalFactory(
+        cnpj=cnpj,
+        date=date(2024, 6, 1),
+        contract_type=Proposal.ContractType.MONTHLY,
+    )
+    ProposalFactory(
+        cnpj=cnpj,
+        date=date(2024, 9, 1),
+        status=Proposal.Status.PENDING,
+    )
+
+    state = ContractState.objects.get(cnpj=cnpj)
+    assert state.latest_accepted_date == date(2024, 6, 1)
+    assert state.latest_accepted_contract_type == Proposal.ContractType.MONTHLY
+    assert state.latest_annual_accepted_date == date(2024, 1, 10)
+
+    monthly.status = Proposal.Status.REJECTED
+    monthly.save()
+    state.refresh_from_db()
+    assert state.latest_accepted_contract_type == Proposal.ContractType.ANNUAL
+
+
+@pytest.mark.django_db
+def test_contract_state_follows_cnpj_changes_and_deletes():
+    proposal = ProposalFactory()
+    old_cnpj = proposal.cnpj
+    new_cnpj = ProposalFactory(status=Proposal.Status.PENDING).cnpj
+
+    proposal.cnpj = new_cnpj
+    proposal.save()
+
+    assert not ContractState.objects.filter(cnpj=old_cnpj).exists()
+    assert ContractState.objects.filter(cnpj=new_cnpj).exists()
+
+    proposal.delete()
+    assert not ContractState.objects.filter(cnpj=new_cnpj).exists()
+
+
+@pytest.mark.django_db
+def test_appointment_periodicity_reads_contract_state():
+    appointment = AppointmentFactory()
+    assert appointment.periodicity is None
+
+    ProposalFactory(
+        cnpj=appointment.unit.client.cnpj,
+        contract_type=Proposal.ContractType.WEEKLY,
+    )
+
+    appointment = type(appointment).objects.get(pk=appointment.pk)
+    assert appointment.periodicity == Proposal.ContractType.WEEKLY
+
+
+@pytest.mark.django_db
+def test_client_contract_type_filter_joins_contract_state():
+    api_client = APIClient()
+    api_client.force_authenticate(
+        user=UserFactory(role=UserAccount.Role.PROPHY_MANAGER)
+    )
+    annual, monthly = (
+        ClientOperationFactory(
+            operation_status=ClientOperation.OperationStatus.ACCEPTED
+        )
+        for _ in range(2)
+    )
+    ProposalFactory(cnpj=annual.cnpj)
+    ProposalFactory(
+        cnpj=monthly.cnpj, contract_type=Proposal.ContractType.MONTHLY
+    )
+    UnitFactory(client=annual)
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = api_client.get(
+            "/api/clients/",
+            {"contract_type": Proposal.ContractType.ANNUAL},
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["id"] for item in response.data["results"]] == [annual.id]
+    proposal_table = Proposal._meta.db_table
+    assert not [
+        query
+        for query in ctx.captured_queries
+        if f'"{proposal_table}"' in query["sql"]
+    ]
@@ -0,0 +1,185 @@
+"""Streaming CSV/XLSX export tests."""
+
+import csv
+import io
+import zipfile
+from datetime import date, timedelta
+from xml.etree import ElementTree
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from clients_management.models import Report
+from core.exports import XLSX_SHEET
+from requisitions.models import ClientOperation, EquipmentOperation
+from tests.factories import (
+    ClientFactory,
+    ClientOperationFactory,
+    EquipmentOperationFactory,
+    ReportFactory,
+    UnitFactory,
+)
+
+SHEET_NS = {"x": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+
+def read_csv(response) -> list[dict[str, str]]:
+    content = b"".join(response.streaming_content).decode("utf-8-sig")
+    return list(csv.DictReader(io.StringIO(content)))
+
+
+def read_xlsx(response) -> list[list[str]]:
+    content = b"".join(response.streaming_content)
+    with zipfile.ZipFile(io.BytesIO(content)) as workbook:
+        sheet = ElementTree.fromstring(workbook.read(XLSX_SHEET))
+    return [
+        ["".join(cell.itertext()) for cell in row.findall("x:c", SHEET_NS)]
+        for row in sheet.iterfind(".//x:row", SHEET_NS)
+    ]
+
+
+@pytest.fixture
+def physicist_client(internal_physicist) -> APIClient:
+    api_client = APIClient()
+    api_client.force_authenticate(user=internal_physicist)
+    return api_client
+
+
+@pytest.fixture
+def reports(internal_physicist) -> list[Report]:
+    unit = UnitFactory(client=ClientFactory(users=[internal_physicist]))
+    today = date.today()
+    created = [
+        ReportFactory(
+            unit=unit,
+            report_type=Report.ReportType.MEMORIAL,
+            due_date=today + timedelta(days=days),
+        )
+        for days in (-10, 15, 90)
+    ]
+    # Outside the physicist's scope.
+    ReportFactory(report_type=Report.ReportType.MEMORIAL)
+    return created
+
+
+@pytest.mark.django_db
+def test_report_export_streams_the_filtered_reports_as_csv(
+    physicist_client, reports
+):
+    response = physicist_client.get(
+        "/api/reports/export/", {"status": "overdue"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.streaming
+    assert response["Content-Type"].startswith("text/csv")
+    assert "attachment" in response["Content-Disposition"]
+    rows = read_csv(response)
+    assert [row["id"] for row in rows] == [str(reports[0].id)]
+    assert rows[0]["status"] == "overdue"
+    assert rows[0]["report_type"] == Report.ReportType.MEMORIAL.label
+    assert rows[0]["client_name"] == reports[0].unit.client.name
+
+
+@pytest.mark.django_db
+def test_report_export_as_xlsx_is_a_readable_workbook(
+    physicist_client, reports
+):
+    response = physicist_client.get(
+        "/api/reports/export/", {"file_type": "xlsx"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    header, *rows = read_xlsx(response)
+    assert header[:3] == ["id", "report_type", "status"]
+    assert sorted(row[2] for row in rows) == ["due_soon", "ok", "overdue"]
+
+
+@pytest.mark.django_db
+def test_report_export_runs_a_fixed_number_of_queries(
+    physicist_client, reports
+):
+    def count_queries() -> int:
+        with CaptureQueriesContext(connection) as queries:
+            b"".join(
+                physicist_client.get("/api/reports/export/").streaming_content
+            )
+        return len(queries)
+
+    count_queries()  # Caches the physicist's access scope.
+    before = count_queries()
+    ReportFactory.create_batch(
+        5, unit=reports[0].unit, report_type=Report.ReportType.MEMORIAL
+    )
+
+    assert count_queries() == before
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("file_type", ["csv", "xlsx"])
+def test_export_quotes_values_read_as_formulas(prophy_manager, file_type):
+    names = ['=HYPERLINK("http://x")', "+1", "-1", "@SUM(A1)", "\tA"]
+    for name in names:
+        ClientOperationFactory(
+            name=name,
+            operation_status=ClientOperation.OperationStatus.ACCEPTED,
+            operation_type=ClientOperation.OperationType.CLOSED,
+        )
+    api_client = APIClient()
+    api_client.force_authenticate(user=prophy_manager)
+
+    response = api_client.get("/api/clients/export/", {"file_type": file_type})
+
+    if file_type == "csv":
+        exported = [row["name"] for row in read_csv(response)]
+    else:
+        header, *rows = read_xlsx(response)
+        exported = [row[header.index("name")] for row in rows]
+    assert sorted(exported) == sorted(f"'{name}" for name in names)
+
+
+@pytest.mark.django_db
+def test_export_rejects_unknown_file_types(physicist_client):
+    response = physicist_client.get(
+        "/api/reports/export/", {"file_type": "pdf"}
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_equipment_and_client_exports_follow_the_list_filters(
+    prophy_manager,
+):
+    accepted = ClientOperationFactory(
+        name="Hospital Exportado",
+        operation_status=ClientOperation.OperationStatus.ACCEPTED,
+        operation_type=ClientOperation.OperationType.CLOSED,
+    )
+    ClientOperationFactory(name="Outro Hospital")
+    equipment = EquipmentOperationFactory(
+        unit=UnitFactory(client=accepted.client_ptr),
+        operation_status=EquipmentOperation.OperationStatus.ACCEPTED,
+        operation_type=EquipmentOperation.OperationType.CLOSED,
+    )
+    EquipmentOperationFactory(
+        operation_status=EquipmentOperation.OperationStatus.ACCEPTED,
+        operation_type=EquipmentOperation.OperationType.CLOSED,
+    )
+    api_client = APIClient()
+    api_client.force_authenticate(user=prophy_manager)
+
+    clients = read_csv(
+        api_client.get("/api/clients/export/", {"name": "Exportado"})
+    )
+    equipments = read_csv(
+        api_client.get("/api/equipments/export/", {"client_name": "Exportado"})
+    )
+
+    assert [row["name"] for row in clients] == ["Hospital Exportado"]
+    assert clients[0]["operation_status"] == "Aceito"
+    assert [row["id"] for row in equipments] == [str(equipment.id)]
+    assert equipments[0]["client_name"] == "Hospital Exportado"
@@ -0,0 +1,93 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from clients_management.management.commands._seed_common import (
+    CPF_ADMIN,
+    CPF_CLIENT_MANAGER,
+    CPF_INTERNAL_PHYSICIST,
+    PASSWORD,
+)
+from clients_management.management.commands.loadtest import assign_roles
+from tests.factories import UserFactory
+from users.models import UserAccount
+
+ROLES = ["physicist", "manager", "client_manager", "scheduler"]
+
+
+@pytest.fixture
+def load_test_users(transactional_db) -> None:
+    for cpf, role in (
+        (CPF_INTERNAL_PHYSICIST, UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST),
+        (CPF_ADMIN, UserAccount.Role.PROPHY_MANAGER),
+        (CPF_CLIENT_MANAGER, UserAccount.Role.CLIENT_GENERAL_MANAGER),
+    ):
+        user = UserFactory(cpf=cpf, role=role)
+        user.set_password(PASSWORD)
+        user.save()
+
+
+def run_loadtest(url: str, output, *options: str) -> dict:
+    call_command(
+        "loadtest",
+        "--url",
+        url,
+        "--output",
+        str(output),
+        *options,
+        stdout=StringIO(),
+        stderr=StringIO(),
+    )
+    return json.loads(output.read_text())
+
+
+def test_assign_roles_covers_every_weighted_role():
+    roles = assign_roles({"physicist": 3, "manager": 1, "scheduler": 0}, 4)
+
+    assert sorted(roles) == ["manager", "physicist", "physicist", "physicist"]
+
+
+@pytest.mark.usefixtures("load_test_users")
+@pytest.mark.parametrize("role", ROLES)
+def test_loadtest_runs_each_journey(live_server, tmp_path, role):
+    summary = run_loadtest(
+        live_server.url,
+        tmp_path / "summary.json",
+        "--concurrency",
+        "1",
+        "--mix",
+        f"{role}=1",
+        "--duration",
+        "0.5",
+    )
+
+    assert summary["users"] == {role: 1}
+    assert summary["requests"] > 0
+    assert summary["errors"] == 0
+
+
+@pytest.mark.skipif(
+    connection.vendor == "sqlite",
+    reason=(
+        "The live server threads share the in-memory SQLite test "
+        "database connection, which is not safe to use concurrently."
+    ),
+)
+@pytest.mark.usefixtures("load_test_users")
+def test_loadtest_drives_concurrent_users(live_server, tmp_path):
+    summary = run_loadtest(
+        live_server.url,
+        tmp_path / "summary.json",
+        "--concurrency",
+        "8",
+        "--duration",
+        "2",
+    )
+
+    assert set(summary["users"]) == set(ROLES)
+    assert summary["requests"] > 0
+    assert summary["errors"] == 0
+    assert "scheduler update_appointments" in summary["steps"]
@@ -0,0 +1,135 @@
+"""Cached modality reference data tests."""
+
+import pytest
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from clients_management.models import Equipment, Modality
+from clients_management.reference import (
+    MODALITIES_CACHE_KEY,
+    get_modalities,
+    get_modality,
+)
+from core.cache_versions import VERSIONS_CACHE
+from requisitions.models import EquipmentOperation
+from tests.factories import EquipmentOperationFactory, ModalityFactory
+
+MODALITIES_URL = "/api/modalities/"
+
+
+@pytest.fixture
+def manager_client(prophy_manager) -> APIClient:
+    api_client = APIClient()
+    api_client.force_authenticate(user=prophy_manager)
+    return api_client
+
+
+@pytest.mark.django_db
+def test_modalities_are_listed_from_the_cache(
+    manager_client, django_assert_num_queries
+):
+    ModalityFactory.create_batch(2)
+    get_modalities()
+
+    # Only the table tokens of the ETag are read.
+    with django_assert_num_queries(1):
+        response = manager_client.get(MODALITIES_URL)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == list(
+        Modality.objects.order_by("pk").values("id", "name", "accessory_type")
+    )
+
+
+@pytest.mark.django_db
+def test_modality_writes_invalidate_the_cache(manager_client):
+    modality = ModalityFactory(name="Tomografia")
+    manager_client.get(MODALITIES_URL)
+
+    response = manager_client.put(
+        f"{MODALITIES_URL}{modality.pk}/",
+        {"name": "Tomografia Computadorizada"},
+        format="json",
+    )
+    assert response.status_code == status.HTTP_200_OK
+    response = manager_client.get(MODALITIES_URL)
+    names = {item["id"]: item["name"] for item in response.data}
+    assert names[modality.pk] == "Tomografia Computadorizada"
+
+    manager_client.delete(f"{MODALITIES_URL}{modality.pk}/")
+    response = manager_client.get(MODALITIES_URL)
+    assert modality.pk not in {item["id"] for item in response.data}
+
+
+@pytest.mark.django_db
+def test_modality_writes_invalidate_the_cache_of_every_worker(settings):
+    settings.CACHES = {
+        alias: {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": f"test_{alias}",
+        }
+        for alias in ("default", VERSIONS_CACHE)
+    }
+    call_command("createcachetable", verbosity=0)
+    modality = ModalityFactory(name="Tomografia")
+    get_modalities()
+    # Another worker holds its own connection to the shared cache.
+    worker_cache = caches.create_connection("default")
+    assert modality.pk in worker_cache.get(MODALITIES_CACHE_KEY)
+
+    modality.name = "Tomografia Computadorizada"
+    modality.save()
+
+    assert worker_cache.get(MODALITIES_CACHE_KEY) is None
+    assert get_modalities()[modality.pk]["name"] == modality.name
+
+
+@pytest.mark.django_db
+def test_missing_modalities_leave_the_shared_cache_alone(
+    django_assert_num_queries,
+):
+    modality = ModalityFactory()
+    get_modalities()
+    # Created by another process, behind the signals of this one.
+    (created,) = Modality.objects.bulk_create([Modality(name="Densitometria")])
+
+    with django_assert_num_queries(1):
+        assert get_modality(created.pk)["name"] == "Densitometria"
+    with django_assert_num_queries(1):
+        assert get_modality(created.pk + 1) is None
+
+    assert modality.pk in caches["default"].get(MODALITIES_CACHE_KEY)
+
+
+@pytest.mark.django_db
+def test_equipments_render_modalities_without_joining_them(manager_client):
+    for _ in range(3):
+        EquipmentOperationFactory(
+            operation_status=EquipmentOperation.OperationStatus.ACCEPTED
+        )
+    get_modalities()
+
+    with CaptureQueriesContext(connection) as queries:
+        response = manager_client.get(
+            "/api/equipments/", {"fields": "id,modality"}
+        )
+
+    equipments = Equipment.objects.select_related("modality").filter(
+        pk__in=[item["id"] for item in response.data["results"]]
+    )
+    assert {
+        item["id"]: item["modality"] for item in response.data["results"]
+    } == {
+        equipment.pk: {
+            "id": equipment.modality.pk,
+            "name": equipment.modality.name,
+            "accessory_type": equipment.modality.accessory_type,
+        }
+        for equipment in equipments
+    }
+    modality_table = f'"{Modality._meta.db_table}"'
+    assert not any(modality_table in query["sql"] for query in queries)
@@ -0,0 +1,201 @@
+"""Query plan regression tests for the hot list queries.
+
+These tests need PostgreSQL and are skipped otherwise. Run them with::
+
+    TEST_DATABASE_ENGINE=postgres pytest -k query_plans
+
+Sequential scans are disabled for the session, so the planner only
+picks one when no index can serve the query.
+"""
+
+import json
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+from django.db import connection
+from django.db.models import Model, QuerySet
+
+from clients_management.models import Appointment, Client, Proposal, Report
+from clients_management.views import (
+    AppointmentViewSet,
+    ClientViewSet,
+    ProposalViewSet,
+    ReportViewSet,
+)
+from requisitions.models import (
+    ClientOperation,
+    EquipmentOperation,
+    UnitOperation,
+)
+from tests.factories import (
+    AppointmentFactory,
+    ClientOperationFactory,
+    EquipmentFactory,
+    EquipmentOperationFactory,
+    ProposalFactory,
+    ReportFactory,
+    UnitOperationFactory,
+    UserFactory,
+)
+from users.models import UserAccount
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "postgresql",
+        reason="Query plans are only checked on PostgreSQL.",
+    ),
+]
+
+PAGE = 10
+
+OPEN_STATUSES = [
+    ClientOperation.OperationStatus.REVIEW,
+    ClientOperation.OperationStatus.REJECTED,
+]
+
+
+def _plan_nodes(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def _assert_indexed(queryset: QuerySet, model: type[Model]) -> None:
+    """Fail when ``model``'s table is read with a sequential scan."""
+    table = model._meta.db_table
+    plan = json.loads(queryset.explain(format="json"))[0]["Plan"]
+    nodes = _plan_nodes(plan)
+
+    seq_scans = [
+        node
+        for node in nodes
+        if node["Node Type"] == "Seq Scan" and node["Relation Name"] == table
+    ]
+    assert not seq_scans, f"Sequential scan on {table}: {plan}"
+
+
+@pytest.fixture
+def seeded():
+    """Seed a few rows of every table and forbid sequential scans."""
+    client = ClientOperationFactory(
+        operation_status=ClientOperation.OperationStatus.ACCEPTED
+    )
+    ProposalFactory(cnpj=client.cnpj)
+    unit = UnitOperationFactory(
+        client=client,
+        operation_status=UnitOperation.OperationStatus.ACCEPTED,
+    )
+    EquipmentOperationFactory(unit=unit)
+    AppointmentFactory(unit=unit)
+    ReportFactory(unit=unit, report_type=Report.ReportType.MEMORIAL)
+    ReportFactory(unit=None, equipment=EquipmentFactory(unit=unit))
+
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+        cursor.execute("SET LOCAL enable_seqscan = off")
+    return unit
+
+
+@pytest.fixture
+def manager() -> UserAccount:
+    return UserFactory(role=UserAccount.Role.PROPHY_MANAGER)
+
+
+def _proposals(params: dict[str, str]) -> QuerySet:
+    view = ProposalViewSet()
+    return view._apply_filters(view._get_base_queryset(), params)[:PAGE]
+
+
+def _reports(user: UserAccount, params: dict[str, str]) -> QuerySet:
+    view = ReportViewSet()
+    queryset = view._apply_filters(view._get_base_queryset(user), params)
+    return queryset.order_by("-completion_date")[:PAGE]
+
+
+def _appointments(user: UserAccount, params: dict[str, str]) -> QuerySet:
+    view = AppointmentViewSet()
+    queryset = view._apply_filters(view._get_base_queryset(user), params)
+    return queryset.order_by("-date")[:PAGE]
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"cnpj": "00000000000191"},
+        {
+            "status": Proposal.Status.ACCEPTED,
+            "contract_type": Proposal.ContractType.ANNUAL,
+        },
+    ],
+)
+def test_proposal_list_uses_indexes(seeded, params):
+    _assert_indexed(_proposals(params), Proposal)
+
+
+def test_client_pending_operations_filter_uses_index(seeded, manager):
+    view = ClientViewSet()
+    queryset = view._apply_filters(
+        view._get_base_queryset(manager), {"operation_status": "pending"}
+    )
+
+    _assert_indexed(queryset, Client)
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"status": "archived"},
+        {"status": "overdue"},
+        {"status": "due_soon"},
+        {"report_type": Report.ReportType.MEMORIAL},
+    ],
+)
+def test_report_list_uses_indexes(seeded, manager, params):
+    _assert_indexed(_reports(manager, params), Report)
+
+
+def test_report_type_and_unit_filter_uses_index(seeded, manager):
+    params = {
+        "report_type": Report.ReportType.MEMORIAL,
+        "unit": str(seeded.pk),
+    }
+
+    _assert_indexed(_reports(manager, params), Report)
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"status": Appointment.Status.PENDING},
+    ],
+)
+def test_appointment_list_uses_indexes(seeded, manager, params):
+    _assert_indexed(_appointments(manager, params), Appointment)
+
+
+def test_appointment_unit_filter_uses_index(seeded, manager):
+    params = {"unit": str(seeded.pk)}
+
+    _assert_indexed(_appointments(manager, params), Appointment)
+
+
+@pytest.mark.parametrize(
+    ("model", "order_by"),
+    [
+        (ClientOperation, "id"),
+        (UnitOperation, "client"),
+        (EquipmentOperation, "unit"),
+    ],
+)
+def test_open_operation_lists_use_indexes(
+    seeded, model: type[Model], order_by: str
+):
+    manager = model.objects  # type: ignore[attr-defined]
+    queryset = manager.filter(operation_status__in=OPEN_STATUSES)
+
+    _assert_indexed(queryset.order_by(order_by), model)
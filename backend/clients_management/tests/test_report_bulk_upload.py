@@ -0,0 +1,170 @@
+"""Bulk report upload tests."""
+
+import io
+import json
+import zipfile
+from datetime import date, timedelta
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from clients_management.models import Report
+from tests.factories import EquipmentFactory, ReportFactory, UnitFactory
+
+BULK_URL = "/api/reports/bulk/"
+COMPLETION_DATE = date(2024, 1, 15)
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def manager_client(prophy_manager) -> APIClient:
+    api_client = APIClient()
+    api_client.force_authenticate(user=prophy_manager)
+    return api_client
+
+
+def make_archive(names: list[str]) -> SimpleUploadedFile:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name in names:
+            archive.writestr(name, f"content of {name}")
+    return SimpleUploadedFile(
+        "reports.zip", buffer.getvalue(), content_type="application/zip"
+    )
+
+
+def equipment_row(equipment, name: str) -> dict:
+    return {
+        "report_type": Report.ReportType.QUALITY_CONTROL,
+        "completion_date": COMPLETION_DATE.isoformat(),
+        "description": f"Controle de qualidade {name}",
+        "equipment": equipment.id,
+        "pdf_file": f"{name}.pdf",
+        "word_file": f"{name}.docx",
+    }
+
+
+def post_bulk(api_client, rows: list[dict], manifest=None):
+    names = [row[key] for row in rows for key in ("pdf_file", "word_file")]
+    return api_client.post(
+        BULK_URL,
+        {
+            "archive": make_archive(names),
+            "manifest": manifest or json.dumps(rows),
+        },
+        format="multipart",
+    )
+
+
+@pytest.mark.django_db
+def test_bulk_upload_creates_reports_and_archives_replaced_ones(
+    manager_client, prophy_manager
+):
+    equipment = EquipmentFactory()
+    unit = UnitFactory()
+    previous = ReportFactory(
+        unit=None,
+        equipment=equipment,
+        report_type=Report.ReportType.QUALITY_CONTROL,
+    )
+    rows = [
+        equipment_row(equipment, "cq/tomografo"),
+        {
+            "report_type": Report.ReportType.MEMORIAL,
+            "completion_date": COMPLETION_DATE.isoformat(),
+            "description": "Memorial",
+            "unit": unit.id,
+            "pdf_file": "memorial.pdf",
+            "word_file": "memorial.doc",
+        },
+    ]
+
+    response = post_bulk(manager_client, rows)
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert len(response.data) == len(rows)
+    previous.refresh_from_db()
+    assert previous.is_deleted
+    assert previous.deleted_by == prophy_manager
+
+    created = Report.objects.get(report_type=Report.ReportType.QUALITY_CONTROL)
+    assert created.due_date == COMPLETION_DATE + timedelta(days=365)
+    assert created.owner_unit == equipment.unit
+    assert created.owner_client == equipment.unit.client
+    assert "tomografo" in created.pdf_file.name
+    with created.pdf_file.open() as stored:
+        assert stored.read() == b"content of cq/tomografo.pdf"
+
+
+@pytest.mark.django_db
+def test_bulk_upload_reads_csv_manifests(manager_client):
+    equipment = EquipmentFactory()
+    row = equipment_row(equipment, "cq")
+    manifest = (
+        "report_type,completion_date,description,unit,equipment,"
+        "pdf_file,word_file\n"
+        f"CQ,{row['completion_date']},CQ,,{equipment.id},cq.pdf,cq.docx\n"
+    )
+
+    response = post_bulk(manager_client, [row], manifest=manifest)
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.data[0]["equipment"] == equipment.id
+
+
+@pytest.mark.django_db
+def test_bulk_upload_rejects_every_row_before_writing(
+    manager_client, media_root
+):
+    equipment = EquipmentFactory()
+    rows = [
+        equipment_row(equipment, "valid"),
+        equipment_row(equipment, "duplicate"),
+        {**equipment_row(equipment, "wrong"), "word_file": "wrong.pdf"},
+        {**equipment_row(equipment, "unit"), "equipment": None},
+    ]
+
+    response = post_bulk(manager_client, rows)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    errors = response.data["rows"]
+    assert errors[0] == {}
+    assert "non_field_errors" in errors[1]
+    assert "word_file" in errors[2]
+    assert "equipment" in errors[3]
+    assert not Report.all_objects.exists()
+    assert not (media_root / "reports").exists()
+
+
+@pytest.mark.django_db
+def test_bulk_upload_runs_a_fixed_number_of_queries(manager_client):
+    def count_queries(count: int) -> int:
+        rows = [
+            equipment_row(EquipmentFactory(), f"cq{index}")
+            for index in range(count)
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            response = post_bulk(manager_client, rows)
+        assert response.status_code == status.HTTP_201_CREATED
+        return len(queries)
+
+    assert count_queries(2) == count_queries(5)
+
+
+@pytest.mark.django_db
+def test_bulk_upload_requires_report_creation_rights(client_manager):
+    api_client = APIClient()
+    api_client.force_authenticate(user=client_manager)
+
+    response = post_bulk(api_client, [equipment_row(EquipmentFactory(), "cq")])
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
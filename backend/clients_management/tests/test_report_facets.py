@@ -0,0 +1,114 @@
+"""Report facet count tests."""
+
+from datetime import date, timedelta
+
+import pytest
+from rest_framework.test import APIClient
+
+from clients_management.access import get_access_scope
+from clients_management.models import Report
+from tests.factories import (
+    ClientFactory,
+    ReportFactory,
+    UnitFactory,
+    UserFactory,
+)
+from users.models import UserAccount
+
+FACETS_URL = "/api/reports/facets/"
+
+
+@pytest.fixture
+def reports(internal_physicist) -> list[Report]:
+    unit = UnitFactory(client=ClientFactory(users=[internal_physicist]))
+    today = date.today()
+    created = [
+        ReportFactory(
+            unit=unit,
+            report_type=Report.ReportType.MEMORIAL,
+            due_date=today + timedelta(days=days),
+        )
+        for days in (-10, 15, 90)
+    ]
+    created.append(ReportFactory(unit=unit, report_type=Report.ReportType.POP))
+    created[-2].soft_delete(deleted_by=internal_physicist)
+    # Outside the physicist's scope.
+    ReportFactory(report_type=Report.ReportType.MEMORIAL)
+    return created
+
+
+@pytest.fixture
+def physicist_client(internal_physicist) -> APIClient:
+    api_client = APIClient()
+    api_client.force_authenticate(user=internal_physicist)
+    return api_client
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("reports")
+def test_facets_count_statuses_and_types_in_one_query(
+    internal_physicist, physicist_client, django_assert_num_queries
+):
+    get_access_scope(internal_physicist)
+    with django_assert_num_queries(1):
+        response = physicist_client.get(FACETS_URL, {"count": "exact"})
+
+    assert response.data["count"] == 4  # noqa: PLR2004
+    assert response.data["status"] == {
+        "overdue": 1,
+        "due_soon": 1,
+        "ok": 0,
+        "archived": 1,
+        "no_due_date": 1,
+    }
+    assert response.data["report_type"][Report.ReportType.MEMORIAL] == 3  # noqa: PLR2004
+    assert response.data["report_type"][Report.ReportType.POP] == 1
+    assert response.data["report_type"][Report.ReportType.OTHERS] == 0
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("reports")
+def test_facets_ignore_their_own_filter(physicist_client):
+    response = physicist_client.get(
+        FACETS_URL,
+        {"status": "overdue", "report_type": Report.ReportType.POP},
+    )
+
+    assert response.data["count"] == 0
+    # Status counts are narrowed by type, type counts by status.
+    assert response.data["status"]["no_due_date"] == 1
+    assert response.data["status"]["overdue"] == 0
+    assert response.data["report_type"][Report.ReportType.MEMORIAL] == 1
+    assert response.data["report_type"][Report.ReportType.POP] == 0
+
+
+@pytest.mark.django_db
+def test_cached_facets_are_invalidated_by_writes(
+    reports, physicist_client, django_assert_num_queries
+):
+    physicist_client.get(FACETS_URL)
+    with django_assert_num_queries(0):
+        response = physicist_client.get(FACETS_URL)
+    assert response.data["status"]["overdue"] == 1
+
+    reports[0].soft_delete(deleted_by=UserFactory())
+
+    response = physicist_client.get(FACETS_URL)
+    assert response.data["status"]["overdue"] == 0
+    assert response.data["status"]["archived"] == 2  # noqa: PLR2004
+
+
+@pytest.mark.django_db
+def test_unit_managers_only_count_their_units(reports):
+    unit_manager = UserFactory(role=UserAccount.Role.UNIT_MANAGER)
+    ReportFactory(
+        unit=UnitFactory(user=unit_manager),
+        report_type=Report.ReportType.POP,
+    )
+    api_client = APIClient()
+    api_client.force_authenticate(user=unit_manager)
+
+    response = api_client.get(FACETS_URL)
+
+    assert response.data["count"] == 1
+    assert response.data["status"]["no_due_date"] == 1
@@ -0,0 +1,183 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from clients_management import signals
+from clients_management.models import Report
+from clients_management.search import (
+    POSTGRES_INDEX_NAME,
+    SQLITE_FTS_TABLE,
+    ensure_report_search_index,
+)
+from tests.factories import (
+    ClientFactory,
+    EquipmentFactory,
+    ReportFactory,
+    UnitFactory,
+    UserFactory,
+)
+from users.models import UserAccount
+
+
+@pytest.fixture
+def manager_client() -> APIClient:
+    api_client = APIClient()
+    api_client.force_authenticate(
+        user=UserFactory(role=UserAccount.Role.PROPHY_MANAGER)
+    )
+    return api_client
+
+
+def _search(api_client: APIClient, text: str) -> list[int]:
+    response = api_client.get("/api/reports/", {"q": text})
+    assert response.status_code == status.HTTP_200_OK
+    return [item["id"] for item in response.data["results"]]
+
+
+@pytest.mark.django_db
+def test_search_matches_every_indexed_field(manager_client):
+    unit = UnitFactory(
+        name="Unidade Orion",
+        city="Campinas",
+        client=ClientFactory(name="Hospital Vega"),
+    )
+    unit_report = ReportFactory(
+        unit=unit,
+        equipment=None,
+        report_type=Report.ReportType.MEMORIAL,
+        description="Levantamento anual",
+    )
+    equipment_report = ReportFactory(
+        unit=None,
+        equipment=EquipmentFactory(model="Aquilion", series_number="XR9081"),
+        description="Controle periódico",
+    )
+
+    assert _search(manager_client, "levantamento") == [unit_report.id]
+    assert _search(manager_client, "memorial") == [unit_report.id]
+    assert _search(manager_client, "vega orion") == [unit_report.id]
+    assert _search(manager_client, "campinas") == [unit_report.id]
+    assert _search(manager_client, "aquilion") == [equipment_report.id]
+    # Terms match as prefixes.
+    assert _search(manager_client, "XR90") == [equipment_report.id]
+    assert _search(manager_client, "vega aquilion") == []
+
+
+@pytest.mark.django_db
+def test_search_results_are_ranked_by_relevance(manager_client):
+    unit = UnitFactory()
+    passing = ReportFactory(
+        unit=unit,
+        equipment=None,
+        report_type=Report.ReportType.MEMORIAL,
+        description="Blindagem revisada junto ao acelerador de partículas",
+    )
+    focused = ReportFactory(
+        unit=unit,
+        equipment=None,
+        report_type=Report.ReportType.MEMORIAL,
+        description="Blindagem da sala, blindagem da porta e blindagem",
+    )
+
+    assert _search(manager_client, "blindagem") == [focused.id, passing.id]
+
+
+@pytest.mark.django_db
+def test_search_follows_client_and_equipment_renames(manager_client):
+    equipment = EquipmentFactory(model="Optima")
+    report = ReportFactory(unit=None, equipment=equipment)
+    client = equipment.unit.client
+    client.name = "Clinica Sirius"
+    client.save()
+    equipment.model = "Revolution"
+    equipment.save()
+
+    assert _search(manager_client, "sirius") == [report.id]
+    assert _search(manager_client, "revolution") == [report.id]
+    assert _search(manager_client, "optima") == []
+
+
+@pytest.mark.django_db
+def test_only_indexed_field_changes_refresh_search_documents(monkeypatch):
+    unit = UnitFactory()
+    report = ReportFactory(unit=unit, report_type=Report.ReportType.MEMORIAL)
+    refreshed = []
+    monkeypatch.setattr(
+        signals,
+        "refresh_search_documents",
+        lambda reports: refreshed.append(list(reports)),
+    )
+
+    unit.client.cnpj = "11222333000181"
+    unit.client.save()
+    unit.state = "SP"
+    unit.save()
+    assert not refreshed
+
+    unit.city = "Campinas"
+    unit.save()
+    assert refreshed == [[report]]
+
+
+@pytest.mark.django_db
+def test_search_keeps_other_filters_and_ignores_blank_terms(manager_client):
+    active = ReportFactory(
+        unit=None, equipment=EquipmentFactory(), description="Dosimetria"
+    )
+    archived = ReportFactory(
+        unit=None, equipment=EquipmentFactory(), description="Dosimetria"
+    )
+    archived.soft_delete(deleted_by=UserFactory())
+
+    response = manager_client.get(
+        "/api/reports/", {"q": "dosimetria", "status": "archived"}
+    )
+    assert [item["id"] for item in response.data["results"]] == [archived.id]
+    assert set(_search(manager_client, "  ?! ")) == {active.id, archived.id}
+
+
+def _rebuilds_index() -> bool:
+    with CaptureQueriesContext(connection) as queries:
+        ensure_report_search_index()
+    return any("'rebuild'" in query["sql"] for query in queries)
+
+
+@pytest.mark.skipif(
+    connection.vendor != "sqlite",
+    reason="The FTS5 table is only maintained on SQLite.",
+)
+@pytest.mark.django_db
+def test_sqlite_index_is_rebuilt_only_when_triggers_are_missing(
+    manager_client,
+):
+    report = ReportFactory(
+        unit=UnitFactory(), report_type=Report.ReportType.MEMORIAL
+    )
+    assert not _rebuilds_index()
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP TRIGGER {SQLITE_FTS_TABLE}_ai")
+    report = ReportFactory(
+        unit=report.unit,
+        report_type=Report.ReportType.MEMORIAL,
+        description="Blindagem da sala",
+    )
+    assert _rebuilds_index()
+
+    assert _search(manager_client, "blindagem") == [report.id]
+
+
+@pytest.mark.skipif(
+    connection.vendor != "postgresql",
+    reason="The GIN index is only built on PostgreSQL.",
+)
+@pytest.mark.django_db
+def test_postgres_index_is_built_by_migrations():
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(
+            cursor, Report._meta.db_table
+        )
+
+    assert constraints[POSTGRES_INDEX_NAME]["type"] == "gin"
@@ -0,0 +1,123 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from clients_management.models import Report
+from core.models import TableVersion
+from tests.factories import (
+    ClientFactory,
+    EquipmentFactory,
+    ReportFactory,
+    UnitFactory,
+    UserFactory,
+)
+from users.models import UserAccount
+
+
+def _create_reports_for_new_clients(count: int, physicist: UserAccount):
+    for index in range(count):
+        client = ClientFactory(users=[physicist])
+        if index % 2:
+            ReportFactory(
+                unit=UnitFactory(client=client),
+                report_type=Report.ReportType.MEMORIAL,
+            )
+        else:
+            ReportFactory(
+                unit=None,
+                equipment=EquipmentFactory(unit__client=client),
+                report_type=Report.ReportType.QUALITY_CONTROL,
+            )
+
+
+def _count_list_queries(api_client: APIClient) -> int:
+    with CaptureQueriesContext(connection) as ctx:
+        response = api_client.get("/api/reports/")
+    assert response.status_code == status.HTTP_200_OK
+    return len(ctx.captured_queries)
+
+
+@pytest.mark.django_db
+def test_reports_list_query_count_does_not_grow_with_page_size():
+    api_client = APIClient()
+    manager = UserFactory(role=UserAccount.Role.PROPHY_MANAGER)
+    physicist = UserFactory(role=UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST)
+    api_client.force_authenticate(user=manager)
+
+    _create_reports_for_new_clients(2, physicist)
+    small_page_queries = _count_list_queries(api_client)
+
+    _create_reports_for_new_clients(6, physicist)
+    full_page_queries = _count_list_queries(api_client)
+
+    assert full_page_queries == small_page_queries
+
+
+@pytest.mark.django_db
+def test_reports_list_responsibles_are_resolved_per_client():
+    api_client = APIClient()
+    manager = UserFactory(role=UserAccount.Role.PROPHY_MANAGER)
+    physicist = UserFactory(role=UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST)
+    other_physicist = UserFactory(
+        role=UserAccount.Role.EXTERNAL_MEDICAL_PHYSICIST
+    )
+    client_manager = UserFactory(role=UserAccount.Role.CLIENT_GENERAL_MANAGER)
+
+    first_client = ClientFactory(users=[physicist, client_manager])
+    second_client = ClientFactory(users=[other_physicist])
+    first_report = ReportFactory(
+        unit=UnitFactory(client=first_client),
+        report_type=Report.ReportType.MEMORIAL,
+    )
+    second_report = ReportFactory(
+        unit=None,
+        equipment=EquipmentFactory(unit__client=second_client),
+    )
+    orphan_report = ReportFactory(
+        unit=UnitFactory(client=None),
+        report_type=Report.ReportType.MEMORIAL,
+    )
+
+    api_client.force_authenticate(user=manager)
+    response = api_client.get("/api/reports/")
+
+    assert response.status_code == status.HTTP_200_OK
+    results = {item["id"]: item for item in response.data["results"]}
+
+    assert [r["id"] for r in results[first_report.id]["responsibles"]] == [
+        physicist.id
+    ]
+    assert results[first_report.id]["responsibles_display"] == physicist.name
+    assert [r["id"] for r in results[second_report.id]["responsibles"]] == [
+        other_physicist.id
+    ]
+    assert results[orphan_report.id]["responsibles"] == []
+    assert results[orphan_report.id]["responsibles_display"] == "—"
+
+
+@pytest.mark.django_db
+def test_report_retrieve_resolves_responsibles_with_one_query():
+    api_client = APIClient()
+    manager = UserFactory(role=UserAccount.Role.PROPHY_MANAGER)
+    physicist = UserFactory(role=UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST)
+    report = ReportFactory(
+        unit=UnitFactory(client__users=[physicist]),
+        report_type=Report.ReportType.MEMORIAL,
+    )
+
+    api_client.force_authenticate(user=manager)
+    with CaptureQueriesContext(connection) as ctx:
+        response = api_client.get(f"/api/reports/{report.id}/")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["responsibles_display"] == physicist.name
+    through_table = report.unit.client.users.through._meta.db_table
+    responsible_queries = [
+        query
+        for query in ctx.captured_queries
+        if through_table in query["sql"]
+        and TableVersion._meta.db_table not in query["sql"]
+    ]
+    assert len(responsible_queries) == 1
@@ -0,0 +1,152 @@
+import pytest
+from django.core.management import CommandError, call_command
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from clients_management.models import Equipment, Report
+from requisitions.models import EquipmentOperation
+from tests.factories import (
+    ClientFactory,
+    EquipmentFactory,
+    EquipmentOperationFactory,
+    ReportFactory,
+    UnitFactory,
+    UserFactory,
+)
+from users.models import UserAccount
+
+
+@pytest.mark.django_db
+def test_report_owner_is_resolved_from_unit_or_equipment():
+    unit = UnitFactory()
+    equipment = EquipmentFactory()
+
+    unit_report = ReportFactory(
+        unit=unit, report_type=Report.ReportType.MEMORIAL
+    )
+    equipment_report = ReportFactory(unit=None, equipment=equipment)
+
+    assert unit_report.owner_unit_id == unit.id
+    assert unit_report.owner_client_id == unit.client_id
+    assert equipment_report.owner_unit_id == equipment.unit_id
+    assert equipment_report.owner_client_id == equipment.unit.client_id
+
+
+@pytest.mark.django_db
+def test_report_owner_follows_unit_client_change():
+    unit = UnitFactory()
+    unit_report = ReportFactory(
+        unit=unit, report_type=Report.ReportType.MEMORIAL
+    )
+    equipment_report = ReportFactory(
+        unit=None, equipment=EquipmentFactory(unit=unit)
+    )
+    new_client = ClientFactory()
+
+    unit.client = new_client
+    unit.save()
+
+    for report in (unit_report, equipment_report):
+        report.refresh_from_db()
+        assert report.owner_client_id == new_client.id
+
+
+@pytest.mark.django_db
+def test_report_owner_follows_equipment_moved_by_operation():
+    operation = EquipmentOperationFactory(
+        operation_status=EquipmentOperation.OperationStatus.ACCEPTED
+    )
+    report = ReportFactory(
+        unit=None, equipment=Equipment.objects.get(pk=operation.pk)
+    )
+    new_unit = UnitFactory()
+
+    operation.unit = new_unit
+    operation.save()
+
+    report.refresh_from_db()
+    assert report.owner_unit_id == new_unit.id
+    assert report.owner_client_id == new_unit.client_id
+
+
+@pytest.mark.django_db
+def test_report_owner_is_cleared_when_unit_is_deleted():
+    unit = UnitFactory()
+    report = ReportFactory(unit=unit, report_type=Report.ReportType.MEMORIAL)
+
+    unit.delete()
+
+    report = Report.all_objects.get(pk=report.pk)
+    assert report.owner_unit_id is None
+    assert report.owner_client_id is None
+
+
+@pytest.mark.django_db
+def test_report_scoping_uses_owner_columns():
+    api_client = APIClient()
+    physicist = UserFactory(role=UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST)
+    unit_manager = UserFactory(role=UserAccount.Role.UNIT_MANAGER)
+    unit = UnitFactory(
+        client=ClientFactory(users=[physicist]), user=unit_manager
+    )
+    unit_report = ReportFactory(
+        unit=unit, report_type=Report.ReportType.MEMORIAL
+    )
+    equipment_report = ReportFactory(
+        unit=None, equipment=EquipmentFactory(unit=unit)
+    )
+    ReportFactory(report_type=Report.ReportType.MEMORIAL)
+
+    for user in (physicist, unit_manager):
+        api_client.force_authenticate(user=user)
+        response = api_client.get("/api/reports/")
+        assert response.status_code == status.HTTP_200_OK
+        assert {item["id"] for item in response.data["results"]} == {
+            unit_report.id,
+            equipment_report.id,
+        }
+
+        response = api_client.get(f"/api/reports/{equipment_report.id}/")
+        assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_report_responsible_cpf_filter_does_not_duplicate_rows():
+    api_client = APIClient()
+    manager = UserFactory(role=UserAccount.Role.PROPHY_MANAGER)
+    physicist = UserFactory(role=UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST)
+    other_physicist = UserFactory(
+        role=UserAccount.Role.EXTERNAL_MEDICAL_PHYSICIST
+    )
+    unit = UnitFactory(
+        client=ClientFactory(users=[physicist, other_physicist])
+    )
+    ReportFactory(unit=unit, report_type=Report.ReportType.MEMORIAL)
+    ReportFactory(unit=None, equipment=EquipmentFactory(unit=unit))
+
+    api_client.force_authenticate(user=manager)
+    response = api_client.get(
+        "/api/reports/", {"responsible_cpf": physicist.cpf}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["count"] == 2  # noqa: PLR2004
+
+
+@pytest.mark.django_db
+def test_check_report_owners_reports_and_fixes_divergence():
+    unit = UnitFactory()
+    report = ReportFactory(unit=unit, report_type=Report.ReportType.MEMORIAL)
+    Report.all_objects.filter(pk=report.pk).update(
+        owner_unit=None, owner_client=None
+    )
+
+    with pytest.raises(CommandError):
+        call_command("check_report_owners")
+
+    call_command("check_report_owners", "--fix")
+
+    report.refresh_from_db()
+    assert report.owner_unit_id == unit.id
+    assert report.owner_client_id == unit.client_id
+    call_command("check_report_owners")
@@ -0,0 +1,147 @@
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from clients_management import policies
+from clients_management.access import get_access_scope
+from clients_management.models import Accessory, Client, Equipment, Report
+from clients_management.policies import Rule
+from core.permissions import ObjectPolicy
+from requisitions.models import ClientOperation
+from tests.factories import (
+    AccessoryFactory,
+    AppointmentFactory,
+    ClientFactory,
+    ClientOperationFactory,
+    EquipmentFactory,
+    ReportFactory,
+    UnitFactory,
+    UserFactory,
+)
+from users.models import UserAccount
+
+
+@pytest.fixture
+def physicist() -> UserAccount:
+    return UserFactory(role=UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST)
+
+
+@pytest.mark.django_db
+def test_nested_paths_compile_to_exists_without_joins(physicist):
+    client = ClientFactory(users=[physicist], is_active=True)
+    accessory = AccessoryFactory(
+        equipment=EquipmentFactory(unit=UnitFactory(client=client))
+    )
+    AccessoryFactory()
+
+    queryset = policies.ACCESSORIES.apply(Accessory.objects.all(), physicist)
+    sql = str(queryset.query).upper()
+
+    assert list(queryset) == [accessory]
+    assert "JOIN" not in sql
+    assert "DISTINCT" not in sql
+    assert sql.count("EXISTS") == 2  # noqa: PLR2004
+
+
+@pytest.mark.django_db
+def test_direct_foreign_keys_compile_to_column_filters():
+    unit_manager = UserFactory(role=UserAccount.Role.UNIT_MANAGER)
+    unit = UnitFactory(user=unit_manager)
+    equipment = EquipmentFactory(unit=unit)
+    EquipmentFactory()
+
+    queryset = policies.EQUIPMENTS.apply(Equipment.objects.all(), unit_manager)
+    sql = str(queryset.query).upper()
+
+    assert list(queryset) == [equipment]
+    assert "EXISTS" not in sql
+    assert '"UNIT_ID" IN' in sql
+
+
+@pytest.mark.django_db
+def test_unrestricted_roles_and_empty_scopes():
+    equipment = EquipmentFactory()
+    commercial = UserFactory(role=UserAccount.Role.COMMERCIAL)
+    physicist = UserFactory(role=UserAccount.Role.EXTERNAL_MEDICAL_PHYSICIST)
+
+    queryset = Equipment.objects.all()
+    assert list(policies.EQUIPMENTS.apply(queryset, commercial)) == [equipment]
+    assert not policies.EQUIPMENTS.apply(queryset, physicist).exists()
+
+
+def test_many_to_many_paths_are_rejected():
+    with pytest.raises(ValueError, match="users"):
+        Rule("users", "client_ids").compile(Client, [1])
+
+
+def test_policies_must_restrict_querysets():
+    class UnfinishedPolicy(ObjectPolicy):
+        model = Report
+
+    with pytest.raises(TypeError):
+        UnfinishedPolicy()
+
+
+@pytest.mark.django_db
+def test_client_responsible_filters_do_not_repeat_clients():
+    manager = UserFactory(role=UserAccount.Role.PROPHY_MANAGER)
+    first, second = (
+        UserFactory(role=UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST)
+        for _ in range(2)
+    )
+    client = ClientOperationFactory(
+        users=[first, second],
+        operation_status=ClientOperation.OperationStatus.ACCEPTED,
+    )
+    api_client = APIClient()
+    api_client.force_authenticate(user=manager)
+
+    for params in (
+        {"user_role": UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST},
+        {"responsible_cpf": first.cpf},
+    ):
+        response = api_client.get("/api/clients/", params)
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["id"] for item in response.data["results"]] == [client.pk]
+
+
+@pytest.mark.django_db
+def test_object_checks_are_batched(physicist, django_assert_num_queries):
+    client = ClientFactory(users=[physicist])
+    reports = [
+        ReportFactory(
+            report_type=Report.ReportType.MEMORIAL,
+            unit=UnitFactory(client=client),
+        )
+        for _ in range(3)
+    ]
+    other = ReportFactory(report_type=Report.ReportType.MEMORIAL)
+    appointments = [
+        AppointmentFactory(unit=report.unit) for report in reports
+    ] + [AppointmentFactory(unit=other.unit)]
+
+    # Report owners are columns matched against the cached scope.
+    get_access_scope(physicist)
+    with django_assert_num_queries(0):
+        accessible = policies.REPORTS.accessible_pks(
+            physicist, [*reports, other]
+        )
+    assert accessible == {report.pk for report in reports}
+
+    # Longer paths and bare keys take a single query however many.
+    with django_assert_num_queries(1):
+        accessible = policies.APPOINTMENTS.accessible_pks(
+            physicist, [appointment.pk for appointment in appointments]
+        )
+    assert accessible == {appointment.pk for appointment in appointments[:3]}
+
+
+@pytest.mark.django_db
+def test_service_orders_are_not_open_to_commercial_users():
+    commercial = UserFactory(role=UserAccount.Role.COMMERCIAL)
+    appointment = AppointmentFactory()
+
+    assert policies.APPOINTMENTS.has_access(commercial, appointment)
+    assert not policies.SERVICE_ORDER_APPOINTMENTS.has_access(
+        commercial, appointment
+    )
@@ -6,15 +6,16 @@ from typing import cast
 
 from dateutil.relativedelta import relativedelta
 from django.core.management import call_command
+from django.db import transaction
 from django.db.models import (
     BooleanField,
     Case,
+    Count,
     Exists,
     F,
     Model,
     OuterRef,
     Q,
-    Subquery,
     Value,
     When,
 )
@@ -23,6 +24,7 @@ from django.http import (
     Http404,
     HttpResponse,
     HttpResponseRedirect,
+    StreamingHttpResponse,
 )
 from django.shortcuts import get_object_or_404
 from drf_yasg import openapi
@@ -34,11 +36,21 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from clients_management import policies
+from clients_management.access import get_access_scope
+from clients_management.bulk_reports import (
+    MAX_BULK_REPORTS,
+    BulkReportUpload,
+    ManifestError,
+    open_archive,
+    read_manifest,
+)
 from clients_management.file_utils import get_content_type_from_filename
 from clients_management.models import (
     Accessory,
     Appointment,
     Client,
+    ContractState,
     Equipment,
     Modality,
     Proposal,
@@ -50,6 +62,8 @@ from clients_management.pdf.service_order_pdf import build_service_order_pdf
 from clients_management.query_utils import (
     annotate_latest_annual_accepted_proposal_date,
 )
+from clients_management.reference import get_modalities
+from clients_management.search import SEARCH_PARAM, search_reports
 from clients_management.serializers import (
     AccessorySerializer,
     AppointmentSerializer,
@@ -65,7 +79,15 @@ from clients_management.serializers import (
     ServiceOrderSerializer,
     UnitSerializer,
 )
-from core.pagination import PaginationMixin
+from core.conditional import conditional_get
+from core.counting import COUNT_MODE_PARAM, CountMode, cached_aggregate
+from core.exports import EXPORT_PARAMETERS, Export, ExportMixin
+from core.fieldsets import FIELDSET_PARAMETERS
+from core.fuzzy import MATCH_PARAMETER, text_lookup
+from core.pagination import CURSOR_PAGINATION_PARAMETERS, PaginationMixin
+from core.query_budget import query_budget
+from core.timing import STORAGE, timed
+from core.uploads import discard_uploads, resolve_chunked_uploads
 from requisitions.models import (
     ClientOperation,
     EquipmentOperation,
@@ -76,6 +98,63 @@ from users.models import UserAccount
 
 logger = logging.getLogger(__name__)
 
+PROPOSAL_FILE_FIELDS = ("pdf_version", "word_version")
+
+CLIENT_EXPORT = Export(
+    "clients",
+    {
+        "id": "id",
+        "cnpj": "cnpj",
+        "name": "name",
+        "razao_social": "razao_social",
+        "email": "email",
+        "phone": "phone",
+        "address": "address",
+        "city": "city",
+        "state": "state",
+        "is_active": "is_active",
+        "operation_status": "operation_status",
+        "needs_appointment": "needs_appointment",
+    },
+)
+EQUIPMENT_EXPORT = Export(
+    "equipments",
+    {
+        "id": "id",
+        "client_name": "unit__client__name",
+        "client_cnpj": "unit__client__cnpj",
+        "unit_name": "unit__name",
+        "modality": "modality__name",
+        "manufacturer": "manufacturer",
+        "model": "model",
+        "series_number": "series_number",
+        "anvisa_registry": "anvisa_registry",
+        "channels": "channels",
+        "official_max_load": "official_max_load",
+        "usual_max_load": "usual_max_load",
+        "purchase_installation_date": "purchase_installation_date",
+        "maintenance_responsable": "maintenance_responsable",
+    },
+)
+REPORT_EXPORT = Export(
+    "reports",
+    {
+        "id": "id",
+        "report_type": "report_type",
+        "status": "status",
+        "completion_date": "completion_date",
+        "due_date": "due_date",
+        "client_name": "owner_client__name",
+        "client_cnpj": "owner_client__cnpj",
+        "unit_name": "owner_unit__name",
+        "unit_city": "owner_unit__city",
+        "equipment_manufacturer": "equipment__manufacturer",
+        "equipment_model": "equipment__model",
+        "equipment_series_number": "equipment__series_number",
+        "archived_at": "deleted_at",
+    },
+)
+
 
 class EquipmentMediaView(APIView):
     permission_classes = [IsAuthenticated]
@@ -89,7 +168,9 @@ class EquipmentMediaView(APIView):
         field = getattr(obj, self.field_name)
         if not field:
             raise Http404
-        return HttpResponseRedirect(request.build_absolute_uri(field.url))
+        with timed(STORAGE):
+            url = field.url
+        return HttpResponseRedirect(request.build_absolute_uri(url))
 
 
 class LatestProposalStatusView(APIView):
@@ -180,6 +261,8 @@ class ProposalViewSet(PaginationMixin, viewsets.ViewSet):
     capability. Only accessible by PROPHY_MANAGER users.
     """
 
+    count_mode = CountMode.CACHED
+
     @swagger_auto_schema(
         operation_summary="List proposals with filtering",
         operation_description="""
@@ -244,6 +327,9 @@ class ProposalViewSet(PaginationMixin, viewsets.ViewSet):
                     "Useful to identify contracts close to renewal."
                 ),
             ),
+            MATCH_PARAMETER,
+            *CURSOR_PAGINATION_PARAMETERS,
+            *FIELDSET_PARAMETERS,
         ],
         responses={
             200: openapi.Response(
@@ -255,6 +341,7 @@ class ProposalViewSet(PaginationMixin, viewsets.ViewSet):
             "required",
         },
     )
+    @query_budget(3)
     def list(self, request):
         user: UserAccount = cast(UserAccount, request.user)
         if user.role not in [
@@ -288,6 +375,9 @@ class ProposalViewSet(PaginationMixin, viewsets.ViewSet):
         operation_description="""
         Create a new proposal instance with the provided data.
         Only PROPHY_MANAGER and COMMERCIAL users can create proposals.
+        The files can be sent beforehand as resumable chunked uploads
+        (see `/api/uploads/`), passing their ids as
+        `pdf_version_upload` and `word_version_upload`.
         """,
         request_body=ProposalSerializer,
         responses={
@@ -322,9 +412,11 @@ class ProposalViewSet(PaginationMixin, viewsets.ViewSet):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        serializer = ProposalSerializer(data=request.data)
+        data, uploads = resolve_chunked_uploads(request, PROPOSAL_FILE_FIELDS)
+        serializer = ProposalSerializer(data=data)
         if serializer.is_valid():
             serializer.save()
+            discard_uploads(uploads)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -334,9 +426,13 @@ class ProposalViewSet(PaginationMixin, viewsets.ViewSet):
         if cnpj is not None:
             queryset = queryset.filter(cnpj=cnpj)
 
+        text_match = text_lookup(query_params)
+
         contact_name = query_params.get("contact_name")
         if contact_name is not None:
-            queryset = queryset.filter(contact_name__icontains=contact_name)
+            queryset = queryset.filter(
+                **{f"contact_name__{text_match}": contact_name}
+            )
 
         contract_type = query_params.get("contract_type")
         if contract_type is not None:
@@ -348,17 +444,15 @@ class ProposalViewSet(PaginationMixin, viewsets.ViewSet):
 
         expiring_annual = query_params.get("expiring_annual")
         if expiring_annual is not None and expiring_annual.lower() == "true":
-            # Annotate with latest accepted annual proposal date per
-            # CNPJ
-            queryset = annotate_latest_annual_accepted_proposal_date(queryset)
-
             cutoff_date = date.today() - relativedelta(months=11)
 
+            # Keep only the latest accepted annual proposal per CNPJ,
+            # read from its contract state.
             queryset = queryset.filter(
                 contract_type=Proposal.ContractType.ANNUAL,
                 status=Proposal.Status.ACCEPTED,
-                date=F("latest_annual_accepted_proposal_date"),
-                latest_annual_accepted_proposal_date__lte=cutoff_date,
+                date=F("contract_state__latest_annual_accepted_date"),
+                date__lte=cutoff_date,
             ).order_by("date", "cnpj")
 
         return queryset
@@ -368,6 +462,9 @@ class ProposalViewSet(PaginationMixin, viewsets.ViewSet):
         operation_description="""
         Update an existing proposal instance with the provided data.
         Only PROPHY_MANAGER and COMMERCIAL users can update proposals.
+        The files can be sent beforehand as resumable chunked uploads
+        (see `/api/uploads/`), passing their ids as
+        `pdf_version_upload` and `word_version_upload`.
         """,
         request_body=ProposalSerializer,
         responses={
@@ -422,11 +519,11 @@ class ProposalViewSet(PaginationMixin, viewsets.ViewSet):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        serializer = ProposalSerializer(
-            proposal, data=request.data, partial=False
-        )
+        data, uploads = resolve_chunked_uploads(request, PROPOSAL_FILE_FIELDS)
+        serializer = ProposalSerializer(proposal, data=data, partial=False)
         if serializer.is_valid():
             serializer.save()
+            discard_uploads(uploads)
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -435,6 +532,9 @@ class ProposalViewSet(PaginationMixin, viewsets.ViewSet):
         operation_description="""
         Partially update fields of an existing proposal instance.
         Only PROPHY_MANAGER and COMMERCIAL users can update proposals.
+        The files can be sent beforehand as resumable chunked uploads
+        (see `/api/uploads/`), passing their ids as
+        `pdf_version_upload` and `word_version_upload`.
         """,
         request_body=ProposalSerializer,
         responses={
@@ -489,11 +589,11 @@ class ProposalViewSet(PaginationMixin, viewsets.ViewSet):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        serializer = ProposalSerializer(
-            proposal, data=request.data, partial=True
-        )
+        data, uploads = resolve_chunked_uploads(request, PROPOSAL_FILE_FIELDS)
+        serializer = ProposalSerializer(proposal, data=data, partial=True)
         if serializer.is_valid():
             serializer.save()
+            discard_uploads(uploads)
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -551,13 +651,14 @@ class ClientStatusView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class ClientViewSet(PaginationMixin, viewsets.ViewSet):
+class ClientViewSet(ExportMixin, PaginationMixin, viewsets.ViewSet):
     """Viewset for managing clients.
 
-    Provides actions for listing, updating clients.
+    Provides actions for listing, exporting and updating clients.
     """
 
     lookup_value_regex = r"\d+"
+    count_mode = CountMode.CACHED
 
     @swagger_auto_schema(
         operation_summary="List clients with contract and appointment "
@@ -654,6 +755,9 @@ class ClientViewSet(PaginationMixin, viewsets.ViewSet):
                 description="Filter clients by their active status. true for "
                 "active clients, false for inactive clients.",
             ),
+            MATCH_PARAMETER,
+            *CURSOR_PAGINATION_PARAMETERS,
+            *FIELDSET_PARAMETERS,
         ],
         responses={
             200: openapi.Response(
@@ -665,8 +769,19 @@ class ClientViewSet(PaginationMixin, viewsets.ViewSet):
             403: "Permission denied",
         },
     )
+    @query_budget(7)
+    @conditional_get(
+        ClientOperation,
+        ContractState,
+        Proposal,
+        Unit,
+        Appointment,
+        UserAccount,
+    )
     def list(self, request):
-        queryset = self._get_base_queryset(request.user)
+        queryset = self._get_base_queryset(request.user).prefetch_related(
+            "users"
+        )
         queryset = self._apply_filters(queryset, request.query_params)
         queryset = self._annotate_appointment_requirements(queryset)
         queryset = queryset.order_by(
@@ -676,33 +791,44 @@ class ClientViewSet(PaginationMixin, viewsets.ViewSet):
         )
         return self._paginate_response(queryset, request, ClientListSerializer)
 
+    @action(detail=False, methods=["get"])
+    @swagger_auto_schema(
+        operation_summary="Export the filtered clients",
+        operation_description="""
+        Download every client matching the list filters as a CSV or
+        XLSX file, in the list order and with its `needs_appointment`
+        indicator. The file is streamed while the rows are read, so
+        exports of any size use constant memory.
+        """,
+        manual_parameters=EXPORT_PARAMETERS,
+        responses={
+            200: "CSV or XLSX file of the filtered clients",
+            400: "Unsupported file type",
+            401: "Unauthorized access",
+        },
+    )
+    def export(self, request: Request) -> StreamingHttpResponse | Response:
+        queryset = self._apply_filters(
+            self._get_base_queryset(request.user), request.query_params
+        )
+        queryset = self._annotate_appointment_requirements(queryset)
+        queryset = queryset.order_by(
+            "-needs_appointment",
+            "latest_annual_accepted_proposal_date",
+            "id",
+        )
+        return self._export_response(queryset, request, CLIENT_EXPORT)
+
     def _get_base_queryset(self, user):
         """Get base queryset based on user role and permissions."""
-        if (
-            user.role == UserAccount.Role.PROPHY_MANAGER
-            or user.role == UserAccount.Role.COMMERCIAL
-        ):
+        if user.role in policies.STAFF_ROLES:
             return ClientOperation.objects.all()
-        elif user.role == UserAccount.Role.UNIT_MANAGER:
-            user_managed_unit_operations = UnitOperation.objects.filter(
-                user=user,
-                client__is_active=True,
-                operation_status=UnitOperation.OperationStatus.ACCEPTED,
-            )
-            client_ids_from_units = user_managed_unit_operations.values_list(
-                "client_id", flat=True
-            ).distinct()
-            return ClientOperation.objects.filter(
-                pk__in=client_ids_from_units,
-                is_active=True,
-                operation_status=ClientOperation.OperationStatus.ACCEPTED,
-            )
-        else:
-            return ClientOperation.objects.filter(
-                users=user,
-                is_active=True,
-                operation_status=ClientOperation.OperationStatus.ACCEPTED,
-            )
+        return policies.CLIENTS.apply(
+            ClientOperation.objects.filter(
+                operation_status=ClientOperation.OperationStatus.ACCEPTED
+            ),
+            user,
+        )
 
     def _apply_filters(self, queryset, query_params):
         """Apply filtering based on query parameters."""
@@ -710,28 +836,42 @@ class ClientViewSet(PaginationMixin, viewsets.ViewSet):
         if cnpj is not None:
             queryset = queryset.filter(cnpj=cnpj)
 
+        text_match = text_lookup(query_params)
+
         name = query_params.get("name")
         if name is not None:
-            queryset = queryset.filter(name__icontains=name)
+            queryset = queryset.filter(**{f"name__{text_match}": name})
 
         city = query_params.get("city")
         if city is not None:
-            queryset = queryset.filter(city__icontains=city)
+            queryset = queryset.filter(**{f"city__{text_match}": city})
+
+        # Responsibles are matched with EXISTS so that clients with
+        # several matching users are not repeated.
+        responsibles = Client.users.through.objects.filter(
+            client_id=OuterRef("pk")
+        )
 
         user_role = query_params.get("user_role")
         if user_role is not None:
-            queryset = queryset.filter(users__role=user_role)
+            queryset = queryset.filter(
+                Exists(responsibles.filter(useraccount__role=user_role))
+            )
 
         responsible_cpf = query_params.get("responsible_cpf")
         if responsible_cpf is not None:
             queryset = queryset.filter(
-                users__cpf=responsible_cpf,
-                users__role__in=[
-                    UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST,
-                    UserAccount.Role.EXTERNAL_MEDICAL_PHYSICIST,
-                    UserAccount.Role.PROPHY_MANAGER,
-                ],
-            ).distinct()
+                Exists(
+                    responsibles.filter(
+                        useraccount__cpf=responsible_cpf,
+                        useraccount__role__in=[
+                            UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST,
+                            UserAccount.Role.EXTERNAL_MEDICAL_PHYSICIST,
+                            UserAccount.Role.PROPHY_MANAGER,
+                        ],
+                    )
+                )
+            )
 
         contract_type = query_params.get("contract_type")
         if contract_type is not None:
@@ -781,50 +921,20 @@ class ClientViewSet(PaginationMixin, viewsets.ViewSet):
 
     def _filter_by_contract_type(self, queryset, contract_type):
         """Filter clients by contract type from the latest proposal."""
-        most_recent_proposals = Proposal.objects.filter(
-            cnpj=OuterRef("cnpj"), status=Proposal.Status.ACCEPTED
-        ).order_by("-date")
-
-        clients_with_contract_type = Proposal.objects.filter(
-            status=Proposal.Status.ACCEPTED,
-            contract_type=contract_type,
-            pk__in=Subquery(most_recent_proposals.values("pk")[:1]),
-        ).values_list("cnpj", flat=True)
-
-        return queryset.filter(cnpj__in=clients_with_contract_type)
-
-    def _filter_by_operation_status(self, queryset, operation_status):
-        """Filter clients by operation status (pending or none)."""
-        has_client_ops = ClientOperation.objects.filter(
-            Q(cnpj=OuterRef("cnpj"))
-            | Q(original_client__cnpj=OuterRef("cnpj")),
-            operation_status=ClientOperation.OperationStatus.REVIEW,
+        return queryset.filter(
+            contract_state__latest_accepted_contract_type=contract_type
         )
 
-        has_unit_ops = UnitOperation.objects.filter(
-            Q(client__cnpj=OuterRef("cnpj"))
-            | Q(original_unit__client__cnpj=OuterRef("cnpj")),
-            operation_status=UnitOperation.OperationStatus.REVIEW,
-        )
-
-        has_equipment_ops = EquipmentOperation.objects.filter(
-            Q(unit__client__cnpj=OuterRef("cnpj"))
-            | Q(original_equipment__unit__client__cnpj=OuterRef("cnpj")),
-            operation_status=EquipmentOperation.OperationStatus.REVIEW,
-        )
+    def _filter_by_operation_status(self, queryset, operation_status):
+        """Filter clients by operation status (pending or none).
 
+        Reads the ``has_pending_operations`` flag maintained by the
+        requisitions app instead of probing every operation table.
+        """
         if operation_status == "pending":
-            return queryset.filter(
-                Q(Exists(has_client_ops))
-                | Q(Exists(has_unit_ops))
-                | Q(Exists(has_equipment_ops))
-            )
+            return queryset.filter(has_pending_operations=True)
         elif operation_status == "none":
-            return queryset.filter(
-                ~Q(Exists(has_client_ops))
-                & ~Q(Exists(has_unit_ops))
-                & ~Q(Exists(has_equipment_ops))
-            )
+            return queryset.filter(has_pending_operations=False)
         return queryset
 
     def _delete_pending_operations(self, client: Client) -> None:
@@ -897,6 +1007,7 @@ class ClientViewSet(PaginationMixin, viewsets.ViewSet):
             403: "Permission denied",
         },
     )
+    @transaction.atomic
     def update(self, request: Request, pk: int) -> Response:
         user: UserAccount = cast(UserAccount, request.user)
         if user.role not in [
@@ -965,6 +1076,7 @@ class ClientViewSet(PaginationMixin, viewsets.ViewSet):
             403: "Permission denied",
         },
     )
+    @transaction.atomic
     def partial_update(self, request: Request, pk: int) -> Response:
         user: UserAccount = cast(UserAccount, request.user)
         if user.role not in [
@@ -1000,6 +1112,10 @@ class UnitViewSet(PaginationMixin, viewsets.ViewSet):
     lookup_value_regex = r"\d+"
 
     @swagger_auto_schema(
+        manual_parameters=[
+            *CURSOR_PAGINATION_PARAMETERS,
+            *FIELDSET_PARAMETERS,
+        ],
         operation_summary="List accepted units",
         operation_description="""
         Retrieve a paginated list of accepted units.
@@ -1028,38 +1144,28 @@ class UnitViewSet(PaginationMixin, viewsets.ViewSet):
             403: "Permission denied",
         },
     )
+    @query_budget(6)
+    @conditional_get(UnitOperation, Client, UserAccount)
     def list(self, request):
-        queryset = self._get_base_queryset(request.user)
+        queryset = self._get_base_queryset(request.user).select_related("user")
         queryset = queryset.order_by("client")
         return self._paginate_response(queryset, request, UnitSerializer)
 
     def _get_base_queryset(self, user):
         """Get base queryset based on user role and permissions."""
-        if (
-            user.role == UserAccount.Role.PROPHY_MANAGER
-            or user.role == UserAccount.Role.COMMERCIAL
-        ):
-            return UnitOperation.objects.filter(
+        return policies.UNITS.apply(
+            UnitOperation.objects.filter(
                 operation_status=UnitOperation.OperationStatus.ACCEPTED
-            )
-        elif user.role == UserAccount.Role.UNIT_MANAGER:
-            return UnitOperation.objects.filter(
-                user=user,
-                client__is_active=True,
-                operation_status=UnitOperation.OperationStatus.ACCEPTED,
-            )
-        else:
-            return UnitOperation.objects.filter(
-                client__users=user,
-                client__is_active=True,
-                operation_status=UnitOperation.OperationStatus.ACCEPTED,
-            )
+            ),
+            user,
+        )
 
 
-class EquipmentViewSet(PaginationMixin, viewsets.ViewSet):
+class EquipmentViewSet(ExportMixin, PaginationMixin, viewsets.ViewSet):
     """Viewset for listing equipments."""
 
     lookup_value_regex = r"\d+"
+    count_mode = CountMode.CACHED
 
     @swagger_auto_schema(
         operation_summary="List accepted equipments",
@@ -1109,6 +1215,9 @@ class EquipmentViewSet(PaginationMixin, viewsets.ViewSet):
                 description="Filter equipments by client ID (through unit "
                 "relationship).",
             ),
+            MATCH_PARAMETER,
+            *CURSOR_PAGINATION_PARAMETERS,
+            *FIELDSET_PARAMETERS,
         ],
         responses={
             200: openapi.Response(
@@ -1119,8 +1228,12 @@ class EquipmentViewSet(PaginationMixin, viewsets.ViewSet):
             403: "Permission denied",
         },
     )
+    @query_budget(7)
+    @conditional_get(EquipmentOperation, Unit, Client, Modality, UserAccount)
     def list(self, request):
-        queryset = self._get_base_queryset(request.user)
+        queryset = self._get_base_queryset(request.user).select_related(
+            "unit__client"
+        )
         queryset = self._apply_filters(queryset, request.query_params)
         queryset = queryset.order_by("unit")
         return self._paginate_response(queryset, request, EquipmentSerializer)
@@ -1169,27 +1282,37 @@ class EquipmentViewSet(PaginationMixin, viewsets.ViewSet):
             {"manufacturers": manufacturers}, status=status.HTTP_200_OK
         )
 
+    @action(detail=False, methods=["get"])
+    @swagger_auto_schema(
+        operation_summary="Export the filtered equipments",
+        operation_description="""
+        Download every accepted equipment matching the list filters as
+        a CSV or XLSX file, with its unit, client and modality. The file
+        is streamed while the rows are read, so exports of any size use
+        constant memory.
+        """,
+        manual_parameters=EXPORT_PARAMETERS,
+        responses={
+            200: "CSV or XLSX file of the filtered equipments",
+            400: "Unsupported file type",
+            401: "Unauthorized access",
+        },
+    )
+    def export(self, request: Request) -> StreamingHttpResponse | Response:
+        queryset = self._apply_filters(
+            self._get_base_queryset(request.user), request.query_params
+        )
+        queryset = queryset.order_by("unit", "id")
+        return self._export_response(queryset, request, EQUIPMENT_EXPORT)
+
     def _get_base_queryset(self, user: UserAccount):
         """Get base queryset based on user role and permissions."""
-        if (
-            user.role == UserAccount.Role.PROPHY_MANAGER
-            or user.role == UserAccount.Role.COMMERCIAL
-        ):
-            return EquipmentOperation.objects.filter(
+        return policies.EQUIPMENTS.apply(
+            EquipmentOperation.objects.filter(
                 operation_status=EquipmentOperation.OperationStatus.ACCEPTED
-            )
-        elif user.role == UserAccount.Role.UNIT_MANAGER:
-            return EquipmentOperation.objects.filter(
-                unit__user=user,
-                unit__client__is_active=True,
-                operation_status=EquipmentOperation.OperationStatus.ACCEPTED,
-            )
-        else:
-            return EquipmentOperation.objects.filter(
-                unit__client__users=user,
-                unit__client__is_active=True,
-                operation_status=EquipmentOperation.OperationStatus.ACCEPTED,
-            )
+            ),
+            user,
+        )
 
     def _apply_filters(self, queryset, query_params):
         """Apply filtering based on query parameters."""
@@ -1197,14 +1320,18 @@ class EquipmentViewSet(PaginationMixin, viewsets.ViewSet):
         if modality is not None:
             queryset = queryset.filter(modality=modality)
 
+        text_match = text_lookup(query_params)
+
         manufacturer = query_params.get("manufacturer")
         if manufacturer is not None:
-            queryset = queryset.filter(manufacturer__icontains=manufacturer)
+            queryset = queryset.filter(
+                **{f"manufacturer__{text_match}": manufacturer}
+            )
 
         client_name = query_params.get("client_name")
         if client_name is not None:
             queryset = queryset.filter(
-                unit__client__name__icontains=client_name
+                **{f"unit__client__name__{text_match}": client_name}
             )
 
         return queryset
@@ -1322,6 +1449,8 @@ class AppointmentViewSet(PaginationMixin, viewsets.ViewSet):
                     "FMI/FME/GP."
                 ),
             ),
+            *CURSOR_PAGINATION_PARAMETERS,
+            *FIELDSET_PARAMETERS,
         ],
         responses={
             200: openapi.Response(
@@ -1332,6 +1461,7 @@ class AppointmentViewSet(PaginationMixin, viewsets.ViewSet):
             403: "Permission denied",
         },
     )
+    @query_budget(6)
     def list(self, request):
         queryset = self._get_base_queryset(request.user)
         queryset = self._apply_filters(queryset, request.query_params)
@@ -1398,9 +1528,8 @@ class AppointmentViewSet(PaginationMixin, viewsets.ViewSet):
         ]
 
         if not is_global_user:
-            client = unit.client
-            has_client_access = bool(
-                client and client.users.filter(pk=user.pk).exists()
+            has_client_access = (
+                unit.client_id in get_access_scope(user).client_ids
             )
             if not has_client_access:
                 return Response(
@@ -1480,7 +1609,7 @@ class AppointmentViewSet(PaginationMixin, viewsets.ViewSet):
             )
 
         try:
-            appointment = Appointment.objects.get(pk=pk)
+            appointment = self._with_related(Appointment.objects).get(pk=pk)
         except Appointment.DoesNotExist:
             return Response(
                 {"detail": "Agendamento não encontrado."},
@@ -1609,15 +1738,19 @@ class AppointmentViewSet(PaginationMixin, viewsets.ViewSet):
 
     def _get_base_queryset(self, user: UserAccount):
         """Get base queryset based on user role and permissions."""
-        if (
-            user.role == UserAccount.Role.PROPHY_MANAGER
-            or user.role == UserAccount.Role.COMMERCIAL
-        ):
-            return Appointment.objects.all()
-        elif user.role == UserAccount.Role.UNIT_MANAGER:
-            return Appointment.objects.filter(unit__user=user)
-        else:
-            return Appointment.objects.filter(unit__client__users=user)
+        queryset = self._with_related(Appointment.objects.all())
+        return policies.APPOINTMENTS.apply(queryset, user)
+
+    def _with_related(self, queryset):
+        """Load what AppointmentSerializer renders in fixed queries.
+
+        Units, clients and service orders are joined in; service order
+        equipments are prefetched once per page. Responsibles are
+        batched by the serializer itself.
+        """
+        return queryset.select_related(
+            "unit__client", "service_order"
+        ).prefetch_related("service_order__equipments")
 
     def _apply_filters(self, queryset, query_params):
         """Apply filtering based on query parameters."""
@@ -1688,18 +1821,7 @@ class AppointmentViewSet(PaginationMixin, viewsets.ViewSet):
         self, user: UserAccount, appointment: Appointment
     ) -> bool:
         """Check if user has access to a specific appointment."""
-        if (
-            user.role == UserAccount.Role.PROPHY_MANAGER
-            or user.role == UserAccount.Role.COMMERCIAL
-        ):
-            return True
-        if appointment.unit is None:
-            return False
-        if user.role == UserAccount.Role.UNIT_MANAGER:
-            return appointment.unit.user == user
-        if appointment.unit.client is None:
-            return False
-        return appointment.unit.client.users.filter(pk=user.pk).exists()
+        return policies.APPOINTMENTS.has_access(user, appointment)
 
 
 class ModalityViewSet(viewsets.ViewSet):
@@ -1722,11 +1844,10 @@ class ModalityViewSet(viewsets.ViewSet):
             "required",
         },
     )
+    @conditional_get(Modality)
     def list(self, request):
-        """Return a list of all modalities."""
-        queryset = Modality.objects.all()
-        serializer = ModalitySerializer(queryset, many=True)
-        return Response(serializer.data)
+        """Return a list of all modalities, served from the cache."""
+        return Response(list(get_modalities().values()))
 
     @swagger_auto_schema(
         operation_summary="Create a new modality",
@@ -1886,18 +2007,7 @@ class AccessoryViewSet(viewsets.ViewSet):
 
     def _get_base_queryset(self, user: UserAccount):
         """Get base queryset based on user role and permissions."""
-        if (
-            user.role == UserAccount.Role.PROPHY_MANAGER
-            or user.role == UserAccount.Role.COMMERCIAL
-        ):
-            return Accessory.objects.all()
-        elif user.role == UserAccount.Role.UNIT_MANAGER:
-            units = UnitOperation.objects.filter(user=user)
-            return Accessory.objects.filter(equipment__unit__in=units)
-        else:
-            return Accessory.objects.filter(
-                equipment__unit__client__users=user
-            )
+        return policies.ACCESSORIES.apply(Accessory.objects.all(), user)
 
     @swagger_auto_schema(
         operation_summary="Create a new accessory",
@@ -2045,18 +2155,9 @@ class ServiceOrderViewSet(viewsets.ViewSet):
     def _has_appointment_access(
         self, user: UserAccount, appointment: Appointment
     ) -> bool:
-        if user.role == UserAccount.Role.PROPHY_MANAGER:
-            return True
-        elif user.role == UserAccount.Role.UNIT_MANAGER:
-            return bool(
-                appointment.unit and appointment.unit.user_id == user.id
-            )
-        else:
-            return bool(
-                appointment.unit
-                and appointment.unit.client
-                and appointment.unit.client.users.filter(pk=user.pk).exists()
-            )
+        return policies.SERVICE_ORDER_APPOINTMENTS.has_access(
+            user, appointment
+        )
 
     @swagger_auto_schema(
         operation_summary="Update a Service Order",
@@ -2285,20 +2386,13 @@ class ServiceOrderPDFView(APIView):
             )
 
         user: UserAccount = cast(UserAccount, request.user)
-        allowed = False
-        if user.role == UserAccount.Role.PROPHY_MANAGER:
-            allowed = True
-        else:
-            appointment = order.appointment
-            unit = appointment.unit if appointment else None
-            if (
-                unit
-                and unit.user_id == user.id
-                or unit
-                and unit.client
-                and unit.client.users.filter(pk=user.pk).exists()
-            ):
-                allowed = True
+        appointment = order.appointment
+        allowed = (
+            appointment is not None
+            and policies.SERVICE_ORDER_APPOINTMENTS.has_access(
+                user, appointment
+            )
+        )
 
         if not allowed:
             return Response(
@@ -2317,9 +2411,11 @@ class ServiceOrderPDFView(APIView):
         return response
 
 
-class ReportViewSet(PaginationMixin, viewsets.ViewSet):
+class ReportViewSet(ExportMixin, PaginationMixin, viewsets.ViewSet):
     """Viewset for managing reports."""
 
+    count_mode = CountMode.CACHED
+
     @swagger_auto_schema(
         operation_summary="Create a new report",
         operation_description="""
@@ -2334,15 +2430,14 @@ class ReportViewSet(PaginationMixin, viewsets.ViewSet):
         The due_date is calculated automatically:
         - Radiometric Survey (LR): 4 years from completion_date
         - All other types: 1 year from completion_date
+
+        Large files can be sent beforehand as resumable chunked uploads
+        (see `/api/uploads/`), passing their ids as `pdf_file_upload`
+        and `word_file_upload` instead of `pdf_file` and `word_file`.
         """,
         request_body=openapi.Schema(
             type=openapi.TYPE_OBJECT,
-            required=[
-                "completion_date",
-                "report_type",
-                "pdf_file",
-                "word_file",
-            ],
+            required=["completion_date", "report_type"],
             properties={
                 "completion_date": openapi.Schema(
                     type=openapi.TYPE_STRING,
@@ -2363,6 +2458,16 @@ class ReportViewSet(PaginationMixin, viewsets.ViewSet):
                     type=openapi.TYPE_FILE,
                     description="Report Word file (.doc or .docx)",
                 ),
+                "pdf_file_upload": openapi.Schema(
+                    type=openapi.TYPE_STRING,
+                    format=openapi.FORMAT_UUID,
+                    description="Completed chunked upload of the PDF file",
+                ),
+                "word_file_upload": openapi.Schema(
+                    type=openapi.TYPE_STRING,
+                    format=openapi.FORMAT_UUID,
+                    description="Completed chunked upload of the Word file",
+                ),
                 "unit": openapi.Schema(
                     type=openapi.TYPE_INTEGER,
                     description="Unit ID (required for unit-only "
@@ -2394,11 +2499,13 @@ class ReportViewSet(PaginationMixin, viewsets.ViewSet):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        serializer = ReportSerializer(
-            data=request.data, context={"request": request}
+        data, uploads = resolve_chunked_uploads(
+            request, ("pdf_file", "word_file")
         )
+        serializer = ReportSerializer(data=data, context={"request": request})
         if serializer.is_valid():
             report = serializer.save()
+            discard_uploads(uploads)
 
             return Response(
                 ReportSerializer(report, context={"request": request}).data,
@@ -2406,6 +2513,111 @@ class ReportViewSet(PaginationMixin, viewsets.ViewSet):
             )
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=False, methods=["post"])
+    @swagger_auto_schema(
+        operation_summary="Create reports in bulk from a ZIP archive",
+        operation_description=f"""
+        Create up to {MAX_BULK_REPORTS} reports at once from a ZIP
+        archive of their files and a manifest listing them.
+        Only PROPHY_MANAGER and medical physicists can create reports.
+
+        The manifest is a JSON array or a CSV file with a header, with
+        one row per report and the columns `report_type`,
+        `completion_date`, `description`, `unit` or `equipment`,
+        `pdf_file` and `word_file`. The file columns name entries of
+        the archive:
+
+        ```json
+        [
+            {{
+                "report_type": "CQ",
+                "completion_date": "2024-01-15",
+                "description": "Controle de qualidade anual",
+                "equipment": 12,
+                "pdf_file": "cq/tomografo.pdf",
+                "word_file": "cq/tomografo.docx"
+            }}
+        ]
+        ```
+
+        Every row is validated first; if any is invalid nothing is
+        created and `rows` holds the errors of each row, in manifest
+        order. Otherwise the reports each row replaces are archived,
+        as on single creation, and all reports are created in one
+        transaction.
+        """,
+        manual_parameters=[
+            openapi.Parameter(
+                name="archive",
+                in_=openapi.IN_FORM,
+                type=openapi.TYPE_FILE,
+                required=True,
+                description="ZIP archive with the report files.",
+            ),
+            openapi.Parameter(
+                name="manifest",
+                in_=openapi.IN_FORM,
+                type=openapi.TYPE_FILE,
+                required=True,
+                description="JSON or CSV manifest, as a file or as text.",
+            ),
+        ],
+        responses={
+            201: openapi.Response(
+                description="Reports created successfully",
+                schema=ReportSerializer(many=True),
+            ),
+            400: "Invalid archive, manifest or rows",
+            401: "Unauthorized access",
+            403: "Permission denied",
+        },
+    )
+    def bulk(self, request: Request) -> Response:
+        user: UserAccount = cast(UserAccount, request.user)
+
+        if not self._can_create_report(user):
+            return Response(
+                {"detail": "You do not have permission to create reports."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        archive = request.FILES.get("archive")
+        manifest = request.data.get("manifest")
+        if archive is None or not manifest:
+            return Response(
+                {"detail": "Both an archive and a manifest are required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            upload = BulkReportUpload(
+                open_archive(archive), read_manifest(manifest), user
+            )
+        except ManifestError as exc:
+            return Response(
+                {"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        with upload.archive:
+            if not upload.is_valid():
+                return Response(
+                    {"rows": upload.errors},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            created = upload.save()
+
+        reports = (
+            Report.objects.filter(pk__in=[report.pk for report in created])
+            .select_related("unit", "equipment", "owner_client")
+            .order_by("pk")
+        )
+        return Response(
+            ReportSerializer(
+                reports, many=True, context={"request": request}
+            ).data,
+            status=status.HTTP_201_CREATED,
+        )
+
     @swagger_auto_schema(
         operation_summary="List reports",
         operation_description="""
@@ -2477,6 +2689,19 @@ class ReportViewSet(PaginationMixin, viewsets.ViewSet):
                     "due_soon, ok, archived, no_due_date."
                 ),
             ),
+            openapi.Parameter(
+                name=SEARCH_PARAM,
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description=(
+                    "Full-text search on description, type, client name, "
+                    "unit name/city and equipment model/series. Every "
+                    "word must match (as a prefix); results are ranked "
+                    "by relevance."
+                ),
+            ),
+            *CURSOR_PAGINATION_PARAMETERS,
+            *FIELDSET_PARAMETERS,
         ],
         responses={
             200: openapi.Response(
@@ -2487,22 +2712,142 @@ class ReportViewSet(PaginationMixin, viewsets.ViewSet):
             403: "Permission denied",
         },
     )
+    @query_budget(7)
+    @conditional_get(Report, Equipment, Unit, Client, UserAccount, daily=True)
     def list(self, request):
-        queryset = (
-            self._get_base_queryset(request.user)
-            .select_related(
-                "unit__client",
-                "equipment__unit__client",
-            )
-            .prefetch_related(
-                "unit__client__users",
-                "equipment__unit__client__users",
-            )
+        queryset = self._get_base_queryset(request.user).select_related(
+            "unit", "equipment", "owner_client"
         )
         queryset = self._apply_filters(queryset, request.query_params)
-        queryset = queryset.order_by("-completion_date")
+        search = request.query_params.get(SEARCH_PARAM)
+        if search:
+            queryset = search_reports(queryset, search).order_by(
+                "-search_rank", "-completion_date"
+            )
+        else:
+            queryset = queryset.order_by("-completion_date")
         return self._paginate_response(queryset, request, ReportSerializer)
 
+    @action(detail=False, methods=["get"])
+    @swagger_auto_schema(
+        operation_summary="Count reports per status and type",
+        operation_description="""
+        Count the reports matching the list filters per derived status
+        and per report type, in a single query.
+
+        Each facet ignores its own filter, so ``status`` narrows the type
+        counts and ``report_type`` the status counts, while ``count`` is
+        the total matching every filter. Counts are cached until reports
+        change unless ``count=exact`` is passed.
+
+        ```json
+        {
+            "count": 12,
+            "status": {
+                "overdue": 2,
+                "due_soon": 3,
+                "ok": 5,
+                "archived": 1,
+                "no_due_date": 1
+            },
+            "report_type": {"CQ": 7, "M": 5, "...": 0}
+        }
+        ```
+        """,
+        manual_parameters=[
+            openapi.Parameter(
+                name=COUNT_MODE_PARAM,
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                enum=[CountMode.EXACT, CountMode.CACHED],
+                description="Whether counts may be served from the cache.",
+            ),
+        ],
+        responses={
+            200: "Report counts per status and type",
+            401: "Unauthorized access",
+        },
+    )
+    def facets(self, request: Request) -> Response:
+        user: UserAccount = cast(UserAccount, request.user)
+        query_params = request.query_params.copy()
+        status_param = query_params.pop("status", [None])[-1]
+        report_type = query_params.pop("report_type", [None])[-1]
+
+        queryset = self._apply_filters(
+            self._get_base_queryset(user), query_params
+        )
+        search = query_params.get(SEARCH_PARAM)
+        if search:
+            queryset = search_reports(queryset, search)
+
+        statuses = self._status_conditions(date.today())
+        by_status = statuses.get(status_param, Q())
+        by_type = Q(report_type=report_type) if report_type else Q()
+        types = Report.ReportType.values
+        aggregates = {
+            "total": Count("pk", filter=by_status & by_type),
+            **{
+                f"status_{name}": Count("pk", filter=condition & by_type)
+                for name, condition in statuses.items()
+            },
+            **{
+                f"type_{code}": Count(
+                    "pk", filter=Q(report_type=code) & by_status
+                )
+                for code in types
+            },
+        }
+
+        count_mode = request.query_params.get(
+            COUNT_MODE_PARAM, self.count_mode
+        )
+        if count_mode == CountMode.EXACT:
+            counts = queryset.aggregate(**aggregates)
+        else:
+            counts = cached_aggregate(queryset, aggregates)
+
+        return Response(
+            {
+                "count": counts["total"],
+                "status": {
+                    name: counts[f"status_{name}"] for name in statuses
+                },
+                "report_type": {
+                    code: counts[f"type_{code}"] for code in types
+                },
+            }
+        )
+
+    @action(detail=False, methods=["get"])
+    @swagger_auto_schema(
+        operation_summary="Export the filtered reports",
+        operation_description="""
+        Download every report matching the list filters and search as a
+        CSV or XLSX file, newest first, with its derived status, owner
+        and equipment. The file is streamed while the rows are read, so
+        exports of any size use constant memory.
+        """,
+        manual_parameters=EXPORT_PARAMETERS,
+        responses={
+            200: "CSV or XLSX file of the filtered reports",
+            400: "Unsupported file type",
+            401: "Unauthorized access",
+        },
+    )
+    def export(self, request: Request) -> StreamingHttpResponse | Response:
+        user: UserAccount = cast(UserAccount, request.user)
+        queryset = self._apply_filters(
+            self._get_base_queryset(user), request.query_params
+        )
+        search = request.query_params.get(SEARCH_PARAM)
+        if search:
+            queryset = search_reports(queryset, search)
+        queryset = queryset.annotate(
+            status=self._status_case(date.today())
+        ).order_by("-completion_date", "id")
+        return self._export_response(queryset, request, REPORT_EXPORT)
+
     @swagger_auto_schema(
         operation_summary="Retrieve a single report",
         operation_description="Get details of a specific report by ID.",
@@ -2526,6 +2871,7 @@ class ReportViewSet(PaginationMixin, viewsets.ViewSet):
             403: "Permission denied",
         },
     )
+    @conditional_get(Report, Equipment, Unit, Client, UserAccount, daily=True)
     def retrieve(self, request, pk=None):
         user: UserAccount = cast(UserAccount, request.user)
 
@@ -2538,17 +2884,9 @@ class ReportViewSet(PaginationMixin, viewsets.ViewSet):
             manager = Report.all_objects
 
         try:
-            report = (
-                manager.select_related(
-                    "unit__client",
-                    "equipment__unit__client",
-                )
-                .prefetch_related(
-                    "unit__client__users",
-                    "equipment__unit__client__users",
-                )
-                .get(pk=pk)
-            )
+            report = manager.select_related(
+                "unit", "equipment", "owner_unit", "owner_client"
+            ).get(pk=pk)
         except Report.DoesNotExist:
             return Response(
                 {"detail": "Relatório não encontrado."},
@@ -2603,17 +2941,9 @@ class ReportViewSet(PaginationMixin, viewsets.ViewSet):
             )
 
         try:
-            report = (
-                Report.objects.select_related(
-                    "unit__client",
-                    "equipment__unit__client",
-                )
-                .prefetch_related(
-                    "unit__client__users",
-                    "equipment__unit__client__users",
-                )
-                .get(pk=pk)
-            )
+            report = Report.objects.select_related(
+                "unit", "equipment", "owner_unit", "owner_client"
+            ).get(pk=pk)
         except Report.DoesNotExist:
             return Response(
                 {"detail": "Relatório não encontrado."},
@@ -2642,30 +2972,16 @@ class ReportViewSet(PaginationMixin, viewsets.ViewSet):
 
     def _get_base_queryset(self, user: UserAccount):
         """Get base queryset based on user role and report scope."""
-        if user.role == UserAccount.Role.PROPHY_MANAGER:
-            return Report.all_objects.all()
-
-        if user.role == UserAccount.Role.COMMERCIAL:
-            return Report.objects.all()
-
+        # Archived reports are visible to managers and physicists only.
         if user.role in [
+            UserAccount.Role.PROPHY_MANAGER,
             UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST,
             UserAccount.Role.EXTERNAL_MEDICAL_PHYSICIST,
         ]:
-            return Report.all_objects.filter(
-                Q(unit__client__users=user)
-                | Q(equipment__unit__client__users=user)
-            )
-
-        if user.role == UserAccount.Role.UNIT_MANAGER:
-            return Report.objects.filter(
-                Q(unit__user=user) | Q(equipment__unit__user=user)
-            )
-
-        return Report.objects.filter(
-            Q(unit__client__users=user)
-            | Q(equipment__unit__client__users=user)
-        )
+            queryset = Report.all_objects.all()
+        else:
+            queryset = Report.objects.all()
+        return policies.REPORTS.apply(queryset, user)
 
     def _apply_filters(self, queryset, query_params):
         """Apply filtering based on query parameters."""
@@ -2694,76 +3010,41 @@ class ReportViewSet(PaginationMixin, viewsets.ViewSet):
         client_name = query_params.get("client_name")
         if client_name:
             queryset = queryset.filter(
-                Q(unit__client__name__icontains=client_name)
-                | Q(equipment__unit__client__name__icontains=client_name)
+                owner_client__name__icontains=client_name
             )
 
         responsible_cpf = query_params.get("responsible_cpf")
         if responsible_cpf:
-            responsible_roles = [
-                UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST,
-                UserAccount.Role.EXTERNAL_MEDICAL_PHYSICIST,
-                UserAccount.Role.PROPHY_MANAGER,
-            ]
+            # CPF is unique, so this join matches at most one user per
+            # client and cannot duplicate rows.
             queryset = queryset.filter(
-                Q(
-                    unit__client__users__cpf=responsible_cpf,
-                    unit__client__users__role__in=responsible_roles,
-                )
-                | Q(
-                    equipment__unit__client__users__cpf=responsible_cpf,
-                    equipment__unit__client__users__role__in=responsible_roles,
-                )
-            ).distinct()
+                owner_client__users__cpf=responsible_cpf,
+                owner_client__users__role__in=[
+                    UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST,
+                    UserAccount.Role.EXTERNAL_MEDICAL_PHYSICIST,
+                    UserAccount.Role.PROPHY_MANAGER,
+                ],
+            )
 
         client_cnpj = query_params.get("client_cnpj")
         if client_cnpj:
-            queryset = queryset.filter(
-                Q(unit__client__cnpj=client_cnpj)
-                | Q(equipment__unit__client__cnpj=client_cnpj)
-            )
+            queryset = queryset.filter(owner_client__cnpj=client_cnpj)
 
         unit_name = query_params.get("unit_name")
         if unit_name:
-            queryset = queryset.filter(
-                Q(unit__name__icontains=unit_name)
-                | Q(equipment__unit__name__icontains=unit_name)
-            )
+            queryset = queryset.filter(owner_unit__name__icontains=unit_name)
 
         unit_city = query_params.get("unit_city")
         if unit_city:
-            queryset = queryset.filter(
-                Q(unit__city__icontains=unit_city)
-                | Q(equipment__unit__city__icontains=unit_city)
-            )
+            queryset = queryset.filter(owner_unit__city__icontains=unit_city)
 
         # Derived status filters (computed from due_date)
-        status_param = query_params.get("status")
         today = date.today()
-        if status_param == "archived":
-            queryset = queryset.filter(deleted_at__isnull=False)
-        elif status_param == "overdue":
-            queryset = queryset.filter(
-                deleted_at__isnull=True,
-                due_date__lt=today,
-            )
-        elif status_param == "due_soon":
-            queryset = queryset.filter(
-                deleted_at__isnull=True,
-                due_date__gte=today,
-                due_date__lte=today + timedelta(days=30),
-            )
-        elif status_param == "ok":
-            queryset = queryset.filter(
-                deleted_at__isnull=True,
-                due_date__gt=today + timedelta(days=30),
-            )
-        elif status_param == "no_due_date":
-            queryset = queryset.filter(
-                deleted_at__isnull=True,
-                due_date__isnull=True,
-                report_type__in=Report.NO_DUE_DATE_TYPES,
-            )
+        status_condition = self._status_conditions(today).get(
+            query_params.get("status")
+        )
+        if status_condition is not None:
+            queryset = queryset.filter(status_condition)
 
         # Backwards-compatible filter
         due_soon = query_params.get("due_soon")
@@ -2773,6 +3054,45 @@ class ReportViewSet(PaginationMixin, viewsets.ViewSet):
 
         return queryset
 
+    @staticmethod
+    def _status_conditions(today: date) -> dict[str, Q]:
+        """Return the condition of each derived status on ``today``."""
+        alive = Q(deleted_at__isnull=True)
+        due_soon_limit = today + timedelta(days=30)
+        return {
+            "overdue": alive & Q(due_date__lt=today),
+            "due_soon": alive
+            & Q(due_date__gte=today, due_date__lte=due_soon_limit),
+            "ok": alive & Q(due_date__gt=due_soon_limit),
+            "archived": Q(deleted_at__isnull=False),
+            "no_due_date": alive
+            & Q(
+                due_date__isnull=True,
+                report_type__in=Report.NO_DUE_DATE_TYPES,
+            ),
+        }
+
+    @staticmethod
+    def _status_case(today: date) -> Case:
+        """Derive the status of each report on ``today`` in SQL.
+
+        Mirrors ``ReportSerializer.get_status``.
+        """
+        return Case(
+            When(deleted_at__isnull=False, then=Value("archived")),
+            When(
+                report_type__in=Report.NO_DUE_DATE_TYPES,
+                then=Value("no_due_date"),
+            ),
+            When(due_date__isnull=True, then=Value("unknown")),
+            When(due_date__lt=today, then=Value("overdue")),
+            When(
+                due_date__lte=today + timedelta(days=30),
+                then=Value("due_soon"),
+            ),
+            default=Value("ok"),
+        )
+
     def _can_create_report(self, user: UserAccount) -> bool:
         """Check if user can create reports."""
         return user.role in [
@@ -2789,7 +3109,8 @@ class ReportViewSet(PaginationMixin, viewsets.ViewSet):
             UserAccount.Role.EXTERNAL_MEDICAL_PHYSICIST,
         ]
 
-    def _can_download_report_word(self, user: UserAccount) -> bool:
+    @staticmethod
+    def _can_download_report_word(user: UserAccount) -> bool:
         """Check if user can download the Word version of a report."""
         return user.role in [
             UserAccount.Role.PROPHY_MANAGER,
@@ -2800,45 +3121,7 @@ class ReportViewSet(PaginationMixin, viewsets.ViewSet):
 
     def _has_report_access(self, user: UserAccount, report: Report) -> bool:
         """Check if user has access to a specific report."""
-        match user.role:
-            case UserAccount.Role.PROPHY_MANAGER:
-                return True
-
-            case UserAccount.Role.COMMERCIAL:
-                return True
-
-            case (
-                UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST
-                | UserAccount.Role.EXTERNAL_MEDICAL_PHYSICIST
-            ):
-                return self._report_client_users_access(user, report)
-
-            case UserAccount.Role.UNIT_MANAGER:
-                return (
-                    report.unit is not None and report.unit.user == user
-                ) or (
-                    report.equipment is not None
-                    and report.equipment.unit.user == user
-                )
-
-            case _:
-                return self._report_client_users_access(user, report)
-
-    def _report_client_users_access(
-        self, user: UserAccount, report: Report
-    ) -> bool:
-        """Check report access via the unit/equipment's client users."""
-        if (
-            report.unit is not None
-            and report.unit.client is not None
-            and report.unit.client.users.filter(pk=user.pk).exists()
-        ):
-            return True
-        return (
-            report.equipment is not None
-            and report.equipment.unit.client is not None
-            and report.equipment.unit.client.users.filter(pk=user.pk).exists()
-        )
+        return policies.REPORTS.has_access(user, report)
 
     @swagger_auto_schema(
         operation_summary="Delete a report",
@@ -2982,7 +3265,7 @@ class ReportFileDownloadView(APIView):
     Returns the file with proper Content-Disposition header to preserve
     the original filename.
 
-    PDF: accessible to all roles that pass _has_report_access.
+    PDF: accessible to all roles the report policy grants access.
     Word: additionally restricted to PROPHY_MANAGER, FMI, FME,
         COMMERCIAL.
     """
@@ -3022,17 +3305,14 @@ class ReportFileDownloadView(APIView):
             manager = Report.all_objects
 
         try:
-            report: Report = manager.select_related(
-                "unit__client", "equipment__unit__client"
-            ).get(pk=report_id)
+            report: Report = manager.get(pk=report_id)
         except Report.DoesNotExist:
             return Response(
                 {"detail": f'Report with ID "{report_id}" does not exist.'},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        viewset = ReportViewSet()
-        if not viewset._has_report_access(user, report):
+        if not policies.REPORTS.has_access(user, report):
             return Response(
                 {
                     "detail": "You do not have permission to download this "
@@ -3045,7 +3325,7 @@ class ReportFileDownloadView(APIView):
             case "pdf":
                 file_field = report.pdf_file
             case "word":
-                if not viewset._can_download_report_word(user):
+                if not ReportViewSet._can_download_report_word(user):
                     return Response(
                         {
                             "detail": (
@@ -3071,8 +3351,10 @@ class ReportFileDownloadView(APIView):
         try:
             filename = os.path.basename(file_field.name)
             content_type = get_content_type_from_filename(filename)
+            with timed(STORAGE):
+                file_obj = file_field.open("rb")
             response = FileResponse(
-                file_field.open("rb"),
+                file_obj,
                 as_attachment=True,
                 filename=filename,
                 content_type=content_type,
@@ -3165,8 +3447,10 @@ class ProposalFileDownloadView(APIView):
         try:
             filename = os.path.basename(file_field.name)
             content_type = get_content_type_from_filename(filename)
+            with timed(STORAGE):
+                file_obj = file_field.open("rb")
             response = FileResponse(
-                file_field.open("rb"),
+                file_obj,
                 as_attachment=True,
                 filename=filename,
                 content_type=content_type,
@@ -1,9 +1,29 @@
+from collections.abc import Callable, Iterable
+
 import pytest
+from django.core.cache import cache
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
 from rest_framework.test import APIClient
 
+from clients_management.reference import clear_local_modalities
+from core.cache_versions import versions
+from core.pagination import KeysetPagination
 from users.models import UserAccount
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Keep cached values, such as paginated counts, test-local."""
+    cache.clear()
+    versions.clear()
+    clear_local_modalities()
+    yield
+    cache.clear()
+    versions.clear()
+    clear_local_modalities()
+
+
 @pytest.fixture
 def api_client() -> APIClient:
     return APIClient()
@@ -55,3 +75,30 @@ def client_manager(db) -> UserAccount:
         phone="11999999994",
         role=UserAccount.Role.CLIENT_GENERAL_MANAGER,
     )
+
+
+@pytest.fixture
+def assert_flat_queries(monkeypatch) -> Callable[..., None]:
+    """Assert that a list runs as many queries at any page size.
+
+    The returned function calls ``get`` once to warm the caches, then
+    once per page size with both paginations limited to that size.
+    Enough items must exist to fill the largest page.
+    """
+
+    def check(
+        get: Callable[[], Response], page_sizes: Iterable[int] = (1, 3)
+    ) -> None:
+        get()
+        counts = {}
+        for size in page_sizes:
+            for pagination in (PageNumberPagination, KeysetPagination):
+                monkeypatch.setattr(pagination, "page_size", size)
+            response = get()
+            assert len(response.data["results"]) == size
+            counts[size] = response.wsgi_request.query_stats.count
+        assert len(set(counts.values())) == 1, (
+            f"Queries by page size: {counts}"
+        )
+
+    return check
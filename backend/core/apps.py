@@ -1,5 +1,14 @@
+from django.apps import AppConfig
 from django.contrib.admin.apps import AdminConfig
 
 
 class ProphyAdminConfig(AdminConfig):
     default_site = "core.admin.ProphyAdminSite"
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "core"
+
+    def ready(self) -> None:
+        from core import signals  # noqa: F401
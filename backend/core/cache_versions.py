@@ -0,0 +1,52 @@
+"""Versions of cached values, kept apart from the values themselves.
+
+Cached counts and access scopes are stored under keys embedding the
+version of what they were computed from, and writes replace that
+version. Versions live in their own cache (the ``versions`` alias of
+``CACHES``), which is never culled, so filling the data cache cannot
+drop them.
+
+Versions are random tokens rather than counters: a version that is
+lost anyway reads as a new token, never as one a stale value was
+stored under.
+"""
+
+import uuid
+from collections.abc import Iterable
+
+from django.core.cache import caches
+from django.utils.connection import ConnectionProxy
+
+VERSIONS_CACHE = "versions"
+
+versions = ConnectionProxy(caches, VERSIONS_CACHE)
+
+
+def _new_version() -> str:
+    return uuid.uuid4().hex
+
+
+def get_versions(keys: Iterable[str]) -> dict[str, str]:
+    """Return the version stored under each of ``keys``.
+
+    Missing versions are created, and the one stored first wins when
+    processes create them concurrently.
+    """
+    keys = list(keys)
+    found = versions.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        for key in missing:
+            versions.add(key, _new_version(), timeout=None)
+        found.update(versions.get_many(missing))
+    return found
+
+
+def get_version(key: str) -> str:
+    """Return the version stored under ``key``."""
+    return get_versions([key])[key]
+
+
+def bump_versions(keys: Iterable[str]) -> None:
+    """Replace the versions of ``keys``, invalidating their values."""
+    versions.set_many({key: _new_version() for key in keys}, timeout=None)
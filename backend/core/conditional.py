@@ -0,0 +1,166 @@
+"""Conditional GET support for read-mostly endpoints.
+
+A response's ETag hashes the request path, the user and the version
+tokens of every table the endpoint reads. The tokens are replaced on
+each write (see ``core.signals``), so an unchanged ETag means the
+response would be identical and ``conditional_get`` answers with
+``304 Not Modified`` after a single lookup of the tokens, without
+running the endpoint's queries or serializers.
+
+Tokens are replaced once the writing transaction commits, outside of
+it, so concurrent writers of a table never wait on its token row.
+User accounts are read by responses only as responsibles, so their
+token is replaced only when a field shown for them changes, not on
+the ``last_login`` update of each login.
+Endpoints returning fields derived from the current date, such as the
+report status, add the date to their ETags with ``daily=True``.
+"""
+
+import hashlib
+import json
+import secrets
+from collections.abc import Callable, Iterable
+from datetime import date
+from functools import partial, wraps
+from typing import Any
+
+from django.apps import apps as global_apps
+from django.db import transaction
+from django.db.models import Model
+from django.utils.cache import get_conditional_response, patch_cache_control
+from rest_framework import status
+
+from core.models import TableVersion
+
+# Apps whose writes replace table tokens.
+VERSIONED_APPS = frozenset({"clients_management", "requisitions", "materials"})
+
+# Fields of user accounts that responses show for responsibles.
+VERSIONED_USER_FIELDS = ("cpf", "name", "role", "email", "phone")
+
+
+def is_versioned(model: type[Model]) -> bool:
+    """Return whether writes to ``model`` replace table tokens.
+
+    Historical models saved by data migrations are left out, since the
+    token table may not exist yet; migrated apps are touched as a whole
+    once ``migrate`` is done instead.
+    """
+    return (
+        model._meta.app_label in VERSIONED_APPS
+        and model._meta.apps is global_apps
+    )
+
+
+def model_tables(model: type[Model]) -> list[str]:
+    """Return the tables holding ``model`` rows and its many-to-manys.
+
+    Parents of multi-table inheritance models are included, since
+    their rows are written with the child's.
+    """
+    models = [model, *model._meta.get_parent_list()]
+    tables = [m._meta.db_table for m in models]
+    tables += [
+        field.remote_field.through._meta.db_table
+        for m in models
+        for field in m._meta.local_many_to_many
+    ]
+    return tables
+
+
+def _replace_tokens(tables: list[str]) -> None:
+    TableVersion.objects.bulk_create(
+        [
+            TableVersion(table=table, token=secrets.token_hex(16))
+            for table in tables
+        ],
+        update_conflicts=True,
+        unique_fields=["table"],
+        update_fields=["token"],
+    )
+
+
+def touch_tables(tables: Iterable[str]) -> None:
+    """Replace the version tokens of ``tables`` once the write commits.
+
+    Outside of a transaction, the tokens are replaced immediately.
+    """
+    transaction.on_commit(partial(_replace_tokens, sorted(set(tables))))
+
+
+def touch_models(*models: type[Model]) -> None:
+    """Replace the version tokens of the tables of ``models``.
+
+    Writes made with ``QuerySet.update()`` or ``bulk_update()`` send no
+    signals, so their callers must call this themselves.
+    """
+    touch_tables(table for model in models for table in model_tables(model))
+
+
+def compute_etag(
+    request: Any, models: Iterable[type[Model]], daily: bool = False
+) -> str:
+    """Return the strong ETag of a response to ``request``.
+
+    Args:
+        request: The request being answered.
+        models: The models whose tables the response is built from.
+        daily: Whether the response changes with the current date.
+
+    Returns:
+        str: A quoted ETag.
+    """
+    tables = sorted({t for model in models for t in model_tables(model)})
+    tokens = dict(
+        TableVersion.objects.filter(table__in=tables).values_list(
+            "table", "token"
+        )
+    )
+    user = request.user
+    digest = hashlib.sha256(
+        json.dumps(
+            [
+                request.get_full_path(),
+                user.pk,
+                getattr(user, "role", None),
+                # The date the derived fields are computed with.
+                date.today().isoformat() if daily else None,
+                [tokens.get(table, "") for table in tables],
+            ]
+        ).encode()
+    ).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def conditional_get(*models: type[Model], daily: bool = False) -> Callable:
+    """Answer unchanged GET requests of a view method with a 304.
+
+    Args:
+        *models: Every model the view reads, including the ones its
+            access scope and serializer read.
+        daily: Whether the response has fields derived from the current
+            date, so that its ETag changes with the day.
+
+    Returns:
+        Callable: A decorator for viewset and ``APIView`` methods.
+    """
+
+    def decorator(method: Callable) -> Callable:
+        @wraps(method)
+        def wrapper(view: Any, request: Any, *args: Any, **kwargs: Any):
+            etag = compute_etag(request, models, daily)
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = method(view, request, *args, **kwargs)
+            if response.status_code in (
+                status.HTTP_200_OK,
+                status.HTTP_304_NOT_MODIFIED,
+            ):
+                response["ETag"] = etag
+                # Browsers must revalidate instead of reusing silently.
+                patch_cache_control(response, private=True, no_cache=True)
+            return response
+
+        return wrapper
+
+    return decorator
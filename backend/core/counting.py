@@ -0,0 +1,172 @@
+import hashlib
+import json
+import re
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+from django.db.models import Aggregate, Model, QuerySet
+
+from core.cache_versions import bump_versions, get_versions
+
+COUNT_MODE_PARAM = "count"
+
+COUNT_CACHE_PREFIX = "paginated-count"
+AGGREGATE_CACHE_PREFIX = "aggregate"
+TABLE_VERSION_PREFIX = "paginated-count-version"
+
+# Below this many estimated rows an exact count is cheap enough.
+ESTIMATE_MIN_ROWS = 10_000
+
+_TABLE_PATTERN = re.compile(r'(?:FROM|JOIN)\s+"([^"]+)"', re.IGNORECASE)
+
+
+class CountMode:
+    """Strategies available to compute the total of a paginated list."""
+
+    EXACT = "exact"
+    CACHED = "cached"
+    ESTIMATE = "estimate"
+
+    CHOICES = (EXACT, CACHED, ESTIMATE)
+
+
+def _table_version_key(table: str) -> str:
+    return f"{TABLE_VERSION_PREFIX}:{table}"
+
+
+def bump_table_versions(*tables: str) -> None:
+    """Invalidate cached counts of every query reading ``tables``."""
+    bump_versions(_table_version_key(table) for table in tables)
+
+
+def invalidate_model_counts(model: type[Model]) -> None:
+    """Invalidate cached counts touching ``model`` or its parents.
+
+    Saves and deletes are picked up by signal receivers; call this after
+    writes that bypass signals, such as ``QuerySet.update``.
+    """
+    tables = [model._meta.db_table]
+    tables += [
+        parent._meta.db_table for parent in model._meta.get_parent_list()
+    ]
+    bump_table_versions(*tables)
+
+
+def exact_count(queryset: QuerySet) -> int:
+    return queryset.count()
+
+
+def _versioned_cache_key(prefix: str, queryset: QuerySet) -> str:
+    """Return a cache key for ``queryset`` that changes on writes.
+
+    The key hashes the compiled SQL and parameters, so it already
+    encodes the user's scope and the normalized filters. It also embeds
+    the current version of every table the query reads, which is bumped
+    on each write.
+
+    Raises:
+        EmptyResultSet: If the queryset can never match a row.
+    """
+    sql, params = queryset.order_by().query.sql_with_params()
+    tables = sorted(set(_TABLE_PATTERN.findall(sql)))
+    versions = get_versions(_table_version_key(t) for t in tables)
+
+    digest = hashlib.sha256(
+        json.dumps(
+            [
+                sql,
+                [str(param) for param in params],
+                [versions[_table_version_key(t)] for t in tables],
+            ]
+        ).encode()
+    ).hexdigest()
+    return f"{prefix}:{queryset.db}:{digest}"
+
+
+def cached_count(queryset: QuerySet) -> int:
+    """Return an exact count memoized until a read table is written."""
+    try:
+        key = _versioned_cache_key(COUNT_CACHE_PREFIX, queryset)
+    except EmptyResultSet:
+        # Filters such as an empty ``id__in`` can never match a row.
+        return 0
+
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, timeout=settings.PAGINATION_COUNT_CACHE_TIMEOUT)
+    return count
+
+
+def cached_aggregate(
+    queryset: QuerySet, aggregates: dict[str, Aggregate]
+) -> dict[str, Any]:
+    """Return ``queryset.aggregate(**aggregates)`` memoized like counts.
+
+    The aggregates, filters included, are part of the hashed SQL, so
+    results are reused until a read table is written.
+    """
+    try:
+        key = _versioned_cache_key(
+            AGGREGATE_CACHE_PREFIX, queryset.annotate(**aggregates)
+        )
+    except EmptyResultSet:
+        return queryset.aggregate(**aggregates)
+
+    result = cache.get(key)
+    if result is None:
+        result = queryset.aggregate(**aggregates)
+        cache.set(key, result, timeout=settings.PAGINATION_COUNT_CACHE_TIMEOUT)
+    return result
+
+
+def estimated_count(queryset: QuerySet) -> int | None:
+    """Return the PostgreSQL planner's row estimate for ``queryset``.
+
+    Estimates are only used for unfiltered querysets, where the planner
+    reads table statistics directly. Returns ``None`` on other backends,
+    for filtered querysets and for small tables.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql" or queryset.query.has_filters():
+        return None
+
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    rows = int(plan[0]["Plan"]["Plan Rows"])
+    if rows < ESTIMATE_MIN_ROWS:
+        return None
+    return rows
+
+
+def resolve_count(queryset: QuerySet, mode: str) -> tuple[int, str]:
+    """Count ``queryset`` with the requested strategy.
+
+    Estimates fall back to a cached exact count when the planner cannot
+    be used.
+
+    Args:
+        queryset: The filtered queryset being paginated.
+        mode: One of the ``CountMode`` values.
+
+    Returns:
+        tuple[int, str]: The count and the mode that produced it.
+    """
+    if mode == CountMode.ESTIMATE:
+        estimate = estimated_count(queryset)
+        if estimate is not None:
+            return estimate, CountMode.ESTIMATE
+        mode = CountMode.CACHED
+
+    if mode == CountMode.CACHED:
+        return cached_count(queryset), CountMode.CACHED
+
+    return exact_count(queryset), CountMode.EXACT
@@ -0,0 +1,213 @@
+"""Sparse fieldsets for list endpoints.
+
+Clients pick the fields of each item with ``?fields=id,name`` or leave
+some out with ``?omit=users``. Serializers using ``SparseFieldsetMixin``
+then neither render the other fields nor load what only they need:
+``restrict_queryset`` narrows the queryset with ``only()`` and drops
+the joins and prefetches serving unrequested fields.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Field, Model, Prefetch, QuerySet
+from drf_yasg import openapi
+from rest_framework.request import Request
+from rest_framework.serializers import BaseSerializer
+
+FIELDS_PARAM = "fields"
+OMIT_PARAM = "omit"
+
+FIELDSET_PARAMETERS = [
+    openapi.Parameter(
+        name=FIELDS_PARAM,
+        in_=openapi.IN_QUERY,
+        type=openapi.TYPE_STRING,
+        description=(
+            "Comma-separated fields to return for each item, e.g. "
+            "'id,name'. Defaults to every field."
+        ),
+    ),
+    openapi.Parameter(
+        name=OMIT_PARAM,
+        in_=openapi.IN_QUERY,
+        type=openapi.TYPE_STRING,
+        description="Comma-separated fields to leave out of each item.",
+    ),
+]
+
+
+def _split(value: str | None) -> frozenset[str] | None:
+    names = frozenset(
+        name.strip() for name in (value or "").split(",") if name.strip()
+    )
+    return names or None
+
+
+@dataclass(frozen=True)
+class Fieldset:
+    """The fields of each item a client asked for.
+
+    Attributes:
+        include: Fields to render, ``None`` for all of them.
+        omit: Fields never to render.
+    """
+
+    include: frozenset[str] | None = None
+    omit: frozenset[str] = frozenset()
+
+    @classmethod
+    def from_request(cls, request: Request) -> "Fieldset":
+        """Read the fieldset from ``?fields=`` and ``?omit=``."""
+        params = request.query_params
+        return cls(
+            include=_split(params.get(FIELDS_PARAM)),
+            omit=_split(params.get(OMIT_PARAM)) or frozenset(),
+        )
+
+    @property
+    def is_sparse(self) -> bool:
+        """Whether some fields are left out."""
+        return self.include is not None or bool(self.omit)
+
+    def wants(self, name: str) -> bool:
+        """Return whether the field ``name`` should be rendered."""
+        if name in self.omit:
+            return False
+        return self.include is None or name in self.include
+
+
+ALL_FIELDS = Fieldset()
+
+
+def _resolve(model: type[Model], path: str) -> Any:
+    """Return the model field a ``__``-separated path ends in."""
+    field: Any = None
+    for name in path.split("__"):
+        field = model._meta.get_field(name)
+        model = field.related_model
+    return field
+
+
+def _prefetch_root(lookup: str | Prefetch) -> str:
+    if isinstance(lookup, Prefetch):
+        lookup = lookup.prefetch_through
+    return lookup.split("__")[0]
+
+
+class SparseFieldsetMixin:
+    """Serializer mixin rendering only the fields of a ``Fieldset``.
+
+    The fieldset is read from ``context["fieldset"]``; without one
+    every field is rendered. Extras added in ``to_representation``
+    must be guarded with ``wants``.
+
+    Attributes:
+        computed_sources: Model paths read by extras and method fields,
+            by output name, so that ``restrict_queryset`` loads them.
+    """
+
+    computed_sources: dict[str, tuple[str, ...]] = {}
+
+    @property
+    def fieldset(self) -> Fieldset:
+        return self.context.get("fieldset", ALL_FIELDS)
+
+    def wants(self, name: str) -> bool:
+        """Return whether the output ``name`` should be rendered."""
+        return self.fieldset.wants(name)
+
+    def get_fields(self) -> dict[str, Field]:
+        fields = super().get_fields()
+        return {
+            name: field for name, field in fields.items() if self.wants(name)
+        }
+
+    def restrict_queryset(self, queryset: QuerySet) -> QuerySet:
+        """Load only what the rendered fields read from ``queryset``.
+
+        Columns are limited with ``only()``, relations read by the
+        fields are joined and prefetches of unrendered fields dropped.
+        The queryset is returned untouched when a field reads something
+        that cannot be traced to model fields.
+        """
+        model = queryset.model
+        annotations = queryset.query.annotations
+        paths = {"pk"}
+        relations: set[str] = set()
+        prefetched: set[str] = set()
+
+        for name, sources in self.computed_sources.items():
+            if self.wants(name):
+                paths.update(sources)
+
+        for name, field in self.fields.items():
+            if name in self.computed_sources or field.source in annotations:
+                continue
+            if field.source == "*":
+                return queryset
+
+            path = "__".join(field.source_attrs)
+            try:
+                model_field = _resolve(model, path)
+            except FieldDoesNotExist:
+                return queryset
+
+            if model_field.many_to_many or model_field.one_to_many:
+                prefetched.add(path)
+                continue
+            paths.add(path)
+            if isinstance(field, BaseSerializer):
+                # Nested serializers render the whole related row.
+                relations.add(path)
+
+        # Keyset pagination reads the ordering values from the rows.
+        ordering = queryset.query.order_by or model._meta.ordering
+        paths.update(
+            name.lstrip("-")
+            for name in ordering
+            if isinstance(name, str) and name.lstrip("-") not in annotations
+        )
+
+        relations.update(
+            path.rsplit("__", 1)[0] for path in paths if "__" in path
+        )
+        roots = {path.split("__")[0] for path in paths | prefetched}
+        lookups = [
+            lookup
+            for lookup in queryset._prefetch_related_lookups
+            if _prefetch_root(lookup) in roots
+        ]
+
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if relations:
+            queryset = queryset.select_related(*sorted(relations))
+        return queryset.prefetch_related(*lookups).only(*sorted(paths))
+
+
+def apply_fieldset(
+    queryset: QuerySet,
+    serializer_class: type[BaseSerializer],
+    request: Request,
+) -> tuple[QuerySet, dict[str, Any]]:
+    """Restrict a list queryset to the fields requested by ``request``.
+
+    Args:
+        queryset: The filtered and ordered queryset being listed.
+        serializer_class: The serializer rendering each item.
+        request: The list request carrying ``?fields=``/``?omit=``.
+
+    Returns:
+        tuple[QuerySet, dict]: The queryset to paginate and the context
+            to build the serializer with.
+    """
+    fieldset = Fieldset.from_request(request)
+    context = {"fieldset": fieldset}
+    if fieldset.is_sparse and issubclass(
+        serializer_class, SparseFieldsetMixin
+    ):
+        queryset = serializer_class(context=context).restrict_queryset(
+            queryset
+        )
+    return queryset, context
@@ -0,0 +1,103 @@
+"""Accent-insensitive, typo-tolerant matching for free-text filters.
+
+Registers a ``fuzzy`` lookup on text fields. Both sides are normalized
+with the ``normalize_search_text`` SQL function (lowercase, accents
+removed), so ``name__fuzzy="sao jose"`` matches "São José".
+
+- PostgreSQL: the function wraps ``unaccent`` and is declared immutable
+  so it can be indexed with ``pg_trgm`` GIN indexes (see the
+  ``clients_management`` migrations). Besides substrings, the lookup
+  also matches words within the trigram word similarity threshold, so
+  small typos are tolerated.
+- SQLite: the function is registered in Python on each connection.
+  Matching is accent-insensitive substring only, without an index.
+
+Viewsets use ``text_lookup`` to switch their ``icontains`` filters to
+``fuzzy`` when ``?match=fuzzy`` is passed.
+"""
+
+import unicodedata
+from typing import Any
+
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.models import CharField, Lookup, TextField
+from django.db.models.sql.compiler import SQLCompiler
+from drf_yasg import openapi
+
+NORMALIZE_FUNCTION = "normalize_search_text"
+
+MATCH_PARAM = "match"
+FUZZY_MATCH = "fuzzy"
+
+MATCH_PARAMETER = openapi.Parameter(
+    name=MATCH_PARAM,
+    in_=openapi.IN_QUERY,
+    type=openapi.TYPE_STRING,
+    enum=[FUZZY_MATCH],
+    description=(
+        "Set to 'fuzzy' to match text filters ignoring accents and, on "
+        "PostgreSQL, tolerating small typos."
+    ),
+)
+
+
+def normalize_search_text(value: str | None) -> str | None:
+    """Lowercase ``value`` and strip its accents."""
+    if value is None:
+        return None
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(
+        char for char in decomposed if not unicodedata.combining(char)
+    ).lower()
+
+
+def register_sqlite_functions(connection: BaseDatabaseWrapper) -> None:
+    """Expose ``normalize_search_text`` to SQLite queries."""
+    connection.connection.create_function(
+        NORMALIZE_FUNCTION, 1, normalize_search_text, deterministic=True
+    )
+
+
+def text_lookup(query_params: Any) -> str:
+    """Return the lookup free-text filters should use for a request."""
+    if query_params.get(MATCH_PARAM) == FUZZY_MATCH:
+        return FuzzyContains.lookup_name
+    return "icontains"
+
+
+@CharField.register_lookup
+@TextField.register_lookup
+class FuzzyContains(Lookup):
+    """Accent-insensitive substring (and, on PostgreSQL, typo) match."""
+
+    lookup_name = "fuzzy"
+
+    def get_db_prep_lookup(self, value: Any, connection: Any) -> Any:
+        return ("%s", [connection.ops.prep_for_like_query(value)])
+
+    def as_sql(
+        self, compiler: SQLCompiler, connection: BaseDatabaseWrapper
+    ) -> tuple[str, list[Any]]:
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        sql = (
+            f"{NORMALIZE_FUNCTION}({lhs}) LIKE "
+            f"'%%' || {NORMALIZE_FUNCTION}({rhs}) || '%%' ESCAPE '\\'"
+        )
+        return sql, [*lhs_params, *rhs_params]
+
+    def as_postgresql(
+        self, compiler: SQLCompiler, connection: BaseDatabaseWrapper
+    ) -> tuple[str, list[Any]]:
+        contains_sql, contains_params = self.as_sql(compiler, connection)
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs_params = [self.rhs]
+        # ``<%`` is pg_trgm's word similarity operator; both forms are
+        # served by the same trigram index.
+        similar_sql = (
+            f"{NORMALIZE_FUNCTION}(%s) <%% {NORMALIZE_FUNCTION}({lhs})"
+        )
+        return (
+            f"({contains_sql} OR {similar_sql})",
+            [*contains_params, *rhs_params, *lhs_params],
+        )
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from core.uploads import UPLOAD_EXPIRY, purge_expired_uploads
+
+
+class Command(BaseCommand):
+    """Deletes chunked uploads left unfinished.
+
+    Uploads that received no chunk for ``UPLOAD_EXPIRY`` are deleted
+    with their stored chunks (see ``core.uploads``). Completed uploads
+    are deleted as soon as an endpoint saves their file, so only
+    abandoned ones remain that long.
+    """
+
+    help = "Deletes chunked uploads left unfinished."
+
+    def handle(self, *args, **options):
+        count = purge_expired_uploads()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Deleted {count} upload(s) idle for {UPLOAD_EXPIRY}."
+            )
+        )
@@ -1,11 +1,34 @@
 from __future__ import annotations
 
+import json
+import logging
+import time
 from collections.abc import Callable
+from typing import Any
 
+from django.conf import settings
+from django.db import connection
 from django.http import HttpRequest, HttpResponse
 
+from core.query_budget import (
+    QueryBudgetExceededError,
+    QueryStats,
+    get_query_budget,
+)
+from core.timing import (
+    RequestTimings,
+    start_request_timings,
+    stop_request_timings,
+)
+
+logger = logging.getLogger(__name__)
+timing_logger = logging.getLogger("core.timing")
+
 HEALTH_CHECK_PATH = "/api/health/"
 
+# Repeated statements listed when a budget is exceeded.
+MAX_REPORTED_DUPLICATES = 3
+
 
 class HealthCheckHostMiddleware:
     """Normalise the Host header for the Cloud Run startup probe.
@@ -31,3 +54,158 @@ class HealthCheckHostMiddleware:
         if request.path == HEALTH_CHECK_PATH:
             request.META["HTTP_HOST"] = "localhost"
         return self.get_response(request)
+
+
+class QueryBudgetMiddleware:
+    """Record the queries of each request and enforce query budgets.
+
+    The statistics are exposed as ``request.query_stats``. Budgets are
+    declared on view methods with ``core.query_budget.query_budget``.
+    A request over its budget raises ``QueryBudgetExceededError`` when
+    ``QUERY_BUDGET_STRICT`` is set and is logged as a warning otherwise.
+    """
+
+    def __init__(
+        self,
+        get_response: Callable[[HttpRequest], HttpResponse],
+    ) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        stats = QueryStats()
+        request.query_stats = stats  # type: ignore[attr-defined]
+        with connection.execute_wrapper(stats):
+            response = self.get_response(request)
+
+        budget = getattr(request, "query_budget", None)
+        if budget is not None and stats.count > budget:
+            self._report(request, stats, budget)
+        return response
+
+    def process_view(  # noqa: PLR0913
+        self,
+        request: HttpRequest,
+        view_func: Callable,
+        view_args: Any,
+        view_kwargs: Any,
+    ) -> None:
+        request.query_budget = get_query_budget(  # type: ignore[attr-defined]
+            view_func, request.method or ""
+        )
+
+    def _report(
+        self, request: HttpRequest, stats: QueryStats, budget: int
+    ) -> None:
+        duplicates = list(stats.duplicates.items())[:MAX_REPORTED_DUPLICATES]
+        message = (
+            f"{request.method} {request.path} ran {stats.count} queries "
+            f"({stats.duration * 1000:.1f} ms) and {stats.cache_count} "
+            f"cache lookups ({stats.cache_duration * 1000:.1f} ms), over "
+            f"its budget of {budget}. Repeated: {duplicates}"
+        )
+        if settings.QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceededError(message)
+        logger.warning(message)
+
+
+def _view_action(view_func: Callable, method: str) -> tuple[str, str]:
+    """Return the view class and action names handling a request."""
+    view_class = getattr(view_func, "cls", None)
+    if view_class is None:
+        return getattr(view_func, "__name__", ""), method.lower()
+    actions = getattr(view_func, "actions", None)
+    action = actions.get(method.lower(), "") if actions else method.lower()
+    return view_class.__name__, action
+
+
+class ServerTimingMiddleware:
+    """Report where the time of each request went, when enabled.
+
+    With ``SERVER_TIMING_ENABLED`` set, the phases timed by
+    ``core.timing`` and the database and database cache times recorded
+    by ``QueryBudgetMiddleware`` are added to a ``Server-Timing`` header
+    and logged as one JSON line per request. Must be placed before
+    ``QueryBudgetMiddleware``.
+    """
+
+    def __init__(
+        self,
+        get_response: Callable[[HttpRequest], HttpResponse],
+    ) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if not settings.SERVER_TIMING_ENABLED:
+            return self.get_response(request)
+
+        timings = start_request_timings()
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            stop_request_timings()
+        self._report(request, response, timings, time.perf_counter() - start)
+        return response
+
+    def process_view(  # noqa: PLR0913
+        self,
+        request: HttpRequest,
+        view_func: Callable,
+        view_args: Any,
+        view_kwargs: Any,
+    ) -> None:
+        request.view_action = _view_action(  # type: ignore[attr-defined]
+            view_func, request.method or ""
+        )
+
+    def _report(  # noqa: PLR0913
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        timings: RequestTimings,
+        total: float,
+    ) -> None:
+        stats = getattr(request, "query_stats", None)
+        durations_ms = {
+            name: round(seconds * 1000, 1)
+            for name, seconds in timings.phases.items()
+        }
+        durations_ms["db"] = round(stats.duration * 1000, 1) if stats else 0
+        durations_ms["cache"] = (
+            round(stats.cache_duration * 1000, 1) if stats else 0
+        )
+        durations_ms["total"] = round(total * 1000, 1)
+        queries = stats.count if stats else 0
+        cache_lookups = stats.cache_count if stats else 0
+        descriptions = {
+            "db": f"{queries} queries",
+            "cache": f"{cache_lookups} lookups",
+        }
+
+        response["Server-Timing"] = ", ".join(
+            f'{name};dur={ms};desc="{descriptions[name]}"'
+            if name in descriptions
+            else f"{name};dur={ms}"
+            for name, ms in durations_ms.items()
+        )
+
+        view, action = getattr(request, "view_action", ("", ""))
+        timing_logger.info(
+            json.dumps(
+                {
+                    "severity": "INFO",
+                    "message": (
+                        f"{request.method} {request.path} "
+                        f"{response.status_code} {durations_ms['total']} ms"
+                    ),
+                    "view": view,
+                    "action": action,
+                    "method": request.method,
+                    "path": request.path,
+                    "status": response.status_code,
+                    "db_queries": queries,
+                    "cache_lookups": cache_lookups,
+                    "durations_ms": durations_ms,
+                }
+            )
+        )
@@ -0,0 +1,100 @@
+import uuid
+
+from django.conf import settings
+from django.db import models
+
+
+class TableVersion(models.Model):
+    """Token replaced on every write to a database table.
+
+    Conditional GET responses derive their ETags from the tokens of the
+    tables they read (see ``core.conditional``). Tokens are stored in
+    the database, so every worker sees a write as soon as it commits.
+
+    Attributes:
+        table (CharField): Name of the database table.
+        token (CharField): Random token, replaced on each write.
+    """
+
+    table = models.CharField(max_length=255, primary_key=True)
+    token = models.CharField(max_length=32)
+
+    def __str__(self) -> str:
+        return f"{self.table}@{self.token}"
+
+
+def _upload_part_path(part: "ChunkedUploadPart", filename: str) -> str:
+    return f"uploads/{part.upload_id}/{part.offset:012d}"
+
+
+class ChunkedUpload(models.Model):
+    """A file sent in chunks, resumable after a dropped connection.
+
+    Each chunk is stored as a ``ChunkedUploadPart`` as soon as it
+    arrives, and ``offset`` records how many bytes were received, so a
+    client resumes from there. Once every byte arrived, endpoints
+    accepting file fields take the upload in place of the file (see
+    ``core.uploads``).
+
+    Attributes:
+        id (UUIDField): Unguessable identifier of the upload.
+        user (ForeignKey): The user sending the file.
+        filename (CharField): Name of the file being sent.
+        size (PositiveBigIntegerField): Size of the whole file.
+        offset (PositiveBigIntegerField): Bytes received so far.
+        created_at (DateTimeField): When the upload was started.
+        updated_at (DateTimeField): When the last chunk was received.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="chunked_uploads",
+    )
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.filename} ({self.offset}/{self.size})"
+
+    @property
+    def is_complete(self) -> bool:
+        return self.offset == self.size
+
+    def discard(self) -> None:
+        """Delete the stored chunks and the upload."""
+        for part in self.parts.all():
+            part.file.delete(save=False)
+        self.delete()
+
+
+class ChunkedUploadPart(models.Model):
+    """A chunk of a ``ChunkedUpload``, stored in the media storage.
+
+    Attributes:
+        upload (ForeignKey): The upload the chunk belongs to.
+        offset (PositiveBigIntegerField): Position of the chunk in the
+            file.
+        file (FileField): The chunk's bytes.
+    """
+
+    upload = models.ForeignKey(
+        ChunkedUpload, on_delete=models.CASCADE, related_name="parts"
+    )
+    offset = models.PositiveBigIntegerField()
+    file = models.FileField(upload_to=_upload_part_path)
+
+    class Meta:
+        ordering = ["offset"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["upload", "offset"], name="unique_upload_part"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.upload_id}@{self.offset}"
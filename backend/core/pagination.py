@@ -1,13 +1,387 @@
-from django.db.models import QuerySet
+import base64
+import binascii
+import datetime
+import json
+from collections.abc import Sequence
+from decimal import Decimal
+from functools import partial
+from typing import Any
+
+from django.core.paginator import EmptyPage
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db.models import Model, Q, QuerySet
+from django.db.models.expressions import F, OrderBy
+from django.utils.functional import cached_property
+from drf_yasg import openapi
 from rest_framework import status
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.serializers import BaseSerializer
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from core.counting import COUNT_MODE_PARAM, CountMode, resolve_count
+from core.fieldsets import apply_fieldset
+from core.timing import SERIALIZE, timed
+
+PAGINATION_MODE_PARAM = "pagination"
+CURSOR_MODE = "cursor"
+CURSOR_PARAM = "cursor"
+PAGE_SIZE_PARAM = "page_size"
+MAX_PAGE_SIZE = 100
+
+CURSOR_PAGINATION_PARAMETERS = [
+    openapi.Parameter(
+        name=PAGINATION_MODE_PARAM,
+        in_=openapi.IN_QUERY,
+        type=openapi.TYPE_STRING,
+        enum=[CURSOR_MODE],
+        description=(
+            "Set to 'cursor' to page with opaque keyset cursors instead "
+            "of page numbers. Cursor pages have no 'count'."
+        ),
+    ),
+    openapi.Parameter(
+        name=CURSOR_PARAM,
+        in_=openapi.IN_QUERY,
+        type=openapi.TYPE_STRING,
+        description="Opaque cursor taken from a 'next'/'previous' link.",
+    ),
+    openapi.Parameter(
+        name=PAGE_SIZE_PARAM,
+        in_=openapi.IN_QUERY,
+        type=openapi.TYPE_INTEGER,
+        description=(
+            f"Number of items per page, in either mode, up to {MAX_PAGE_SIZE}."
+        ),
+    ),
+    openapi.Parameter(
+        name=COUNT_MODE_PARAM,
+        in_=openapi.IN_QUERY,
+        type=openapi.TYPE_STRING,
+        enum=list(CountMode.CHOICES),
+        description=(
+            "Strategy for the page-number 'count': exact, cached (exact, "
+            "reused until the data changes) or estimate (PostgreSQL "
+            "planner estimate for unfiltered lists). The strategy used "
+            "is returned in 'count_mode'."
+        ),
+    ),
+]
+
+
+class _CursorEncoder(json.JSONEncoder):
+    """JSON encoder keeping full precision of ordering values.
+
+    Unlike ``DjangoJSONEncoder`` it keeps microseconds, whose loss would
+    make datetime cursors skip or repeat rows.
+    """
+
+    def default(self, o: Any) -> Any:
+        if isinstance(o, datetime.date | datetime.time):
+            return o.isoformat()
+        if isinstance(o, Decimal):
+            return str(o)
+        return super().default(o)
+
+
+class KeysetPagination:
+    """Cursor pagination on the queryset's own ordering.
+
+    The ordering terms of the queryset (or the model's default
+    ordering) are extended with the primary key as a tiebreaker, and
+    each page is fetched with a ``WHERE (ordering) > (last row)``
+    condition instead of an OFFSET. NULLs are always sorted last so the
+    comparison stays well defined for nullable columns and annotations.
+    No count query is run.
+
+    Only plain field names, foreign keys and annotations are supported
+    as ordering terms; related lookups (``a__b``) and expressions are
+    rejected with a ``ValidationError``. Pages have the size
+    page-number pagination would use.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = PAGE_SIZE_PARAM
+    max_page_size = MAX_PAGE_SIZE
+
+    def __init__(self) -> None:
+        self.request: Request | None = None
+        self.ordering: list[tuple[str, bool]] = []
+        self.has_next = False
+        self.has_previous = False
+        self.first_values: list[Any] | None = None
+        self.last_values: list[Any] | None = None
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request
+    ) -> list[Model]:
+        """Return the page of ``queryset`` addressed by the cursor.
+
+        Args:
+            queryset: The ordered queryset to paginate.
+            request: The HTTP request carrying the optional cursor.
+
+        Returns:
+            list[Model]: The objects of the requested page.
+
+        Raises:
+            NotFound: If the cursor cannot be decoded.
+            ValidationError: If the queryset's ordering cannot be paged
+                with cursors.
+        """
+        self.request = request
+        self.ordering = self._get_ordering(queryset)
+        page_size = self.get_page_size(request)
+
+        values, reverse = self._decode_cursor(
+            request.query_params.get(CURSOR_PARAM)
+        )
+
+        if values is not None:
+            queryset = queryset.filter(self._after(values, reverse=reverse))
+        queryset = queryset.order_by(*self._order_by(reverse=reverse))
+
+        page = list(queryset[: page_size + 1])
+        has_more = len(page) > page_size
+        page = page[:page_size]
+        if reverse:
+            page.reverse()
+            self.has_previous = has_more
+            self.has_next = True
+        else:
+            self.has_next = has_more
+            self.has_previous = values is not None
+
+        if page:
+            self.first_values = self._row_values(page[0])
+            self.last_values = self._row_values(page[-1])
+        return page
+
+    def get_paginated_response(self, data: Any) -> Response:
+        """Wrap serialized page data with next/previous cursor links."""
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_page_size(self, request: Request) -> int:
+        """Read ``?page_size=`` as page-number pagination does."""
+        return PageNumberPagination.get_page_size(self, request)
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next or self.last_values is None:
+            return None
+        return self._build_link(self.last_values, reverse=False)
+
+    def get_previous_link(self) -> str | None:
+        if not self.has_previous:
+            return None
+        if self.first_values is None:
+            assert self.request is not None
+            return remove_query_param(
+                self.request.build_absolute_uri(), CURSOR_PARAM
+            )
+        return self._build_link(self.first_values, reverse=True)
+
+    def _get_ordering(self, queryset: QuerySet) -> list[tuple[str, bool]]:
+        """Normalize the ordering to (attribute, descending) pairs."""
+        terms: Sequence[Any] = (
+            queryset.query.order_by or queryset.model._meta.ordering
+        )
+        opts = queryset.model._meta
+        annotations = queryset.query.annotations
+
+        ordering: list[tuple[str, bool]] = []
+        for term in terms:
+            if isinstance(term, OrderBy) and isinstance(term.expression, F):
+                name, descending = term.expression.name, term.descending
+            elif isinstance(term, str):
+                descending = term.startswith("-")
+                name = term.lstrip("-")
+            else:
+                raise self._unsupported_ordering()
+
+            if name in annotations:
+                ordering.append((name, descending))
+                continue
+            if "__" in name:
+                raise self._unsupported_ordering()
+            field = opts.pk if name == "pk" else opts.get_field(name)
+            ordering.append((field.attname, descending))
+
+        pk_attname = opts.pk.attname
+        if pk_attname not in {name for name, _ in ordering}:
+            descending = ordering[0][1] if ordering else False
+            ordering.append((pk_attname, descending))
+        return ordering
+
+    @staticmethod
+    def _unsupported_ordering() -> ValidationError:
+        return ValidationError(
+            {
+                PAGINATION_MODE_PARAM: [
+                    "Cursor pagination is not available for this "
+                    "ordering; page with page numbers instead."
+                ]
+            }
+        )
+
+    def _order_by(self, *, reverse: bool) -> list[OrderBy]:
+        if reverse:
+            return [
+                F(name).asc(nulls_first=True)
+                if descending
+                else F(name).desc(nulls_first=True)
+                for name, descending in self.ordering
+            ]
+        return [
+            F(name).desc(nulls_last=True)
+            if descending
+            else F(name).asc(nulls_last=True)
+            for name, descending in self.ordering
+        ]
+
+    def _after(self, values: list[Any], *, reverse: bool) -> Q:
+        """Build the lexicographic ``row > cursor`` condition.
+
+        In the forward direction NULLs sort last; when paging backwards
+        both the directions and the NULL placement are inverted.
+        """
+        condition = Q(pk__in=[])
+        equal_so_far = Q()
+        for (name, descending), value in zip(
+            self.ordering, values, strict=True
+        ):
+            if reverse:
+                descending = not descending
+
+            if value is None:
+                # NULLs are last going forward, first going backward.
+                after = Q(**{f"{name}__isnull": False}) if reverse else None
+                equal = Q(**{f"{name}__isnull": True})
+            else:
+                lookup = "lt" if descending else "gt"
+                after = Q(**{f"{name}__{lookup}": value})
+                if not reverse:
+                    after |= Q(**{f"{name}__isnull": True})
+                equal = Q(**{name: value})
+
+            if after is not None:
+                condition |= equal_so_far & after
+            equal_so_far &= equal
+        return condition
+
+    def _row_values(self, obj: Model) -> list[Any]:
+        return [getattr(obj, name) for name, _ in self.ordering]
+
+    def _build_link(self, values: list[Any], *, reverse: bool) -> str:
+        assert self.request is not None
+        payload = json.dumps({"v": values, "r": reverse}, cls=_CursorEncoder)
+        cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+        return replace_query_param(
+            self.request.build_absolute_uri(), CURSOR_PARAM, cursor
+        )
+
+    def _decode_cursor(
+        self, cursor: str | None
+    ) -> tuple[list[Any] | None, bool]:
+        if not cursor:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            values, reverse = payload["v"], bool(payload["r"])
+        except (
+            binascii.Error,
+            UnicodeDecodeError,
+            ValueError,
+            TypeError,
+            KeyError,
+        ) as exc:
+            raise NotFound("Invalid cursor.") from exc
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound("Invalid cursor.")
+        return values, reverse
+
+
+class _KnownCountPaginator(DjangoPaginator):
+    """Django paginator whose total is computed ahead of time.
+
+    With ``allow_overflow`` (used for planner estimates) pages past the
+    estimated end are served instead of raising, and pages are never
+    truncated to the estimated total.
+    """
+
+    def __init__(self, object_list: Any, per_page: int, **kwargs: Any):
+        self.known_count: int = kwargs.pop("known_count")
+        self.allow_overflow: bool = kwargs.pop("allow_overflow", False)
+        super().__init__(object_list, per_page, **kwargs)
+
+    @cached_property
+    def count(self) -> int:
+        return self.known_count
+
+    def page(self, number: Any) -> Any:
+        if not self.allow_overflow:
+            return super().page(number)
+        try:
+            number = self.validate_number(number)
+        except EmptyPage:
+            number = int(number)
+        bottom = (number - 1) * self.per_page
+        return self._get_page(
+            self.object_list[bottom : bottom + self.per_page], number, self
+        )
+
+
+class CountedPageNumberPagination(PageNumberPagination):
+    """Page-number pagination with a pluggable count strategy.
+
+    The response includes ``count_mode`` naming the strategy that
+    produced ``count`` (see ``core.counting.CountMode``).
+    """
+
+    page_size_query_param = PAGE_SIZE_PARAM
+    max_page_size = MAX_PAGE_SIZE
+
+    def __init__(self, count_mode: str = CountMode.EXACT) -> None:
+        self.count_mode = count_mode
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view: Any = None
+    ) -> list[Any] | None:
+        if self.get_page_size(request) is None:
+            return None
+
+        count, self.count_mode = resolve_count(queryset, self.count_mode)
+        self.django_paginator_class = partial(
+            _KnownCountPaginator,
+            known_count=count,
+            allow_overflow=self.count_mode == CountMode.ESTIMATE,
+        )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data: Any) -> Response:
+        response = super().get_paginated_response(data)
+        response.data["count_mode"] = self.count_mode
+        return response
 
 
 class PaginationMixin:
-    """Mixin providing a pagination helper via _paginate_response."""
+    """Mixin providing a pagination helper via _paginate_response.
+
+    Attributes:
+        count_mode: Default strategy used to compute ``count`` on
+            page-number responses. Clients may override it per request
+            with ``?count=exact|cached|estimate``.
+    """
+
+    count_mode: str = CountMode.EXACT
 
     def _paginate_response(
         self,
@@ -17,6 +391,13 @@ class PaginationMixin:
     ) -> Response:
         """Handle pagination and serialization of the queryset.
 
+        Page-number pagination is used by default, with the total
+        computed by the count strategy from ``?count=`` or
+        ``count_mode``. Passing ``?pagination=cursor`` switches to
+        keyset pagination on the queryset's ordering, which skips the
+        count query. Items are limited to the ``?fields=``/``?omit=``
+        fieldset (see ``core.fieldsets``).
+
         Args:
             queryset: The Django queryset to paginate.
             request: The HTTP request object.
@@ -27,11 +408,23 @@ class PaginationMixin:
             Response: Paginated response if pagination is applicable,
                 otherwise full queryset response.
         """
-        paginator = PageNumberPagination()
+        paginator: CountedPageNumberPagination | KeysetPagination
+        if request.query_params.get(PAGINATION_MODE_PARAM) == CURSOR_MODE:
+            paginator = KeysetPagination()
+        else:
+            count_mode = request.query_params.get(COUNT_MODE_PARAM)
+            if count_mode not in CountMode.CHOICES:
+                count_mode = self.count_mode
+            paginator = CountedPageNumberPagination(count_mode)
+        queryset, context = apply_fieldset(queryset, serializer_class, request)
         page = paginator.paginate_queryset(queryset, request)
         if page is not None:
-            serializer = serializer_class(page, many=True)
-            return paginator.get_paginated_response(serializer.data)
+            serializer = serializer_class(page, many=True, context=context)
+            with timed(SERIALIZE):
+                data = serializer.data
+            return paginator.get_paginated_response(data)
         else:
-            serializer = serializer_class(queryset, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            serializer = serializer_class(queryset, many=True, context=context)
+            with timed(SERIALIZE):
+                data = serializer.data
+            return Response(data, status=status.HTTP_200_OK)
@@ -0,0 +1,59 @@
+"""Object-level permission checks derived from queryset policies.
+
+A policy restricts querysets to the rows a user may access. The same
+restriction answers "which of these objects may this user access?" for
+any number of objects in a single query, so detail views and downloads
+share the rules of the list endpoints and pages linking many objects
+can authorize them in bulk.
+"""
+
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from typing import Any
+
+from django.db.models import Model, QuerySet
+
+from core.timing import PERMISSION, timed
+
+
+class ObjectPolicy(ABC):
+    """Base of the policies restricting access to rows of ``model``.
+
+    Subclasses implement ``apply`` and, when some users see every row,
+    ``is_unrestricted``; the object checks are derived from them.
+    """
+
+    model: type[Model]
+
+    def is_unrestricted(self, user: Any) -> bool:
+        """Return whether ``user`` may access every row."""
+        return False
+
+    @abstractmethod
+    def apply(self, queryset: QuerySet, user: Any) -> QuerySet:
+        """Restrict ``queryset`` to the rows ``user`` may access."""
+
+    def accessible_pks(
+        self, user: Any, objects: Iterable[Model | Any]
+    ) -> set[Any]:
+        """Return the keys of the ``objects`` that ``user`` may access.
+
+        Args:
+            user: The user requesting access.
+            objects: Instances of ``model`` or their primary keys.
+
+        Returns:
+            set: The accessible primary keys, found with at most one
+                query however many objects are checked.
+        """
+        pks = {getattr(obj, "pk", obj) for obj in objects} - {None}
+        if not pks or self.is_unrestricted(user):
+            return pks
+
+        queryset = self.model._base_manager.filter(pk__in=pks)
+        with timed(PERMISSION):
+            return set(self.apply(queryset, user).values_list("pk", flat=True))
+
+    def has_access(self, user: Any, obj: Model) -> bool:
+        """Return whether ``user`` may access ``obj``."""
+        return obj.pk in self.accessible_pks(user, [obj])
@@ -0,0 +1,138 @@
+"""Per-request query statistics and query budgets.
+
+``QueryBudgetMiddleware`` (see ``core.middleware``) records the queries
+of every request: how many ran, how long they took in total and which
+statements ran more than once, the usual sign of an N+1 lookup in a
+serializer.
+
+View methods declare how many queries they may run with
+``query_budget``. A request over its budget raises
+``QueryBudgetExceededError`` when ``QUERY_BUDGET_STRICT`` is set, as
+in the test settings, and is logged as a warning otherwise.
+
+Statements on the tables of database caches are cache lookups, which
+any cache backend could serve. They are recorded apart, as
+``cache_count`` and ``cache_duration``, so budgets keep counting the
+queries of the application while the cost of the lookups stays
+visible.
+"""
+
+import re
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from django.conf import settings
+
+_IN_LIST_PATTERN = re.compile(r"IN \((?:%s, )*%s\)")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+class QueryBudgetExceededError(Exception):
+    """Raised when a request runs more queries than its budget."""
+
+
+def _is_cache_lookup(sql: str) -> bool:
+    return any(
+        f'"{cache["LOCATION"]}"' in sql
+        for cache in settings.CACHES.values()
+        if cache["BACKEND"].endswith(".DatabaseCache")
+    )
+
+
+def fingerprint(sql: str) -> str:
+    """Return ``sql`` with ``IN`` lists of any length made alike."""
+    sql = _WHITESPACE_PATTERN.sub(" ", sql.strip())
+    return _IN_LIST_PATTERN.sub("IN (...)", sql)
+
+
+@dataclass
+class QueryStats:
+    """Queries run while handling a request.
+
+    Attributes:
+        count: Number of queries, cache lookups excluded.
+        duration: Time spent in those queries, in seconds.
+        fingerprints: Times each statement fingerprint ran.
+        cache_count: Number of lookups in database caches.
+        cache_duration: Time spent in those lookups, in seconds.
+    """
+
+    count: int = 0
+    duration: float = 0.0
+    fingerprints: Counter[str] = field(default_factory=Counter)
+    cache_count: int = 0
+    cache_duration: float = 0.0
+
+    def __call__(  # noqa: PLR0913
+        self,
+        execute: Callable,
+        sql: str,
+        params: Any,
+        many: bool,
+        context: dict[str, Any],
+    ) -> Any:
+        """Run a query as a ``connection.execute_wrapper``."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            if _is_cache_lookup(sql):
+                self.cache_duration += elapsed
+                self.cache_count += 1
+            else:
+                self.duration += elapsed
+                self.count += 1
+                self.fingerprints[fingerprint(sql)] += 1
+
+    @property
+    def duplicates(self) -> dict[str, int]:
+        """Statements that ran more than once, most repeated first."""
+        return {
+            sql: times
+            for sql, times in self.fingerprints.most_common()
+            if times > 1
+        }
+
+
+def query_budget(max_queries: int) -> Callable:
+    """Declare how many queries a view method may run per request.
+
+    The budget covers the whole request, authentication and access
+    scopes included, and must not depend on the page size.
+
+    Args:
+        max_queries: The most queries a request may run.
+
+    Returns:
+        Callable: A decorator for viewset and ``APIView`` methods.
+    """
+
+    def decorator(method: Callable) -> Callable:
+        method.query_budget = max_queries  # type: ignore[attr-defined]
+        return method
+
+    return decorator
+
+
+def get_query_budget(view_func: Callable, method: str) -> int | None:
+    """Return the budget declared by the handler of a request.
+
+    Args:
+        view_func: The view resolved for the request, as returned by
+            ``as_view()``.
+        method: The HTTP method of the request.
+
+    Returns:
+        int | None: The budget, or ``None`` if none was declared.
+    """
+    view_class = getattr(view_func, "cls", None)
+    if view_class is None:
+        return None
+    actions = getattr(view_func, "actions", None)
+    name = actions.get(method.lower()) if actions else method.lower()
+    handler = getattr(view_class, name or "", None)
+    return getattr(handler, "query_budget", None)
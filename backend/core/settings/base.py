@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import sys
 from datetime import timedelta
 from os import getenv, path
 from pathlib import Path
@@ -37,6 +38,7 @@ EXPORT_CYPRESS_FIXTURES = False
 
 INSTALLED_APPS = [
     "core.apps.ProphyAdminConfig",
+    "core.apps.CoreConfig",
     "django.contrib.auth",
     "django.contrib.contenttypes",
     "django.contrib.sessions",
@@ -58,6 +60,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "core.middleware.HealthCheckHostMiddleware",
+    "core.middleware.ServerTimingMiddleware",
+    "core.middleware.QueryBudgetMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.security.SecurityMiddleware",
@@ -238,6 +242,68 @@ REST_FRAMEWORK = {
     "PAGE_SIZE": 10,
 }
 
+# Cached paginated totals, access scopes and modalities are invalidated
+# on write, so every worker and instance must share one cache. It is
+# kept in database tables, created by the core migrations, as every
+# deployment already has the database. Once full, the default cache
+# culls entries, which are then recomputed. The versions invalidating
+# them (see core.cache_versions) are kept apart and never culled.
+CACHE_TABLE = "core_cache"
+VERSIONS_CACHE_TABLE = "core_cache_versions"
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": CACHE_TABLE,
+        "OPTIONS": {"MAX_ENTRIES": 100_000},
+    },
+    "versions": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": VERSIONS_CACHE_TABLE,
+        "OPTIONS": {"MAX_ENTRIES": sys.maxsize},
+    },
+}
+
+# Seconds a cached paginated total may be served. Cached totals are also
+# invalidated on every write, in the shared cache.
+PAGINATION_COUNT_CACHE_TIMEOUT = int(
+    getenv("PAGINATION_COUNT_CACHE_TIMEOUT", "60")
+)
+
+# Seconds a user's cached access scope (see clients_management.access)
+# may be served. Association changes invalidate it immediately, for
+# every worker, in the shared cache.
+ACCESS_SCOPE_CACHE_TIMEOUT = int(getenv("ACCESS_SCOPE_CACHE_TIMEOUT", "300"))
+
+# Seconds the modalities (see clients_management.reference) may be
+# served from the shared cache. Writes invalidate them immediately, and
+# each process re-reads them from there every few seconds.
+MODALITY_CACHE_TIMEOUT = int(getenv("MODALITY_CACHE_TIMEOUT", "3600"))
+
+# Whether requests over their query budget (see core.query_budget) fail
+# instead of being logged as warnings.
+QUERY_BUDGET_STRICT = False
+
+# Whether API responses carry a Server-Timing header and are logged with
+# their latency breakdown (see core.timing).
+SERVER_TIMING_ENABLED = getenv("SERVER_TIMING_ENABLED", "") == "true"
+
+# Latency lines are JSON, which Cloud Logging parses into fields.
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {"json": {"format": "%(message)s"}},
+    "handlers": {
+        "timing": {"class": "logging.StreamHandler", "formatter": "json"}
+    },
+    "loggers": {
+        "core.timing": {
+            "handlers": ["timing"],
+            "level": "INFO",
+            "propagate": False,
+        }
+    },
+}
+
 EMAIL_BACKEND = "anymail.backends.mailgun.EmailBackend"
 ANYMAIL = {
     "MAILGUN_API_KEY": getenv("MAILGUN_API_KEY"),
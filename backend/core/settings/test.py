@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import sys
+from os import getenv
+from typing import Any
+
 from . import base as base_settings
 
 for _name in dir(base_settings):
@@ -12,6 +16,8 @@ DEBUG = True
 
 ENABLE_CYPRESS_ROUTES = True
 
+QUERY_BUDGET_STRICT = True
+
 
 INSTALLED_APPS = [
     *base_settings.INSTALLED_APPS,
@@ -24,20 +30,46 @@ BASE_DIR = base_settings.BASE_DIR
 
 # Force a test-only database. This prevents accidentally running tests
 # against staging or production.
-DATABASES = {
+DATABASES: dict[str, dict[str, Any]] = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db_test.sqlite3",
     }
 }
 
-_db_name = str(DATABASES["default"]["NAME"])
+# Opt-in PostgreSQL run (POSTGRES_* or DATABASE_URL), needed by the
+# query plan tests. The test database is always a dedicated one.
+if getenv("TEST_DATABASE_ENGINE", "sqlite").lower() == "postgres":
+    DATABASES = {
+        "default": {
+            **base_settings._get_postgresql_database(),
+            "TEST": {"NAME": "prophy_test"},
+        }
+    }
+
+_db_name = str(
+    DATABASES["default"].get("TEST", {}).get("NAME")
+    or DATABASES["default"]["NAME"]
+)
 if "test" not in _db_name:
     raise RuntimeError(
         f"Refusing to run tests with a non-test database name: {_db_name!r}"
     )
 
 
+# Tests run in a single process, which a local memory cache serves.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "default",
+    },
+    "versions": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "versions",
+        "OPTIONS": {"MAX_ENTRIES": sys.maxsize},
+    },
+}
+
 PASSWORD_HASHERS = [
     "django.contrib.auth.hashers.MD5PasswordHasher",
 ]
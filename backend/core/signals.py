@@ -0,0 +1,125 @@
+from django.apps import AppConfig
+from django.apps import apps as global_apps
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from core.conditional import (
+    VERSIONED_APPS,
+    VERSIONED_USER_FIELDS,
+    is_versioned,
+    touch_models,
+    touch_tables,
+)
+from core.counting import bump_table_versions, invalidate_model_counts
+from core.fuzzy import register_sqlite_functions
+from core.models import TableVersion
+from users.models import UserAccount
+
+
+def _is_current(model: type) -> bool:
+    # Historical models are written by migrations, possibly before the
+    # cache table exists, and are never counted by the API.
+    return model._meta.apps is global_apps
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_counts_on_write(sender: type, **kwargs) -> None:
+    if _is_current(sender):
+        invalidate_model_counts(sender)
+
+
+@receiver(m2m_changed)
+def invalidate_counts_on_m2m_change(
+    sender: type, action: str, **kwargs
+) -> None:
+    if action.startswith("post_") and _is_current(sender):
+        bump_table_versions(sender._meta.db_table)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def touch_versions_on_write(sender: type, **kwargs) -> None:
+    if is_versioned(sender):
+        touch_models(sender)
+
+
+@receiver(m2m_changed)
+def touch_versions_on_m2m_change(sender: type, action: str, **kwargs) -> None:
+    if action.startswith("post_") and is_versioned(sender):
+        touch_tables([sender._meta.db_table])
+
+
+def _skips_user_fields(update_fields: frozenset | None) -> bool:
+    return update_fields is not None and update_fields.isdisjoint(
+        VERSIONED_USER_FIELDS
+    )
+
+
+@receiver(pre_save, sender=UserAccount)
+def capture_old_user_fields(
+    sender: type[UserAccount], instance: UserAccount, **kwargs
+) -> None:
+    """Remember the versioned fields of the stored user before a save.
+
+    ``_old_fields`` is ``None`` for users that are not stored yet.
+    """
+    if _skips_user_fields(kwargs.get("update_fields")):
+        return
+    instance._old_fields = (
+        sender.objects.filter(pk=instance.pk)
+        .values(*VERSIONED_USER_FIELDS)
+        .first()
+        if instance.pk and not kwargs.get("raw")
+        else None
+    )
+
+
+@receiver(post_save, sender=UserAccount)
+def touch_versions_on_user_write(
+    sender: type[UserAccount], instance: UserAccount, **kwargs
+) -> None:
+    if _skips_user_fields(kwargs.get("update_fields")):
+        return
+    old = getattr(instance, "_old_fields", None)
+    if old is None or any(
+        old[field] != getattr(instance, field)
+        for field in VERSIONED_USER_FIELDS
+    ):
+        touch_models(sender)
+
+
+@receiver(post_delete, sender=UserAccount)
+def touch_versions_on_user_delete(sender: type[UserAccount], **kwargs) -> None:
+    touch_models(sender)
+
+
+@receiver(post_migrate)
+def touch_versions_on_migrate(sender: AppConfig, using: str, **kwargs) -> None:
+    # Data migrations write without touching the tables they change.
+    if sender.label in VERSIONED_APPS:
+        models = sender.get_models()
+    elif sender.label == UserAccount._meta.app_label:
+        models = [UserAccount]
+    else:
+        return
+    connection = connections[using]
+    if TableVersion._meta.db_table in connection.introspection.table_names():
+        touch_models(*models)
+
+
+@receiver(connection_created)
+def register_database_functions(
+    sender: type, connection: BaseDatabaseWrapper, **kwargs
+) -> None:
+    if connection.vendor == "sqlite":
+        register_sqlite_functions(connection)
@@ -0,0 +1,261 @@
+"""Resumable chunked upload tests."""
+
+import os
+import uuid
+from datetime import date
+
+import pytest
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from clients_management.models import Report
+from core.models import ChunkedUpload
+from core.uploads import UPLOAD_EXPIRY, ChunkedFile
+from materials.models import InstitutionalMaterial
+from tests.factories import ProposalFactory, UnitFactory
+
+UPLOADS_URL = "/api/uploads/"
+CONTENT = b"%PDF-1.4 " + bytes(range(256)) * 4
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def manager_client(prophy_manager) -> APIClient:
+    api_client = APIClient()
+    api_client.force_authenticate(user=prophy_manager)
+    return api_client
+
+
+@pytest.fixture
+def scheduler_client(settings, mocker) -> APIClient:
+    settings.OIDC_AUDIENCE = "test-audience"
+    mocker.patch(
+        "users.authentication.id_token.verify_oauth2_token",
+        return_value={
+            "iss": "accounts.google.com",
+            "email": "scheduler@prophy.com",
+        },
+    )
+    api_client = APIClient()
+    api_client.credentials(HTTP_AUTHORIZATION="Bearer fake")
+    return api_client
+
+
+def stored_chunks(media_root) -> list:
+    return [
+        path for path in (media_root / "uploads").rglob("*") if path.is_file()
+    ]
+
+
+def start_upload(api_client, filename: str) -> str:
+    response = api_client.post(
+        UPLOADS_URL, {"filename": filename, "size": len(CONTENT)}
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    return response.data["id"]
+
+
+def put_chunk(api_client, upload_id, start: int):
+    chunk = CONTENT[start : start + 500]
+    return api_client.put(
+        f"{UPLOADS_URL}{upload_id}/",
+        chunk,
+        content_type="application/octet-stream",
+        headers={
+            "Content-Range": (
+                f"bytes {start}-{start + len(chunk) - 1}/{len(CONTENT)}"
+            )
+        },
+    )
+
+
+def upload(api_client, filename: str) -> str:
+    upload_id = start_upload(api_client, filename)
+    for start in range(0, len(CONTENT), 500):
+        response = put_chunk(api_client, upload_id, start)
+        assert response.status_code == status.HTTP_200_OK
+    return upload_id
+
+
+@pytest.mark.django_db
+def test_report_is_created_from_resumed_chunked_uploads(
+    manager_client, media_root
+):
+    upload_id = start_upload(manager_client, "laudo.pdf")
+    put_chunk(manager_client, upload_id, 0)
+
+    # The connection dropped: the client asks where to resume.
+    progress = manager_client.get(f"{UPLOADS_URL}{upload_id}/")
+    assert progress.data["offset"] == len(CONTENT[:500])
+    for start in range(progress.data["offset"], len(CONTENT), 500):
+        put_chunk(manager_client, upload_id, start)
+
+    response = manager_client.post(
+        "/api/reports/",
+        {
+            "completion_date": date(2024, 1, 15).isoformat(),
+            "report_type": Report.ReportType.MEMORIAL,
+            "description": "Memorial descritivo",
+            "unit": UnitFactory().id,
+            "pdf_file_upload": upload_id,
+            "word_file_upload": upload(manager_client, "laudo.docx"),
+        },
+        format="multipart",
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    report = Report.objects.get(pk=response.data["id"])
+    assert report.pdf_file.name.startswith("reports/pdfs/laudo")
+    with report.pdf_file.open() as stored:
+        assert stored.read() == CONTENT
+    assert not ChunkedUpload.objects.exists()
+    assert not stored_chunks(media_root)
+
+
+@pytest.mark.django_db
+def test_chunks_must_continue_from_the_offset(manager_client):
+    upload_id = start_upload(manager_client, "laudo.pdf")
+    put_chunk(manager_client, upload_id, 0)
+
+    retried = put_chunk(manager_client, upload_id, 0)
+    mismatched = manager_client.put(
+        f"{UPLOADS_URL}{upload_id}/",
+        b"short",
+        content_type="application/octet-stream",
+        headers={"Content-Range": f"bytes 500-999/{len(CONTENT)}"},
+    )
+
+    assert retried.status_code == status.HTTP_409_CONFLICT
+    assert retried.data["offset"] == len(CONTENT[:500])
+    assert mismatched.status_code == status.HTTP_400_BAD_REQUEST
+    assert ChunkedUpload.objects.get(pk=upload_id).parts.count() == 1
+
+
+@pytest.mark.django_db
+def test_a_lost_offset_claim_stores_no_chunk(
+    manager_client, media_root, mocker
+):
+    upload_id = start_upload(manager_client, "laudo.pdf")
+    put_chunk(manager_client, upload_id, 0)
+    # A concurrent request read the upload before the first chunk
+    # advanced its offset.
+    stale = ChunkedUpload.objects.get(pk=upload_id)
+    stale.offset = 0
+    mocker.patch("core.views.get_object_or_404", return_value=stale)
+
+    response = put_chunk(manager_client, upload_id, 0)
+
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert response.data["offset"] == len(CONTENT[:500])
+    assert len(stored_chunks(media_root)) == 1
+
+
+@pytest.mark.django_db
+def test_completed_uploads_are_read_from_any_offset(manager_client):
+    upload_id = upload(manager_client, "laudo.pdf")
+    file = ChunkedFile(ChunkedUpload.objects.get(pk=upload_id))
+
+    file.seek(700)
+    assert file.read(100) == CONTENT[700:800]
+    file.seek(250)
+    file.seek(300, os.SEEK_CUR)
+    assert file.read(5) == CONTENT[550:555]
+    file.seek(-10, os.SEEK_END)
+    assert file.read() == CONTENT[-10:]
+    assert file.tell() == len(CONTENT)
+    file.seek(0)
+    assert file.read() == CONTENT
+
+
+@pytest.mark.django_db
+def test_expired_uploads_are_purged_by_the_scheduled_trigger(
+    manager_client, scheduler_client, media_root
+):
+    expired = start_upload(manager_client, "laudo.pdf")
+    put_chunk(manager_client, expired, 0)
+    ChunkedUpload.objects.filter(pk=expired).update(
+        updated_at=timezone.now() - UPLOAD_EXPIRY * 2
+    )
+    # Started long ago, but still receiving chunks.
+    slow = start_upload(manager_client, "laudo.odt")
+    ChunkedUpload.objects.filter(pk=slow).update(
+        created_at=timezone.now() - UPLOAD_EXPIRY * 2
+    )
+    put_chunk(manager_client, slow, 0)
+    # Starting uploads leaves expired ones to the scheduled purge.
+    recent = start_upload(manager_client, "laudo.docx")
+    assert ChunkedUpload.objects.filter(pk=expired).exists()
+
+    response = scheduler_client.post(f"{UPLOADS_URL}tasks/purge-expired/")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["status"] == "ok"
+    assert set(ChunkedUpload.objects.values_list("pk", flat=True)) == {
+        uuid.UUID(slow),
+        uuid.UUID(recent),
+    }
+    assert len(stored_chunks(media_root)) == 1
+
+
+@pytest.mark.django_db
+def test_only_completed_uploads_of_the_user_are_accepted(
+    manager_client, prophy_manager, internal_physicist
+):
+    incomplete = start_upload(manager_client, "laudo.pdf")
+    physicist_client = APIClient()
+    physicist_client.force_authenticate(user=internal_physicist)
+
+    response = manager_client.post(
+        "/api/reports/",
+        {
+            "completion_date": date(2024, 1, 15).isoformat(),
+            "report_type": Report.ReportType.MEMORIAL,
+            "description": "Memorial descritivo",
+            "unit": UnitFactory().id,
+            "pdf_file_upload": incomplete,
+            "word_file_upload": upload(physicist_client, "laudo.docx"),
+        },
+        format="multipart",
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert set(response.data) == {"pdf_file_upload", "word_file_upload"}
+    assert (
+        physicist_client.get(f"{UPLOADS_URL}{incomplete}/").status_code
+        == status.HTTP_404_NOT_FOUND
+    )
+    assert not Report.objects.exists()
+
+
+@pytest.mark.django_db
+def test_materials_and_proposals_accept_chunked_uploads(manager_client):
+    material = manager_client.post(
+        "/api/materials/",
+        {
+            "title": "Manual",
+            "description": "Manual de proteção radiológica",
+            "visibility": InstitutionalMaterial.Visibility.PUBLIC,
+            "category": InstitutionalMaterial.PublicCategory.SIGNS,
+            "file_upload": upload(manager_client, "manual.pdf"),
+        },
+        format="multipart",
+    )
+    proposal = ProposalFactory()
+    updated = manager_client.patch(
+        f"/api/proposals/{proposal.id}/",
+        {"pdf_version_upload": upload(manager_client, "proposta.pdf")},
+        format="multipart",
+    )
+
+    assert material.status_code == status.HTTP_201_CREATED
+    assert updated.status_code == status.HTTP_200_OK
+    proposal.refresh_from_db()
+    with proposal.pdf_version.open() as stored:
+        assert stored.read() == CONTENT
+    assert not ChunkedUpload.objects.exists()
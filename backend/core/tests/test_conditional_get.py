@@ -0,0 +1,180 @@
+from datetime import date, timedelta
+
+import pytest
+from django.contrib.auth.models import update_last_login
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from clients_management.models import Report
+from core import conditional
+from core.models import TableVersion
+from tests.factories import (
+    ClientFactory,
+    ModalityFactory,
+    ReportFactory,
+    UnitFactory,
+    UserFactory,
+)
+from users.models import UserAccount
+
+
+def _client_for(user: UserAccount) -> APIClient:
+    api_client = APIClient()
+    api_client.force_authenticate(user=user)
+    return api_client
+
+
+@pytest.fixture
+def physicist() -> UserAccount:
+    return UserFactory(role=UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST)
+
+
+@pytest.fixture
+def report(physicist) -> Report:
+    return ReportFactory(
+        unit=UnitFactory(client=ClientFactory(users=[physicist])),
+        report_type=Report.ReportType.MEMORIAL,
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("report")
+def test_unchanged_list_is_answered_with_one_query(
+    physicist, django_assert_num_queries
+):
+    api_client = _client_for(physicist)
+    response = api_client.get("/api/reports/")
+    etag = response["ETag"]
+
+    with django_assert_num_queries(1):
+        response = api_client.get("/api/reports/", HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response["ETag"] == etag
+    assert "no-cache" in response["Cache-Control"]
+
+
+@pytest.mark.django_db
+def test_writes_change_the_etag(
+    physicist, report, django_capture_on_commit_callbacks
+):
+    api_client = _client_for(physicist)
+    url = f"/api/reports/{report.pk}/"
+    etag = api_client.get(url)["ETag"]
+
+    report.unit.name = "Renamed unit"
+    with django_capture_on_commit_callbacks(execute=True):
+        report.unit.save()
+
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"] != etag
+    assert response.data["unit_name"] == "Renamed unit"
+
+
+@pytest.mark.django_db
+def test_only_shown_user_fields_change_the_etag(
+    physicist, report, django_capture_on_commit_callbacks
+):
+    api_client = _client_for(physicist)
+    url = f"/api/reports/{report.pk}/"
+    etag = api_client.get(url)["ETag"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        update_last_login(None, physicist)
+        physicist.set_password("another-password")
+        physicist.save()
+
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    physicist.name = "Renamed physicist"
+    with django_capture_on_commit_callbacks(execute=True):
+        physicist.save()
+
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_modality_list_answers_unchanged_requests_with_a_304(
+    prophy_manager, django_capture_on_commit_callbacks
+):
+    api_client = _client_for(prophy_manager)
+    etag = api_client.get("/api/modalities/")["ETag"]
+
+    response = api_client.get("/api/modalities/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    with django_capture_on_commit_callbacks(execute=True):
+        ModalityFactory()
+
+    response = api_client.get("/api/modalities/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_bulk_updates_change_the_etag(
+    physicist, report, django_capture_on_commit_callbacks
+):
+    api_client = _client_for(physicist)
+    etag = api_client.get("/api/reports/")["ETag"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Report.objects.filter(pk=report.pk).soft_delete(deleted_by=physicist)
+
+    response = api_client.get("/api/reports/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("report")
+def test_etags_depend_on_the_user_and_the_query(physicist):
+    other = _client_for(
+        UserFactory(role=UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST)
+    )
+    api_client = _client_for(physicist)
+    etag = api_client.get("/api/reports/")["ETag"]
+
+    assert other.get("/api/reports/")["ETag"] != etag
+    assert api_client.get("/api/reports/?fields=id")["ETag"] != etag
+    response = api_client.get("/api/reports/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_tokens_are_replaced_once_the_write_commits(
+    report, django_capture_on_commit_callbacks
+):
+    def token() -> str | None:
+        return (
+            TableVersion.objects.filter(table=Report._meta.db_table)
+            .values_list("token", flat=True)
+            .first()
+        )
+
+    before = token()
+    with django_capture_on_commit_callbacks(execute=True):
+        report.save()
+        assert token() == before
+
+    assert token() != before
+
+
+@pytest.mark.django_db
+def test_only_date_derived_responses_change_with_the_day(
+    physicist, report, monkeypatch
+):
+    class Tomorrow(date):
+        @classmethod
+        def today(cls) -> date:
+            return date.today() + timedelta(days=1)
+
+    api_client = _client_for(physicist)
+    report_etag = api_client.get(f"/api/reports/{report.pk}/")["ETag"]
+    material_etag = api_client.get("/api/materials/")["ETag"]
+
+    monkeypatch.setattr(conditional, "date", Tomorrow)
+
+    assert api_client.get(f"/api/reports/{report.pk}/")["ETag"] != report_etag
+    assert api_client.get("/api/materials/")["ETag"] == material_etag
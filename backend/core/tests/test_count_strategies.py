@@ -0,0 +1,106 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from clients_management.models import Report
+from tests.factories import (
+    ClientFactory,
+    EquipmentFactory,
+    ReportFactory,
+    UserFactory,
+)
+from users.models import UserAccount
+
+
+def _get_reports(api_client: APIClient, **params):
+    with CaptureQueriesContext(connection) as ctx:
+        response = api_client.get("/api/reports/", params)
+    assert response.status_code == status.HTTP_200_OK
+    count_queries = [
+        query
+        for query in ctx.captured_queries
+        if "COUNT(" in query["sql"].upper()
+    ]
+    return response.data, len(count_queries)
+
+
+def _create_report(**kwargs) -> Report:
+    return ReportFactory(unit=None, equipment=EquipmentFactory(**kwargs))
+
+
+@pytest.fixture
+def manager_client() -> APIClient:
+    api_client = APIClient()
+    api_client.force_authenticate(
+        user=UserFactory(role=UserAccount.Role.PROPHY_MANAGER)
+    )
+    return api_client
+
+
+@pytest.mark.django_db
+def test_cached_count_is_reused_until_reports_change(manager_client):
+    _create_report()
+
+    data, count_queries = _get_reports(manager_client)
+    assert (data["count"], data["count_mode"]) == (1, "cached")
+    assert count_queries == 1
+
+    data, count_queries = _get_reports(manager_client)
+    assert data["count"] == 1
+    assert count_queries == 0
+
+    _create_report()
+    data, count_queries = _get_reports(manager_client)
+    assert data["count"] == 2  # noqa: PLR2004
+    assert count_queries == 1
+
+
+@pytest.mark.django_db
+def test_cached_count_is_keyed_by_filters_and_user_scope(manager_client):
+    physicist = UserFactory(role=UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST)
+    own_report = _create_report(unit__client=ClientFactory(users=[physicist]))
+    _create_report()
+    physicist_client = APIClient()
+    physicist_client.force_authenticate(user=physicist)
+
+    assert _get_reports(manager_client)[0]["count"] == 2  # noqa: PLR2004
+    assert _get_reports(physicist_client)[0]["count"] == 1
+    filtered, _ = _get_reports(
+        manager_client, client_name=own_report.owner_client.name
+    )
+    assert filtered["count"] == 1
+
+
+@pytest.mark.django_db
+def test_cached_count_is_invalidated_by_bulk_and_m2m_writes(manager_client):
+    client = ClientFactory()
+    physicist = UserFactory(role=UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST)
+    _create_report(unit__client=client)
+    physicist_client = APIClient()
+    physicist_client.force_authenticate(user=physicist)
+
+    assert _get_reports(physicist_client)[0]["count"] == 0
+    client.users.add(physicist)
+    assert _get_reports(physicist_client)[0]["count"] == 1
+
+    active, _ = _get_reports(manager_client, status="ok")
+    Report.objects.all().soft_delete(deleted_by=physicist)
+    assert _get_reports(manager_client, status="ok")[0]["count"] == (
+        active["count"] - 1
+    )
+
+
+@pytest.mark.django_db
+def test_count_mode_can_be_selected_per_request(manager_client):
+    _create_report()
+
+    exact, count_queries = _get_reports(manager_client, count="exact")
+    assert (exact["count"], exact["count_mode"]) == (1, "exact")
+    assert count_queries == 1
+
+    # Estimates need PostgreSQL and a large table, otherwise the cached
+    # exact count is used.
+    estimate, _ = _get_reports(manager_client, count="estimate")
+    assert (estimate["count"], estimate["count_mode"]) == (1, "cached")
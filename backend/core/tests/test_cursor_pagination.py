@@ -0,0 +1,184 @@
+from datetime import date
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from clients_management.models import Report
+from core.pagination import MAX_PAGE_SIZE, KeysetPagination
+from requisitions.models import ClientOperation
+from tests.factories import (
+    ClientOperationFactory,
+    EquipmentFactory,
+    ProposalFactory,
+    ReportFactory,
+    UserFactory,
+)
+from users.models import UserAccount
+
+
+def _walk(api_client: APIClient, url: str, params: dict) -> list[dict]:
+    pages = []
+    response = api_client.get(url, params)
+    while True:
+        assert response.status_code == status.HTTP_200_OK
+        assert "count" not in response.data
+        pages.append(response.data)
+        if not response.data["next"]:
+            return pages
+        response = api_client.get(response.data["next"])
+
+
+@pytest.fixture
+def manager_client() -> APIClient:
+    api_client = APIClient()
+    api_client.force_authenticate(
+        user=UserFactory(role=UserAccount.Role.PROPHY_MANAGER)
+    )
+    return api_client
+
+
+@pytest.mark.django_db
+def test_cursor_pages_cover_tied_rows_exactly_once(manager_client):
+    same_day = date(2025, 1, 10)
+    for index in range(23):
+        completion_date = same_day if index % 2 else date(2025, 1, index + 1)
+        ReportFactory(
+            unit=None,
+            equipment=EquipmentFactory(),
+            completion_date=completion_date,
+        )
+
+    pages = _walk(manager_client, "/api/reports/", {"pagination": "cursor"})
+
+    cursor_ids = [item["id"] for page in pages for item in page["results"]]
+    assert len(pages) == 3  # noqa: PLR2004
+    assert len(cursor_ids) == len(set(cursor_ids)) == 23  # noqa: PLR2004
+    completion_dates = [
+        item["completion_date"] for page in pages for item in page["results"]
+    ]
+    assert completion_dates == sorted(completion_dates, reverse=True)
+
+
+@pytest.mark.django_db
+def test_cursor_previous_link_returns_the_previous_page(manager_client):
+    for _ in range(15):
+        ReportFactory(unit=None, equipment=EquipmentFactory())
+
+    first = manager_client.get("/api/reports/", {"pagination": "cursor"})
+    second = manager_client.get(first.data["next"])
+    back = manager_client.get(second.data["previous"])
+
+    assert second.data["next"] is None
+    assert [item["id"] for item in back.data["results"]] == [
+        item["id"] for item in first.data["results"]
+    ]
+    assert back.data["previous"] is None
+
+
+@pytest.mark.django_db
+def test_cursor_mode_skips_count_query(manager_client):
+    for _ in range(3):
+        ReportFactory(unit=None, equipment=EquipmentFactory())
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = manager_client.get(
+            "/api/reports/", {"pagination": "cursor"}
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not [
+        query
+        for query in ctx.captured_queries
+        if "COUNT(" in query["sql"].upper()
+    ]
+
+
+@pytest.mark.django_db
+def test_cursor_mode_pages_annotated_client_ordering(manager_client):
+    clients = [
+        ClientOperationFactory(
+            operation_status=ClientOperation.OperationStatus.ACCEPTED
+        )
+        for _ in range(12)
+    ]
+    for client in clients[::3]:
+        ProposalFactory(cnpj=client.cnpj)
+
+    pages = _walk(manager_client, "/api/clients/", {"pagination": "cursor"})
+
+    cursor_ids = [item["id"] for page in pages for item in page["results"]]
+    page_number_ids = []
+    for page in (1, 2):
+        response = manager_client.get("/api/clients/", {"page": page})
+        page_number_ids += [item["id"] for item in response.data["results"]]
+    assert sorted(cursor_ids) == sorted(client.id for client in clients)
+    assert cursor_ids == page_number_ids
+
+
+@pytest.mark.django_db
+def test_cursor_mode_reads_the_page_size_like_page_numbers(manager_client):
+    for _ in range(5):
+        ReportFactory(unit=None, equipment=EquipmentFactory())
+
+    pages = _walk(
+        manager_client,
+        "/api/reports/",
+        {"pagination": "cursor", "page_size": 2},
+    )
+    capped = manager_client.get(
+        "/api/reports/",
+        {"pagination": "cursor", "page_size": MAX_PAGE_SIZE + 1},
+    )
+    numbered = manager_client.get("/api/reports/", {"page_size": 2})
+
+    assert [len(page["results"]) for page in pages] == [2, 2, 1]
+    # Oversized pages are capped, not rejected.
+    assert len(capped.data["results"]) == sum(
+        len(page["results"]) for page in pages
+    )
+    assert len(numbered.data["results"]) == len(pages[0]["results"])
+
+
+@pytest.mark.django_db
+def test_unsupported_cursor_ordering_is_a_validation_error():
+    request = Request(APIRequestFactory().get("/", {"pagination": "cursor"}))
+
+    with pytest.raises(ValidationError) as excinfo:
+        KeysetPagination().paginate_queryset(
+            Report.objects.order_by("unit__name"), request
+        )
+
+    assert excinfo.value.status_code == status.HTTP_400_BAD_REQUEST
+    assert "pagination" in excinfo.value.detail
+
+
+@pytest.mark.django_db
+def test_invalid_cursor_returns_not_found(manager_client):
+    response = manager_client.get(
+        "/api/reports/", {"pagination": "cursor", "cursor": "not-a-cursor"}
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/api/proposals/",
+        "/api/units/",
+        "/api/equipments/",
+        "/api/appointments/",
+        "/api/materials/",
+    ],
+)
+def test_cursor_mode_is_available_on_paginated_lists(manager_client, url):
+    response = manager_client.get(url, {"pagination": "cursor"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert set(response.data) == {"next", "previous", "results"}
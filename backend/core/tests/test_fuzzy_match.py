@@ -0,0 +1,113 @@
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from clients_management.models import Client
+from core.fuzzy import normalize_search_text
+from requisitions.models import ClientOperation, EquipmentOperation
+from tests.factories import (
+    ClientOperationFactory,
+    EquipmentOperationFactory,
+    ProposalFactory,
+    UnitFactory,
+    UserFactory,
+)
+from users.models import UserAccount
+
+ACCEPTED = ClientOperation.OperationStatus.ACCEPTED
+
+
+@pytest.fixture
+def manager_client() -> APIClient:
+    api_client = APIClient()
+    api_client.force_authenticate(
+        user=UserFactory(role=UserAccount.Role.PROPHY_MANAGER)
+    )
+    return api_client
+
+
+def _list_ids(api_client: APIClient, url: str, params: dict) -> set[int]:
+    response = api_client.get(url, params)
+    assert response.status_code == status.HTTP_200_OK
+    return {item["id"] for item in response.data["results"]}
+
+
+def test_normalize_search_text_strips_accents_and_case():
+    assert normalize_search_text("São JOSÉ do Pará") == "sao jose do para"
+    assert normalize_search_text(None) is None
+
+
+@pytest.mark.django_db
+def test_fuzzy_lookup_ignores_accents_and_case():
+    client = ClientOperationFactory(name="Clínica São José")
+
+    assert Client.objects.get(name__fuzzy="SAO JOSE").pk == client.pk
+    assert Client.objects.get(name__fuzzy="clínica são").pk == client.pk
+    assert not Client.objects.filter(name__icontains="sao jose").exists()
+
+
+@pytest.mark.django_db
+def test_fuzzy_lookup_escapes_like_wildcards():
+    ClientOperationFactory(name="Hospital Central")
+
+    assert not Client.objects.filter(name__fuzzy="hosp%central").exists()
+    assert not Client.objects.filter(name__fuzzy="_ospital").exists()
+
+
+@pytest.mark.django_db
+def test_client_list_fuzzy_name_and_city(manager_client):
+    accented = ClientOperationFactory(
+        name="Radiologia Açaí", city="Maringá", operation_status=ACCEPTED
+    )
+    ClientOperationFactory(
+        name="Radiologia Norte", city="Londrina", operation_status=ACCEPTED
+    )
+
+    fuzzy = {"match": "fuzzy"}
+    assert _list_ids(
+        manager_client, "/api/clients/", {**fuzzy, "name": "acai"}
+    ) == {accented.id}
+    assert _list_ids(
+        manager_client, "/api/clients/", {**fuzzy, "city": "MARINGA"}
+    ) == {accented.id}
+    # Without ``match=fuzzy`` the filters keep matching exactly.
+    assert _list_ids(manager_client, "/api/clients/", {"name": "acai"}) == (
+        set()
+    )
+
+
+@pytest.mark.django_db
+def test_equipment_list_fuzzy_manufacturer_and_client(manager_client):
+    client = ClientOperationFactory(
+        name="Clínica Itajubá", operation_status=ACCEPTED
+    )
+    equipment = EquipmentOperationFactory(
+        manufacturer="Siemens Healthineers Brasília",
+        unit=UnitFactory(client=client),
+        operation_status=EquipmentOperation.OperationStatus.ACCEPTED,
+    )
+    EquipmentOperationFactory(
+        manufacturer="Philips",
+        operation_status=EquipmentOperation.OperationStatus.ACCEPTED,
+    )
+
+    url = "/api/equipments/"
+    fuzzy = {"match": "fuzzy"}
+    assert _list_ids(
+        manager_client, url, {**fuzzy, "manufacturer": "brasilia"}
+    ) == {equipment.id}
+    assert _list_ids(
+        manager_client, url, {**fuzzy, "client_name": "itajuba"}
+    ) == {equipment.id}
+
+
+@pytest.mark.django_db
+def test_proposal_list_fuzzy_contact_name(manager_client):
+    proposal = ProposalFactory(contact_name="João Conceição")
+    ProposalFactory(contact_name="Maria Souza")
+
+    assert _list_ids(
+        manager_client,
+        "/api/proposals/",
+        {"match": "fuzzy", "contact_name": "joao conceicao"},
+    ) == {proposal.id}
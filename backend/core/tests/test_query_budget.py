@@ -0,0 +1,158 @@
+import logging
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from clients_management.models import Report
+from clients_management.views import ReportViewSet
+from core.query_budget import (
+    QueryBudgetExceededError,
+    QueryStats,
+    fingerprint,
+)
+from requisitions.models import (
+    ClientOperation,
+    EquipmentOperation,
+    UnitOperation,
+)
+from tests.factories import (
+    AppointmentFactory,
+    ClientOperationFactory,
+    EquipmentOperationFactory,
+    InstitutionalMaterialFactory,
+    ProposalFactory,
+    ReportFactory,
+    UnitOperationFactory,
+    UserFactory,
+)
+from users.models import UserAccount
+
+ITEMS = 3
+
+
+@pytest.fixture
+def manager_client() -> APIClient:
+    api_client = APIClient()
+    api_client.force_authenticate(
+        user=UserFactory(role=UserAccount.Role.PROPHY_MANAGER)
+    )
+    return api_client
+
+
+@pytest.fixture
+def listed_items() -> None:
+    accepted = ClientOperation.OperationStatus.ACCEPTED
+    for _ in range(ITEMS):
+        client = ClientOperationFactory(
+            operation_status=accepted, users=[UserFactory()]
+        )
+        unit = UnitOperationFactory(
+            operation_status=UnitOperation.OperationStatus.ACCEPTED,
+            client=client,
+            user=UserFactory(role=UserAccount.Role.UNIT_MANAGER),
+        )
+        EquipmentOperationFactory(
+            operation_status=EquipmentOperation.OperationStatus.ACCEPTED,
+            unit=unit,
+            manufacturer="Siemens",
+        )
+        ReportFactory(unit=unit, report_type=Report.ReportType.MEMORIAL)
+        AppointmentFactory(unit=unit)
+        ProposalFactory(cnpj=client.cnpj)
+        InstitutionalMaterialFactory(allowed_external_users=[UserFactory()])
+        ClientOperationFactory(users=[UserFactory()])
+        UnitOperationFactory(client=client)
+        EquipmentOperationFactory(unit=unit, manufacturer="GE")
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("listed_items")
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/api/clients/",
+        "/api/units/",
+        "/api/equipments/",
+        "/api/appointments/",
+        "/api/proposals/",
+        "/api/reports/",
+        "/api/reports/?pagination=cursor",
+        "/api/materials/",
+        "/api/clients/operations/",
+        "/api/units/operations/",
+        "/api/equipments/operations/",
+    ],
+)
+def test_list_queries_do_not_grow_with_the_page(
+    manager_client, assert_flat_queries, url
+):
+    assert_flat_queries(lambda: manager_client.get(url))
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("listed_items")
+def test_requests_record_their_queries(manager_client):
+    response = manager_client.get("/api/reports/")
+
+    stats = response.wsgi_request.query_stats
+    assert response.status_code == status.HTTP_200_OK
+    assert stats.count > 0
+    assert stats.duration > 0
+    assert stats.duplicates == {}
+
+
+@pytest.fixture
+def tight_report_budget(monkeypatch) -> None:
+    monkeypatch.setattr(ReportViewSet.list, "query_budget", 1)
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("listed_items", "tight_report_budget")
+def test_exceeding_a_budget_fails_in_strict_mode(manager_client):
+    with pytest.raises(QueryBudgetExceededError, match="over its budget"):
+        manager_client.get("/api/reports/")
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("listed_items", "tight_report_budget")
+def test_exceeding_a_budget_is_logged_otherwise(
+    manager_client, settings, caplog
+):
+    settings.QUERY_BUDGET_STRICT = False
+
+    with caplog.at_level(logging.WARNING, logger="core.middleware"):
+        response = manager_client.get("/api/reports/")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "GET /api/reports/ ran" in caplog.text
+
+
+def test_fingerprints_ignore_in_list_lengths():
+    assert fingerprint('SELECT 1 FROM "a" WHERE "id" IN (%s, %s)') == (
+        fingerprint('SELECT 1 FROM "a"\n WHERE "id" IN (%s)')
+    )
+
+
+@pytest.mark.django_db
+def test_database_cache_lookups_are_recorded_apart(settings):
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "test_cache",
+        }
+    }
+    call_command("createcachetable", verbosity=0)
+    cache.set("key", "value")
+    stats = QueryStats()
+
+    with connection.execute_wrapper(stats):
+        assert cache.get("key") == "value"
+        Report.objects.count()
+
+    assert stats.count == 1
+    assert stats.cache_count == 1
+    assert stats.cache_duration > 0
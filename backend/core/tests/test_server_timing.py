@@ -0,0 +1,96 @@
+import json
+import logging
+
+import pytest
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from clients_management.models import Report
+from core.timing import (
+    AUTH,
+    SERIALIZE,
+    start_request_timings,
+    stop_request_timings,
+    timed,
+)
+from tests.factories import (
+    ClientFactory,
+    ReportFactory,
+    UnitFactory,
+    UserFactory,
+)
+from users.models import UserAccount
+
+
+@pytest.fixture
+def physicist_client() -> APIClient:
+    physicist = UserFactory(role=UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST)
+    ReportFactory(
+        unit=UnitFactory(client=ClientFactory(users=[physicist])),
+        report_type=Report.ReportType.MEMORIAL,
+    )
+    api_client = APIClient()
+    api_client.credentials(
+        HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(physicist)}"
+    )
+    return api_client
+
+
+def _metrics(header: str) -> dict[str, str]:
+    return {metric.split(";")[0]: metric for metric in header.split(", ")}
+
+
+@pytest.mark.django_db
+def test_timing_is_opt_in(physicist_client):
+    response = physicist_client.get("/api/reports/")
+
+    assert "Server-Timing" not in response
+
+
+@pytest.mark.django_db
+def test_responses_break_their_latency_down(
+    physicist_client, settings, caplog
+):
+    settings.SERVER_TIMING_ENABLED = True
+
+    with caplog.at_level(logging.INFO, logger="core.timing"):
+        response = physicist_client.get("/api/reports/")
+
+    metrics = _metrics(response["Server-Timing"])
+    assert set(metrics) == {
+        "auth",
+        "permission",
+        "serialize",
+        "storage",
+        "db",
+        "cache",
+        "total",
+    }
+    queries = response.wsgi_request.query_stats.count
+    assert f'desc="{queries} queries"' in metrics["db"]
+
+    (record,) = [r for r in caplog.records if r.name == "core.timing"]
+    line = json.loads(record.getMessage())
+    assert line["view"] == "ReportViewSet"
+    assert line["action"] == "list"
+    assert line["status"] == response.status_code
+    assert line["db_queries"] == queries
+    assert line["durations_ms"]["auth"] > 0
+    assert line["durations_ms"]["serialize"] > 0
+
+
+def test_nested_phases_are_counted_once():
+    timings = start_request_timings()
+    try:
+        with timed(SERIALIZE), timed(AUTH):
+            pass
+    finally:
+        stop_request_timings()
+
+    assert timings.phases[SERIALIZE] > 0
+    assert timings.phases[AUTH] == 0
+
+
+def test_phases_outside_requests_are_ignored():
+    with timed(SERIALIZE):
+        pass
@@ -0,0 +1,144 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from clients_management.models import Report
+from clients_management.reference import get_modalities
+from requisitions.models import EquipmentOperation
+from tests.factories import (
+    AppointmentFactory,
+    ClientFactory,
+    EquipmentOperationFactory,
+    ReportFactory,
+    UnitFactory,
+    UserFactory,
+)
+from users.models import UserAccount
+
+
+@pytest.fixture
+def manager_client() -> APIClient:
+    api_client = APIClient()
+    api_client.force_authenticate(
+        user=UserFactory(role=UserAccount.Role.PROPHY_MANAGER)
+    )
+    return api_client
+
+
+def _memorials(count: int) -> list[Report]:
+    physicist = UserFactory(role=UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST)
+    client = ClientFactory(users=[physicist])
+    return [
+        ReportFactory(
+            unit=UnitFactory(client=client),
+            report_type=Report.ReportType.MEMORIAL,
+        )
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.django_db
+def test_reports_render_and_load_only_requested_fields(manager_client):
+    _memorials(3)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = manager_client.get(
+            "/api/reports/",
+            {"fields": "id,status,client_name", "count": "exact"},
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert {tuple(sorted(item)) for item in response.data["results"]} == {
+        ("client_name", "id", "status")
+    }
+    # The ETag tokens, the count and the page; responsibles are never
+    # looked up.
+    assert len(queries) == 3  # noqa: PLR2004
+    page_sql = queries[-1]["sql"]
+    assert '"description"' not in page_sql
+    assert '"pdf_file"' not in page_sql
+    assert '"clients_management_unit"' not in page_sql
+
+
+@pytest.mark.django_db
+def test_omitted_fields_are_dropped(manager_client):
+    (report,) = _memorials(1)
+
+    response = manager_client.get(
+        "/api/reports/", {"omit": "responsibles,responsibles_display"}
+    )
+
+    (item,) = response.data["results"]
+    assert item["id"] == report.pk
+    assert item["unit_name"] == report.unit.name
+    assert "responsibles" not in item
+    assert "responsibles_display" not in item
+
+
+@pytest.mark.django_db
+def test_cursor_pages_load_their_ordering_with_sparse_fields(manager_client):
+    _memorials(11)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = manager_client.get(
+            "/api/reports/", {"fields": "id", "pagination": "cursor"}
+        )
+
+    assert {tuple(item) for item in response.data["results"]} == {("id",)}
+    assert response.data["next"]
+    # Cursor values are read from the page without loading more.
+    assert len(queries) == 2  # noqa: PLR2004
+
+
+@pytest.mark.django_db
+def test_related_extras_are_joined_when_requested(
+    manager_client, django_assert_num_queries
+):
+    for _ in range(3):
+        EquipmentOperationFactory(
+            operation_status=EquipmentOperation.OperationStatus.ACCEPTED
+        )
+        AppointmentFactory()
+    # Modalities are rendered from the reference cache.
+    get_modalities()
+
+    with django_assert_num_queries(3):
+        response = manager_client.get(
+            "/api/equipments/",
+            {"fields": "id,modality,client_name", "count": "exact"},
+        )
+    assert len(response.data["results"]) == 3  # noqa: PLR2004
+    assert set(response.data["results"][0]["modality"]) == {
+        "id",
+        "name",
+        "accessory_type",
+    }
+
+    with django_assert_num_queries(2):
+        response = manager_client.get(
+            "/api/appointments/",
+            {"fields": "id,unit_full_address,type_display", "count": "exact"},
+        )
+    assert all(
+        set(item) == {"id", "unit_full_address", "type_display"}
+        for item in response.data["results"]
+    )
+
+
+@pytest.mark.django_db
+def test_requisition_lists_accept_sparse_fieldsets(manager_client):
+    operation = EquipmentOperationFactory(
+        operation_status=EquipmentOperation.OperationStatus.REVIEW,
+        operation_type=EquipmentOperation.OperationType.ADD,
+    )
+
+    response = manager_client.get(
+        "/api/equipments/operations/", {"fields": "id,manufacturer"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["results"] == [
+        {"id": operation.pk, "manufacturer": operation.manufacturer}
+    ]
@@ -0,0 +1,76 @@
+"""Latency breakdown of API requests.
+
+With ``SERVER_TIMING_ENABLED``, ``ServerTimingMiddleware`` (see
+``core.middleware``) reports where the time of each request went, both
+in a ``Server-Timing`` header and in a JSON log line tagged with the
+view and action, from which per-endpoint percentiles can be computed.
+
+Code marks its phases with ``timed``, which does nothing outside an
+instrumented request. Nested phases are counted in the outermost one
+only, so the phases never add up to more than the request took. The
+database time, and the time spent in database cache lookups, are
+reported separately from ``request.query_stats`` and overlap the
+phases.
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+AUTH = "auth"
+PERMISSION = "permission"
+SERIALIZE = "serialize"
+STORAGE = "storage"
+
+PHASES = (AUTH, PERMISSION, SERIALIZE, STORAGE)
+
+
+@dataclass
+class RequestTimings:
+    """Time spent in each phase of a request.
+
+    Attributes:
+        phases: Seconds spent in each phase, by name.
+        active: Whether a phase is being timed.
+    """
+
+    phases: dict[str, float] = field(
+        default_factory=lambda: dict.fromkeys(PHASES, 0.0)
+    )
+    active: bool = False
+
+
+_current: ContextVar[RequestTimings | None] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def start_request_timings() -> RequestTimings:
+    """Start collecting the timings of the current request."""
+    timings = RequestTimings()
+    _current.set(timings)
+    return timings
+
+
+def stop_request_timings() -> None:
+    """Stop collecting timings for the current request."""
+    _current.set(None)
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """Add the time spent in the block to ``phase`` of the request."""
+    timings = _current.get()
+    if timings is None or timings.active:
+        yield
+        return
+
+    timings.active = True
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.phases[phase] += time.perf_counter() - start
+        timings.active = False
@@ -0,0 +1,262 @@
+"""Resumable chunked uploads of large files.
+
+Hospital networks often drop long uploads, and a multipart request has
+to be sent again from its first byte. Instead, a client may:
+
+1. start an upload with ``POST /api/uploads/`` and the file's
+   ``filename`` and ``size``;
+2. send the file in order, one chunk per
+   ``PUT /api/uploads/{id}/`` with a
+   ``Content-Range: bytes {start}-{end}/{size}`` header. Each chunk is
+   stored in the media storage as soon as it arrives;
+3. after a dropped connection, read the received ``offset`` with
+   ``GET /api/uploads/{id}/`` and resume from there;
+4. once every byte arrived, send ``{field}_upload={id}`` instead of
+   ``{field}`` to an endpoint accepting the file (reports, materials
+   and proposals). The stored chunks are streamed, one after the
+   other, into the file's final location, then deleted.
+
+Uploads that received no chunk for ``UPLOAD_EXPIRY`` are deleted by
+the ``purge_expired_uploads`` command, which Cloud Scheduler runs daily.
+"""
+
+import os
+import re
+import uuid
+from bisect import bisect_right
+from collections.abc import Iterable
+from datetime import timedelta
+from typing import Any
+
+from django.core.files import File
+from django.db.models import F
+from django.http import QueryDict
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.request import Request
+
+from core.constants import MAX_DOCUMENT_FILE_SIZE_MB
+from core.models import ChunkedUpload, ChunkedUploadPart
+
+UPLOAD_FIELD_SUFFIX = "_upload"
+MAX_UPLOAD_SIZE = MAX_DOCUMENT_FILE_SIZE_MB * 1024 * 1024
+MAX_CHUNK_SIZE = 2 * 1024 * 1024
+UPLOAD_EXPIRY = timedelta(days=1)
+
+CONTENT_RANGE = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+
+
+class ContentRangeError(ValueError):
+    """Raised when a chunk's Content-Range header is malformed."""
+
+
+def parse_content_range(header: str | None) -> tuple[int, int, int]:
+    """Read the range of a chunk from its Content-Range header.
+
+    Args:
+        header: A ``bytes {start}-{end}/{size}`` header value, where
+            ``end`` is inclusive.
+
+    Returns:
+        tuple[int, int, int]: The start and exclusive end of the chunk,
+            and the size of the whole file.
+
+    Raises:
+        ContentRangeError: If the header is missing or malformed.
+    """
+    match = CONTENT_RANGE.match(header or "")
+    if match is None:
+        raise ContentRangeError(
+            "Send each chunk with a 'Content-Range: bytes "
+            "{start}-{end}/{size}' header."
+        )
+    start, end, size = (int(value) for value in match.groups())
+    if end < start or end >= size:
+        raise ContentRangeError("The Content-Range is out of bounds.")
+    return start, end + 1, size
+
+
+class ChunkedUploadSerializer(serializers.ModelSerializer):
+    size = serializers.IntegerField(min_value=1, max_value=MAX_UPLOAD_SIZE)
+
+    class Meta:
+        model = ChunkedUpload
+        fields = [
+            "id",
+            "filename",
+            "size",
+            "offset",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = ["id", "offset", "created_at", "updated_at"]
+
+
+def _as_uuid(value: Any) -> uuid.UUID | None:
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+def purge_expired_uploads() -> int:
+    """Delete the uploads that received no chunk for ``UPLOAD_EXPIRY``.
+
+    Uploads still receiving chunks are kept, however long ago they
+    were started.
+
+    Returns:
+        int: The number of uploads deleted.
+    """
+    expired = ChunkedUpload.objects.filter(
+        updated_at__lt=timezone.now() - UPLOAD_EXPIRY
+    ).prefetch_related("parts")
+    count = 0
+    for upload in expired:
+        upload.discard()
+        count += 1
+    return count
+
+
+class _PartsReader:
+    """Reads the stored chunks of an upload as one seekable stream."""
+
+    closed = False
+
+    def __init__(self, parts: list[ChunkedUploadPart], size: int) -> None:
+        self.parts = parts
+        self.size = size
+        self._starts = [part.offset for part in parts]
+        self._position = 0
+        self._next_part = 0
+        self._current: Any = None
+
+    def read(self, size: int = -1) -> bytes:
+        data = []
+        while size:
+            if self._current is None:
+                if self._next_part >= len(self.parts):
+                    break
+                part = self.parts[self._next_part]
+                self._next_part += 1
+                self._current = part.file.storage.open(part.file.name, "rb")
+                if self._position > part.offset:
+                    self._current.seek(self._position - part.offset)
+            chunk = self._current.read(size)
+            if not chunk:
+                self._current.close()
+                self._current = None
+                continue
+            data.append(chunk)
+            self._position += len(chunk)
+            if size > 0:
+                size -= len(chunk)
+        return b"".join(data)
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += self.size
+        if offset < 0:
+            raise OSError("Cannot seek before the start of the upload.")
+        self.close()
+        self._position = offset
+        # The next read opens the part holding ``offset``.
+        self._next_part = (
+            max(bisect_right(self._starts, offset) - 1, 0)
+            if offset < self.size
+            else len(self.parts)
+        )
+        return offset
+
+    def tell(self) -> int:
+        return self._position
+
+    def close(self) -> None:
+        if self._current is not None:
+            self._current.close()
+            self._current = None
+
+
+class ChunkedFile(File):
+    """A completed upload, read from its stored chunks.
+
+    Its size is the one the upload was started with, so validators
+    run without reading it, and storages read it in chunks.
+    """
+
+    def __init__(self, upload: ChunkedUpload) -> None:
+        self.upload = upload
+        super().__init__(
+            _PartsReader(list(upload.parts.all()), upload.size),
+            name=upload.filename,
+        )
+
+    @property
+    def size(self) -> int:
+        return self.upload.size
+
+
+def resolve_chunked_uploads(
+    request: Request, fields: Iterable[str]
+) -> tuple[Any, list[ChunkedUpload]]:
+    """Replace the ``{field}_upload`` ids of a request with their files.
+
+    Args:
+        request: A request that may send the file fields ``fields``
+            as completed uploads of its user.
+        fields: The file fields the request may send.
+
+    Returns:
+        tuple[Any, list[ChunkedUpload]]: The request data with a
+            ``ChunkedFile`` for each referenced upload, and the uploads,
+            to ``discard`` once their files are saved.
+
+    Raises:
+        serializers.ValidationError: If an id does not name a completed
+            upload of the user.
+    """
+    references = {
+        field: request.data[field + UPLOAD_FIELD_SUFFIX]
+        for field in fields
+        if request.data.get(field + UPLOAD_FIELD_SUFFIX)
+    }
+    if not references:
+        return request.data, []
+
+    ids = {field: _as_uuid(value) for field, value in references.items()}
+    uploads = (
+        ChunkedUpload.objects.filter(user=request.user, offset=F("size"))
+        .prefetch_related("parts")
+        .in_bulk({upload_id for upload_id in ids.values() if upload_id})
+    )
+    errors = {}
+    files = {}
+    for field, upload_id in ids.items():
+        upload = uploads.get(upload_id)
+        if upload is None:
+            errors[field + UPLOAD_FIELD_SUFFIX] = [
+                "No completed upload with this id."
+            ]
+        else:
+            files[field] = ChunkedFile(upload)
+    if errors:
+        raise serializers.ValidationError(errors)
+
+    if isinstance(request.data, QueryDict):
+        # Copied list by list: deep-copying would copy uploaded files.
+        data = QueryDict(mutable=True)
+        for key, values in request.data.lists():
+            data.setlist(key, values)
+    else:
+        data = dict(request.data)
+    for field, file in files.items():
+        data[field] = file
+    return data, [file.upload for file in files.values()]
+
+
+def discard_uploads(uploads: Iterable[ChunkedUpload]) -> None:
+    """Delete uploads whose files were saved, with their chunks."""
+    for upload in uploads:
+        upload.discard()
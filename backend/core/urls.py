@@ -5,8 +5,13 @@ from django.urls import include, path
 from drf_yasg import openapi
 from drf_yasg.views import get_schema_view
 from rest_framework import permissions
+from rest_framework.routers import DefaultRouter
 
-from core.views import HealthCheckView
+from core.views import (
+    ChunkedUploadViewSet,
+    HealthCheckView,
+    TriggerPurgeExpiredUploadsView,
+)
 
 schema_view = get_schema_view(
     openapi.Info(
@@ -26,6 +31,9 @@ schema_view = get_schema_view(
     permission_classes=(permissions.AllowAny,),
 )
 
+upload_router = DefaultRouter()
+upload_router.register(r"", ChunkedUploadViewSet, basename="uploads")
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/health/", HealthCheckView.as_view(), name="health-check"),
@@ -33,6 +41,12 @@ urlpatterns = [
     path("api/", include("clients_management.urls")),
     path("api/", include("requisitions.urls")),
     path("api/", include("materials.urls")),
+    path(
+        "api/uploads/tasks/purge-expired/",
+        TriggerPurgeExpiredUploadsView.as_view(),
+        name="trigger_purge_expired_uploads",
+    ),
+    path("api/uploads/", include(upload_router.urls)),
     path(
         "api/docs/",
         schema_view.with_ui("swagger", cache_timeout=0),
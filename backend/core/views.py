@@ -1,14 +1,31 @@
 from __future__ import annotations
 
 import logging
+from io import StringIO
 
-from django.db import DatabaseError, connection
-from rest_framework import status
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.db import DatabaseError, connection, transaction
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status, viewsets
 from rest_framework.permissions import AllowAny
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from core.models import ChunkedUpload, ChunkedUploadPart
+from core.uploads import (
+    MAX_CHUNK_SIZE,
+    MAX_UPLOAD_SIZE,
+    ChunkedUploadSerializer,
+    ContentRangeError,
+    parse_content_range,
+)
+from users.authentication import GoogleOIDCAuthentication
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,3 +51,197 @@ class HealthCheckView(APIView):
             )
 
         return Response({"status": "ok"}, status=status.HTTP_200_OK)
+
+
+class ChunkedUploadViewSet(viewsets.ViewSet):
+    """Viewset for resumable chunked uploads (see ``core.uploads``)."""
+
+    lookup_value_regex = "[0-9a-f-]{36}"
+
+    @swagger_auto_schema(
+        operation_summary="Start a chunked upload",
+        operation_description=f"""
+        Start a resumable upload of a file of up to {MAX_UPLOAD_SIZE}
+        bytes, then send it with `PUT /api/uploads/{{id}}/`. Once
+        complete, send the upload's id as `{{field}}_upload` instead of
+        the file to the report, material or proposal endpoints.
+        Uploads that receive no chunk for a day are deleted.
+        """,
+        request_body=ChunkedUploadSerializer,
+        responses={
+            201: ChunkedUploadSerializer,
+            400: "Invalid input data",
+            401: "Unauthorized access",
+        },
+    )
+    def create(self, request: Request) -> Response:
+        serializer = ChunkedUploadSerializer(data=request.data)
+        if serializer.is_valid():
+            serializer.save(user=request.user)
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    @swagger_auto_schema(
+        operation_summary="Get the progress of a chunked upload",
+        operation_description="""
+        Return how many bytes of the file were received, in `offset`.
+        After a dropped connection, resume sending from there.
+        """,
+        responses={
+            200: ChunkedUploadSerializer,
+            401: "Unauthorized access",
+            404: "Upload not found",
+        },
+    )
+    def retrieve(self, request: Request, pk: str) -> Response:
+        upload = get_object_or_404(ChunkedUpload, pk=pk, user=request.user)
+        return Response(ChunkedUploadSerializer(upload).data)
+
+    @swagger_auto_schema(
+        operation_summary="Send a chunk of a chunked upload",
+        operation_description=f"""
+        Send the next chunk of the file, of up to {MAX_CHUNK_SIZE}
+        bytes, as the raw request body with a
+        `Content-Range: bytes {{start}}-{{end}}/{{size}}` header.
+        `start` must be the upload's current `offset`; otherwise the
+        chunk is rejected with a 409 response holding the `offset` to
+        resume from.
+        """,
+        manual_parameters=[
+            openapi.Parameter(
+                name="Content-Range",
+                in_=openapi.IN_HEADER,
+                type=openapi.TYPE_STRING,
+                required=True,
+                description="bytes {start}-{end}/{size}, end inclusive",
+            ),
+        ],
+        responses={
+            200: ChunkedUploadSerializer,
+            400: "Malformed or inconsistent Content-Range",
+            401: "Unauthorized access",
+            404: "Upload not found",
+            409: "The chunk does not start at the upload's offset",
+            413: "The chunk is too large",
+        },
+    )
+    def update(self, request: Request, pk: str) -> Response:
+        upload = get_object_or_404(ChunkedUpload, pk=pk, user=request.user)
+        try:
+            start, end, size = parse_content_range(
+                request.headers.get("Content-Range")
+            )
+        except ContentRangeError as exc:
+            return Response(
+                {"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST
+            )
+        if size != upload.size:
+            return Response(
+                {"detail": f"The upload is {upload.size} bytes long."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if end - start > MAX_CHUNK_SIZE:
+            return Response(
+                {"detail": f"Chunks are at most {MAX_CHUNK_SIZE} bytes."},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+        if start != upload.offset:
+            return self._offset_conflict(upload)
+
+        content = request.body
+        if len(content) != end - start:
+            return Response(
+                {"detail": "The chunk does not match its Content-Range."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        with transaction.atomic():
+            # Only one of concurrent requests sending the same chunk
+            # claims the offset; the others wait for it, then are
+            # rejected without storing anything.
+            advanced = ChunkedUpload.objects.filter(
+                pk=upload.pk, offset=start
+            ).update(offset=end, updated_at=timezone.now())
+            if advanced:
+                part = ChunkedUploadPart(upload=upload, offset=start)
+                try:
+                    part.file.save(upload.filename, ContentFile(content))
+                except Exception:
+                    # The claim is rolled back, so the chunk can be sent
+                    # again.
+                    part.file.delete(save=False)
+                    raise
+        if not advanced:
+            upload.refresh_from_db()
+            return self._offset_conflict(upload)
+
+        upload.offset = end
+        return Response(ChunkedUploadSerializer(upload).data)
+
+    @swagger_auto_schema(
+        operation_summary="Cancel a chunked upload",
+        operation_description="Delete the upload and its stored chunks.",
+        responses={
+            204: "Upload deleted",
+            401: "Unauthorized access",
+            404: "Upload not found",
+        },
+    )
+    def destroy(self, request: Request, pk: str) -> Response:
+        upload = get_object_or_404(ChunkedUpload, pk=pk, user=request.user)
+        upload.discard()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    def _offset_conflict(self, upload: ChunkedUpload) -> Response:
+        return Response(
+            {
+                "detail": "Resume the upload from its offset.",
+                "offset": upload.offset,
+            },
+            status=status.HTTP_409_CONFLICT,
+        )
+
+
+class TriggerPurgeExpiredUploadsView(APIView):
+    """A secure API view to be triggered by Google Cloud Scheduler.
+
+    This view is protected by OIDC authentication, ensuring that only
+    authenticated Google services can access it. When a valid POST
+    request is received, it executes the `purge_expired_uploads`
+    management command.
+    """
+
+    authentication_classes = [GoogleOIDCAuthentication]
+
+    def post(self, request: Request, *args, **kwargs) -> Response:
+        """Handle the POST request from Cloud Scheduler."""
+        logger.info("Received request to purge expired uploads...")
+        try:
+            output = StringIO()
+            call_command("purge_expired_uploads", stdout=output)
+            command_output = output.getvalue()
+
+            logger.info(
+                "Command 'purge_expired_uploads' executed successfully. "
+                "Output: %s",
+                command_output.strip(),
+            )
+            return Response(
+                {
+                    "status": "ok",
+                    "message": "purge_expired_uploads executed",
+                    "output": command_output,
+                },
+                status=status.HTTP_200_OK,
+            )
+        except Exception as e:
+            logger.error(
+                "An error occurred while running purge_expired_uploads "
+                "command: %s",
+                e,
+                exc_info=True,
+            )
+            return Response(
+                {"status": "error", "message": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
@@ -11,5 +11,5 @@ echo -e "yes" | python manage.py flush
 # Remove all local media files
 python manage.py clean_local_media --force
 
-# Run the populate command
-python manage.py populate
+# Run the populate command, forwarding options such as --scale
+python manage.py populate "$@"
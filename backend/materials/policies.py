@@ -0,0 +1,54 @@
+"""Access policy of the institutional materials.
+
+Public materials are open to everyone. Internal ones are open to Prophy
+managers and internal physicists, and to the external physicists they
+were shared with.
+"""
+
+from django.db.models import Exists, OuterRef, Q, QuerySet
+
+from core.permissions import ObjectPolicy
+from materials.models import InstitutionalMaterial
+from users.models import UserAccount
+
+FULL_ACCESS_ROLES = frozenset(
+    {
+        UserAccount.Role.PROPHY_MANAGER,
+        UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST,
+    }
+)
+
+
+class MaterialPolicy(ObjectPolicy):
+    """The institutional materials each user may see and download."""
+
+    model = InstitutionalMaterial
+
+    def is_unrestricted(self, user: UserAccount) -> bool:
+        """Return whether ``user`` sees internal materials too."""
+        return user.role in FULL_ACCESS_ROLES
+
+    def apply(self, queryset: QuerySet, user: UserAccount) -> QuerySet:
+        """Restrict ``queryset`` to the materials ``user`` may see.
+
+        Shares are matched with ``EXISTS`` rather than a join, so no
+        ``DISTINCT`` is needed.
+        """
+        if self.is_unrestricted(user):
+            return queryset
+
+        visible = Q(visibility=InstitutionalMaterial.Visibility.PUBLIC)
+        if user.role == UserAccount.Role.EXTERNAL_MEDICAL_PHYSICIST:
+            shares = InstitutionalMaterial.allowed_external_users.through
+            visible |= Q(
+                Exists(
+                    shares.objects.filter(
+                        institutionalmaterial_id=OuterRef("pk"),
+                        useraccount_id=user.pk,
+                    )
+                )
+            )
+        return queryset.filter(visible)
+
+
+MATERIALS = MaterialPolicy()
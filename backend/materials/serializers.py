@@ -1,11 +1,16 @@
 from rest_framework import serializers
 
+from core.fieldsets import SparseFieldsetMixin
 from users.models import UserAccount
 
 from .models import InstitutionalMaterial
 
 
-class InstitutionalMaterialSerializer(serializers.ModelSerializer):
+class InstitutionalMaterialSerializer(
+    SparseFieldsetMixin, serializers.ModelSerializer
+):
+    computed_sources = {"file_name": ("file",)}
+
     class Meta:
         model = InstitutionalMaterial
         fields = "__all__"
@@ -14,7 +19,7 @@ class InstitutionalMaterialSerializer(serializers.ModelSerializer):
         self, instance: InstitutionalMaterial
     ) -> dict[str, object]:
         representation = super().to_representation(instance)
-        if instance.file and instance.file.name:
+        if self.wants("file_name") and instance.file and instance.file.name:
             representation["file_name"] = instance.file.name.split("/")[-1]
         return representation
 
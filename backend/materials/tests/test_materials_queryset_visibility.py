@@ -2,6 +2,7 @@ import pytest
 from rest_framework import status
 
 from materials.models import InstitutionalMaterial
+from materials.policies import MATERIALS
 from tests.factories import InstitutionalMaterialFactory, UserFactory
 from users.models import UserAccount
 
@@ -144,3 +145,27 @@ def test_external_physicist_filter_visibility_internal_does_not_leak(
     ids = {item["id"] for item in response.data["results"]}
     assert allowed_internal.id in ids
     assert hidden_internal.id not in ids
+
+
+@pytest.mark.django_db
+def test_external_physicist_access_is_checked_in_bulk(
+    django_assert_num_queries,
+):
+    external = UserFactory(role=UserAccount.Role.EXTERNAL_MEDICAL_PHYSICIST)
+    public_material = InstitutionalMaterialFactory()
+    shared, hidden = (
+        InstitutionalMaterialFactory(
+            visibility=InstitutionalMaterial.Visibility.INTERNAL,
+            category=InstitutionalMaterial.InternalCategory.REPORT_TEMPLATES,
+        )
+        for _ in range(2)
+    )
+    shared.allowed_external_users.set([external])
+
+    with django_assert_num_queries(1):
+        accessible = MATERIALS.accessible_pks(
+            external, [public_material, shared, hidden.pk]
+        )
+
+    assert accessible == {public_material.pk, shared.pk}
+    assert not MATERIALS.has_access(external, hidden)
@@ -1,7 +1,7 @@
 import os
 from typing import cast
 
-from django.db.models import Q, QuerySet
+from django.db.models import QuerySet
 from django.http import FileResponse, HttpResponse
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
@@ -12,10 +12,16 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from core.pagination import PaginationMixin
+from core.conditional import conditional_get
+from core.fieldsets import FIELDSET_PARAMETERS
+from core.pagination import CURSOR_PAGINATION_PARAMETERS, PaginationMixin
+from core.query_budget import query_budget
+from core.timing import STORAGE, timed
+from core.uploads import discard_uploads, resolve_chunked_uploads
 from users.models import UserAccount
 
 from .models import InstitutionalMaterial
+from .policies import MATERIALS
 from .schemas import MaterialListQuery, SetPermissionsBody
 from .serializers import (
     InstitutionalMaterialCreateSerializer,
@@ -30,26 +36,7 @@ class InstitutionalMaterialViewSet(PaginationMixin, viewsets.ModelViewSet):
 
     def get_queryset(self) -> QuerySet[InstitutionalMaterial]:
         user: UserAccount = cast(UserAccount, self.request.user)
-        base = InstitutionalMaterial.objects.all()
-
-        match user.role:
-            case (
-                UserAccount.Role.PROPHY_MANAGER
-                | UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST
-            ):
-                return base
-            case UserAccount.Role.EXTERNAL_MEDICAL_PHYSICIST:
-                return base.filter(
-                    Q(visibility=InstitutionalMaterial.Visibility.PUBLIC)
-                    | Q(
-                        visibility=InstitutionalMaterial.Visibility.INTERNAL,
-                        allowed_external_users=user,
-                    )
-                ).distinct()
-            case _:
-                return base.filter(
-                    visibility=InstitutionalMaterial.Visibility.PUBLIC
-                )
+        return MATERIALS.apply(InstitutionalMaterial.objects.all(), user)
 
     @swagger_auto_schema(
         operation_summary="List institutional materials",
@@ -86,14 +73,20 @@ class InstitutionalMaterialViewSet(PaginationMixin, viewsets.ModelViewSet):
                     "Search materials by title (case-insensitive contains)"
                 ),
             ),
+            *CURSOR_PAGINATION_PARAMETERS,
+            *FIELDSET_PARAMETERS,
         ],
         responses={
             200: InstitutionalMaterialSerializer(many=True),
             401: "Unauthorized",
         },
     )
+    @query_budget(5)
+    @conditional_get(InstitutionalMaterial, UserAccount)
     def list(self, request: Request) -> Response:
-        queryset = self.get_queryset()
+        queryset = self.get_queryset().prefetch_related(
+            "allowed_external_users"
+        )
         params = MaterialListQuery.model_validate(
             {
                 "visibility": request.query_params.get("visibility"),
@@ -107,6 +100,10 @@ class InstitutionalMaterialViewSet(PaginationMixin, viewsets.ModelViewSet):
             queryset, request, self.get_serializer_class()
         )
 
+    @conditional_get(InstitutionalMaterial, UserAccount)
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        return super().retrieve(request, *args, **kwargs)
+
     @swagger_auto_schema(
         operation_summary="Create institutional material",
         operation_description=(
@@ -114,7 +111,9 @@ class InstitutionalMaterialViewSet(PaginationMixin, viewsets.ModelViewSet):
             "can create Public or Internal; INTERNAL_MEDICAL_"
             "PHYSICIST may create only Public materials (no "
             "specific permissions). EXTERNAL_MEDICAL_PHYSICIST "
-            "cannot create materials."
+            "cannot create materials. The file can be sent beforehand "
+            "as a resumable chunked upload (see /api/uploads/), "
+            "passing its id as file_upload."
         ),
         request_body=InstitutionalMaterialCreateSerializer,
         responses={
@@ -154,9 +153,11 @@ class InstitutionalMaterialViewSet(PaginationMixin, viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-        serializer = InstitutionalMaterialCreateSerializer(data=request.data)
+        data, uploads = resolve_chunked_uploads(request, ("file",))
+        serializer = InstitutionalMaterialCreateSerializer(data=data)
         if serializer.is_valid():
             serializer.save()
+            discard_uploads(uploads)
             return Response(
                 InstitutionalMaterialSerializer(serializer.instance).data,
                 status=status.HTTP_201_CREATED,
@@ -368,7 +369,7 @@ class InstitutionalMaterialDownloadView(APIView):
             )
 
         user: UserAccount = cast(UserAccount, request.user)
-        if not self._has_access(user, material):
+        if not MATERIALS.has_access(user, material):
             return Response(
                 {
                     "detail": (
@@ -388,29 +389,11 @@ class InstitutionalMaterialDownloadView(APIView):
         extension = ext or ".pdf"
         download_name = f"material_{material.id}{extension}"
 
-        file_obj = material.file.open("rb")
+        with timed(STORAGE):
+            file_obj = material.file.open("rb")
         return FileResponse(
             file_obj,
             as_attachment=True,
             filename=download_name,
             content_type="application/octet-stream",
         )
-
-    def _has_access(
-        self, user: UserAccount, material: InstitutionalMaterial
-    ) -> bool:
-        match (material.visibility, user.role):
-            case (InstitutionalMaterial.Visibility.PUBLIC, _):
-                return True
-            case (
-                _,
-                UserAccount.Role.PROPHY_MANAGER
-                | UserAccount.Role.INTERNAL_MEDICAL_PHYSICIST,
-            ):
-                return True
-            case (_, UserAccount.Role.EXTERNAL_MEDICAL_PHYSICIST):
-                return material.allowed_external_users.filter(
-                    pk=user.pk
-                ).exists()
-            case _:
-                return False
@@ -5,3 +5,6 @@ class RequisitionsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "requisitions"
     verbose_name = "Requisições"
+
+    def ready(self) -> None:
+        from requisitions import signals  # noqa: F401
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.16 on 2026-10-17 02:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients_management', '0018_index_pack'),
+        ('requisitions', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='clientoperation',
+            index=models.Index(condition=models.Q(('operation_status__in', ['REV', 'R'])), fields=['operation_status'], name='clientop_open_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipmentoperation',
+            index=models.Index(condition=models.Q(('operation_status__in', ['REV', 'R'])), fields=['operation_status'], name='equipmentop_open_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='unitoperation',
+            index=models.Index(condition=models.Q(('operation_status__in', ['REV', 'R'])), fields=['operation_status'], name='unitop_open_status_idx'),
+        ),
+    ]
@@ -1,15 +1,25 @@
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.db import models
-from django.db.models import TextChoices
+from django.db.models import Exists, OuterRef, Q, QuerySet, TextChoices
 
 from clients_management.models import Accessory, Client, Equipment, Unit
+from core.conditional import touch_models
+from core.counting import invalidate_model_counts
 
 User = get_user_model()
 
 
 class BaseOperation(models.Model):
-    """Abstract base model for a standardized operation workflow."""
+    """Abstract base model for a standardized operation workflow.
+
+    Attributes:
+        client_cnpj_lookups: Lookups resolving the CNPJs of the clients
+            an operation refers to, directly and through its original
+            entity.
+    """
+
+    client_cnpj_lookups: tuple[str, ...] = ()
 
     class OperationType(TextChoices):
         ADD = "A", "Adicionar"
@@ -73,6 +83,21 @@ class BaseOperation(models.Model):
         """Override in subclasses for entity-specific filtering."""
         raise NotImplementedError("Subclasses must implement this method")
 
+    def get_client_cnpjs(self) -> set[str]:
+        """Return the CNPJs of the clients the operation refers to.
+
+        The values are read from the database, so they reflect the
+        operation as last saved rather than unsaved changes.
+        """
+        if self.pk is None:
+            return set()
+
+        manager = self.__class__.objects  # type: ignore[attr-defined]
+        rows = manager.filter(pk=self.pk).values_list(
+            *self.client_cnpj_lookups
+        )
+        return {cnpj for row in rows for cnpj in row if cnpj}
+
     def save(self, *args, **kwargs) -> None:
         """Custom save method to handle operation logic."""
         self.full_clean()
@@ -101,6 +126,16 @@ class BaseOperation(models.Model):
         super().save(*args, **kwargs)
 
 
+# Accepted operations are the bulk of each table; the lists and the
+# pending checks only look at the ones under review or rejected.
+OPEN_OPERATIONS = Q(
+    operation_status__in=[
+        BaseOperation.OperationStatus.REVIEW,
+        BaseOperation.OperationStatus.REJECTED,
+    ]
+)
+
+
 class ClientOperation(BaseOperation, Client):
     """Model representing an operation on client data."""
 
@@ -123,6 +158,8 @@ class ClientOperation(BaseOperation, Client):
         help_text="Cliente original associado à operação.",
     )
 
+    client_cnpj_lookups = ("cnpj", "original_client__cnpj")
+
     def clean(self):
         super().clean()
 
@@ -209,6 +246,13 @@ class ClientOperation(BaseOperation, Client):
     class Meta:
         verbose_name = "Operação de Cliente"
         verbose_name_plural = "Operações de Clientes"
+        indexes = [
+            models.Index(
+                fields=["operation_status"],
+                condition=OPEN_OPERATIONS,
+                name="clientop_open_status_idx",
+            ),
+        ]
 
 
 class UnitOperation(BaseOperation, Unit):
@@ -233,6 +277,8 @@ class UnitOperation(BaseOperation, Unit):
         help_text="Unidade original associada à operação.",
     )
 
+    client_cnpj_lookups = ("client__cnpj", "original_unit__client__cnpj")
+
     def clean(self):
         super().clean()
 
@@ -295,6 +341,13 @@ class UnitOperation(BaseOperation, Unit):
     class Meta:
         verbose_name = "Operação de Unidade"
         verbose_name_plural = "Operações de Unidades"
+        indexes = [
+            models.Index(
+                fields=["operation_status"],
+                condition=OPEN_OPERATIONS,
+                name="unitop_open_status_idx",
+            ),
+        ]
 
 
 class EquipmentOperation(BaseOperation, Equipment):
@@ -319,6 +372,11 @@ class EquipmentOperation(BaseOperation, Equipment):
         help_text="Equipamento original associado à operação.",
     )
 
+    client_cnpj_lookups = (
+        "unit__client__cnpj",
+        "original_equipment__unit__client__cnpj",
+    )
+
     def clean(self):
         super().clean()
 
@@ -400,3 +458,69 @@ class EquipmentOperation(BaseOperation, Equipment):
     class Meta:
         verbose_name = "Operação de Equipamento"
         verbose_name_plural = "Operações de Equipamentos"
+        indexes = [
+            models.Index(
+                fields=["operation_status"],
+                condition=OPEN_OPERATIONS,
+                name="equipmentop_open_status_idx",
+            ),
+        ]
+
+
+def pending_operations_condition() -> Q:
+    """Match clients whose CNPJ has an operation under review.
+
+    An operation counts for a CNPJ both when it is staged for a client
+    with that CNPJ and when it edits or removes one of its entities.
+    """
+    client_operations = ClientOperation.objects.filter(
+        Q(cnpj=OuterRef("cnpj")) | Q(original_client__cnpj=OuterRef("cnpj")),
+        operation_status=ClientOperation.OperationStatus.REVIEW,
+    )
+    unit_operations = UnitOperation.objects.filter(
+        Q(client__cnpj=OuterRef("cnpj"))
+        | Q(original_unit__client__cnpj=OuterRef("cnpj")),
+        operation_status=UnitOperation.OperationStatus.REVIEW,
+    )
+    equipment_operations = EquipmentOperation.objects.filter(
+        Q(unit__client__cnpj=OuterRef("cnpj"))
+        | Q(original_equipment__unit__client__cnpj=OuterRef("cnpj")),
+        operation_status=EquipmentOperation.OperationStatus.REVIEW,
+    )
+    return (
+        Q(Exists(client_operations))
+        | Q(Exists(unit_operations))
+        | Q(Exists(equipment_operations))
+    )
+
+
+def sync_pending_operations(clients: QuerySet[Client]) -> int:
+    """Align ``Client.has_pending_operations`` with the operations.
+
+    Only rows whose flag is wrong are written.
+
+    Args:
+        clients: The clients to recompute the flag for.
+
+    Returns:
+        int: The number of clients whose flag changed.
+    """
+    pending = pending_operations_condition()
+    changed = clients.filter(pending, has_pending_operations=False).update(
+        has_pending_operations=True
+    )
+    changed += clients.filter(~pending, has_pending_operations=True).update(
+        has_pending_operations=False
+    )
+    if changed:
+        invalidate_model_counts(Client)
+        touch_models(Client)
+    return changed
+
+
+def refresh_pending_operations(*cnpjs: str | None) -> int:
+    """Recompute the pending flag of the clients with ``cnpjs``."""
+    values = {cnpj for cnpj in cnpjs if cnpj}
+    if not values:
+        return 0
+    return sync_pending_operations(Client.objects.filter(cnpj__in=values))
@@ -0,0 +1,51 @@
+"""Row-level access policies of the requisition review lists.
+
+Only Prophy managers see every open operation; commercial users are
+restricted to the clients they are responsible for, like customers.
+"""
+
+from django.db.models import Q
+
+from clients_management.models import Client
+from clients_management.policies import RowPolicy, Rule
+from requisitions.models import (
+    BaseOperation,
+    EquipmentOperation,
+    UnitOperation,
+)
+from users.models import UserAccount
+
+Role = UserAccount.Role
+
+OPEN_STATUSES = [
+    BaseOperation.OperationStatus.REVIEW,
+    BaseOperation.OperationStatus.REJECTED,
+]
+
+OPEN_CLIENT_OPERATIONS = RowPolicy(
+    Client,
+    default=Rule("", "client_ids"),
+    rules={
+        # Unit managers see clients with open operations on their units.
+        Role.UNIT_MANAGER: Rule(
+            "units",
+            "unit_ids",
+            Q(operation__operation_status__in=OPEN_STATUSES),
+        ),
+    },
+    unrestricted=frozenset({Role.PROPHY_MANAGER}),
+)
+
+OPEN_UNIT_OPERATIONS = RowPolicy(
+    UnitOperation,
+    default=Rule("client", "client_ids"),
+    rules={Role.UNIT_MANAGER: Rule("original_unit", "unit_ids")},
+    unrestricted=frozenset({Role.PROPHY_MANAGER}),
+)
+
+OPEN_EQUIPMENT_OPERATIONS = RowPolicy(
+    EquipmentOperation,
+    default=Rule("unit__client", "client_ids"),
+    rules={Role.UNIT_MANAGER: Rule("unit", "unit_ids")},
+    unrestricted=frozenset({Role.PROPHY_MANAGER}),
+)
@@ -1,6 +1,8 @@
 from rest_framework import serializers
 
 from clients_management.models import Client, Equipment, Unit
+from clients_management.reference import get_modality
+from core.fieldsets import SparseFieldsetMixin
 from requisitions.models import (
     ClientOperation,
     EquipmentOperation,
@@ -8,7 +10,9 @@ from requisitions.models import (
 )
 
 
-class ClientOperationSerializer(serializers.ModelSerializer):
+class ClientOperationSerializer(
+    SparseFieldsetMixin, serializers.ModelSerializer
+):
     class Meta:
         model = ClientOperation
         exclude = ["is_active"]
@@ -45,7 +49,9 @@ class ClientOperationUpdateStatusSerializer(serializers.ModelSerializer):
         fields = ["operation_status"]
 
 
-class UnitOperationSerializer(serializers.ModelSerializer):
+class UnitOperationSerializer(
+    SparseFieldsetMixin, serializers.ModelSerializer
+):
     class Meta:
         model = UnitOperation
         fields = "__all__"
@@ -83,7 +89,13 @@ class UnitOperationDeleteSerializer(serializers.ModelSerializer):
         return unit_operation
 
 
-class EquipmentOperationSerializer(serializers.ModelSerializer):
+class EquipmentOperationSerializer(
+    SparseFieldsetMixin, serializers.ModelSerializer
+):
+    computed_sources = {
+        "modality": ("modality",),
+    }
+
     class Meta:
         model = EquipmentOperation
         fields = "__all__"
@@ -126,11 +138,8 @@ class EquipmentOperationSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance: EquipmentOperation):
         representation = super().to_representation(instance)
-        representation["modality"] = {
-            "id": instance.modality.id,
-            "name": instance.modality.name,
-            "accessory_type": instance.modality.accessory_type,
-        }
+        if self.wants("modality"):
+            representation["modality"] = get_modality(instance.modality_id)
         return representation
 
 
@@ -0,0 +1,76 @@
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from clients_management.models import Client
+from requisitions.models import (
+    BaseOperation,
+    ClientOperation,
+    EquipmentOperation,
+    UnitOperation,
+    refresh_pending_operations,
+)
+
+
+@receiver(pre_save, sender=ClientOperation)
+@receiver(pre_save, sender=UnitOperation)
+@receiver(pre_save, sender=EquipmentOperation)
+@receiver(pre_delete, sender=ClientOperation)
+@receiver(pre_delete, sender=UnitOperation)
+@receiver(pre_delete, sender=EquipmentOperation)
+def capture_operation_client_cnpjs(
+    sender: type[BaseOperation],
+    instance: BaseOperation,
+    **kwargs,
+) -> None:
+    if kwargs.get("raw"):
+        return
+    instance._old_client_cnpjs = instance.get_client_cnpjs()
+
+
+@receiver(post_save, sender=ClientOperation)
+@receiver(post_save, sender=UnitOperation)
+@receiver(post_save, sender=EquipmentOperation)
+@receiver(post_delete, sender=ClientOperation)
+@receiver(post_delete, sender=UnitOperation)
+@receiver(post_delete, sender=EquipmentOperation)
+def refresh_operation_clients(
+    sender: type[BaseOperation],
+    instance: BaseOperation,
+    **kwargs,
+) -> None:
+    """Refresh the pending flag of clients before and after the write.
+
+    Deleted operations can no longer be read back, so only the CNPJs
+    captured before the deletion are used for them.
+    """
+    if kwargs.get("raw"):
+        return
+    cnpjs = set(getattr(instance, "_old_client_cnpjs", ()))
+    if kwargs["signal"] is post_save:
+        cnpjs |= instance.get_client_cnpjs()
+    refresh_pending_operations(*cnpjs)
+
+
+@receiver(post_save, sender=Client)
+def refresh_client_pending_operations(
+    sender: type[Client],
+    instance: Client,
+    **kwargs,
+) -> None:
+    """Recompute the flag of the client's current and previous CNPJ.
+
+    Accepted client edits rewrite the original client's CNPJ, which
+    moves the operations of both CNPJs. Refreshing on every save also
+    repairs a stale flag written back from an outdated instance. The
+    previous CNPJ is the one read by
+    ``clients_management.signals.capture_old_fields``.
+    """
+    if kwargs.get("raw"):
+        return
+    old = getattr(instance, "_old_fields", None)
+    refresh_pending_operations(instance.cnpj, old and old["cnpj"])
@@ -0,0 +1,110 @@
+import pytest
+from django.core.management import CommandError, call_command
+from django.db.models.signals import pre_save
+from rest_framework import status
+from rest_framework.test import APIClient
+from validate_docbr import CNPJ
+
+from clients_management.models import Client
+from requisitions.models import (
+    ClientOperation,
+    EquipmentOperation,
+    UnitOperation,
+)
+from tests.factories import (
+    ClientFactory,
+    ClientOperationFactory,
+    EquipmentOperationFactory,
+    UnitFactory,
+    UnitOperationFactory,
+    UserFactory,
+)
+from users.models import UserAccount
+
+
+def _flag(client: Client) -> bool:
+    return Client.objects.get(pk=client.pk).has_pending_operations
+
+
+@pytest.mark.django_db
+def test_unit_operation_review_flags_client_until_accepted():
+    client = ClientFactory()
+    original = UnitFactory(client=client)
+    assert not _flag(client)
+
+    staged = UnitOperationFactory(
+        operation_type=UnitOperation.OperationType.EDIT,
+        original_unit=original,
+        client=client,
+    )
+    assert _flag(client)
+
+    staged.operation_status = UnitOperation.OperationStatus.ACCEPTED
+    staged.save()
+    assert not _flag(client)
+
+
+@pytest.mark.django_db
+def test_equipment_operation_destroy_clears_flag():
+    api_client = APIClient()
+    api_client.force_authenticate(
+        user=UserFactory(role=UserAccount.Role.PROPHY_MANAGER)
+    )
+    operation = EquipmentOperationFactory()
+    client = operation.unit.client
+    assert _flag(client)
+
+    response = api_client.delete(f"/api/equipments/operations/{operation.pk}/")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not EquipmentOperation.objects.filter(pk=operation.pk).exists()
+    assert not _flag(client)
+
+
+@pytest.mark.django_db
+def test_accepted_client_edit_refreshes_old_and_new_cnpj():
+    original = ClientOperationFactory(
+        operation_status=ClientOperation.OperationStatus.ACCEPTED,
+        operation_type=ClientOperation.OperationType.CLOSED,
+    )
+    new_cnpj = CNPJ().generate()
+    staged = ClientOperationFactory(
+        operation_type=ClientOperation.OperationType.EDIT,
+        original_client=original.client_ptr,
+        cnpj=new_cnpj,
+    )
+    assert _flag(original)
+
+    staged.operation_status = ClientOperation.OperationStatus.ACCEPTED
+    staged.save()
+
+    original.refresh_from_db()
+    assert original.cnpj == new_cnpj
+    assert not _flag(original)
+
+
+@pytest.mark.django_db
+def test_rebuild_pending_operations_repairs_drift():
+    pending = UnitOperationFactory().client
+    idle = ClientFactory()
+    Client.objects.filter(pk=pending.pk).update(has_pending_operations=False)
+    Client.objects.filter(pk=idle.pk).update(has_pending_operations=True)
+
+    with pytest.raises(CommandError):
+        call_command("rebuild_pending_operations", "--check")
+
+    call_command("rebuild_pending_operations")
+
+    assert _flag(pending)
+    assert not _flag(idle)
+    call_command("rebuild_pending_operations", "--check")
+
+
+@pytest.mark.django_db
+def test_client_saves_read_the_previous_row_once(django_assert_num_queries):
+    client = ClientFactory()
+
+    with django_assert_num_queries(1):
+        pre_save.send(sender=Client, instance=client, raw=False)
+
+    assert client._old_fields["cnpj"] == client.cnpj
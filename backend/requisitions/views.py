@@ -11,11 +11,20 @@ from rest_framework.response import Response
 from rest_framework.serializers import ModelSerializer
 
 from clients_management.models import Proposal
+from core.fieldsets import FIELDSET_PARAMETERS, apply_fieldset
+from core.query_budget import query_budget
+from core.timing import SERIALIZE, timed
 from requisitions.models import (
+    OPEN_OPERATIONS,
     ClientOperation,
     EquipmentOperation,
     UnitOperation,
 )
+from requisitions.policies import (
+    OPEN_CLIENT_OPERATIONS,
+    OPEN_EQUIPMENT_OPERATIONS,
+    OPEN_UNIT_OPERATIONS,
+)
 from requisitions.serializers import (
     ClientOperationSerializer,
     EquipmentOperationDeleteSerializer,
@@ -64,54 +73,36 @@ class ClientOperationViewSet(viewsets.ViewSet):
             401: "Unauthorized access",
             403: "Permission denied",
         },
+        manual_parameters=FIELDSET_PARAMETERS,
     )
+    @query_budget(6)
     def list(self, request):
         user: UserAccount = cast(UserAccount, request.user)
-        if user.role == UserAccount.Role.PROPHY_MANAGER:
-            queryset = ClientOperation.objects.filter(
-                operation_status__in=[
-                    ClientOperation.OperationStatus.REVIEW,
-                    ClientOperation.OperationStatus.REJECTED,
-                ]
-            )
-        elif user.role == UserAccount.Role.UNIT_MANAGER:
-            user_managed_unit_operations = UnitOperation.objects.filter(
-                user=user,
-                operation_status__in=[
-                    ClientOperation.OperationStatus.REVIEW,
-                    ClientOperation.OperationStatus.REJECTED,
-                ],
-            )
-            client_ids_from_units = user_managed_unit_operations.values_list(
-                "client_id", flat=True
-            ).distinct()
-            queryset = ClientOperation.objects.filter(
-                pk__in=client_ids_from_units,
-                is_active=True,
-                operation_status__in=[
-                    ClientOperation.OperationStatus.REVIEW,
-                    ClientOperation.OperationStatus.REJECTED,
-                ],
-            )
-        else:
-            queryset = ClientOperation.objects.filter(
-                users=user,
-                operation_status__in=[
-                    ClientOperation.OperationStatus.REVIEW,
-                    ClientOperation.OperationStatus.REJECTED,
-                ],
-            )
-
-        queryset = queryset.order_by("id")
+        queryset = ClientOperation.objects.filter(
+            OPEN_OPERATIONS
+        ).prefetch_related("users")
+        if user.role == UserAccount.Role.UNIT_MANAGER:
+            queryset = queryset.filter(is_active=True)
+        queryset = OPEN_CLIENT_OPERATIONS.apply(queryset, user).order_by("id")
+
+        queryset, context = apply_fieldset(
+            queryset, ClientOperationSerializer, request
+        )
 
         # Pagination
         paginator = PageNumberPagination()
         page = paginator.paginate_queryset(queryset, request)
         if page is not None:
-            serializer = ClientOperationSerializer(page, many=True)
-            return paginator.get_paginated_response(serializer.data)
+            serializer = ClientOperationSerializer(
+                page, many=True, context=context
+            )
+            with timed(SERIALIZE):
+                data = serializer.data
+            return paginator.get_paginated_response(data)
         else:
-            serializer = ClientOperationSerializer(queryset, many=True)
+            serializer = ClientOperationSerializer(
+                queryset, many=True, context=context
+            )
             return Response(serializer.data, status=status.HTTP_200_OK)
 
     @swagger_auto_schema(
@@ -260,6 +251,7 @@ class ClientOperationViewSet(viewsets.ViewSet):
             404: "Client operation not found",
         },
     )
+    @transaction.atomic
     def update(self, request, pk=None):
         try:
             instance = ClientOperation.objects.get(pk=pk)
@@ -301,6 +293,7 @@ class ClientOperationViewSet(viewsets.ViewSet):
             404: "Client operation not found",
         },
     )
+    @transaction.atomic
     def destroy(self, request, pk=None):
         try:
             instance = ClientOperation.objects.get(pk=pk)
@@ -357,43 +350,33 @@ class UnitOperationViewSet(viewsets.ViewSet):
             401: "Unauthorized access",
             403: "Permission denied",
         },
+        manual_parameters=FIELDSET_PARAMETERS,
     )
+    @query_budget(5)
     def list(self, request):
         user: UserAccount = cast(UserAccount, request.user)
-        if user.role == UserAccount.Role.PROPHY_MANAGER:
-            queryset = UnitOperation.objects.filter(
-                operation_status__in=[
-                    UnitOperation.OperationStatus.REVIEW,
-                    UnitOperation.OperationStatus.REJECTED,
-                ]
-            )
-        elif user.role == UserAccount.Role.UNIT_MANAGER:
-            queryset = UnitOperation.objects.filter(
-                original_unit__user=user,
-                operation_status__in=[
-                    UnitOperation.OperationStatus.REVIEW,
-                    UnitOperation.OperationStatus.REJECTED,
-                ],
-            )
-        else:
-            queryset = UnitOperation.objects.filter(
-                client__users=user,
-                operation_status__in=[
-                    UnitOperation.OperationStatus.REVIEW,
-                    UnitOperation.OperationStatus.REJECTED,
-                ],
-            )
+        queryset = OPEN_UNIT_OPERATIONS.apply(
+            UnitOperation.objects.filter(OPEN_OPERATIONS), user
+        ).order_by("client")
 
-        queryset = queryset.order_by("client")
+        queryset, context = apply_fieldset(
+            queryset, UnitOperationSerializer, request
+        )
 
         # Pagination
         paginator = PageNumberPagination()
         page = paginator.paginate_queryset(queryset, request)
         if page is not None:
-            serializer = UnitOperationSerializer(page, many=True)
-            return paginator.get_paginated_response(serializer.data)
+            serializer = UnitOperationSerializer(
+                page, many=True, context=context
+            )
+            with timed(SERIALIZE):
+                data = serializer.data
+            return paginator.get_paginated_response(data)
         else:
-            serializer = UnitOperationSerializer(queryset, many=True)
+            serializer = UnitOperationSerializer(
+                queryset, many=True, context=context
+            )
             return Response(serializer.data, status=status.HTTP_200_OK)
 
     @swagger_auto_schema(
@@ -439,6 +422,7 @@ class UnitOperationViewSet(viewsets.ViewSet):
             ),
         },
     )
+    @transaction.atomic
     def create(self, request):
         data = request.data
 
@@ -485,6 +469,7 @@ class UnitOperationViewSet(viewsets.ViewSet):
             404: "Unit operation not found",
         },
     )
+    @transaction.atomic
     def update(self, request, pk=None):
         try:
             operation = UnitOperation.objects.get(pk=pk)
@@ -532,6 +517,7 @@ class UnitOperationViewSet(viewsets.ViewSet):
             404: "Unit operation not found",
         },
     )
+    @transaction.atomic
     def destroy(self, request, pk=None):
         try:
             instance = UnitOperation.objects.get(pk=pk)
@@ -588,43 +574,33 @@ class EquipmentOperationViewSet(viewsets.ViewSet):
             401: "Unauthorized access",
             403: "Permission denied",
         },
+        manual_parameters=FIELDSET_PARAMETERS,
     )
+    @query_budget(6)
     def list(self, request):
         user: UserAccount = cast(UserAccount, request.user)
-        if user.role == UserAccount.Role.PROPHY_MANAGER:
-            queryset = EquipmentOperation.objects.filter(
-                operation_status__in=[
-                    EquipmentOperation.OperationStatus.REVIEW,
-                    EquipmentOperation.OperationStatus.REJECTED,
-                ]
-            )
-        elif user.role == UserAccount.Role.UNIT_MANAGER:
-            queryset = EquipmentOperation.objects.filter(
-                unit__user=user,
-                operation_status__in=[
-                    EquipmentOperation.OperationStatus.REVIEW,
-                    EquipmentOperation.OperationStatus.REJECTED,
-                ],
-            )
-        else:
-            queryset = EquipmentOperation.objects.filter(
-                unit__client__users=user,
-                operation_status__in=[
-                    EquipmentOperation.OperationStatus.REVIEW,
-                    EquipmentOperation.OperationStatus.REJECTED,
-                ],
-            )
+        queryset = OPEN_EQUIPMENT_OPERATIONS.apply(
+            EquipmentOperation.objects.filter(OPEN_OPERATIONS), user
+        ).order_by("unit")
 
-        queryset = queryset.order_by("unit")
+        queryset, context = apply_fieldset(
+            queryset, EquipmentOperationSerializer, request
+        )
 
         # Pagination
         paginator = PageNumberPagination()
         page = paginator.paginate_queryset(queryset, request)
         if page is not None:
-            serializer = EquipmentOperationSerializer(page, many=True)
-            return paginator.get_paginated_response(serializer.data)
+            serializer = EquipmentOperationSerializer(
+                page, many=True, context=context
+            )
+            with timed(SERIALIZE):
+                data = serializer.data
+            return paginator.get_paginated_response(data)
         else:
-            serializer = EquipmentOperationSerializer(queryset, many=True)
+            serializer = EquipmentOperationSerializer(
+                queryset, many=True, context=context
+            )
             return Response(serializer.data, status=status.HTTP_200_OK)
 
     @swagger_auto_schema(
@@ -668,6 +644,7 @@ class EquipmentOperationViewSet(viewsets.ViewSet):
             ),
         },
     )
+    @transaction.atomic
     def create(self, request):
         data = request.data
 
@@ -719,6 +696,7 @@ class EquipmentOperationViewSet(viewsets.ViewSet):
             404: openapi.Response(description="Equipment operation not found"),
         },
     )
+    @transaction.atomic
     def update(self, request, pk=None):
         try:
             instance = EquipmentOperation.objects.get(pk=pk)
@@ -760,6 +738,7 @@ class EquipmentOperationViewSet(viewsets.ViewSet):
             404: openapi.Response(description="Equipment operation not found"),
         },
     )
+    @transaction.atomic
     def destroy(self, request, pk=None):
         try:
             instance = EquipmentOperation.objects.get(pk=pk)
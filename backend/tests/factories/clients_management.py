@@ -1,6 +1,7 @@
 import factory
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.utils import timezone
+from faker import Faker
 from validate_docbr import CNPJ
 
 from clients_management.models import (
@@ -16,6 +17,13 @@ from clients_management.models import (
 )
 from users.models import UserAccount
 
+fake = Faker()
+
+
+def manufacturer_name() -> str:
+    """Return a company name short enough for a manufacturer field."""
+    return fake.company()[:30]
+
 
 class ClientFactory(factory.django.DjangoModelFactory):
     class Meta:
@@ -81,7 +89,7 @@ class EquipmentFactory(factory.django.DjangoModelFactory):
     unit = factory.SubFactory(UnitFactory)
     modality = factory.SubFactory(ModalityFactory)
 
-    manufacturer = factory.Faker("company")
+    manufacturer = factory.LazyFunction(manufacturer_name)
     model = factory.Faker("word")
     series_number = factory.Sequence(lambda n: f"SN-{n}")
     equipment_photo = SimpleUploadedFile(
@@ -103,7 +111,7 @@ class AccessoryFactory(factory.django.DjangoModelFactory):
 
     equipment = factory.SubFactory(EquipmentFactory)
     category = Modality.AccessoryType.NONE
-    manufacturer = factory.Faker("company")
+    manufacturer = factory.LazyFunction(manufacturer_name)
     model = factory.Faker("word")
     series_number = factory.Sequence(lambda n: f"ASN-{n}")
     equipment_photo = SimpleUploadedFile(
@@ -7,7 +7,12 @@ from requisitions.models import (
     UnitOperation,
 )
 
-from .clients_management import ClientFactory, EquipmentFactory, UnitFactory
+from .clients_management import (
+    ClientFactory,
+    EquipmentFactory,
+    UnitFactory,
+    manufacturer_name,
+)
 from .users import UserFactory
 
 
@@ -74,7 +79,7 @@ class EquipmentOperationFactory(factory.django.DjangoModelFactory):
     modality = factory.SubFactory(
         "tests.factories.clients_management.ModalityFactory"
     )
-    manufacturer = factory.Faker("company")
+    manufacturer = factory.LazyFunction(manufacturer_name)
     model = factory.Faker("word")
     series_number = factory.Sequence(lambda n: f"SNOP-{n}")
     equipment_photo = factory.LazyFunction(
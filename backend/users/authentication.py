@@ -10,6 +10,7 @@ from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import TokenError
 from validate_docbr import CPF
 
+from core.timing import AUTH, timed
 from users.models import UserAccount
 
 
@@ -42,6 +43,10 @@ class CustomJWTAuthentication(JWTAuthentication):
     """
 
     def authenticate(self, request: Request):
+        with timed(AUTH):
+            return self._authenticate(request)
+
+    def _authenticate(self, request: Request):
         """Authenticates a JWT token from the header or a cookie.
 
         Args:
@@ -80,6 +85,10 @@ class GoogleOIDCAuthentication(BaseAuthentication):
     """
 
     def authenticate(self, request):
+        with timed(AUTH):
+            return self._authenticate(request)
+
+    def _authenticate(self, request):
         auth_header = request.headers.get("Authorization") or ""
         if not auth_header.startswith("Bearer "):
             return None
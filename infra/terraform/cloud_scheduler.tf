@@ -60,3 +60,24 @@ resource "google_cloud_scheduler_job" "contract_notifications" {
 
   depends_on = [google_project_service.apis]
 }
+
+resource "google_cloud_scheduler_job" "purge_expired_uploads" {
+  name             = "prophy-purge-expired-uploads"
+  description      = "Delete unfinished chunked uploads (daily 03:00 BRT)"
+  schedule         = "0 3 * * *"
+  time_zone        = "America/Sao_Paulo"
+  attempt_deadline = "30s"
+  paused           = true
+
+  http_target {
+    http_method = "POST"
+    uri         = "${var.backend_run_url}/api/uploads/tasks/purge-expired/"
+
+    oidc_token {
+      service_account_email = google_service_account.scheduler.email
+      audience              = var.backend_run_url
+    }
+  }
+
+  depends_on = [google_project_service.apis]
+}